@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.contrib import admin
 
 from .models import Customer
+from .services.search import search_customers
 
 
 @admin.register(Customer)
@@ -9,3 +11,15 @@ class CustomerAdmin(admin.ModelAdmin):
     search_fields = ("id", "name", "external_ref", "contact_email", "contact_person")
     list_filter = ("created_at",)
     readonly_fields = ("created_at", "updated_at")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Autocomplete widgets (e.g. the customer field on licenses) only
+        # show the best few matches, so they take them from the search
+        # index; terms it does not know fall back to scanning every search
+        # field. The changelist always searches every field, unlimited.
+        resolver_match = request.resolver_match
+        if resolver_match is not None and resolver_match.url_name == "autocomplete" and search_term.strip():
+            matches = search_customers(search_term, settings.CUSTOMER_SEARCH_MAX_RESULTS)
+            if matches:
+                return queryset.filter(pk__in=[match.id for match in matches]), False
+        return super().get_search_results(request, queryset, search_term)
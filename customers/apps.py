@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CustomersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'customers'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from .models import Customer
+        from .services.search import invalidate_customer_search
+
+        post_save.connect(invalidate_customer_search, sender=Customer, dispatch_uid="customer-search-save")
+        post_delete.connect(invalidate_customer_search, sender=Customer, dispatch_uid="customer-search-delete")
@@ -0,0 +1,181 @@
+# customers/management/commands/benchmark_customer_search.py
+
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from customers.models import Customer
+from customers.services.search import (
+    customer_index,
+    reset_customer_index,
+    search_customers,
+    trigram_search_available,
+)
+
+
+BENCHMARK_ID_PREFIX = "bench-cust-"
+
+_WORDS = (
+    "acme", "global", "north", "blue", "river", "summit", "delta", "quantum",
+    "pioneer", "harbor", "silver", "atlas", "vertex", "crescent", "granite",
+    "meridian", "orbit", "cedar", "falcon", "horizon", "lumen", "nova",
+    "prairie", "redwood", "sierra", "tandem", "union", "willow", "zenith",
+)
+_SUFFIXES = ("systems", "labs", "holdings", "group", "industries", "software", "gmbh", "inc", "ltd")
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure customer search latency (GET /api/customers/search/) over a "
+        "generated customer set, against a plain icontains lookup. Generated "
+        "customers are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--customers",
+            type=int,
+            default=500000,
+            help="Customers to generate (default: 500000).",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=1000,
+            help="Queries per kind (default: 1000).",
+        )
+        parser.add_argument(
+            "--baseline-queries",
+            type=int,
+            default=50,
+            help="Queries for the icontains baseline (default: 50).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Results per query (default: 10).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed (default: 1).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the generated customers (and reuse them on the next run).",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        existing = Customer.objects.filter(pk__startswith=BENCHMARK_ID_PREFIX).count()
+        if existing and existing != options["customers"]:
+            raise CommandError(
+                f"{existing} generated customers from an earlier --keep run exist; "
+                f"pass --customers {existing} or delete them first."
+            )
+        if not existing:
+            self._generate(options["customers"], rng)
+
+        try:
+            self._run(options, rng)
+        finally:
+            if not options["keep"]:
+                self.stdout.write("deleting generated customers")
+                Customer.objects.filter(pk__startswith=BENCHMARK_ID_PREFIX).delete()
+                reset_customer_index()
+
+    def _name(self, number: int, rng: random.Random) -> str:
+        words = rng.sample(_WORDS, rng.randint(1, 3))
+        return f"{' '.join(words).title()} {rng.choice(_SUFFIXES).title()} {number}"
+
+    def _generate(self, count: int, rng: random.Random) -> None:
+        self.stdout.write(f"generating {count} customers")
+        started = time.perf_counter()
+        batch = []
+        for number in range(count):
+            batch.append(
+                Customer(
+                    id=f"{BENCHMARK_ID_PREFIX}{number}",
+                    name=self._name(number, rng),
+                    external_ref=f"bench-{number:07d}",
+                )
+            )
+            if len(batch) == 5000 or number == count - 1:
+                with transaction.atomic():
+                    Customer.objects.bulk_create(batch)
+                batch = []
+        self.stdout.write(f"  {time.perf_counter() - started:.1f}s")
+
+    def _run(self, options, rng: random.Random) -> None:
+        total = Customer.objects.count()
+        reset_customer_index()
+        started = time.perf_counter()
+        customer_index()
+        build_seconds = time.perf_counter() - started
+
+        reset_customer_index()
+        tracemalloc.start()
+        customer_index()
+        index_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.stdout.write(
+            f"index over {total} customers: built in {build_seconds:.2f}s, "
+            f"{index_bytes / 2**20:.0f} MiB"
+        )
+
+        generated = options["customers"]
+        names = list(
+            Customer.objects.filter(
+                pk__in=[f"{BENCHMARK_ID_PREFIX}{rng.randrange(generated)}" for _ in range(2000)]
+            ).values_list("name", "external_ref")
+        )
+        samples = [rng.choice(names) for _ in range(options["queries"])]
+        kinds = {
+            "name prefix (1-2 chars)": [name[: rng.randint(1, 2)] for name, _ in samples],
+            "name prefix (3-8 chars)": [name[: rng.randint(3, 8)] for name, _ in samples],
+            "external_ref prefix": [ref[: rng.randint(8, 13)] for _, ref in samples],
+            "later word prefix": [name.split(" ", 1)[1][:5] for name, _ in samples],
+            "full name": [name for name, _ in samples],
+            "substring (contains)": [name[2:7] for name, _ in samples],
+            "no match": [f"zz{rng.randint(0, 10**6)}" for _ in samples],
+        }
+
+        limit = options["limit"]
+        alias = Customer.objects.db
+        self.stdout.write(
+            f"{options['queries']} queries per kind, limit {limit}, "
+            f"pg_trgm {'available' if trigram_search_available(alias) else 'not available'}"
+        )
+        for kind, queries in kinds.items():
+            self._report(kind, queries, lambda query: search_customers(query, limit))
+
+        baseline = [query for queries in kinds.values() for query in queries[: max(1, options["baseline_queries"] // len(kinds))]]
+        self._report(
+            "icontains baseline (mixed)",
+            baseline,
+            lambda query: list(
+                Customer.objects.filter(Q(name__icontains=query) | Q(external_ref__icontains=query))
+                .values_list("id", flat=True)[:limit]
+            ),
+        )
+
+    def _report(self, kind: str, queries, search) -> None:
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            search(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        percentile = lambda p: timings[min(len(timings) - 1, int(len(timings) * p))]
+        self.stdout.write(
+            f"  {kind:<28} p50 {percentile(0.50):8.2f} ms  p95 {percentile(0.95):8.2f} ms  "
+            f"p99 {percentile(0.99):8.2f} ms  mean {statistics.fmean(timings):8.2f} ms"
+        )
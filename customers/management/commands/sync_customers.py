@@ -0,0 +1,80 @@
+# customers/management/commands/sync_customers.py
+
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.services.sync import CustomerSyncError, sync_customers
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or update customers from a CRM export keyed by external_ref "
+        "(JSON array or NDJSON; same record format as POST /api/customers/sync/)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for stdin.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Records upserted per statement and transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--show-rejected",
+            type=int,
+            default=20,
+            metavar="N",
+            help="Print the first N rejected records (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        records = self._read(options["path"])
+
+        started = time.perf_counter()
+        try:
+            result = sync_customers(records, chunk_size=options["chunk_size"])
+        except CustomerSyncError as exc:
+            raise CommandError(str(exc)) from exc
+        elapsed = time.perf_counter() - started
+
+        for item in result["rejected"][: options["show_rejected"]]:
+            self.stderr.write(f"record {item['index']}: {item['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(records)} records in {elapsed:.2f}s: {result['created']} created, "
+                f"{result['updated']} updated, {result['unchanged']} unchanged, "
+                f"{len(result['rejected'])} rejected."
+            )
+        )
+
+    def _read(self, path: str) -> list:
+        try:
+            if path == "-":
+                text = sys.stdin.read()
+            else:
+                with open(path, encoding="utf-8") as handle:
+                    text = handle.read()
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}") from exc
+
+        if text.lstrip().startswith("["):
+            try:
+                records = json.loads(text)
+            except ValueError as exc:
+                raise CommandError(f"JSON parse error: {exc}") from exc
+            return records
+
+        records = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError as exc:
+                raise CommandError(f"NDJSON parse error on line {line_no}: {exc}") from exc
+        return records
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def blank_refs_to_null(apps, schema_editor):
+    # Several customers without a reference must not collide on ''.
+    Customer = apps.get_model("customers", "Customer")
+    Customer.objects.using(schema_editor.connection.alias).filter(external_ref="").update(external_ref=None)
+
+
+def check_unique_refs(apps, schema_editor):
+    # Stop with the offending references instead of an IntegrityError
+    # from the unique index below.
+    Customer = apps.get_model("customers", "Customer")
+    customers = Customer.objects.using(schema_editor.connection.alias)
+    duplicates = list(
+        customers.filter(external_ref__isnull=False)
+        .values("external_ref")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .order_by("external_ref")
+        .values_list("external_ref", flat=True)
+    )
+    if not duplicates:
+        return
+
+    examples = "; ".join(
+        f"{ref!r}: {', '.join(customers.filter(external_ref=ref).order_by('id').values_list('id', flat=True))}"
+        for ref in duplicates[:10]
+    )
+    raise RuntimeError(
+        f"Customer.external_ref becomes unique, but {len(duplicates)} reference(s) are shared "
+        f"by several customers ({examples}). Give each customer its own reference (or clear "
+        "it) and run migrate again."
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_refs_to_null, migrations.RunPython.noop),
+        migrations.RunPython(check_unique_refs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='customer',
+            name='external_ref',
+            field=models.CharField(blank=True, help_text='Optional CRM / billing reference (e.g., Stripe or HubSpot ID). Key of the CRM sync.', max_length=255, null=True, unique=True),
+        ),
+    ]
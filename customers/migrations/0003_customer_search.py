@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:36
+
+from django.db import DatabaseError, migrations, models, transaction
+
+
+def create_trigram_index(apps, schema_editor):
+    # PostgreSQL only. pg_trgm ships with PostgreSQL (contrib) and is a
+    # trusted extension, but may be missing from minimal builds; without it
+    # customer search matches by prefix only.
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except DatabaseError:
+        return
+    # UPPER(name): the expression Django's name__icontains compares.
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS customer_name_trgm_idx "
+        "ON customers_customer USING gin (UPPER(name) gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS customer_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_alter_customer_external_ref'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['updated_at'], name='customer_updated_idx'),
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -20,7 +20,8 @@ class Customer(models.Model):
         max_length=255,
         blank=True,
         null=True,
-        help_text="Optional CRM / billing reference (e.g., Stripe or HubSpot ID).",
+        unique=True,
+        help_text="Optional CRM / billing reference (e.g., Stripe or HubSpot ID). Key of the CRM sync.",
     )
     contact_email = models.EmailField(
         blank=True,
@@ -44,6 +45,10 @@ class Customer(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # Incremental refresh of the in-process search index.
+            models.Index(fields=["updated_at"], name="customer_updated_idx"),
+        ]
 
     def __str__(self) -> str:  
         return f"{self.name} ({self.id})"
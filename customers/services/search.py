@@ -0,0 +1,318 @@
+# customers/services/search.py
+
+"""
+Customer autocomplete by name or external_ref.
+
+Matches are ranked:
+
+    0  exact name or external_ref
+    1  name starts with the query
+    2  external_ref starts with the query
+    3  a later word of the name starts with the query
+    4  name contains the query elsewhere
+
+Ranks 0-3 come from CustomerPrefixIndex, sorted lists of normalized keys
+held in process memory and searched with bisect. Each process builds it
+on first use and then applies changes incrementally: saves (and syncs)
+bump a version in the Django cache, and the index re-reads customers
+updated since its last refresh whenever the version moves or
+CUSTOMER_SEARCH_REFRESH_SECONDS have passed (the fallback when processes
+do not share a cache). Writes must therefore touch updated_at, as save()
+and the CRM sync do; a bare queryset.update() goes unnoticed.
+
+Rank 4 comes from the database, through the trigram index on UPPER(name)
+(migration customers 0003), ordered by similarity. It is only looked up
+when the prefix ranks leave room and the query has at least three
+characters, and only on PostgreSQL with pg_trgm: elsewhere (SQLite, or
+PostgreSQL without the extension) it would be a full table scan, so
+search falls back to the prefix ranks alone.
+"""
+
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, router, transaction
+
+from customers.models import Customer
+
+
+_VERSION_CACHE_KEY = "customer-search:version"
+
+# Between a key and the customer id in an index entry. Sorts before any
+# printable character, so "acme" + SEP + id comes before "acme corp" + ...
+_SEP = "\x00"
+
+MATCH_EXACT = 0
+MATCH_NAME_PREFIX = 1
+MATCH_REF_PREFIX = 2
+MATCH_WORD_PREFIX = 3
+MATCH_CONTAINS = 4
+
+MATCH_LABELS = {
+    MATCH_EXACT: "exact",
+    MATCH_NAME_PREFIX: "name_prefix",
+    MATCH_REF_PREFIX: "external_ref_prefix",
+    MATCH_WORD_PREFIX: "word_prefix",
+    MATCH_CONTAINS: "contains",
+}
+
+# Above this many changed customers a refresh rebuilds the index instead
+# of inserting into it one key at a time.
+_INCREMENTAL_LIMIT = 5000
+
+
+@dataclass(frozen=True)
+class CustomerMatch:
+    id: str
+    name: str
+    external_ref: str | None
+    rank: int
+
+    @property
+    def match(self) -> str:
+        return MATCH_LABELS[self.rank]
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def bump_customer_search_version() -> None:
+    try:
+        cache.incr(_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.add(_VERSION_CACHE_KEY, 1, None)
+
+
+def invalidate_customer_search(**kwargs) -> None:
+    """
+    post_save / post_delete receiver for Customer.
+    """
+    transaction.on_commit(bump_customer_search_version)
+
+
+class CustomerPrefixIndex:
+    """
+    Sorted name, external_ref and word keys of every customer.
+
+    Entries are "<normalized key>\\x00<customer id>" strings, so one
+    bisect finds the first key with a given prefix and the next `limit`
+    entries are the alphabetically first matches.
+    """
+
+    def __init__(self):
+        self._names: List[str] = []
+        self._refs: List[str] = []
+        self._words: List[str] = []
+        # id -> (name, external_ref)
+        self._customers: Dict[str, Tuple[str, str | None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._customers)
+
+    @staticmethod
+    def _entries(customer_id: str, name: str, external_ref: str | None):
+        key = normalize(name)
+        words = key.split(" ")
+        return (
+            [f"{key}{_SEP}{customer_id}"],
+            [f"{normalize(external_ref)}{_SEP}{customer_id}"] if external_ref else [],
+            # Suffixes of the name from each later word on ("corp" and
+            # "acme corp" for "big acme corp"), to rank by what follows.
+            [f"{' '.join(words[i:])}{_SEP}{customer_id}" for i in range(1, len(words))],
+        )
+
+    def build(self, rows: Iterable[Tuple[str, str, str | None]]) -> None:
+        names, refs, words = [], [], []
+        customers = {}
+        for customer_id, name, external_ref in rows:
+            customers[customer_id] = (name, external_ref)
+            name_entries, ref_entries, word_entries = self._entries(customer_id, name, external_ref)
+            names += name_entries
+            refs += ref_entries
+            words += word_entries
+        names.sort()
+        refs.sort()
+        words.sort()
+        self._names, self._refs, self._words, self._customers = names, refs, words, customers
+
+    def remove(self, customer_id: str) -> None:
+        current = self._customers.pop(customer_id, None)
+        if current is None:
+            return
+        for entries, keys in zip(self._entries(customer_id, *current), (self._names, self._refs, self._words)):
+            for entry in entries:
+                position = bisect_left(keys, entry)
+                if position < len(keys) and keys[position] == entry:
+                    del keys[position]
+
+    def upsert(self, customer_id: str, name: str, external_ref: str | None) -> None:
+        self.remove(customer_id)
+        self._customers[customer_id] = (name, external_ref)
+        for entries, keys in zip(self._entries(customer_id, name, external_ref), (self._names, self._refs, self._words)):
+            for entry in entries:
+                insort(keys, entry)
+
+    def _scan(self, keys: List[str], prefix: str, limit: int) -> Iterable[Tuple[str, bool]]:
+        # (customer id, exact) for the first `limit` keys starting with prefix.
+        position = bisect_left(keys, prefix)
+        end = min(len(keys), position + limit)
+        while position < end:
+            entry = keys[position]
+            if not entry.startswith(prefix):
+                return
+            key, _, customer_id = entry.rpartition(_SEP)
+            yield customer_id, len(key) == len(prefix)
+            position += 1
+
+    def search(self, query: str, limit: int) -> List[CustomerMatch]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        ranked: Dict[str, int] = {}
+        for keys, rank in ((self._names, MATCH_NAME_PREFIX), (self._refs, MATCH_REF_PREFIX), (self._words, MATCH_WORD_PREFIX)):
+            # An exact key sorts before every longer one, so it is among the first.
+            for customer_id, exact in self._scan(keys, prefix, limit):
+                best = MATCH_EXACT if exact and rank != MATCH_WORD_PREFIX else rank
+                if best < ranked.get(customer_id, MATCH_CONTAINS):
+                    ranked[customer_id] = best
+
+        # dicts keep insertion order, so within a rank matches stay alphabetical.
+        matches = []
+        for customer_id, rank in sorted(ranked.items(), key=lambda item: item[1])[:limit]:
+            # May have been removed by a concurrent refresh since the scan.
+            current = self._customers.get(customer_id)
+            if current is not None:
+                matches.append(CustomerMatch(customer_id, *current, rank))
+        return matches
+
+
+class _IndexState:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index: CustomerPrefixIndex | None = None
+        self.version = None
+        self.refreshed_at = 0.0
+        # Latest Customer.updated_at applied to the index.
+        self.high_water: datetime | None = None
+
+
+_state = _IndexState()
+
+
+def _rebuild(state: _IndexState) -> None:
+    index = CustomerPrefixIndex()
+    rows = Customer.objects.order_by().values_list("id", "name", "external_ref", "updated_at")
+    high_water = None
+
+    def _rows():
+        nonlocal high_water
+        for customer_id, name, external_ref, updated_at in rows.iterator(chunk_size=10000):
+            if high_water is None or updated_at > high_water:
+                high_water = updated_at
+            yield customer_id, name, external_ref
+
+    index.build(_rows())
+    state.index, state.high_water = index, high_water
+
+
+def _refresh(state: _IndexState) -> None:
+    queryset = Customer.objects.order_by()
+    if state.high_water is not None:
+        # >=: rows written in the same instant as the last one seen may
+        # have committed after the last refresh. Re-applying is harmless.
+        queryset = queryset.filter(updated_at__gte=state.high_water)
+    changed = list(queryset.values_list("id", "name", "external_ref", "updated_at")[: _INCREMENTAL_LIMIT + 1])
+    if len(changed) > _INCREMENTAL_LIMIT:
+        _rebuild(state)
+        return
+
+    for customer_id, name, external_ref, updated_at in changed:
+        state.index.upsert(customer_id, name, external_ref)
+        if state.high_water is None or updated_at > state.high_water:
+            state.high_water = updated_at
+    # Deletions leave no trace in updated_at; a count mismatch finds them.
+    if len(state.index) != Customer.objects.count():
+        _rebuild(state)
+
+
+def customer_index() -> CustomerPrefixIndex:
+    """
+    This process's prefix index, brought up to date first if needed.
+    """
+    version = cache.get(_VERSION_CACHE_KEY)
+    now = time.monotonic()
+    state = _state
+    if (
+        state.index is not None
+        and version == state.version
+        and now - state.refreshed_at < settings.CUSTOMER_SEARCH_REFRESH_SECONDS
+    ):
+        return state.index
+
+    with state.lock:
+        if state.index is None:
+            _rebuild(state)
+        elif version != state.version or now - state.refreshed_at >= settings.CUSTOMER_SEARCH_REFRESH_SECONDS:
+            _refresh(state)
+        state.version, state.refreshed_at = version, now
+        return state.index
+
+
+def reset_customer_index() -> None:
+    """
+    Drop this process's index; the next search rebuilds it.
+    """
+    with _state.lock:
+        _state.index = None
+
+
+_trigram_available: Dict[str, bool] = {}
+
+
+def trigram_search_available(alias: str) -> bool:
+    """
+    Whether the database behind alias has pg_trgm (checked once per alias).
+    """
+    if alias not in _trigram_available:
+        connection = connections[alias]
+        available = False
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                available = cursor.fetchone() is not None
+        _trigram_available[alias] = available
+    return _trigram_available[alias]
+
+
+def _contains_matches(query: str, exclude: Iterable[str], limit: int) -> List[CustomerMatch]:
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    queryset = (
+        Customer.objects.filter(name__icontains=query)
+        .exclude(pk__in=list(exclude))
+        .annotate(similarity=TrigramSimilarity("name", query))
+        .order_by("-similarity", "name")
+    )
+    return [
+        CustomerMatch(customer_id, name, external_ref, MATCH_CONTAINS)
+        for customer_id, name, external_ref in queryset.values_list("id", "name", "external_ref")[:limit]
+    ]
+
+
+def search_customers(query: str, limit: int = 10) -> List[CustomerMatch]:
+    """
+    Up to `limit` customers matching query, best first (see module docstring).
+    """
+    matches = customer_index().search(query, limit)
+    query = " ".join(query.split())
+    if len(matches) < limit and len(query) >= 3 and trigram_search_available(router.db_for_read(Customer)):
+        matches += _contains_matches(query, [match.id for match in matches], limit - len(matches))
+    return matches
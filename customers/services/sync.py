@@ -0,0 +1,225 @@
+# customers/services/sync.py
+
+"""
+Bulk upsert of customers from a CRM, keyed by Customer.external_ref.
+
+Records are applied in chunks. Each chunk reads the customers it names,
+drops records that would not change anything, and writes the rest with
+one INSERT ... ON CONFLICT (external_ref) DO UPDATE (bulk_create with
+update_conflicts). Fields missing from a record keep their current value.
+"""
+
+import uuid
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+
+from customers.models import Customer
+from customers.services.search import bump_customer_search_version
+
+
+# Customer fields a CRM record may set (besides external_ref and, for new
+# customers, id).
+SYNC_FIELDS = ("name", "contact_email", "contact_person", "notes")
+
+
+class CustomerSyncError(Exception):
+    """
+    Domain-level error for a sync batch that cannot be applied as a whole.
+    """
+    pass
+
+
+def _max_length(field_name: str) -> int | None:
+    return Customer._meta.get_field(field_name).max_length
+
+
+def _clean_record(raw: Any) -> Dict[str, Any]:
+    """
+    Validate one CRM record. Raises ValueError with a client-facing message.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Record must be a JSON object.")
+
+    external_ref = raw.get("external_ref")
+    if not isinstance(external_ref, str) or not external_ref.strip():
+        raise ValueError("'external_ref' must be a non-empty string.")
+    if len(external_ref) > _max_length("external_ref"):
+        raise ValueError(f"'external_ref' must be at most {_max_length('external_ref')} characters.")
+    record: Dict[str, Any] = {"external_ref": external_ref}
+
+    customer_id = raw.get("id")
+    if customer_id is not None:
+        if not isinstance(customer_id, str) or not customer_id or len(customer_id) > _max_length("id"):
+            raise ValueError(f"'id' must be a non-empty string of at most {_max_length('id')} characters.")
+        record["id"] = customer_id
+
+    for field_name in SYNC_FIELDS:
+        if field_name not in raw:
+            continue
+        value = raw[field_name]
+        if field_name == "name":
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError("'name' must be a non-empty string.")
+        elif value is not None and not isinstance(value, str):
+            raise ValueError(f"'{field_name}' must be a string or null.")
+        max_length = _max_length(field_name)
+        if value is not None and max_length and len(value) > max_length:
+            raise ValueError(f"'{field_name}' must be at most {max_length} characters.")
+        record[field_name] = value
+
+    return record
+
+
+def _new_customer_id() -> str:
+    return f"cust-{uuid.uuid4().hex[:12]}"
+
+
+def _sync_chunk(
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    result: Dict[str, Any],
+) -> None:
+    refs = [record["external_ref"] for _, record in chunk]
+    existing = {
+        row["external_ref"]: row
+        for row in Customer.objects.filter(external_ref__in=refs).values(
+            "id", "external_ref", *SYNC_FIELDS
+        )
+    }
+
+    # (index, merged row, is_new) for records that change something.
+    pending: List[Tuple[int, Dict[str, Any], bool]] = []
+    for index, record in chunk:
+        current = existing.get(record["external_ref"])
+        if current is None:
+            if "name" not in record:
+                result["rejected"].append(
+                    {"index": index, "error": "'name' is required for new customers."}
+                )
+                continue
+            row = {field_name: None for field_name in SYNC_FIELDS}
+            row.update(record)
+            row.setdefault("id", _new_customer_id())
+        else:
+            row = {**current, **{k: v for k, v in record.items() if k in SYNC_FIELDS}}
+            if row == current:
+                result["unchanged"] += 1
+                continue
+
+        # Checked only for changed emails: the validator dominates the
+        # cost of a sync in which little changes.
+        if row["contact_email"] and (current is None or row["contact_email"] != current["contact_email"]):
+            try:
+                validate_email(row["contact_email"])
+            except ValidationError:
+                result["rejected"].append(
+                    {"index": index, "error": "'contact_email' must be a valid email address."}
+                )
+                continue
+        pending.append((index, row, current is None))
+
+    # name and id are unique too; refuse records that would collide with
+    # another customer instead of failing the whole chunk.
+    name_owners = {
+        name: (external_ref, customer_id)
+        for name, external_ref, customer_id in Customer.objects.filter(
+            name__in=[row["name"] for _, row, _ in pending]
+        ).values_list("name", "external_ref", "id")
+    }
+    taken_ids = set(
+        Customer.objects.filter(
+            pk__in=[row["id"] for _, row, is_new in pending if is_new]
+        ).values_list("pk", flat=True)
+    )
+    customers: List[Customer] = []
+    names_in_chunk: set = set()
+    created = updated = 0
+    for index, row, is_new in pending:
+        owner_ref, owner_id = name_owners.get(row["name"], (row["external_ref"], None))
+        if owner_ref != row["external_ref"]:
+            result["rejected"].append(
+                {"index": index, "error": f"Name '{row['name']}' belongs to customer '{owner_id}'."}
+            )
+            continue
+        if row["name"] in names_in_chunk:
+            result["rejected"].append(
+                {"index": index, "error": f"Name '{row['name']}' is used by another record in the batch."}
+            )
+            continue
+        if is_new and row["id"] in taken_ids:
+            result["rejected"].append(
+                {"index": index, "error": f"Customer id '{row['id']}' already exists."}
+            )
+            continue
+        names_in_chunk.add(row["name"])
+        customers.append(Customer(**row))
+        if is_new:
+            created += 1
+        else:
+            updated += 1
+
+    if customers:
+        try:
+            with transaction.atomic():
+                Customer.objects.bulk_create(
+                    customers,
+                    update_conflicts=True,
+                    unique_fields=["external_ref"],
+                    update_fields=[*SYNC_FIELDS, "updated_at"],
+                )
+                # bulk_create sends no post_save signals.
+                transaction.on_commit(bump_customer_search_version)
+        except IntegrityError as exc:
+            raise CustomerSyncError(
+                f"Customers changed concurrently during the sync; retry. ({exc})"
+            ) from exc
+
+    result["created"] += created
+    result["updated"] += updated
+
+
+def sync_customers(
+    raw_records: Iterable[Any],
+    *,
+    chunk_size: int = 1000,
+    max_records: int | None = None,
+) -> Dict[str, Any]:
+    """
+    Create or update customers by external_ref.
+
+    Invalid records are reported and skipped; each chunk of valid ones is
+    written in one transaction. Returns
+    {"created": n, "updated": n, "unchanged": n, "rejected": [{"index": i, "error": "..."}]},
+    where index is the 0-based position of the record in the batch.
+    """
+    raw_records = list(raw_records)
+    if max_records is not None and len(raw_records) > max_records:
+        raise CustomerSyncError(f"At most {max_records} records are accepted per sync.")
+
+    result: Dict[str, Any] = {"created": 0, "updated": 0, "unchanged": 0, "rejected": []}
+    cleaned: List[Tuple[int, Dict[str, Any]]] = []
+    first_index: Dict[str, int] = {}
+    for index, raw in enumerate(raw_records):
+        try:
+            record = _clean_record(raw)
+        except ValueError as exc:
+            result["rejected"].append({"index": index, "error": str(exc)})
+            continue
+        if record["external_ref"] in first_index:
+            result["rejected"].append(
+                {
+                    "index": index,
+                    "error": f"Duplicate external_ref (first at index {first_index[record['external_ref']]}).",
+                }
+            )
+            continue
+        first_index[record["external_ref"]] = index
+        cleaned.append((index, record))
+
+    for start in range(0, len(cleaned), chunk_size):
+        _sync_chunk(cleaned[start:start + chunk_size], result)
+
+    result["rejected"].sort(key=lambda item: item["index"])
+    return result
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from customers.models import Customer
+from customers.services.search import (
+    CustomerPrefixIndex,
+    _IndexState,
+    _rebuild,
+    _refresh,
+    customer_index,
+    reset_customer_index,
+)
+
+
+@override_settings(CUSTOMER_SEARCH_MAX_RESULTS=3)
+class CustomerAdminSearchTests(TestCase):
+    def setUp(self):
+        reset_customer_index()
+        self.addCleanup(reset_customer_index)
+        user = get_user_model().objects.create_user(username="op", is_staff=True, is_superuser=True)
+        self.client.force_login(user)
+        Customer.objects.bulk_create(Customer(id=f"cust-{i}", name=f"Acme {i}") for i in range(5))
+
+    def test_changelist_search_is_not_limited(self):
+        response = self.client.get("/admin/customers/customer/", {"q": "acme"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 5)
+
+    def test_autocomplete_takes_the_best_matches_from_the_index(self):
+        response = self.client.get(
+            "/admin/autocomplete/",
+            {"term": "acme", "app_label": "licenses", "model_name": "license", "field_name": "customer"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 3)
+
+
+class CustomerPrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = CustomerPrefixIndex()
+        self.index.build(
+            [
+                ("c-word", "Big  ACME Ltd", None),
+                ("c-ref", "Zeta", "ACME-9"),
+                ("c-exact", "Acme", "X-1"),
+                ("c-name", "Acme Corp", None),
+                ("c-inside", "Nacme", None),
+            ]
+        )
+
+    def _search(self, query, limit=10):
+        return [(match.id, match.match) for match in self.index.search(query, limit)]
+
+    def test_matches_are_ranked(self):
+        self.assertEqual(
+            self._search(" acme "),
+            [
+                ("c-exact", "exact"),
+                ("c-name", "name_prefix"),
+                ("c-ref", "external_ref_prefix"),
+                ("c-word", "word_prefix"),
+            ],
+        )
+        self.assertEqual(self._search("ACME", limit=2), [("c-exact", "exact"), ("c-name", "name_prefix")])
+        self.assertEqual(self._search("x-1"), [("c-exact", "exact")])
+        self.assertEqual(self._search("acme ltd"), [("c-word", "word_prefix")])
+        self.assertEqual(self._search("  "), [])
+
+    def test_upsert_and_remove(self):
+        self.index.upsert("c-name", "Omega", "acme-corp")
+        self.index.upsert("c-new", "Acme", None)
+        self.index.remove("c-word")
+        self.index.remove("c-missing")
+
+        self.assertEqual(
+            self._search("acme"),
+            [
+                ("c-exact", "exact"),
+                ("c-new", "exact"),
+                ("c-ref", "external_ref_prefix"),
+                ("c-name", "external_ref_prefix"),
+            ],
+        )
+        self.assertEqual(self._search("omega")[0], ("c-name", "exact"))
+        self.assertEqual(len(self.index), 5)
+
+
+@override_settings(CUSTOMER_SEARCH_REFRESH_SECONDS=3600)
+class CustomerIndexRefreshTests(TestCase):
+    def setUp(self):
+        reset_customer_index()
+        self.addCleanup(reset_customer_index)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Customer.objects.create(id="cust-1", name="Acme")
+        Customer.objects.create(id="cust-2", name="Beta")
+
+    def _ids(self, query):
+        return [match.id for match in customer_index().search(query, 10)]
+
+    def test_saves_are_applied_incrementally(self):
+        self.assertEqual(self._ids("acme"), ["cust-1"])
+        index = customer_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(id="cust-3", name="Acme Two")
+            customer = Customer.objects.get(id="cust-2")
+            customer.name = "Acme Gamma"
+            customer.save()
+
+        self.assertIs(customer_index(), index)
+        self.assertEqual(self._ids("acme"), ["cust-1", "cust-2", "cust-3"])
+        self.assertEqual(self._ids("beta"), [])
+
+    def test_deletes_rebuild_the_index(self):
+        index = customer_index()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.filter(id="cust-1").delete()
+
+        self.assertIsNot(customer_index(), index)
+        self.assertEqual(self._ids("acme"), [])
+        self.assertEqual(len(customer_index()), 1)
+
+    def test_refresh_picks_up_rows_changed_since_the_high_water_mark(self):
+        state = _IndexState()
+        _rebuild(state)
+        mark = state.high_water
+
+        Customer.objects.filter(id="cust-2").update(name="Acme Beta", updated_at=mark + timedelta(seconds=1))
+        # Not touching updated_at goes unnoticed.
+        Customer.objects.filter(id="cust-1").update(name="Gamma")
+        _refresh(state)
+
+        self.assertEqual(state.high_water, mark + timedelta(seconds=1))
+        self.assertEqual([match.id for match in state.index.search("acme", 10)], ["cust-1", "cust-2"])
@@ -0,0 +1,96 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+from customers.models import Customer
+from customers.services.sync import sync_customers
+
+
+class CustomerSyncTests(TestCase):
+    def test_counts_and_rejections(self):
+        Customer.objects.create(id="cust-old", name="Old Name", external_ref="crm-1", notes="kept")
+        Customer.objects.create(id="cust-same", name="Same", external_ref="crm-2")
+
+        result = sync_customers(
+            [
+                {"external_ref": "crm-1", "name": "New Name"},
+                {"external_ref": "crm-2", "name": "Same"},
+                {"external_ref": "crm-3", "name": "Fresh", "id": "cust-fresh"},
+                {"external_ref": "crm-4"},
+                {"external_ref": "crm-3", "name": "Again"},
+                {"external_ref": "crm-5", "name": "Bad", "contact_email": "not-an-email"},
+                {"external_ref": "crm-6", "name": "Same"},
+                "not a record",
+            ]
+        )
+
+        self.assertEqual((result["created"], result["updated"], result["unchanged"]), (1, 1, 1))
+        self.assertEqual(
+            [(item["index"], item["error"]) for item in result["rejected"]],
+            [
+                (3, "'name' is required for new customers."),
+                (4, "Duplicate external_ref (first at index 2)."),
+                (5, "'contact_email' must be a valid email address."),
+                (6, "Name 'Same' belongs to customer 'cust-same'."),
+                (7, "Record must be a JSON object."),
+            ],
+        )
+        updated = Customer.objects.get(external_ref="crm-1")
+        self.assertEqual((updated.id, updated.name, updated.notes), ("cust-old", "New Name", "kept"))
+        self.assertEqual(Customer.objects.get(external_ref="crm-3").id, "cust-fresh")
+
+    def test_resync_matches_by_external_ref(self):
+        records = [{"external_ref": f"crm-{i}", "name": f"Customer {i}"} for i in range(5)]
+        first = sync_customers(records, chunk_size=2)
+        ids = dict(Customer.objects.values_list("external_ref", "id"))
+
+        self.assertEqual((first["created"], first["updated"], first["unchanged"]), (5, 0, 0))
+        again = sync_customers(records, chunk_size=2)
+        self.assertEqual((again["created"], again["updated"], again["unchanged"]), (0, 0, 5))
+
+        records[1] = {"external_ref": "crm-1", "contact_person": "Ann"}
+        changed = sync_customers(records, chunk_size=2)
+        self.assertEqual((changed["created"], changed["updated"], changed["unchanged"]), (0, 1, 4))
+        self.assertEqual(dict(Customer.objects.values_list("external_ref", "id")), ids)
+        self.assertEqual(Customer.objects.get(external_ref="crm-1").name, "Customer 1")
+
+    def test_sync_endpoint_accepts_ndjson(self):
+        user = get_user_model().objects.create_user(username="op", is_staff=True)
+        self.client.force_login(user)
+        body = "\n".join(json.dumps({"external_ref": f"crm-{i}", "name": f"Customer {i}"}) for i in range(3))
+
+        response = self.client.post("/api/customers/sync/", body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"created": 3, "updated": 0, "unchanged": 0, "rejected": []})
+
+
+class ExternalRefMigrationTests(TransactionTestCase):
+    before = [("customers", "0001_initial")]
+    after = [("customers", "0002_alter_customer_external_ref")]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_duplicate_references_stop_the_migration(self):
+        Customer = self._migrate(self.before).get_model("customers", "Customer")
+        Customer.objects.create(id="cust-1", name="One", external_ref="crm-1")
+        Customer.objects.create(id="cust-2", name="Two", external_ref="crm-1")
+        Customer.objects.create(id="cust-3", name="Three", external_ref="")
+        Customer.objects.create(id="cust-4", name="Four", external_ref="")
+
+        with self.assertRaisesMessage(RuntimeError, "'crm-1': cust-1, cust-2"):
+            self._migrate(self.after)
+
+        Customer.objects.filter(id="cust-2").update(external_ref="crm-2")
+        Customer = self._migrate(self.after).get_model("customers", "Customer")
+        self.assertEqual(Customer.objects.filter(external_ref__isnull=True).count(), 2)
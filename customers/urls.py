@@ -0,0 +1,10 @@
+# customers/urls.py
+
+from django.urls import path
+
+from .views import CustomerSearchView, CustomerSyncView
+
+urlpatterns = [
+    path("sync/", CustomerSyncView.as_view(), name="customer-sync"),
+    path("search/", CustomerSearchView.as_view(), name="customer-search"),
+]
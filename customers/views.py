@@ -1,3 +1,99 @@
-from django.shortcuts import render
+# customers/views.py
 
-# Create your views here.
+from django.conf import settings
+from rest_framework import permissions, status
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from licenses.parsers import NDJSONParser
+
+from .services.search import search_customers
+from .services.sync import CustomerSyncError, sync_customers
+
+
+class CustomerSyncView(APIView):
+    """
+    POST /api/customers/sync/
+
+    Creates or updates customers keyed by external_ref. Accepts NDJSON
+    (application/x-ndjson) or a JSON array, one record per line/item:
+    { "external_ref": "crm-123", "name": "...", "contact_email": "...",
+      "contact_person": "...", "notes": "...", "id": "cust-..." }
+
+    Only external_ref is required (and name, for new customers); missing
+    fields keep their current value. id is used for new customers only
+    (generated when omitted). Returns:
+    {
+      "created": 10,
+      "updated": 3,
+      "unchanged": 4987,
+      "rejected": [ { "index": 17, "error": "..." } ]
+    }
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [NDJSONParser, JSONParser]
+
+    def post(self, request, *args, **kwargs):
+        records = request.data
+        if not isinstance(records, list):
+            return Response(
+                {"detail": "Expected NDJSON lines or a JSON array of customer records."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            result = sync_customers(records, max_records=settings.CUSTOMER_SYNC_MAX_RECORDS)
+        except CustomerSyncError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class CustomerSearchView(APIView):
+    """
+    GET /api/customers/search/?q=acm&limit=10
+
+    Autocomplete over customer names and external_refs, best match first:
+    {
+      "results": [
+        { "id": "cust-1", "name": "Acme", "external_ref": "crm-7", "match": "name_prefix" }
+      ]
+    }
+
+    match is one of exact, name_prefix, external_ref_prefix, word_prefix
+    and contains (PostgreSQL with pg_trgm and queries of three or more
+    characters only).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.CUSTOMER_SEARCH_MAX_RESULTS:
+            return Response(
+                {"detail": f"limit must be between 1 and {settings.CUSTOMER_SEARCH_MAX_RESULTS}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        matches = search_customers(query, limit) if query else []
+        response_data = {
+            "results": [
+                {
+                    "id": match.id,
+                    "name": match.name,
+                    "external_ref": match.external_ref,
+                    "match": match.match,
+                }
+                for match in matches
+            ],
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
@@ -1,10 +1,154 @@
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.db import transaction
 
-from .models import License, LicenseTemplate
+from licenses.services.sharding import (
+    CustomerShardMoving,
+    _license_customer_id,
+    customer_write,
+    writable_on_shard,
+)
+from licensing_server.sharding import shard_aliases, sharding_enabled
+
+from .models import (
+    Activation,
+    ArchivedLicense,
+    FloatingLease,
+    Job,
+    License,
+    LicenseTemplate,
+    OutboxMessage,
+    UsageRollup,
+    WebhookEndpoint,
+)
+
+
+class ShardListFilter(admin.SimpleListFilter):
+    """
+    Picks the shard a sharded changelist reads from (the first by default).
+    """
+
+    title = "shard"
+    parameter_name = "shard"
+
+    def lookups(self, request, model_admin):
+        if not sharding_enabled():
+            return []
+        return [(alias, alias) for alias in shard_aliases()]
+
+    def choices(self, changelist):
+        current = self.value() or shard_aliases()[0]
+        for alias, title in self.lookup_choices:
+            yield {
+                "selected": current == alias,
+                "query_string": changelist.get_query_string({self.parameter_name: alias}),
+                "display": title,
+            }
+
+    def queryset(self, request, queryset):
+        # The database is chosen in ShardedModelAdmin.get_queryset().
+        return queryset
+
+
+class ShardedModelAdmin(admin.ModelAdmin):
+    """
+    Admin for models in licensing_server.sharding.SHARDED_MODELS.
+
+    The changelist shows one shard at a time (ShardListFilter); change
+    pages find the object on whichever shard holds it. Saves and deletes
+    go through customer_write() like every other write to a customer's
+    sharded rows.
+    """
+
+    # Rows on a shard cannot be offered as choices from another database.
+    shard_readonly_fields: tuple = ()
+
+    def get_list_filter(self, request):
+        return (ShardListFilter, *super().get_list_filter(request))
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if not sharding_enabled():
+            return qs
+        alias = request.GET.get(ShardListFilter.parameter_name)
+        return qs.using(alias if alias in shard_aliases() else shard_aliases()[0])
+
+    def get_object(self, request, object_id, from_field=None):
+        if not sharding_enabled():
+            return super().get_object(request, object_id, from_field)
+
+        field = (
+            self.model._meta.pk if from_field is None else self.model._meta.get_field(from_field)
+        )
+        try:
+            object_id = field.to_python(object_id)
+        except (ValidationError, ValueError):
+            return None
+        qs = super().get_queryset(request)
+        for alias in shard_aliases():
+            obj = qs.using(alias).filter(**{field.name: object_id}).first()
+            if obj is not None:
+                return obj
+        return None
+
+    def get_readonly_fields(self, request, obj=None):
+        fields = tuple(super().get_readonly_fields(request, obj))
+        if sharding_enabled():
+            fields += self.shard_readonly_fields
+        return fields
+
+    def has_add_permission(self, request):
+        # Children of a license can only be created next to it, via the API.
+        if sharding_enabled() and self.shard_readonly_fields:
+            return False
+        return super().has_add_permission(request)
+
+    @staticmethod
+    def _customer_id(obj) -> str:
+        if hasattr(obj, "customer_id"):
+            return obj.customer_id
+        return _license_customer_id(obj.license_id)
+
+    def _check_shard(self, obj, alias: str) -> None:
+        if obj._state.db is not None and obj._state.db != alias:
+            raise CustomerShardMoving(
+                f"Customer '{self._customer_id(obj)}' was moved to shard '{alias}'; reload the page."
+            )
+
+    def save_model(self, request, obj, form, change):
+        if not sharding_enabled():
+            return super().save_model(request, obj, form, change)
+
+        with customer_write(self._customer_id(obj)) as alias:
+            if change:
+                self._check_shard(obj, alias)
+            super().save_model(request, obj, form, change)
+
+    def delete_model(self, request, obj):
+        if not sharding_enabled():
+            return super().delete_model(request, obj)
+
+        with customer_write(self._customer_id(obj)) as alias:
+            self._check_shard(obj, alias)
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        if not sharding_enabled():
+            return super().delete_queryset(request, queryset)
+
+        with transaction.atomic(using="default"), transaction.atomic(using=queryset.db):
+            customer_ids = {self._customer_id(obj) for obj in queryset}
+            moved = customer_ids - writable_on_shard(queryset.db, customer_ids)
+            if moved:
+                raise CustomerShardMoving(
+                    f"Customers {sorted(moved)} are being moved or were moved off shard "
+                    f"'{queryset.db}'; reload the page."
+                )
+            super().delete_queryset(request, queryset)
 
 
 @admin.register(License)
-class LicenseAdmin(admin.ModelAdmin):
+class LicenseAdmin(ShardedModelAdmin):
     list_display = (
         "license_id",
         "customer",
@@ -25,6 +169,7 @@ class LicenseAdmin(admin.ModelAdmin):
     )
     list_filter = ("license_type", "status", "product", "edition")
     readonly_fields = ("payload", "signature", "created_at", "updated_at")
+    autocomplete_fields = ("customer",)
 
 
 @admin.register(LicenseTemplate)
@@ -41,3 +186,87 @@ class LicenseTemplateAdmin(admin.ModelAdmin):
     search_fields = ("id", "name", "product__code", "edition__code")
     list_filter = ("product", "edition", "license_type")
     readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(Activation)
+class ActivationAdmin(ShardedModelAdmin):
+    list_display = (
+        "machine_fingerprint",
+        "license",
+        "hostname",
+        "is_active",
+        "activated_at",
+        "last_seen_at",
+    )
+    search_fields = ("machine_fingerprint", "hostname", "license__license_id")
+    list_filter = ("is_active",)
+    readonly_fields = ("created_at", "updated_at")
+    shard_readonly_fields = ("license",)
+
+
+@admin.register(FloatingLease)
+class FloatingLeaseAdmin(ShardedModelAdmin):
+    list_display = ("lease_id", "license", "client_id", "checked_out_at", "expires_at")
+    search_fields = ("lease_id", "client_id", "license__license_id")
+    readonly_fields = ("checked_out_at", "expires_at")
+    shard_readonly_fields = ("license",)
+
+
+@admin.register(UsageRollup)
+class UsageRollupAdmin(ShardedModelAdmin):
+    list_display = ("license", "metric", "granularity", "bucket_start", "total", "event_count")
+    search_fields = ("license__license_id", "metric")
+    list_filter = ("granularity", "metric")
+    readonly_fields = ("updated_at",)
+    shard_readonly_fields = ("license",)
+
+
+@admin.register(ArchivedLicense)
+class ArchivedLicenseAdmin(ShardedModelAdmin):
+    # Read-only: licenses leave the archive through restore_licenses.
+    list_display = ("license_id", "customer", "status", "valid_until", "archived_at")
+    search_fields = ("license_id", "customer__id")
+    list_filter = ("status",)
+    exclude = ("record",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ("id", "url", "is_active", "created_at")
+    search_fields = ("id", "url")
+    list_filter = ("is_active",)
+    readonly_fields = ("created_at", "updated_at")
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ("id", "endpoint", "event_type", "status", "attempts", "next_attempt_at")
+    search_fields = ("id", "endpoint__id")
+    list_filter = ("status", "event_type", "endpoint")
+    readonly_fields = ("payload", "created_at", "delivered_at", "last_error")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "progress_done", "progress_total", "attempts", "created_by", "created_at")
+    list_filter = ("status", "kind")
+    search_fields = ("id",)
+    readonly_fields = (
+        "params",
+        "result",
+        "output_file",
+        "output_bytes",
+        "locked_by",
+        "locked_until",
+        "last_error",
+        "created_at",
+        "started_at",
+        "finished_at",
+        "updated_at",
+    )
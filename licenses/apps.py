@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class LicensesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'licenses'
+
+    def ready(self):
+        if settings.LICENSE_WARMUP:
+            from licenses.services.warmup import warm_up
+
+            warm_up()
@@ -0,0 +1,9 @@
+# licenses/event_urls.py
+
+from django.urls import path
+
+from .views import LicenseEventFeedView
+
+urlpatterns = [
+    path("", LicenseEventFeedView.as_view(), name="license-events"),
+]
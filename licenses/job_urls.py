@@ -0,0 +1,12 @@
+# licenses/job_urls.py
+
+from django.urls import path
+
+from .views import JobCancelView, JobDetailView, JobEnqueueView, JobOutputView
+
+urlpatterns = [
+    path("", JobEnqueueView.as_view(), name="job-enqueue"),
+    path("<uuid:job_id>/", JobDetailView.as_view(), name="job-detail"),
+    path("<uuid:job_id>/cancel/", JobCancelView.as_view(), name="job-cancel"),
+    path("<uuid:job_id>/output/", JobOutputView.as_view(), name="job-output"),
+]
@@ -0,0 +1,34 @@
+# licenses/management/commands/archive_licenses.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from licenses.services.archive import archive_licenses
+
+
+class Command(BaseCommand):
+    help = (
+        "Move licenses expired or superseded longer than --older-than-days "
+        "from the License table into the archive (tombstone + compressed record)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.LICENSE_ARCHIVE_AFTER_DAYS,
+            help="Archive licenses expired/superseded more than this many days ago.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Licenses archived per transaction (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_licenses(
+            older_than_days=options["older_than_days"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} licenses."))
@@ -0,0 +1,24 @@
+# licenses/management/commands/backfill_entitlements.py
+
+from django.core.management.base import BaseCommand
+
+from licenses.services.entitlements import backfill_entitlements
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the entitlement index (features and usage_limits of every "
+        "license) from the license payloads. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Licenses indexed per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        processed = backfill_entitlements(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed entitlements of {processed} licenses."))
@@ -0,0 +1,213 @@
+# licenses/management/commands/benchmark_cold_start.py
+
+import base64
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Child process: boot the WSGI application, report the bound port, serve.
+_SERVER_SCRIPT = """
+import json
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+from licensing_server.wsgi import application
+from licenses.services.warmup import last_warmup
+
+server = make_server("127.0.0.1", 0, application, handler_class=QuietHandler)
+print(json.dumps({"port": server.server_port, "warmup": last_warmup}), flush=True)
+server.serve_forever()
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure process start to first response: boot the WSGI app in a fresh "
+        "process, time the first and second request, with LICENSE_WARMUP off "
+        "and on. Fails if the first response is slower than --max-first-response-ms."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Fresh processes per mode (default: 5).",
+        )
+        parser.add_argument(
+            "--mode",
+            choices=("both", "cold", "warm"),
+            default="both",
+            help="Measure without warm-up (cold), with it (warm), or both (default).",
+        )
+        parser.add_argument(
+            "--path",
+            default="/api/events/?limit=1",
+            help="GET path for the probe request (default: /api/events/?limit=1).",
+        )
+        parser.add_argument(
+            "--issue",
+            nargs=3,
+            metavar=("CUSTOMER_ID", "PRODUCT_ID", "EDITION_ID"),
+            help="Probe with POST /api/licenses/issue/ instead (issues real licenses).",
+        )
+        parser.add_argument("--username", required=True, help="Basic auth user.")
+        parser.add_argument("--password", required=True, help="Basic auth password.")
+        parser.add_argument(
+            "--max-first-response-ms",
+            type=float,
+            help="Fail when the median start-to-first-response exceeds this.",
+        )
+        parser.add_argument(
+            "--import-profile",
+            type=int,
+            default=0,
+            metavar="N",
+            help="Also print the N slowest imports at boot (python -X importtime).",
+        )
+
+    def handle(self, *args, **options):
+        credentials = f"{options['username']}:{options['password']}".encode("utf-8")
+        self.auth_header = "Basic " + base64.b64encode(credentials).decode("ascii")
+        self.issue = options["issue"]
+        self.path = "/api/licenses/issue/" if self.issue else options["path"]
+
+        modes = ["cold", "warm"] if options["mode"] == "both" else [options["mode"]]
+        results = {mode: [] for mode in modes}
+        for _ in range(options["runs"]):
+            for mode in modes:
+                results[mode].append(self._measure(warm=mode == "warm"))
+
+        self.stdout.write(f"probe: {'POST' if self.issue else 'GET'} {self.path}")
+        self.stdout.write(
+            f"{'mode':<6}{'boot':>10}{'first resp':>12}{'1st req':>10}{'2nd req':>10}   (median ms)"
+        )
+        failed = []
+        for mode, runs in results.items():
+            medians = {
+                key: statistics.median(run[key] for run in runs) * 1000
+                for key in ("boot", "first_response", "first_request", "second_request")
+            }
+            self.stdout.write(
+                f"{mode:<6}{medians['boot']:>10.0f}{medians['first_response']:>12.0f}"
+                f"{medians['first_request']:>10.0f}{medians['second_request']:>10.0f}"
+            )
+            limit = options["max_first_response_ms"]
+            if limit is not None and medians["first_response"] > limit:
+                failed.append(f"{mode}: {medians['first_response']:.0f} ms")
+
+        if "warm" in results:
+            warmup = results["warm"][-1]["warmup"]
+            steps = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in warmup.items())
+            self.stdout.write(f"warm-up steps: {steps}")
+
+        if options["import_profile"]:
+            self._print_import_profile(options["import_profile"])
+
+        if failed:
+            raise CommandError(
+                f"First response slower than {options['max_first_response_ms']:.0f} ms "
+                f"({'; '.join(failed)})."
+            )
+
+    def _request(self, port: int) -> float:
+        headers = {"Authorization": self.auth_header}
+        data = None
+        if self.issue:
+            now = datetime.now(timezone.utc)
+            customer_id, product_id, edition_id = self.issue
+            data = json.dumps(
+                {
+                    "customer_id": customer_id,
+                    "product_id": product_id,
+                    "edition_id": edition_id,
+                    "license_type": "trial",
+                    "valid_from": now.isoformat(),
+                    "valid_until": (now + timedelta(days=14)).isoformat(),
+                    "note": "benchmark_cold_start",
+                }
+            ).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}{self.path}",
+            data=data,
+            headers=headers,
+            method="POST" if data else "GET",
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+        except urllib.error.HTTPError as exc:
+            raise CommandError(
+                f"Probe request failed with HTTP {exc.code}: {exc.read()[:300]!r}"
+            ) from exc
+        return time.perf_counter() - started
+
+    def _spawn(self, warm: bool, extra_args=()):
+        env = {**os.environ, "LICENSE_WARMUP": "true" if warm else "false"}
+        return subprocess.Popen(
+            [sys.executable, *extra_args, "-c", _SERVER_SCRIPT],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if extra_args else subprocess.DEVNULL,
+            text=True,
+        )
+
+    def _measure(self, warm: bool) -> dict:
+        started = time.perf_counter()
+        process = self._spawn(warm)
+        try:
+            line = process.stdout.readline()
+            if not line:
+                raise CommandError("Server process exited before listening.")
+            boot = time.perf_counter() - started
+            info = json.loads(line)
+            first_request = self._request(info["port"])
+            first_response = time.perf_counter() - started
+            second_request = self._request(info["port"])
+        finally:
+            process.kill()
+            process.wait()
+        return {
+            "boot": boot,
+            "first_response": first_response,
+            "first_request": first_request,
+            "second_request": second_request,
+            "warmup": info["warmup"],
+        }
+
+    def _print_import_profile(self, top: int) -> None:
+        process = self._spawn(warm=False, extra_args=("-X", "importtime"))
+        try:
+            process.stdout.readline()
+        finally:
+            process.kill()
+            _, stderr = process.communicate()
+
+        # "import time: self [us] | cumulative | imported package"
+        imports = []
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+            imports.append((int(cumulative), name.strip()))
+
+        self.stdout.write(f"slowest imports at boot (cumulative ms, top {top}):")
+        for cumulative, name in sorted(imports, reverse=True)[:top]:
+            self.stdout.write(f"  {cumulative / 1000:>8.1f}  {name}")
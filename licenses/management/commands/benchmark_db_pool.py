@@ -0,0 +1,157 @@
+# licenses/management/commands/benchmark_db_pool.py
+
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from rest_framework.test import APIClient
+
+from licenses.models import License
+from licenses.services.sharding import each_shard
+from licensing_server.db_pool import pool_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the API in-process with many concurrent clients and report "
+        "latency percentiles and connection pool metrics. Run once with "
+        "DB_POOL_MAX_SIZE set (e.g. 20) and once without it to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=200,
+            help="Concurrent clients, one thread each (default: 200).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=4000,
+            help="Total requests across all clients (default: 4000).",
+        )
+        parser.add_argument(
+            "--path",
+            help="GET path to request (default: download of --license-id).",
+        )
+        parser.add_argument(
+            "--license-id",
+            type=uuid.UUID,
+            help="License to download (default: any active license).",
+        )
+        parser.add_argument(
+            "--username",
+            help="User to authenticate as (default: the first superuser).",
+        )
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        users = user_model.objects.filter(is_active=True)
+        user = (
+            users.filter(username=options["username"]).first()
+            if options["username"]
+            else users.filter(is_superuser=True).first()
+        )
+        if user is None:
+            raise CommandError("No user to authenticate as; pass --username.")
+
+        path = options["path"]
+        if not path:
+            license_id = options["license_id"]
+            if not license_id:
+                for _ in each_shard():
+                    license_id = (
+                        License.objects.filter(status="active")
+                        .values_list("license_id", flat=True)
+                        .first()
+                    )
+                    if license_id:
+                        break
+            if not license_id:
+                raise CommandError("No active license to download; pass --license-id or --path.")
+            path = f"/api/licenses/{license_id}/download/"
+
+        # Physical connections opened (with pooling: connections borrowed).
+        opened = 0
+        opened_lock = threading.Lock()
+
+        def count_connection(sender, connection, **kwargs):
+            nonlocal opened
+            with opened_lock:
+                opened += 1
+
+        total = options["requests"]
+        concurrency = options["concurrency"]
+        per_client = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+        start = threading.Barrier(concurrency + 1)
+
+        def client_loop(count: int):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user)
+            timings, failures = [], []
+            start.wait()
+            for _ in range(count):
+                began = time.perf_counter()
+                response = client.get(path)
+                # The test client skips the end-of-request cleanup that
+                # closes (or returns to the pool) the request's connection.
+                close_old_connections()
+                timings.append(time.perf_counter() - began)
+                if response.status_code >= 400:
+                    failures.append(response.status_code)
+            connections.close_all()
+            return timings, failures
+
+        connections.close_all()
+        connection_created.connect(count_connection)
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                futures = [pool.submit(client_loop, count) for count in per_client]
+                start.wait()
+                started = time.perf_counter()
+                results = [future.result() for future in futures]
+                elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count_connection)
+
+        timings = sorted(t for result, _ in results for t in result)
+        failures: dict[int, int] = {}
+        for _, codes in results:
+            for code in codes:
+                failures[code] = failures.get(code, 0) + 1
+
+        cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+        stats = pool_stats()
+
+        self.stdout.write(f"path:         {path}")
+        self.stdout.write(
+            "pooling:      "
+            + (", ".join(f"{alias} max_size={s['max_size']}" for alias, s in stats.items()) or "off")
+        )
+        self.stdout.write(
+            f"requests:     {len(timings)} from {concurrency} clients in {elapsed:.2f}s "
+            f"({len(timings) / elapsed:,.0f}/s)"
+        )
+        self.stdout.write(
+            f"latency ms:   p50={cuts[49] * 1000:.1f} p95={cuts[94] * 1000:.1f} "
+            f"p99={cuts[98] * 1000:.1f} max={timings[-1] * 1000:.1f}"
+        )
+        self.stdout.write(
+            "errors:       "
+            + (", ".join(f"{code}: {count}" for code, count in sorted(failures.items())) or "none")
+        )
+        self.stdout.write(f"connects:     {opened}")
+        for alias, s in stats.items():
+            self.stdout.write(
+                f"pool {alias}: size={s['size']} in_use={s['in_use']} opened={s['connections_opened']} "
+                f"queued={s['requests_queued']}/{s['requests']} ({s['queued_ratio']:.0%}) "
+                f"wait avg={s['wait_ms_avg']:.1f}ms total={s['wait_ms_total']}ms "
+                f"timeouts={s['timeouts']}"
+            )
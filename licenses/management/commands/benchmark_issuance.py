@@ -0,0 +1,166 @@
+# licenses/management/commands/benchmark_issuance.py
+
+import contextlib
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections, transaction
+
+from customers.models import Customer
+from licenses.services.issuance import issue_license_from_validated_data
+from products.models import Edition
+
+
+BENCHMARK_NOTE = "benchmark-issuance"
+
+
+class Command(BaseCommand):
+    help = (
+        "Issue licenses from many concurrent threads and report throughput, "
+        "issuance latency and how long each issuance holds a database "
+        "transaction. --sign-inside wraps every issuance in one transaction, "
+        "as before signing moved out of it, for comparison. Issued licenses "
+        "are ordinary licenses (noted 'benchmark-issuance') and are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Concurrent issuing threads (default: 32).",
+        )
+        parser.add_argument(
+            "--licenses",
+            type=int,
+            default=2000,
+            help="Licenses to issue across all threads (default: 2000).",
+        )
+        parser.add_argument(
+            "--customer",
+            help="Customer to issue for (default: the first customer).",
+        )
+        parser.add_argument(
+            "--edition",
+            help="Edition to issue (default: the first edition).",
+        )
+        parser.add_argument(
+            "--username",
+            help="Issuing user (default: the first superuser).",
+        )
+        parser.add_argument(
+            "--sign-inside",
+            action="store_true",
+            help="Hold one transaction for the whole issuance (old behaviour).",
+        )
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True)
+        user = (
+            users.filter(username=options["username"]).first()
+            if options["username"]
+            else users.filter(is_superuser=True).first()
+        )
+        if user is None:
+            raise CommandError("No user to issue as; pass --username.")
+
+        customers = Customer.objects.order_by("pk")
+        customer = (
+            customers.filter(pk=options["customer"]).first() if options["customer"] else customers.first()
+        )
+        editions = Edition.objects.order_by("pk")
+        edition = (
+            editions.filter(pk=options["edition"]).first() if options["edition"] else editions.first()
+        )
+        if customer is None or edition is None:
+            raise CommandError("No customer or edition to issue; create one or pass --customer/--edition.")
+
+        valid_from = datetime.now(timezone.utc)
+        data = {
+            "customer_id": customer.pk,
+            "product_id": edition.product_id,
+            "edition_id": edition.pk,
+            "license_type": "subscription",
+            "valid_from": valid_from,
+            "valid_until": valid_from + timedelta(days=365),
+            "features": {"benchmark": True, "seats_tier": "standard"},
+            "usage_limits": {"max_activations": 5},
+            "deployment": {"mode": "online"},
+            "note": BENCHMARK_NOTE,
+        }
+
+        total = options["licenses"]
+        concurrency = options["concurrency"]
+        per_thread = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+        start = threading.Barrier(concurrency + 1)
+        sign_inside = options["sign_inside"]
+
+        def worker(count: int):
+            latencies, holds = [], []
+            transaction_started = {}
+
+            def track(execute, sql, params, many, context):
+                # First statement of a transaction: the server-side BEGIN
+                # (and, for Django, the connection being held) starts here.
+                connection = context["connection"]
+                if connection.in_atomic_block and connection.alias not in transaction_started:
+                    transaction_started[connection.alias] = time.perf_counter()
+                    transaction.on_commit(
+                        lambda alias=connection.alias: holds.append(
+                            time.perf_counter() - transaction_started[alias]
+                        ),
+                        using=connection.alias,
+                    )
+                return execute(sql, params, many, context)
+
+            start.wait()
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(track))
+                for _ in range(count):
+                    transaction_started.clear()
+                    began = time.perf_counter()
+                    if sign_inside:
+                        with transaction.atomic():
+                            issue_license_from_validated_data(data, issued_by=user)
+                    else:
+                        issue_license_from_validated_data(data, issued_by=user)
+                    latencies.append(time.perf_counter() - began)
+                    close_old_connections()
+            connections.close_all()
+            return latencies, holds
+
+        connections.close_all()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(worker, count) for count in per_thread]
+            start.wait()
+            started = time.perf_counter()
+            results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(t for result, _ in results for t in result)
+        holds = sorted(t for _, result in results for t in result)
+
+        self.stdout.write(f"mode:         {'sign inside transaction' if sign_inside else 'sign before transaction'}")
+        self.stdout.write(
+            f"issued:       {len(latencies)} from {concurrency} threads in {elapsed:.2f}s "
+            f"({len(latencies) / elapsed:,.1f}/s)"
+        )
+        self._write_percentiles("latency ms:  ", latencies)
+        self._write_percentiles("txn held ms: ", holds)
+        self.stdout.write(
+            f"txn share:    {sum(holds) / sum(latencies):.0%} of issuance time spent in a transaction"
+        )
+
+    def _write_percentiles(self, label: str, timings) -> None:
+        cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+        self.stdout.write(
+            f"{label} p50={cuts[49] * 1000:.1f} p95={cuts[94] * 1000:.1f} "
+            f"p99={cuts[98] * 1000:.1f} max={timings[-1] * 1000:.1f} "
+            f"mean={statistics.fmean(timings) * 1000:.1f}"
+        )
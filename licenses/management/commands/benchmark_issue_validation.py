@@ -0,0 +1,96 @@
+# licenses/management/commands/benchmark_issue_validation.py
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+
+from licenses.serializers import LicenseIssueRequestSerializer
+from licenses.tests.issue_requests import compiled_result, mutated_request, serializer_result, valid_request
+from licenses.validation import validate_issue_request
+
+
+def _run_serializer(data) -> None:
+    LicenseIssueRequestSerializer(data=data).is_valid()
+
+
+def _run_compiled(data) -> None:
+    try:
+        validate_issue_request(data)
+    except serializers.ValidationError:
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the compiled issuance validator (licenses/validation.py) "
+        "returns the same validated data, errors and error codes as "
+        "LicenseIssueRequestSerializer over generated valid and invalid "
+        "requests, then measure the per-item validation cost of both."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cases",
+            type=int,
+            default=50000,
+            help="Generated requests for the differential check (default: 50000).",
+        )
+        parser.add_argument(
+            "--items",
+            type=int,
+            default=20000,
+            help="Requests per timed batch (default: 20000).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed (default: 1).",
+        )
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        cases = [mutated_request(rng) for _ in range(options["cases"])]
+        mismatches = []
+        invalid = 0
+        for data in cases:
+            expected = serializer_result(data)
+            actual = compiled_result(data)
+            invalid += expected[0] == "invalid"
+            if actual != expected:
+                mismatches.append((data, expected, actual))
+
+        self.stdout.write(
+            f"differential: {len(cases)} requests ({invalid} invalid), {len(mismatches)} mismatches"
+        )
+        for data, expected, actual in mismatches[:10]:
+            self.stdout.write(f"  input:      {data!r}")
+            self.stdout.write(f"  serializer: {expected!r}")
+            self.stdout.write(f"  compiled:   {actual!r}")
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} requests validated differently.")
+
+        batches = {
+            "valid": [valid_request(rng) for _ in range(options["items"])],
+            "mixed": [mutated_request(rng) for _ in range(options["items"])],
+        }
+        for label, batch in batches.items():
+            serializer_us = self._per_item_us(batch, _run_serializer)
+            compiled_us = self._per_item_us(batch, _run_compiled)
+            self.stdout.write(
+                f"{label:<6} {len(batch)} items: serializer {serializer_us:7.1f} us/item, "
+                f"compiled {compiled_us:7.1f} us/item ({serializer_us / compiled_us:.1f}x)"
+            )
+
+    def _per_item_us(self, batch, validate) -> float:
+        # Best of three, to keep GC and warm-up out of the figure.
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            for data in batch:
+                validate(data)
+            best = min(best, time.perf_counter() - started)
+        return best / len(batch) * 1e6
@@ -0,0 +1,132 @@
+# licenses/management/commands/benchmark_license_format.py
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from django.core.management.base import BaseCommand
+
+from licenses.models import License
+from licenses.services.binary_format import (
+    decode_license_file,
+    encode_license_file,
+    split_license_file,
+)
+from licenses.services.sharding import license_shard
+from licenses.services.signing import (
+    _b64url_decode_no_padding,
+    _b64url_encode_no_padding,
+    canonical_payload_bytes,
+)
+
+
+def _sample_payload() -> dict:
+    now = datetime.now(timezone.utc)
+    stamp = lambda dt: dt.isoformat().replace("+00:00", "Z")  # noqa: E731
+    return {
+        "license_id": "0b6f2f0e-5d4a-4c52-9d0e-6f7b1f3c2a91",
+        "customer": {"id": "cust-1001", "name": "Example Manufacturing GmbH"},
+        "product": {"id": "prod-data-pipeline", "code": "data-pipeline-app", "name": "Data Pipeline"},
+        "edition": {"id": "ed-enterprise", "code": "enterprise", "name": "Enterprise"},
+        "license_type": "subscription",
+        "validity": {
+            "valid_from": stamp(now),
+            "valid_until": stamp(now + timedelta(days=365)),
+        },
+        "features": {"advanced_export": True, "sso": True, "audit_log": False},
+        "usage_limits": {"max_machines": 10, "max_runs_per_day": 500},
+        "deployment": {},
+        "issuer": {"issued_at": stamp(now), "issuer_id": "1", "issuer_username": "admin"},
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare .license file size and parse time for meta.version 1 (JSON) and 2 (binary)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20000,
+            help="Parses per format (default: 20000).",
+        )
+        parser.add_argument(
+            "--license-id",
+            type=uuid.UUID,
+            help="Use the payload of this stored license instead of a synthetic one.",
+        )
+
+    def handle(self, *args, **options):
+        if options["license_id"]:
+            with license_shard(options["license_id"]):
+                payload = License.objects.get(license_id=options["license_id"]).payload
+        else:
+            payload = _sample_payload()
+
+        key = ed25519.Ed25519PrivateKey.generate()
+
+        # v1: JSON file, signature over canonical JSON, base64url.
+        v1_sig = key.sign(canonical_payload_bytes(payload, 1))
+        v1_file = json.dumps(
+            {
+                "meta": {"version": 1, "alg": "Ed25519", "key_id": "main-v1"},
+                "payload": payload,
+                "signature": _b64url_encode_no_padding(v1_sig),
+            },
+            indent=2,
+        ).encode("utf-8")
+
+        # v2: binary container, raw 64-byte signature over canonical binary.
+        v2_payload = canonical_payload_bytes(payload, 2)
+        v2_file = encode_license_file(
+            {"version": 2, "alg": "Ed25519", "key_id": "main-v1"},
+            v2_payload,
+            key.sign(v2_payload),
+        )
+
+        def signed_bytes_v1():
+            # JSON has to be parsed and re-canonicalized before verifying.
+            doc = json.loads(v1_file)
+            return canonical_payload_bytes(doc["payload"], 1), _b64url_decode_no_padding(doc["signature"])
+
+        def signed_bytes_v2():
+            # The binary container carries the signed bytes verbatim.
+            _, signed, signature = split_license_file(v2_file)
+            return signed, signature
+
+        def full_parse_v1():
+            doc = json.loads(v1_file)
+            canonical_payload_bytes(doc["payload"], 1)
+            return doc["payload"]
+
+        def full_parse_v2():
+            return decode_license_file(v2_file)[1]
+
+        iterations = options["iterations"]
+
+        def per_call_us(fn) -> float:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            return (time.perf_counter() - started) / iterations * 1e6
+
+        rows = [
+            ("v1 json", len(v1_file), per_call_us(signed_bytes_v1), per_call_us(full_parse_v1)),
+            ("v2 binary", len(v2_file), per_call_us(signed_bytes_v2), per_call_us(full_parse_v2)),
+        ]
+
+        self.stdout.write(f"{'format':<10} {'bytes':>7} {'to signed bytes (us)':>21} {'full parse (us)':>16}")
+        for name, size, to_signed, full in rows:
+            self.stdout.write(f"{name:<10} {size:>7} {to_signed:>21.1f} {full:>16.1f}")
+
+        (_, v1_size, v1_signed, v1_full), (_, v2_size, v2_signed, v2_full) = rows
+        self.stdout.write(
+            f"v2/v1: size {v2_size / v1_size:.0%}, time to signed bytes "
+            f"{v2_signed / v1_signed:.0%}, full parse {v2_full / v1_full:.0%}"
+        )
+        self.stdout.write(
+            "Note: v1 parsing uses CPython's C json module while the v2 decoder "
+            "here is pure Python; native client decoders do not have that skew."
+        )
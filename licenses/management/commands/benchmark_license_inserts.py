@@ -0,0 +1,154 @@
+# licenses/management/commands/benchmark_license_inserts.py
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from licenses.models import License
+from licenses.services.ids import uuid7
+from licenses.services.sharding import each_shard
+from licensing_server.sharding import current_shard, shard_of, use_shard
+
+
+BENCHMARK_KEY_ID = "benchmark-inserts"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure License insert throughput as the table grows, with time-ordered "
+        "(UUIDv7, the default for new licenses) or random (UUIDv4) primary keys. "
+        "Rows are copies of an existing license and are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=100000,
+            help="Rows to insert (default: 100000).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows per bulk insert and transaction (default: 500).",
+        )
+        parser.add_argument(
+            "--segments",
+            type=int,
+            default=5,
+            help="Report throughput for this many equal slices of --rows (default: 5).",
+        )
+        parser.add_argument(
+            "--id-version",
+            type=int,
+            choices=(4, 7),
+            default=7,
+            help="UUID version of the inserted primary keys (default: 7).",
+        )
+        parser.add_argument(
+            "--template",
+            type=uuid.UUID,
+            help="License to copy (default: any license).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the inserted rows (e.g., to grow the table between runs).",
+        )
+
+    def handle(self, *args, **options):
+        template = None
+        for _ in each_shard():
+            queryset = License.objects.all()
+            if options["template"]:
+                queryset = queryset.filter(license_id=options["template"])
+            template = queryset.first()
+            if template is not None:
+                break
+        if template is None:
+            raise CommandError("No license to copy; issue one first or pass --template.")
+
+        new_id = uuid7 if options["id_version"] == 7 else uuid.uuid4
+        rows = options["rows"]
+        batch_size = options["batch_size"]
+        segment = max(1, rows // options["segments"])
+
+        with use_shard(shard_of(template)):
+            alias = current_shard()
+            self.stdout.write(
+                f"inserting {rows} rows, UUIDv{options['id_version']} keys, "
+                f"batches of {batch_size}, into {alias} "
+                f"({License.objects.count()} rows before)"
+            )
+
+            inserted = 0
+            reported = 0
+            started = segment_started = time.perf_counter()
+            while inserted < rows:
+                count = min(batch_size, rows - inserted)
+                batch = [self._copy(template, new_id()) for _ in range(count)]
+                with transaction.atomic(using=alias):
+                    License.objects.bulk_create(batch)
+                inserted += count
+
+                if inserted - reported >= segment or inserted == rows:
+                    now = time.perf_counter()
+                    self.stdout.write(
+                        f"  rows {reported:>9}-{inserted:<9} "
+                        f"{(inserted - reported) / (now - segment_started):>10,.0f} rows/s"
+                    )
+                    reported, segment_started = inserted, now
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"total: {rows / elapsed:,.0f} rows/s")
+            self._print_index_sizes(alias)
+
+            if not options["keep"]:
+                while True:
+                    pks = list(
+                        License.objects.filter(meta_key_id=BENCHMARK_KEY_ID)
+                        .values_list("pk", flat=True)[:10000]
+                    )
+                    if not pks:
+                        break
+                    License.objects.filter(pk__in=pks).delete()
+
+    def _copy(self, template: License, license_id: uuid.UUID) -> License:
+        return License(
+            license_id=license_id,
+            customer_id=template.customer_id,
+            product_id=template.product_id,
+            edition_id=template.edition_id,
+            license_type=template.license_type,
+            valid_from=template.valid_from,
+            valid_until=template.valid_until,
+            meta_version=template.meta_version,
+            meta_alg=template.meta_alg,
+            meta_key_id=BENCHMARK_KEY_ID,
+            payload={**template.payload, "license_id": str(license_id)},
+            signature=template.signature,
+            issued_at=template.issued_at,
+            issued_by_id=template.issued_by_id,
+        )
+
+    def _print_index_sizes(self, alias: str) -> None:
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexrelname, pg_size_pretty(pg_relation_size(indexrelid)) "
+                "FROM pg_stat_user_indexes WHERE relname = %s ORDER BY indexrelname",
+                [License._meta.db_table],
+            )
+            for name, size in cursor.fetchall():
+                self.stdout.write(f"  index {name}: {size}")
+            cursor.execute(
+                "SELECT pg_size_pretty(pg_relation_size(%s)), pg_size_pretty(pg_indexes_size(%s))",
+                [License._meta.db_table, License._meta.db_table],
+            )
+            table_size, index_size = cursor.fetchone()
+            self.stdout.write(f"  table: {table_size}, all indexes: {index_size}")
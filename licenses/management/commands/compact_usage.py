@@ -0,0 +1,46 @@
+# licenses/management/commands/compact_usage.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from licenses.services.usage import compact_usage
+
+
+class Command(BaseCommand):
+    help = (
+        "Prune raw usage events (already folded into rollups at ingestion) "
+        "and expired hourly rollups. Daily rollups are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--raw-retention-days",
+            type=int,
+            default=settings.USAGE_RAW_RETENTION_DAYS,
+            help="Keep raw events received within this many days.",
+        )
+        parser.add_argument(
+            "--hourly-retention-days",
+            type=int,
+            default=settings.USAGE_HOURLY_RETENTION_DAYS,
+            help="Keep hourly rollups within this many days.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Rows deleted per transaction (default: 5000).",
+        )
+
+    def handle(self, *args, **options):
+        result = compact_usage(
+            raw_retention_days=options["raw_retention_days"],
+            hourly_retention_days=options["hourly_retention_days"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {result['raw_events_deleted']} raw events and "
+                f"{result['hourly_rollups_deleted']} hourly rollups."
+            )
+        )
@@ -0,0 +1,75 @@
+# licenses/management/commands/dispatch_webhooks.py
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from licenses.services.webhooks import (
+    dispatch_due_messages,
+    requeue_dead_messages,
+    HTTPConnectionPool,
+)
+
+
+class Command(BaseCommand):
+    help = "Deliver pending webhook outbox messages in batches per endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run a single dispatch round and exit.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when no messages were due (default: 1).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="Messages claimed per round (default: 1000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Endpoints delivered to in parallel (default: 8).",
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Move dead-lettered messages back to pending before dispatching.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            requeued = requeue_dead_messages()
+            self.stdout.write(f"Requeued {requeued} dead-lettered messages.")
+
+        pool = HTTPConnectionPool(timeout=settings.WEBHOOK_TIMEOUT_SECONDS)
+        try:
+            while True:
+                close_old_connections()
+                totals = dispatch_due_messages(
+                    pool,
+                    limit=options["limit"],
+                    max_workers=options["workers"],
+                )
+                if totals["claimed"]:
+                    self.stdout.write(
+                        f"claimed={totals['claimed']} delivered={totals['delivered']} "
+                        f"retried={totals['retried']} dead={totals['dead']}"
+                    )
+                if options["once"]:
+                    break
+                if not totals["claimed"]:
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.close()
@@ -0,0 +1,75 @@
+# licenses/management/commands/export_licenses.py
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from licenses.services.export import (
+    build_export_queryset,
+    parse_export_columns,
+    stream_license_export,
+    EXPORT_COLUMNS,
+    EXPORT_FORMATS,
+    LicenseExportError,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream licenses to CSV or NDJSON in constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-format",
+            choices=EXPORT_FORMATS,
+            default="csv",
+            help="Output format (default: csv).",
+        )
+        parser.add_argument(
+            "--columns",
+            help=f"Comma-separated columns. Available: {', '.join(EXPORT_COLUMNS)}.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            help="Gzip-compress the output.",
+        )
+        parser.add_argument(
+            "--out",
+            help="Output file path (default: stdout).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Rows fetched per cursor round-trip (default: 2000).",
+        )
+        parser.add_argument("--status", help="Only export licenses with this status.")
+        parser.add_argument("--product-id", help="Only export licenses of this product.")
+        parser.add_argument("--edition-id", help="Only export licenses of this edition.")
+        parser.add_argument("--customer-id", help="Only export licenses of this customer.")
+
+    def handle(self, *args, **options):
+        try:
+            chunks = stream_license_export(
+                build_export_queryset(
+                    status=options["status"],
+                    product_id=options["product_id"],
+                    edition_id=options["edition_id"],
+                    customer_id=options["customer_id"],
+                ),
+                columns=parse_export_columns(options["columns"]),
+                output_format=options["output_format"],
+                gzip=options["gzip"],
+                chunk_size=options["chunk_size"],
+            )
+        except LicenseExportError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["out"]:
+            with open(options["out"], "wb") as fh:
+                for chunk in chunks:
+                    fh.write(chunk)
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,504 @@
+# licenses/management/commands/loadtest.py
+
+import asyncio
+import json
+import random
+import ssl
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.crypto import get_random_string
+
+from customers.models import Customer
+from licenses.models import ArchivedLicense, License, OutboxMessage, ShardAssignment, WebhookEndpoint
+from licenses.services.sharding import customer_write
+from products.models import Edition, Product
+
+
+SEED_PREFIX = "loadtest"
+OPERATOR_USERNAME = "loadtest-operator"
+
+ENDPOINTS = ("issue", "download", "status")
+
+
+class _AsyncHttpClient:
+    """
+    Minimal HTTP/1.1 client on asyncio streams, with keep-alive connections
+    (one per in-flight request at most).
+    """
+
+    def __init__(self, base_url: str, headers: Dict[str, str]):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise CommandError("--url must be an http:// or https:// URL.")
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.prefix = parts.path.rstrip("/")
+        self.headers = {"Host": parts.netloc, **headers}
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+        if self._idle:
+            reader, writer = self._idle.pop()
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+        head = [f"{method} {self.prefix}{path} HTTP/1.1"]
+        head += [f"{name}: {value}" for name, value in self.headers.items()]
+        head.append(f"Content-Length: {len(body)}")
+        try:
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            status_code, response_body, keep_alive = await self._read_response(reader)
+        except BaseException:
+            writer.close()
+            raise
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status_code, response_body
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server.")
+        version, status_code = status_line.split(b" ", 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+        connection_header = headers.get("connection", "").lower()
+        keep_alive = connection_header != "close" and (version == b"HTTP/1.1" or connection_header == "keep-alive")
+        return int(status_code), body, keep_alive
+
+    async def close(self) -> None:
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+class _InProcessClient:
+    """
+    Django test client in worker threads (views are synchronous), so
+    requests run concurrently without a server.
+    """
+
+    def __init__(self, headers: Dict[str, str], workers: int):
+        from django.test import Client
+        from django.test.utils import setup_test_environment
+
+        # Allows the test client's "testserver" host.
+        setup_test_environment()
+        self._client_class = Client
+        self._headers = headers
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loadtest")
+
+    def _send(self, method: str, path: str, body: bytes) -> Tuple[int, bytes]:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._client_class()
+        response = client.generic(method, path, body, content_type="application/json", headers=self._headers)
+        return response.status_code, response.content
+
+    async def request(self, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._send, method, path, body)
+
+    async def close(self) -> None:
+        from django.test.utils import teardown_test_environment
+
+        self._executor.shutdown(wait=True)
+        teardown_test_environment()
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the licensing API: seed synthetic customers, products and "
+        "editions, then drive issue/download/status requests at a target rate "
+        "(asyncio, open loop) against a running server (--url) or the "
+        "in-process test client. Prints throughput and p50/p95/p99 latency "
+        "per endpoint as JSON. Seeded rows and issued licenses (ids start "
+        f"with '{SEED_PREFIX}-') are kept for the next run unless --teardown "
+        "is given; their events get no webhook deliveries "
+        "(WEBHOOK_SKIP_CUSTOMER_PREFIXES)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running server sharing this database "
+            "(e.g., http://127.0.0.1:8000). Default: in-process test client.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=50.0,
+            help="Target requests per second over all endpoints (default: 50).",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30.0,
+            help="Seconds of measured traffic (default: 30).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Maximum requests in flight (default: 32).",
+        )
+        parser.add_argument(
+            "--mix",
+            default="issue=1,download=4,status=5",
+            help="Relative weights per endpoint (default: issue=1,download=4,status=5).",
+        )
+        parser.add_argument(
+            "--customers",
+            type=int,
+            default=200,
+            help="Synthetic customers to seed (default: 200).",
+        )
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=3,
+            help="Synthetic products to seed, with two editions each (default: 3).",
+        )
+        parser.add_argument(
+            "--prefill",
+            type=int,
+            default=50,
+            help="Licenses issued before measuring, for download/status (default: 50).",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=1,
+            help="Random seed (default: 1).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Also write the JSON report to this file.",
+        )
+        parser.add_argument(
+            "--teardown",
+            action="store_true",
+            help="After the run, delete the seeded rows and every license issued for them.",
+        )
+        parser.add_argument(
+            "--teardown-only",
+            action="store_true",
+            help="Only delete what earlier runs left behind, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["teardown_only"]:
+            self._report_teardown(self._teardown())
+            return
+
+        mix = self._parse_mix(options["mix"])
+        if options["rate"] <= 0 or options["duration"] <= 0 or options["concurrency"] < 1:
+            raise CommandError("--rate, --duration and --concurrency must be positive.")
+        self._check_webhooks_skipped()
+
+        targets = self._seed(options["customers"], options["products"])
+        headers = self._auth_headers()
+        try:
+            report = asyncio.run(self._run(options, mix, targets, headers))
+        finally:
+            if options["teardown"]:
+                self._report_teardown(self._teardown())
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(output + "\n")
+        self.stdout.write(output)
+
+    # --- Setup ---
+
+    def _parse_mix(self, raw: str) -> Dict[str, float]:
+        mix = {}
+        for item in raw.split(","):
+            name, _, weight = item.partition("=")
+            name = name.strip()
+            if name not in ENDPOINTS:
+                raise CommandError(f"Unknown endpoint '{name}' in --mix; use {', '.join(ENDPOINTS)}.")
+            try:
+                mix[name] = float(weight)
+            except ValueError as exc:
+                raise CommandError(f"Invalid weight for '{name}' in --mix.") from exc
+        if not any(weight > 0 for weight in mix.values()):
+            raise CommandError("--mix needs at least one positive weight.")
+        return mix
+
+    def _check_webhooks_skipped(self) -> None:
+        # Synthetic licenses must not reach real webhook receivers.
+        if f"{SEED_PREFIX}-".startswith(tuple(settings.WEBHOOK_SKIP_CUSTOMER_PREFIXES)):
+            return
+        if WebhookEndpoint.objects.filter(is_active=True).exists():
+            raise CommandError(
+                f"Active webhook endpoints would receive the load test's events; add "
+                f"'{SEED_PREFIX}-' to WEBHOOK_SKIP_CUSTOMER_PREFIXES (on the server too)."
+            )
+
+    def _seed(self, customers: int, products: int) -> List[Tuple[str, str, str]]:
+        """
+        Create missing synthetic rows; returns (customer, product, edition) id triples to issue for.
+        """
+        with transaction.atomic():
+            Customer.objects.bulk_create(
+                [
+                    Customer(id=f"{SEED_PREFIX}-cust-{i}", name=f"Loadtest Customer {i}")
+                    for i in range(customers)
+                ],
+                ignore_conflicts=True,
+            )
+            Product.objects.bulk_create(
+                [
+                    Product(id=f"{SEED_PREFIX}-prod-{i}", code=f"{SEED_PREFIX}-{i}", name=f"Loadtest Product {i}")
+                    for i in range(products)
+                ],
+                ignore_conflicts=True,
+            )
+            Edition.objects.bulk_create(
+                [
+                    Edition(
+                        id=f"{SEED_PREFIX}-ed-{i}-{code}",
+                        product_id=f"{SEED_PREFIX}-prod-{i}",
+                        code=code,
+                        name=code.title(),
+                    )
+                    for i in range(products)
+                    for code in ("standard", "enterprise")
+                ],
+                ignore_conflicts=True,
+            )
+
+        customer_ids = [f"{SEED_PREFIX}-cust-{i}" for i in range(customers)]
+        editions = list(
+            Edition.objects.filter(pk__startswith=f"{SEED_PREFIX}-ed-").values_list("product_id", "pk")
+        )
+        if not customer_ids or not editions:
+            raise CommandError("--customers and --products must be at least 1.")
+        return [
+            (customer_id, product_id, edition_id)
+            for customer_id in customer_ids
+            for product_id, edition_id in editions
+        ]
+
+    def _auth_headers(self) -> Dict[str, str]:
+        """
+        Headers of a logged-in session for the load-test operator. A session
+        rather than Basic auth: Basic auth would hash the password on every
+        request and measure PBKDF2 instead of the API.
+        """
+        user, created = get_user_model().objects.get_or_create(
+            username=OPERATOR_USERNAME,
+            defaults={"is_staff": True},
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+
+        session = SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+
+        csrf_token = get_random_string(32)
+        return {
+            "Cookie": f"{settings.SESSION_COOKIE_NAME}={session.session_key}; {settings.CSRF_COOKIE_NAME}={csrf_token}",
+            "X-CSRFToken": csrf_token,
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+
+    def _teardown(self) -> Dict[str, int]:
+        """
+        Delete the synthetic customers, products, editions and operator,
+        with their licenses (and rows cascading from them) on every shard.
+        The event journal is append-only and keeps their events.
+        """
+        deleted: Counter = Counter()
+        customer_ids = list(
+            Customer.objects.filter(pk__startswith=f"{SEED_PREFIX}-").values_list("pk", flat=True)
+        )
+        for customer_id in customer_ids:
+            with customer_write(customer_id):
+                for model in (License, ArchivedLicense):
+                    _, counts = model.objects.filter(customer_id=customer_id).delete()
+                    deleted.update(counts)
+
+        with transaction.atomic():
+            # Queued before WEBHOOK_SKIP_CUSTOMER_PREFIXES covered the prefix.
+            _, counts = OutboxMessage.objects.filter(
+                status="pending",
+                payload__data__customer_id__startswith=f"{SEED_PREFIX}-",
+            ).delete()
+            deleted.update(counts)
+            ShardAssignment.objects.using("default").filter(customer_id__in=customer_ids).delete()
+            for queryset in (
+                Customer.objects.filter(pk__in=customer_ids),
+                # Also removes their license summary rows.
+                Edition.objects.filter(pk__startswith=f"{SEED_PREFIX}-"),
+                Product.objects.filter(pk__startswith=f"{SEED_PREFIX}-"),
+                get_user_model().objects.filter(username=OPERATOR_USERNAME),
+            ):
+                _, counts = queryset.delete()
+                deleted.update(counts)
+        return dict(deleted)
+
+    def _report_teardown(self, deleted: Dict[str, int]) -> None:
+        summary = ", ".join(f"{label}={count}" for label, count in sorted(deleted.items())) or "nothing"
+        self.stderr.write(f"Teardown deleted: {summary}.")
+
+    # --- Traffic ---
+
+    async def _run(self, options, mix, targets, headers) -> Dict[str, Any]:
+        rng = random.Random(options["seed"])
+        if options["url"]:
+            # Django checks the Referer of HTTPS requests against CSRF_TRUSTED_ORIGINS / the host.
+            client = _AsyncHttpClient(options["url"], {**headers, "Referer": options["url"].rstrip("/") + "/"})
+        else:
+            client = _InProcessClient(headers, options["concurrency"])
+
+        license_ids: List[str] = []
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        codes: Dict[str, Counter] = defaultdict(Counter)
+        now = datetime.now(timezone.utc)
+
+        def issue_body() -> bytes:
+            customer_id, product_id, edition_id = rng.choice(targets)
+            return json.dumps(
+                {
+                    "customer_id": customer_id,
+                    "product_id": product_id,
+                    "edition_id": edition_id,
+                    "license_type": "subscription",
+                    "valid_from": now.isoformat(),
+                    "valid_until": (now + timedelta(days=365)).isoformat(),
+                    "features": {"advanced_export": rng.random() < 0.5},
+                    "usage_limits": {"max_machines": rng.randint(1, 20)},
+                    "note": "loadtest",
+                }
+            ).encode("utf-8")
+
+        async def call(endpoint: str) -> int:
+            if endpoint == "issue" or not license_ids:
+                status_code, body = await client.request("POST", "/api/licenses/issue/", issue_body())
+                if status_code == 201:
+                    license_ids.append(json.loads(body)["license_id"])
+                return status_code
+            license_id = rng.choice(license_ids)
+            status_code, _ = await client.request("GET", f"/api/licenses/{license_id}/{endpoint}/")
+            return status_code
+
+        try:
+            # Not measured: warms connections and gives download/status licenses to fetch.
+            for _ in range(max(1, options["prefill"])):
+                await call("issue")
+            if not license_ids:
+                raise CommandError("Prefill issuance failed; is the server up and sharing this database?")
+
+            endpoints = [name for name in mix if mix[name] > 0]
+            weights = [mix[name] for name in endpoints]
+            interval = 1.0 / options["rate"]
+            in_flight = asyncio.Semaphore(options["concurrency"])
+            tasks = set()
+
+            async def send(endpoint: str, scheduled: float) -> None:
+                async with in_flight:
+                    try:
+                        status_code = await call(endpoint)
+                    except Exception as exc:  # noqa: BLE001 - counted, not raised
+                        status_code = type(exc).__name__
+                # From the scheduled start, so time spent waiting for a free
+                # slot counts (no coordinated omission when the server lags).
+                latencies[endpoint].append(time.perf_counter() - scheduled)
+                codes[endpoint][str(status_code)] += 1
+
+            started = time.perf_counter()
+            arrivals = int(options["duration"] * options["rate"])
+            for number in range(arrivals):
+                scheduled = started + number * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = asyncio.create_task(send(rng.choices(endpoints, weights)[0], scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+            elapsed = time.perf_counter() - started
+        finally:
+            await client.close()
+
+        return self._report(options, elapsed, latencies, codes)
+
+    # --- Report ---
+
+    def _report(self, options, elapsed, latencies, codes) -> Dict[str, Any]:
+        def percentile(values: List[float], fraction: float) -> float:
+            return round(values[min(len(values) - 1, int(len(values) * fraction))] * 1000, 2)
+
+        endpoints = {}
+        for endpoint, values in sorted(latencies.items()):
+            values.sort()
+            ok = sum(count for code, count in codes[endpoint].items() if code.startswith("2"))
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "errors": len(values) - ok,
+                "status_codes": dict(codes[endpoint]),
+                "throughput_rps": round(ok / elapsed, 2),
+                "latency_ms": {
+                    "p50": percentile(values, 0.50),
+                    "p95": percentile(values, 0.95),
+                    "p99": percentile(values, 0.99),
+                    "max": round(values[-1] * 1000, 2),
+                    "mean": round(sum(values) / len(values) * 1000, 2),
+                },
+            }
+
+        total = sum(len(values) for values in latencies.values())
+        return {
+            "target": options["url"] or "in-process",
+            "database": settings.DATABASES["default"]["ENGINE"].rsplit(".", 1)[-1],
+            "target_rate_rps": options["rate"],
+            "concurrency": options["concurrency"],
+            "duration_s": round(elapsed, 2),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+        }
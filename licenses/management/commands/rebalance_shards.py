@@ -0,0 +1,60 @@
+# licenses/management/commands/rebalance_shards.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from licenses.services.rebalance import rebalance_customer
+from licenses.services.sharding import (
+    shard_for_customer,
+    shard_license_counts,
+    ShardingError,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Show licenses per shard, or move one customer's licenses, "
+        "activations, leases and usage to another shard."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "customer_id",
+            nargs="?",
+            help="Customer to move. Omit to only print shard counts.",
+        )
+        parser.add_argument("--to", dest="target", help="Target shard alias.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows copied per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        customer_id = options["customer_id"]
+        if customer_id:
+            if not options["target"]:
+                raise CommandError("--to is required when moving a customer.")
+            source = shard_for_customer(customer_id)
+            try:
+                copied = rebalance_customer(
+                    customer_id,
+                    options["target"],
+                    chunk_size=options["chunk_size"],
+                )
+            except ShardingError as exc:
+                raise CommandError(str(exc)) from exc
+
+            if not copied:
+                self.stdout.write(f"Customer '{customer_id}' is already on {source}.")
+            else:
+                moved = ", ".join(f"{label}={count}" for label, count in copied.items())
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Moved customer '{customer_id}' from {source} to "
+                        f"{options['target']}: {moved}."
+                    )
+                )
+
+        for alias, count in shard_license_counts().items():
+            self.stdout.write(f"{alias}: {count} licenses")
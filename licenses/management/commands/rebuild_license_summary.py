@@ -0,0 +1,13 @@
+# licenses/management/commands/rebuild_license_summary.py
+
+from django.core.management.base import BaseCommand
+
+from licenses.services.summary import rebuild_license_summary
+
+
+class Command(BaseCommand):
+    help = "Recompute the license summary table from the License table."
+
+    def handle(self, *args, **options):
+        groups = rebuild_license_summary()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt license summary ({groups} groups)."))
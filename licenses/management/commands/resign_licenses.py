@@ -0,0 +1,75 @@
+# licenses/management/commands/resign_licenses.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from licenses.services.resign import ResignError, resign_licenses
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-sign active licenses signed with retired keys (KeyMetadata.retired_at) "
+        "under the current signing key. Resumes from the last checkpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--new-key-id",
+            help="Key to sign with (default: SIGNING_KEY_ID).",
+        )
+        parser.add_argument(
+            "--old-key-id",
+            action="append",
+            dest="old_key_ids",
+            help="Key to replace; repeatable (default: every retired key).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Licenses per page and per write transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Signing processes (default: number of CPUs).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and walk from the beginning.",
+        )
+
+    def handle(self, *args, **options):
+        def progress(report):
+            self.stdout.write(
+                f"  batch {report.batches}: {report.resigned} re-signed, "
+                f"{report.skipped} skipped, {report.licenses_per_second:.0f}/s"
+            )
+
+        try:
+            report = resign_licenses(
+                new_key_id=options["new_key_id"],
+                old_key_ids=options["old_key_ids"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                restart=options["restart"],
+                progress=progress,
+            )
+        except (ResignError, FileNotFoundError, TypeError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        if not report.old_key_ids:
+            self.stdout.write("No retired keys to replace.")
+            return
+
+        if report.resumed_from is not None:
+            self.stdout.write(f"Resumed after license {report.resumed_from}.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Re-signed {report.resigned} licenses ({', '.join(report.old_key_ids)} -> "
+                f"{report.new_key_id}); {report.skipped} skipped as changed concurrently. "
+                f"This run: {report.resigned_this_run} in {report.elapsed_seconds:.2f}s "
+                f"({report.licenses_per_second:.0f} licenses/s)."
+            )
+        )
@@ -0,0 +1,31 @@
+# licenses/management/commands/restore_licenses.py
+
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from licenses.models import License
+from licenses.services.archive import LicenseArchiveError, restore_license
+
+
+class Command(BaseCommand):
+    help = "Move archived licenses back into the License table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "license_ids",
+            nargs="+",
+            type=uuid.UUID,
+            metavar="license_id",
+            help="Archived license(s) to restore.",
+        )
+
+    def handle(self, *args, **options):
+        for license_id in options["license_ids"]:
+            try:
+                license_record = restore_license(license_id)
+            except License.DoesNotExist as exc:
+                raise CommandError(f"License '{license_id}' does not exist.") from exc
+            except LicenseArchiveError as exc:
+                raise CommandError(str(exc)) from exc
+            self.stdout.write(f"Restored {license_record.license_id} ({license_record.status}).")
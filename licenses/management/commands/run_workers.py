@@ -0,0 +1,116 @@
+# licenses/management/commands/run_workers.py
+
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from licenses.services.jobs import (
+    claim_jobs,
+    fail_job_attempt,
+    release_jobs,
+    renew_leases,
+    requeue_expired_jobs,
+    run_job,
+    worker_name,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (POST /api/jobs/) in a pool of worker "
+        "processes. Several instances may run side by side. On Ctrl-C, "
+        "running jobs are put back in the queue; if the command is killed, "
+        "they are requeued once their lease (JOB_LEASE_SECONDS) expires."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=4,
+            help="Jobs run at the same time, one process each (default: 4).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds between polls for new jobs (default: 1).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due or running.",
+        )
+
+    def _pool(self, processes: int) -> ProcessPoolExecutor:
+        # "spawn": forked children would share the parent's open database
+        # connections. Each child sets Django up before its first job.
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        if processes < 1:
+            raise CommandError("--processes must be at least 1.")
+
+        worker = worker_name()
+        self.stdout.write(f"worker {worker}: {processes} processes")
+
+        pool = self._pool(processes)
+        running: Dict[Future, uuid.UUID] = {}
+        try:
+            while True:
+                close_old_connections()
+                requeued = requeue_expired_jobs()
+                if requeued:
+                    self.stdout.write(f"requeued {requeued} jobs with expired leases")
+                renew_leases(worker, list(running.values()))
+
+                for job_id in claim_jobs(worker, processes - len(running)):
+                    running[pool.submit(run_job, job_id, worker)] = job_id
+                    self.stdout.write(f"started {job_id}")
+
+                if not running:
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+                    continue
+
+                finished, _ = wait(running, timeout=options["interval"], return_when=FIRST_COMPLETED)
+                broken = False
+                for future in finished:
+                    job_id = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as exc:  # noqa: BLE001 - the pool process died
+                        broken = broken or isinstance(exc, BrokenProcessPool)
+                        outcome = fail_job_attempt(
+                            job_id,
+                            worker,
+                            f"Worker process failed: {type(exc).__name__}: {exc}",
+                        )
+                    self.stdout.write(f"finished {job_id}: {outcome}")
+
+                if broken:
+                    # Every job of a broken pool fails; collect them and start afresh.
+                    for future in list(running):
+                        job_id = running.pop(future)
+                        outcome = fail_job_attempt(job_id, worker, "Worker process pool broke.")
+                        self.stdout.write(f"finished {job_id}: {outcome}")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = self._pool(processes)
+        except KeyboardInterrupt:
+            released = release_jobs(worker)
+            self.stdout.write(f"stopping; {released} running jobs put back in the queue")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,109 @@
+# licenses/management/commands/stress_activations.py
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from licenses.models import Activation, License
+from licenses.services.activation import (
+    activate_machine,
+    get_machine_limit,
+    ActivationLimitReached,
+)
+from licenses.services.sharding import license_shard
+from licensing_server.sharding import shard_of, use_shard
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent activations at one license and check that the seat "
+        "count never exceeds its max_machines limit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("license_id", type=uuid.UUID, help="License to activate against.")
+        parser.add_argument(
+            "--machines",
+            type=int,
+            default=2000,
+            help="Number of distinct machine fingerprints to activate (default: 2000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=2,
+            help="Activations per fingerprint, to exercise the idempotent path (default: 2).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=64,
+            help="Concurrent worker threads (default: 64).",
+        )
+
+    def handle(self, *args, **options):
+        license_id = options["license_id"]
+        try:
+            with license_shard(license_id):
+                license_record = License.objects.get(license_id=license_id)
+        except License.DoesNotExist as exc:
+            raise CommandError(f"License '{license_id}' does not exist.") from exc
+
+        limit = get_machine_limit(license_record)
+        run_tag = uuid.uuid4().hex[:8]
+        fingerprints = [
+            f"stress-{run_tag}-{i}"
+            for i in range(options["machines"])
+            for _ in range(options["repeat"])
+        ]
+
+        def attempt(fingerprint: str) -> str:
+            try:
+                _, created = activate_machine(
+                    license_id=license_id,
+                    machine_fingerprint=fingerprint,
+                )
+                return "created" if created else "refreshed"
+            except ActivationLimitReached:
+                return "rejected"
+            except Exception as exc:  # noqa: BLE001 - reported, not raised
+                return f"error: {type(exc).__name__}"
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            outcomes = list(pool.map(attempt, fingerprints))
+        elapsed = time.perf_counter() - started
+
+        tally: dict[str, int] = {}
+        for outcome in outcomes:
+            tally[outcome] = tally.get(outcome, 0) + 1
+
+        license_record.refresh_from_db(fields=["activation_count"])
+        with use_shard(shard_of(license_record)):
+            active_rows = Activation.objects.filter(
+                license=license_record,
+                is_active=True,
+            ).count()
+
+        self.stdout.write(f"requests:      {len(outcomes)} in {elapsed:.2f}s "
+                          f"({len(outcomes) / elapsed:.0f}/s)")
+        for outcome, count in sorted(tally.items()):
+            self.stdout.write(f"  {outcome}: {count}")
+        self.stdout.write(f"seat counter:  {license_record.activation_count}")
+        self.stdout.write(f"active rows:   {active_rows}")
+        self.stdout.write(f"limit:         {limit if limit is not None else 'unlimited'}")
+
+        errors = sum(count for outcome, count in tally.items() if outcome.startswith("error"))
+        if errors:
+            raise CommandError(f"{errors} activations failed with an unexpected error.")
+        if license_record.activation_count != active_rows:
+            raise CommandError("Seat counter drifted from active activation rows.")
+        if limit is not None and active_rows > limit:
+            raise CommandError("Seat limit exceeded.")
+
+        self.stdout.write(self.style.SUCCESS("Seat accounting is consistent."))
@@ -0,0 +1,21 @@
+# licenses/management/commands/sweep_expired_licenses.py
+
+from django.core.management.base import BaseCommand
+
+from licenses.services.lifecycle import sweep_expired_licenses
+
+
+class Command(BaseCommand):
+    help = "Mark active licenses whose valid_until has passed as expired."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Licenses transitioned per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        swept = sweep_expired_licenses(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Marked {swept} licenses as expired."))
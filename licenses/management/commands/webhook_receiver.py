@@ -0,0 +1,82 @@
+# licenses/management/commands/webhook_receiver.py
+
+import hashlib
+import hmac
+import json
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from licenses.services.webhooks import SIGNATURE_HEADER
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local stand-in webhook receiver for exercising dispatch_webhooks. "
+        "Prints each batch and can inject failures to test backoff and dead-lettering."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--secret",
+            default="",
+            help="Verify X-License-Signature with this secret (optional).",
+        )
+        parser.add_argument(
+            "--fail-rate",
+            type=float,
+            default=0.0,
+            help="Fraction of requests answered with HTTP 503 (default: 0).",
+        )
+
+    def handle(self, *args, **options):
+        command = self
+        secret = options["secret"].encode("utf-8")
+        fail_rate = options["fail_rate"]
+        seen_seqs = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+                if secret:
+                    expected = "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest()
+                    if not hmac.compare_digest(expected, self.headers.get(SIGNATURE_HEADER, "")):
+                        return self._reply(401, b"bad signature")
+
+                if random.random() < fail_rate:
+                    return self._reply(503, b"injected failure")
+
+                events = json.loads(body)["events"]
+                duplicates = sum(1 for event in events if event["seq"] in seen_seqs)
+                seen_seqs.update(event["seq"] for event in events)
+                command.stdout.write(
+                    f"received {len(events)} events "
+                    f"({duplicates} duplicates, {len(seen_seqs)} unique total): "
+                    + ", ".join(f"#{e['seq']} {e['event_type']}" for e in events[:5])
+                    + (" ..." if len(events) > 5 else "")
+                )
+                return self._reply(200, b"ok")
+
+            def _reply(self, code: int, body: bytes):
+                self.send_response(code)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((options["host"], options["port"]), Handler)
+        self.stdout.write(f"Listening on http://{options['host']}:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='license',
+            name='activation_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of machines currently activated against this license.'),
+        ),
+        migrations.CreateModel(
+            name='Activation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('machine_fingerprint', models.CharField(help_text='Stable client-computed machine fingerprint.', max_length=128)),
+                ('hostname', models.CharField(blank=True, help_text='Optional hostname reported by the client, for operator reference.', max_length=255, null=True)),
+                ('is_active', models.BooleanField(default=True, help_text='Whether this machine currently holds a seat.')),
+                ('activated_at', models.DateTimeField(help_text='UTC timestamp of the most recent activation.')),
+                ('deactivated_at', models.DateTimeField(blank=True, help_text='UTC timestamp of the most recent deactivation.', null=True)),
+                ('last_seen_at', models.DateTimeField(help_text='UTC timestamp of the last activate call from this machine.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activations', to='licenses.license')),
+            ],
+            options={
+                'ordering': ['-activated_at'],
+                'indexes': [models.Index(fields=['license', 'is_active'], name='activation_license_active_idx')],
+                'constraints': [models.UniqueConstraint(fields=('license', 'machine_fingerprint'), name='uniq_activation_license_fingerprint')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0002_license_activation_count_activation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FloatingLease',
+            fields=[
+                ('lease_id', models.CharField(help_text='Opaque lease identifier handed to the client.', max_length=64, primary_key=True, serialize=False)),
+                ('client_id', models.CharField(help_text='Client-chosen identifier of the seat holder (user/session).', max_length=128)),
+                ('checked_out_at', models.DateTimeField(help_text='UTC timestamp when the lease was checked out.')),
+                ('expires_at', models.DateTimeField(help_text='UTC expiry as of the last flush; extended by heartbeats.')),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='floating_leases', to='licenses.license')),
+            ],
+            options={
+                'ordering': ['expires_at'],
+                'indexes': [models.Index(fields=['license', 'expires_at'], name='lease_license_expiry_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0003_floatinglease'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(help_text="Metric name (e.g., 'runs' for usage_limits.max_runs_per_day).", max_length=128)),
+                ('quantity', models.BigIntegerField(default=1, help_text='Amount consumed by this event.')),
+                ('occurred_at', models.DateTimeField(help_text='UTC timestamp reported by the client.')),
+                ('received_at', models.DateTimeField(help_text='UTC timestamp when the server accepted the event.')),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_events', to='licenses.license')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['received_at'], name='usage_event_received_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UsageRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=128)),
+                ('granularity', models.CharField(choices=[('hour', 'Hourly'), ('day', 'Daily')], max_length=8)),
+                ('bucket_start', models.DateTimeField(help_text='UTC start of the hour/day bucket.')),
+                ('total', models.BigIntegerField(default=0)),
+                ('event_count', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_rollups', to='licenses.license')),
+            ],
+            options={
+                'ordering': ['license', 'metric', 'granularity', '-bucket_start'],
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='usage_rollup_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('license', 'metric', 'granularity', 'bucket_start'), name='uniq_usage_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0004_usageevent_usagerollup'),
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('license_type', models.CharField(max_length=32)),
+                ('status', models.CharField(max_length=32)),
+                ('expiry_date', models.DateField(help_text='UTC date of License.valid_until.')),
+                ('count', models.IntegerField(default=0)),
+                ('edition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='products.edition')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='products.product')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('product', 'edition', 'license_type', 'status', 'expiry_date'), name='uniq_license_summary_group')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0005_licensesummary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseEvent',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('license_id', models.CharField(db_index=True, help_text='License.license_id the event refers to.', max_length=128)),
+                ('event_type', models.CharField(choices=[('issued', 'Issued'), ('revoked', 'Revoked'), ('superseded', 'Superseded'), ('expired', 'Expired')], max_length=32)),
+                ('data', models.JSONField(help_text='Event details (status transition, customer/product, validity).')),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['seq'],
+            },
+        ),
+    ]
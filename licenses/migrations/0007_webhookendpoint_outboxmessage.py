@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0006_licenseevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEndpoint',
+            fields=[
+                ('id', models.CharField(help_text="Internal endpoint identifier (e.g., 'wh-billing').", max_length=64, primary_key=True, serialize=False)),
+                ('url', models.URLField(help_text='HTTP(S) URL that receives batched event POSTs.', max_length=500)),
+                ('secret', models.CharField(blank=True, help_text='Shared secret for the X-License-Signature HMAC header. Optional.', max_length=255)),
+                ('event_types', models.JSONField(blank=True, default=list, help_text="Event types to deliver (e.g., ['issued', 'revoked']). Empty means all.")),
+                ('is_active', models.BooleanField(default=True, help_text='Inactive endpoints receive no new outbox messages.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=32)),
+                ('payload', models.JSONField(help_text='Event body delivered to the endpoint.')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('delivered', 'Delivered'), ('dead', 'Dead-lettered')], default='pending', max_length=16)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(help_text='Earliest UTC time of the next delivery attempt (also the claim lease).')),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('delivered_at', models.DateTimeField(blank=True, null=True)),
+                ('endpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_messages', to='licenses.webhookendpoint')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx')],
+            },
+        ),
+    ]
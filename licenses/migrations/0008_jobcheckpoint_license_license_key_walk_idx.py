@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('licenses', '0007_webhookendpoint_outboxmessage'),
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCheckpoint',
+            fields=[
+                ('name', models.CharField(help_text="Job name (e.g., 'resign:main-v2').", max_length=128, primary_key=True, serialize=False)),
+                ('cursor', models.JSONField(default=dict, help_text='Job-specific position and counters.')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['meta_key_id', 'status', 'id'], name='license_key_walk_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('licenses', '0008_jobcheckpoint_license_license_key_walk_idx'),
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['updated_at', 'id'], name='license_updated_idx'),
+        ),
+    ]
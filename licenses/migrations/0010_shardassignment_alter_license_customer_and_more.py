@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('licenses', '0009_license_license_updated_idx'),
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShardAssignment',
+            fields=[
+                ('customer_id', models.CharField(help_text='Customer.id whose licenses live on the shard.', max_length=64, primary_key=True, serialize=False)),
+                ('shard', models.CharField(help_text='Database alias from LICENSE_SHARDS.', max_length=64)),
+                ('moving_to', models.CharField(blank=True, help_text='Set while rebalance copies the customer; writes are refused meanwhile.', max_length=64, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['customer_id'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='license',
+            name='customer',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.PROTECT, related_name='licenses', to='customers.customer'),
+        ),
+        migrations.AlterField(
+            model_name='license',
+            name='edition',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.PROTECT, related_name='licenses', to='products.edition'),
+        ),
+        migrations.AlterField(
+            model_name='license',
+            name='issued_by',
+            field=models.ForeignKey(db_constraint=False, help_text='Admin/operator user who issued this license.', on_delete=django.db.models.deletion.PROTECT, related_name='issued_licenses', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='license',
+            name='product',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.PROTECT, related_name='licenses', to='products.product'),
+        ),
+    ]
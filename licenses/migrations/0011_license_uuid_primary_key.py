@@ -0,0 +1,89 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:08
+
+import uuid
+
+import licenses.services.ids
+from django.db import migrations, models
+
+
+# Tables whose license_id column holds License primary keys.
+LICENSE_KEY_COLUMNS = (
+    ("licenses_license", "id"),
+    ("licenses_activation", "license_id"),
+    ("licenses_floatinglease", "license_id"),
+    ("licenses_usageevent", "license_id"),
+    ("licenses_usagerollup", "license_id"),
+)
+
+
+def check_license_ids(apps, schema_editor):
+    # Existing IDs are kept (they are part of signed license files), so
+    # they must already be UUIDs.
+    License = apps.get_model("licenses", "License")
+    db_alias = schema_editor.connection.alias
+    for license_pk in License.objects.using(db_alias).values_list("pk", flat=True).iterator():
+        try:
+            uuid.UUID(license_pk)
+        except ValueError as exc:
+            raise ValueError(
+                f"License id '{license_pk}' is not a UUID; fix it before migrating."
+            ) from exc
+
+
+def strip_uuid_hyphens(apps, schema_editor):
+    # PostgreSQL converts the columns to uuid itself (USING ...::uuid).
+    # Elsewhere UUIDField is char(32) holding the hex form.
+    if schema_editor.connection.vendor == "postgresql":
+        return
+    quote = schema_editor.quote_name
+    for table, column in LICENSE_KEY_COLUMNS:
+        schema_editor.execute(
+            f"UPDATE {quote(table)} SET {quote(column)} = REPLACE({quote(column)}, '-', '')"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0010_shardassignment_alter_license_customer_and_more'),
+    ]
+
+    # The RunPython steps are hinted with the model so that, with sharding,
+    # they only run on the databases that hold the license tables.
+    operations = [
+        migrations.RunPython(check_license_ids, migrations.RunPython.noop, hints={'model_name': 'license'}),
+        migrations.RemoveIndex(
+            model_name='license',
+            name='license_key_walk_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='license',
+            name='license_updated_idx',
+        ),
+        # id and license_id always held the same value; keep one column.
+        migrations.RemoveField(
+            model_name='license',
+            name='license_id',
+        ),
+        # Altering the primary key also converts the foreign key columns
+        # pointing at it.
+        migrations.AlterField(
+            model_name='license',
+            name='id',
+            field=models.UUIDField(default=licenses.services.ids.new_license_id, editable=False, help_text='License identifier as appears in payload (UUIDv7 since 0011).', primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(strip_uuid_hyphens, migrations.RunPython.noop, hints={'model_name': 'license'}),
+        migrations.RenameField(
+            model_name='license',
+            old_name='id',
+            new_name='license_id',
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['meta_key_id', 'status', 'license_id'], name='license_key_walk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='license',
+            index=models.Index(fields=['updated_at', 'license_id'], name='license_updated_idx'),
+        ),
+    ]
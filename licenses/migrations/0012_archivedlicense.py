@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('licenses', '0011_license_uuid_primary_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLicense',
+            fields=[
+                ('license_id', models.UUIDField(help_text='License.license_id of the archived license.', primary_key=True, serialize=False)),
+                ('status', models.CharField(help_text='License status when archived (expired | superseded).', max_length=32)),
+                ('valid_until', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('record', models.BinaryField(help_text='zlib-compressed JSON of the archived rows.')),
+                ('customer', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.PROTECT, related_name='archived_licenses', to='customers.customer')),
+            ],
+            options={
+                'ordering': ['license_id'],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 03:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0003_customer_search'),
+        ('licenses', '0012_archivedlicense'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseEntitlement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('license_status', models.CharField(help_text='License.status (copied, kept current by lifecycle).', max_length=32)),
+                ('section', models.CharField(choices=[('features', 'Features'), ('usage_limits', 'Usage limits')], help_text='Payload object the entry comes from.', max_length=16)),
+                ('key', models.CharField(max_length=128)),
+                ('value_type', models.CharField(choices=[('bool', 'Boolean'), ('number', 'Number'), ('string', 'String'), ('other', 'Other (null, list, object, long string)')], max_length=8)),
+                ('bool_value', models.BooleanField(blank=True, null=True)),
+                ('number_value', models.FloatField(blank=True, null=True)),
+                ('text_value', models.CharField(blank=True, max_length=255, null=True)),
+                ('value', models.JSONField(help_text='The value as it appears in the payload.', null=True)),
+                ('customer', models.ForeignKey(db_constraint=False, db_index=False, help_text='License.customer (copied).', on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='customers.customer')),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entitlements', to='licenses.license')),
+            ],
+            options={
+                'ordering': ['license_id', 'section', 'key'],
+                'indexes': [models.Index(fields=['key', 'license_status', 'bool_value', 'license'], name='entitlement_bool_idx'), models.Index(fields=['key', 'license_status', 'number_value', 'license'], name='entitlement_number_idx'), models.Index(fields=['key', 'license_status', 'text_value', 'license'], name='entitlement_text_idx')],
+                'constraints': [models.UniqueConstraint(fields=('license', 'section', 'key'), name='uniq_license_entitlement')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-19 04:18
+
+import django.db.models.deletion
+import licenses.services.ids
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0013_licenseentitlement'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.UUIDField(default=licenses.services.ids.new_license_id, editable=False, help_text='Job identifier (time-ordered UUID).', primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('issue_licenses', 'Issue licenses'), ('renew_licenses', 'Renew licenses'), ('revoke_licenses', 'Revoke licenses'), ('export_licenses', 'Export licenses')], max_length=32)),
+                ('params', models.JSONField(help_text='Kind-specific input (e.g., the issuance requests).')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='queued', max_length=16)),
+                ('progress_done', models.PositiveIntegerField(default=0, help_text='Items processed so far (the resume point of a retry).')),
+                ('progress_total', models.PositiveIntegerField(blank=True, help_text='Items to process, once known.', null=True)),
+                ('result', models.JSONField(default=dict, help_text='Outcome counters (succeeded, failed, ...).')),
+                ('output_file', models.CharField(blank=True, help_text='Output file name in JOB_OUTPUT_DIR (per-item results or the export).', max_length=255)),
+                ('output_bytes', models.BigIntegerField(default=0, help_text='Output length covered by progress_done.')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=3)),
+                ('run_after', models.DateTimeField(help_text='Earliest UTC time the job may be claimed (retry backoff).')),
+                ('locked_by', models.CharField(blank=True, help_text='Worker running the job (host:pid).', max_length=255, null=True)),
+                ('locked_until', models.DateTimeField(blank=True, help_text='Lease expiry; the job is requeued if its worker stops renewing it.', null=True)),
+                ('cancel_requested', models.BooleanField(default=False)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(help_text='User who enqueued the job (and issues its licenses).', on_delete=django.db.models.deletion.PROTECT, related_name='license_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='job_due_idx'), models.Index(fields=['status', 'locked_until'], name='job_lease_idx')],
+            },
+        ),
+    ]
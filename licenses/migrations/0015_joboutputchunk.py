@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 05:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licenses', '0014_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='output_file',
+            field=models.CharField(blank=True, help_text='Download file name of the output (per-item results or the export).', max_length=255),
+        ),
+        migrations.CreateModel(
+            name='JobOutputChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField(help_text='Position of the chunk in the output (0, 1, ...).')),
+                ('data', models.BinaryField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='output_chunks', to='licenses.job')),
+            ],
+            options={
+                'ordering': ['job', 'seq'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'seq'), name='uniq_job_output_chunk_seq')],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.conf import settings
 from django.db import models
 
 from customers.models import Customer
+from licenses.services.ids import new_license_id
 from products.models import Product, Edition
 
 
@@ -17,31 +18,35 @@ class License(models.Model):
         ("expired", "Expired (record only)"),
     ]
 
-    id = models.CharField(
-        max_length=64,
+    # The only key: a time-ordered UUID (native uuid column on PostgreSQL),
+    # the same value as payload["license_id"].
+    license_id = models.UUIDField(
         primary_key=True,
-        help_text="Internal DB identifier for the license record.",
-    )
-    license_id = models.CharField(
-        max_length=128,
-        unique=True,
-        help_text="License identifier as appears in payload (typically a UUID).",
+        default=new_license_id,
+        editable=False,
+        help_text="License identifier as appears in payload (UUIDv7 since 0011).",
     )
 
+    # No DB-level constraints on these: with sharding (LICENSE_SHARDS) the
+    # license rows live on a shard while customers/products/users stay on
+    # "default". on_delete=PROTECT is still enforced by Django.
     customer = models.ForeignKey(
         Customer,
         on_delete=models.PROTECT,
         related_name="licenses",
+        db_constraint=False,
     )
     product = models.ForeignKey(
         Product,
         on_delete=models.PROTECT,
         related_name="licenses",
+        db_constraint=False,
     )
     edition = models.ForeignKey(
         Edition,
         on_delete=models.PROTECT,
         related_name="licenses",
+        db_constraint=False,
     )
 
     license_type = models.CharField(
@@ -88,6 +93,7 @@ class License(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT,
         related_name="issued_licenses",
+        db_constraint=False,
         help_text="Admin/operator user who issued this license.",
     )
 
@@ -104,16 +110,672 @@ class License(models.Model):
         help_text="Optional notes about revocation, contract terms, etc.",
     )
 
+    activation_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of machines currently activated against this license.",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset walks over licenses signed with a given key (re-signing).
+            models.Index(fields=["meta_key_id", "status", "license_id"], name="license_key_walk_idx"),
+            # Incremental signature scans (high-water mark on updated_at).
+            models.Index(fields=["updated_at", "license_id"], name="license_updated_idx"),
+        ]
 
     def __str__(self) -> str:  
         return f"{self.license_id} ({self.customer.name} / {self.product.code}:{self.edition.code})"
 
 
+class Activation(models.Model):
+    """
+    A machine activated against a node-locked license.
+
+    Seats are counted on License.activation_count; rows are kept after
+    deactivation so a machine can re-activate without a new insert.
+    """
+
+    license = models.ForeignKey(
+        License,
+        on_delete=models.CASCADE,
+        related_name="activations",
+    )
+    machine_fingerprint = models.CharField(
+        max_length=128,
+        help_text="Stable client-computed machine fingerprint.",
+    )
+    hostname = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Optional hostname reported by the client, for operator reference.",
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Whether this machine currently holds a seat.",
+    )
+
+    activated_at = models.DateTimeField(
+        help_text="UTC timestamp of the most recent activation.",
+    )
+    deactivated_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="UTC timestamp of the most recent deactivation.",
+    )
+    last_seen_at = models.DateTimeField(
+        help_text="UTC timestamp of the last activate call from this machine.",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-activated_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["license", "machine_fingerprint"],
+                name="uniq_activation_license_fingerprint",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["license", "is_active"], name="activation_license_active_idx"),
+        ]
+
+    def __str__(self) -> str:  
+        return f"{self.machine_fingerprint} on {self.license_id}"
+
+
+class FloatingLease(models.Model):
+    """
+    Persisted snapshot of a floating-seat lease.
+
+    The live lease table is held in memory by licenses.services.leases and
+    written here periodically (write-behind) so a restart can recover it.
+    """
+
+    lease_id = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="Opaque lease identifier handed to the client.",
+    )
+    license = models.ForeignKey(
+        License,
+        on_delete=models.CASCADE,
+        related_name="floating_leases",
+    )
+    client_id = models.CharField(
+        max_length=128,
+        help_text="Client-chosen identifier of the seat holder (user/session).",
+    )
+    checked_out_at = models.DateTimeField(
+        help_text="UTC timestamp when the lease was checked out.",
+    )
+    expires_at = models.DateTimeField(
+        help_text="UTC expiry as of the last flush; extended by heartbeats.",
+    )
+
+    class Meta:
+        ordering = ["expires_at"]
+        indexes = [
+            models.Index(fields=["license", "expires_at"], name="lease_license_expiry_idx"),
+        ]
+
+    def __str__(self) -> str:  
+        return f"{self.lease_id} ({self.client_id})"
+
+
+class UsageEvent(models.Model):
+    """
+    Raw usage event reported by a client, kept until the retention job
+    prunes it. Reads go through UsageRollup instead.
+    """
+
+    license = models.ForeignKey(
+        License,
+        on_delete=models.CASCADE,
+        related_name="usage_events",
+    )
+    metric = models.CharField(
+        max_length=128,
+        help_text="Metric name (e.g., 'runs' for usage_limits.max_runs_per_day).",
+    )
+    quantity = models.BigIntegerField(
+        default=1,
+        help_text="Amount consumed by this event.",
+    )
+    occurred_at = models.DateTimeField(
+        help_text="UTC timestamp reported by the client.",
+    )
+    received_at = models.DateTimeField(
+        help_text="UTC timestamp when the server accepted the event.",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["received_at"], name="usage_event_received_idx"),
+        ]
+
+    def __str__(self) -> str:  
+        return f"{self.metric}+{self.quantity} on {self.license_id}"
+
+
+class UsageRollup(models.Model):
+    """
+    Per-license, per-metric usage total for one hour or day bucket.
+
+    Maintained incrementally at ingestion time.
+    """
+
+    GRANULARITY_CHOICES = [
+        ("hour", "Hourly"),
+        ("day", "Daily"),
+    ]
+
+    license = models.ForeignKey(
+        License,
+        on_delete=models.CASCADE,
+        related_name="usage_rollups",
+    )
+    metric = models.CharField(max_length=128)
+    granularity = models.CharField(
+        max_length=8,
+        choices=GRANULARITY_CHOICES,
+    )
+    bucket_start = models.DateTimeField(
+        help_text="UTC start of the hour/day bucket.",
+    )
+    total = models.BigIntegerField(default=0)
+    event_count = models.BigIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["license", "metric", "granularity", "-bucket_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["license", "metric", "granularity", "bucket_start"],
+                name="uniq_usage_rollup_bucket",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["granularity", "bucket_start"], name="usage_rollup_bucket_idx"),
+        ]
+
+    def __str__(self) -> str:  
+        return f"{self.metric}@{self.granularity}:{self.bucket_start:%Y-%m-%dT%H} = {self.total}"
+
+
+class LicenseEntitlement(models.Model):
+    """
+    One feature flag or usage limit of a license, with its value in a typed
+    column, so "who has advanced_export?" or "max_runs_per_day over 100" is
+    an index lookup rather than a scan of License.payload.
+
+    Derived from the signed payload at issuance (backfill_entitlements for
+    older licenses); the payload stays authoritative. The license's
+    customer and status are copied in (lifecycle keeps the status current)
+    so queries never touch License. Lives on the license's shard.
+    """
+
+    SECTION_CHOICES = [
+        ("features", "Features"),
+        ("usage_limits", "Usage limits"),
+    ]
+    VALUE_TYPE_CHOICES = [
+        ("bool", "Boolean"),
+        ("number", "Number"),
+        ("string", "String"),
+        ("other", "Other (null, list, object, long string)"),
+    ]
+
+    license = models.ForeignKey(
+        License,
+        on_delete=models.CASCADE,
+        related_name="entitlements",
+    )
+    customer = models.ForeignKey(
+        Customer,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+        db_constraint=False,
+        db_index=False,
+        help_text="License.customer (copied).",
+    )
+    license_status = models.CharField(
+        max_length=32,
+        help_text="License.status (copied, kept current by lifecycle).",
+    )
+    section = models.CharField(
+        max_length=16,
+        choices=SECTION_CHOICES,
+        help_text="Payload object the entry comes from.",
+    )
+    key = models.CharField(max_length=128)
+    value_type = models.CharField(
+        max_length=8,
+        choices=VALUE_TYPE_CHOICES,
+    )
+    # Exactly one of these is set, matching value_type (none for "other").
+    bool_value = models.BooleanField(null=True, blank=True)
+    number_value = models.FloatField(null=True, blank=True)
+    text_value = models.CharField(max_length=255, null=True, blank=True)
+    value = models.JSONField(
+        null=True,
+        help_text="The value as it appears in the payload.",
+    )
+
+    class Meta:
+        ordering = ["license_id", "section", "key"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["license", "section", "key"],
+                name="uniq_license_entitlement",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["key", "license_status", "bool_value", "license"], name="entitlement_bool_idx"),
+            models.Index(fields=["key", "license_status", "number_value", "license"], name="entitlement_number_idx"),
+            models.Index(fields=["key", "license_status", "text_value", "license"], name="entitlement_text_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.section}.{self.key} = {self.value!r}"
+
+
+class ArchivedLicense(models.Model):
+    """
+    Tombstone of a license moved out of License by archive_licenses.
+
+    Only what lookups need is kept in columns; the archived rows (license,
+    activations, usage rollups) are one zlib-compressed JSON document in
+    `record`, which restore_license() puts back. Lives on the license's shard.
+    """
+
+    license_id = models.UUIDField(
+        primary_key=True,
+        help_text="License.license_id of the archived license.",
+    )
+    customer = models.ForeignKey(
+        Customer,
+        on_delete=models.PROTECT,
+        related_name="archived_licenses",
+        db_constraint=False,
+    )
+    status = models.CharField(
+        max_length=32,
+        help_text="License status when archived (expired | superseded).",
+    )
+    valid_until = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    record = models.BinaryField(
+        help_text="zlib-compressed JSON of the archived rows.",
+    )
+
+    class Meta:
+        ordering = ["license_id"]
+
+    def __str__(self) -> str:
+        return f"{self.license_id} ({self.status}, archived {self.archived_at:%Y-%m-%d})"
+
+
+class LicenseSummary(models.Model):
+    """
+    License counts grouped by product, edition, license_type, status and
+    expiry date. Kept in step with License inside the same transactions
+    that create or transition licenses; rebuild_license_summary fixes drift.
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    edition = models.ForeignKey(
+        Edition,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    license_type = models.CharField(max_length=32)
+    status = models.CharField(max_length=32)
+    expiry_date = models.DateField(
+        help_text="UTC date of License.valid_until.",
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "edition", "license_type", "status", "expiry_date"],
+                name="uniq_license_summary_group",
+            ),
+        ]
+
+    def __str__(self) -> str:  
+        return (
+            f"{self.product_id}/{self.edition_id}/{self.license_type}/"
+            f"{self.status}/{self.expiry_date}: {self.count}"
+        )
+
+
+class LicenseEvent(models.Model):
+    """
+    Append-only journal of license issuance and status changes.
+
+    seq is strictly increasing in commit order, so consumers can sync with
+    "everything after the last seq I saw". license_id is a plain column
+    (not a foreign key) so events outlive the license rows they describe.
+    """
+
+    EVENT_TYPE_CHOICES = [
+        ("issued", "Issued"),
+        ("revoked", "Revoked"),
+        ("superseded", "Superseded"),
+        ("expired", "Expired"),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    license_id = models.CharField(
+        max_length=128,
+        db_index=True,
+        help_text="License.license_id the event refers to.",
+    )
+    event_type = models.CharField(
+        max_length=32,
+        choices=EVENT_TYPE_CHOICES,
+    )
+    data = models.JSONField(
+        help_text="Event details (status transition, customer/product, validity).",
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["seq"]
+
+    def __str__(self) -> str:  
+        return f"#{self.seq} {self.event_type} {self.license_id}"
+
+
+class WebhookEndpoint(models.Model):
+    """
+    External system notified about license events.
+    """
+
+    id = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="Internal endpoint identifier (e.g., 'wh-billing').",
+    )
+    url = models.URLField(
+        max_length=500,
+        help_text="HTTP(S) URL that receives batched event POSTs.",
+    )
+    secret = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Shared secret for the X-License-Signature HMAC header. Optional.",
+    )
+    event_types = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Event types to deliver (e.g., ['issued', 'revoked']). Empty means all.",
+    )
+    is_active = models.BooleanField(
+        default=True,
+        help_text="Inactive endpoints receive no new outbox messages.",
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:  
+        return f"{self.id} -> {self.url}"
+
+
+class OutboxMessage(models.Model):
+    """
+    Webhook notification written in the same transaction as the license
+    change, delivered later by the dispatch_webhooks command.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("delivered", "Delivered"),
+        ("dead", "Dead-lettered"),
+    ]
+
+    endpoint = models.ForeignKey(
+        WebhookEndpoint,
+        on_delete=models.CASCADE,
+        related_name="outbox_messages",
+    )
+    event_type = models.CharField(max_length=32)
+    payload = models.JSONField(
+        help_text="Event body delivered to the endpoint.",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default="pending",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        help_text="Earliest UTC time of the next delivery attempt (also the claim lease).",
+    )
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:  
+        return f"#{self.pk} {self.event_type} -> {self.endpoint_id} ({self.status})"
+
+
+class ShardAssignment(models.Model):
+    """
+    Explicit customer -> shard placement (see licenses/services/sharding.py).
+
+    Customers without a row live on their hash shard. Always stored on
+    "default".
+    """
+
+    customer_id = models.CharField(
+        max_length=64,
+        primary_key=True,
+        help_text="Customer.id whose licenses live on the shard.",
+    )
+    shard = models.CharField(
+        max_length=64,
+        help_text="Database alias from LICENSE_SHARDS.",
+    )
+    moving_to = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text="Set while rebalance copies the customer; writes are refused meanwhile.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["customer_id"]
+
+    def __str__(self) -> str:  
+        return f"{self.customer_id} -> {self.shard}"
+
+
+class JobCheckpoint(models.Model):
+    """
+    Resume point of a long-running batch job (e.g., re-signing).
+
+    The cursor is written in the same transaction as the batch it covers.
+    """
+
+    name = models.CharField(
+        max_length=128,
+        primary_key=True,
+        help_text="Job name (e.g., 'resign:main-v2').",
+    )
+    cursor = models.JSONField(
+        default=dict,
+        help_text="Job-specific position and counters.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self) -> str:  
+        return f"{self.name} @ {self.cursor}"
+
+
+class Job(models.Model):
+    """
+    Background job for a long-running license operation (mass issuance,
+    renewal, revocation, export), run by `manage.py run_workers`; see
+    licenses/services/jobs.py. Always stored on "default".
+    """
+
+    KIND_CHOICES = [
+        ("issue_licenses", "Issue licenses"),
+        ("renew_licenses", "Renew licenses"),
+        ("revoke_licenses", "Revoke licenses"),
+        ("export_licenses", "Export licenses"),
+    ]
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=new_license_id,
+        editable=False,
+        help_text="Job identifier (time-ordered UUID).",
+    )
+    kind = models.CharField(
+        max_length=32,
+        choices=KIND_CHOICES,
+    )
+    params = models.JSONField(
+        help_text="Kind-specific input (e.g., the issuance requests).",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default="queued",
+    )
+
+    progress_done = models.PositiveIntegerField(
+        default=0,
+        help_text="Items processed so far (the resume point of a retry).",
+    )
+    progress_total = models.PositiveIntegerField(
+        blank=True,
+        null=True,
+        help_text="Items to process, once known.",
+    )
+    result = models.JSONField(
+        default=dict,
+        help_text="Outcome counters (succeeded, failed, ...).",
+    )
+    output_file = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Download file name of the output (per-item results or the export).",
+    )
+    output_bytes = models.BigIntegerField(
+        default=0,
+        help_text="Output length covered by progress_done.",
+    )
+
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(
+        help_text="Earliest UTC time the job may be claimed (retry backoff).",
+    )
+    locked_by = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        help_text="Worker running the job (host:pid).",
+    )
+    locked_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Lease expiry; the job is requeued if its worker stops renewing it.",
+    )
+    cancel_requested = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT,
+        related_name="license_jobs",
+        help_text="User who enqueued the job (and issues its licenses).",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_due_idx"),
+            models.Index(fields=["status", "locked_until"], name="job_lease_idx"),
+        ]
+
+    def __str__(self) -> str:  
+        return f"{self.id} {self.kind} ({self.status})"
+
+
+class JobOutputChunk(models.Model):
+    """
+    A piece of a job's output, written in the same transaction as the
+    checkpoint it belongs to, so any worker host can resume the output and
+    any web host can serve it.
+    """
+
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="output_chunks",
+    )
+    seq = models.PositiveIntegerField(
+        help_text="Position of the chunk in the output (0, 1, ...).",
+    )
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ["job", "seq"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "seq"],
+                name="uniq_job_output_chunk_seq",
+            ),
+        ]
+
+    def __str__(self) -> str:  
+        return f"{self.job_id} #{self.seq}"
+
+
 class LicenseTemplate(models.Model):
     """
     Optional template for issuing licenses with consistent defaults.
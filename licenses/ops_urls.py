@@ -0,0 +1,9 @@
+# licenses/ops_urls.py
+
+from django.urls import path
+
+from .views import DatabasePoolStatsView
+
+urlpatterns = [
+    path("db-pool/", DatabasePoolStatsView.as_view(), name="ops-db-pool"),
+]
@@ -0,0 +1,26 @@
+# licenses/renderers.py
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class LicenseBinaryRenderer(BaseRenderer):
+    """
+    Passes pre-encoded binary .license bytes (meta.version 2) through unchanged.
+
+    Anything else (e.g., error details) is rendered as JSON, so 404/401
+    responses to binary requests stay readable.
+    """
+
+    media_type = "application/vnd.license+binary"
+    format = "licb"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = JSONRenderer.media_type
+        return JSONRenderer().render(data, renderer_context=renderer_context)
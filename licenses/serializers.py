@@ -52,6 +52,11 @@ class LicenseIssueRequestSerializer(serializers.Serializer):
         help_text="Optional internal note stored on the License record.",
     )
 
+    supersedes = serializers.UUIDField(
+        required=False,
+        help_text="Optional license_id of an active license this one replaces.",
+    )
+
     def validate(self, attrs):
         """
         Cross-field validation: ensure valid_from <= valid_until.
@@ -65,3 +70,43 @@ class LicenseIssueRequestSerializer(serializers.Serializer):
             )
 
         return attrs
+
+
+class ActivationRequestSerializer(serializers.Serializer):
+    """
+    Request schema for activating or deactivating a machine on a license.
+    """
+
+    machine_fingerprint = serializers.CharField(
+        max_length=128,
+        help_text="Stable client-computed machine fingerprint.",
+    )
+    hostname = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=255,
+        help_text="Optional hostname, stored for operator reference.",
+    )
+
+
+class LeaseCheckoutRequestSerializer(serializers.Serializer):
+    """
+    Request schema for checking out a floating seat.
+    """
+
+    client_id = serializers.CharField(
+        max_length=128,
+        help_text="Identifier of the seat holder (e.g., user or session ID).",
+    )
+
+
+class LicenseRevokeRequestSerializer(serializers.Serializer):
+    """
+    Request schema for revoking a license.
+    """
+
+    reason = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="Optional reason, appended to the License notes.",
+    )
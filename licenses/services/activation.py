@@ -0,0 +1,173 @@
+# licenses/services/activation.py
+
+from typing import Tuple
+from datetime import datetime, timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from licenses.models import Activation, License
+from licenses.services.sharding import license_write
+
+
+# usage_limits key holding the maximum number of concurrently activated machines.
+MAX_MACHINES_LIMIT_KEY = "max_machines"
+
+
+class ActivationError(Exception):
+    """
+    Domain-level error for activation problems (e.g., inactive or expired license).
+    """
+    pass
+
+
+class ActivationLimitReached(ActivationError):
+    """
+    Raised when every seat of a node-locked license is already taken.
+    """
+    pass
+
+
+def get_machine_limit(license_record: License) -> int | None:
+    """
+    Return the machine limit from the signed payload, or None when unlimited.
+    """
+    usage_limits = (license_record.payload or {}).get("usage_limits") or {}
+    limit = usage_limits.get(MAX_MACHINES_LIMIT_KEY)
+
+    if limit is None:
+        return None
+
+    try:
+        return int(limit)
+    except (TypeError, ValueError) as exc:
+        raise ActivationError(
+            f"License '{license_record.license_id}' has a non-integer "
+            f"'{MAX_MACHINES_LIMIT_KEY}' usage limit."
+        ) from exc
+
+
+def _ensure_activatable(license_record: License, now: datetime) -> None:
+    if license_record.status != "active":
+        raise ActivationError(
+            f"License '{license_record.license_id}' is {license_record.status}."
+        )
+
+    if not (license_record.valid_from <= now < license_record.valid_until):
+        raise ActivationError(
+            f"License '{license_record.license_id}' is outside its validity window."
+        )
+
+
+def _claim_seat(license_pk: str, limit: int | None) -> None:
+    """
+    Take one seat with a single conditional UPDATE.
+
+    The row lock taken by the UPDATE serializes concurrent claims on the same
+    license, so the count can never overshoot the limit.
+    """
+    qs = License.objects.filter(pk=license_pk)
+    if limit is not None:
+        qs = qs.filter(activation_count__lt=limit)
+
+    if qs.update(activation_count=F("activation_count") + 1) == 0:
+        raise ActivationLimitReached(
+            f"All {limit} machine activations are in use for this license."
+        )
+
+
+def _release_seat(license_pk: str) -> None:
+    License.objects.filter(pk=license_pk, activation_count__gt=0).update(
+        activation_count=F("activation_count") - 1,
+    )
+
+
+def _activate_once(
+    license_record: License,
+    machine_fingerprint: str,
+    hostname: str | None,
+    now: datetime,
+) -> Tuple[Activation, bool]:
+    machine_qs = Activation.objects.filter(
+        license=license_record,
+        machine_fingerprint=machine_fingerprint,
+    )
+
+    # Same machine activating again: refresh it, no new seat.
+    if machine_qs.filter(is_active=True).update(last_seen_at=now):
+        return machine_qs.get(), False
+
+    _claim_seat(license_record.pk, get_machine_limit(license_record))
+
+    reactivated = machine_qs.filter(is_active=False).update(
+        is_active=True,
+        hostname=hostname,
+        activated_at=now,
+        deactivated_at=None,
+        last_seen_at=now,
+        updated_at=now,
+    )
+    if reactivated:
+        return machine_qs.get(), True
+
+    activation = Activation.objects.create(
+        license=license_record,
+        machine_fingerprint=machine_fingerprint,
+        hostname=hostname,
+        is_active=True,
+        activated_at=now,
+        last_seen_at=now,
+    )
+    return activation, True
+
+
+def activate_machine(
+    *,
+    license_id: str,
+    machine_fingerprint: str,
+    hostname: str | None = None,
+) -> Tuple[Activation, bool]:
+    """
+    Activate a machine against a license.
+
+    Returns (activation, created) where created is False when the machine
+    already held a seat. Raises License.DoesNotExist for unknown licenses.
+    """
+    with license_write(license_id) as alias:
+        license_record = License.objects.get(license_id=license_id)
+        now = datetime.now(timezone.utc)
+        _ensure_activatable(license_record, now)
+
+        try:
+            with transaction.atomic(using=alias):
+                return _activate_once(license_record, machine_fingerprint, hostname, now)
+        except IntegrityError:
+            # A concurrent request inserted the same fingerprint first; its seat
+            # claim won and ours was rolled back, so retry as a refresh.
+            with transaction.atomic(using=alias):
+                return _activate_once(license_record, machine_fingerprint, hostname, now)
+
+
+def deactivate_machine(*, license_id: str, machine_fingerprint: str) -> None:
+    """
+    Release the seat held by a machine.
+
+    Raises License.DoesNotExist for unknown licenses and ActivationError when
+    the machine holds no seat.
+    """
+    with license_write(license_id):
+        license_record = License.objects.only("pk").get(license_id=license_id)
+        now = datetime.now(timezone.utc)
+
+        released = Activation.objects.filter(
+            license=license_record,
+            machine_fingerprint=machine_fingerprint,
+            is_active=True,
+        ).update(is_active=False, deactivated_at=now, updated_at=now)
+
+        if not released:
+            raise ActivationError(
+                f"Machine '{machine_fingerprint}' is not activated on license '{license_id}'."
+            )
+
+        _release_seat(license_record.pk)
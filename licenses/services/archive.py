@@ -0,0 +1,213 @@
+# licenses/services/archive.py
+
+"""
+Archival tier for licenses that are long expired or superseded.
+
+archive_licenses() moves them out of License, one chunk per transaction,
+into ArchivedLicense: a narrow tombstone row (license_id, customer,
+status, valid_until) plus the license, its activations and its usage
+rollups as one compressed JSON record. Floating leases, raw usage
+events and entitlement index rows are dropped (leases are long gone, raw
+events are already in the rollups, and restore re-indexes the payload).
+The summary table counts hot licenses only, so archived ones leave their
+group.
+
+Downloads and status checks fall back to the tombstone
+(find_archived_license); restore_license() moves a license back.
+"""
+
+import json
+import uuid
+import zlib
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from django.db import models, transaction
+
+from licenses.models import Activation, ArchivedLicense, License, UsageRollup
+from licenses.services.entitlements import record_license_entitlements
+from licenses.services.sharding import each_shard, license_write, writable_on_shard
+from licenses.services.summary import apply_summary_deltas, summary_key
+
+
+class LicenseArchiveError(Exception):
+    """
+    Domain-level error for archive and restore operations.
+    """
+    pass
+
+
+def _dump_row(instance: models.Model) -> Dict[str, Any]:
+    row = {}
+    for field in instance._meta.concrete_fields:
+        value = field.value_from_object(instance)
+        row[field.attname] = None if value is None else field.value_to_string(instance)
+    return row
+
+
+def _load_row(model: type[models.Model], row: Dict[str, Any]) -> models.Model:
+    values = {}
+    for field in model._meta.concrete_fields:
+        # Auto-increment keys are reassigned on restore; nothing refers to them.
+        if field.primary_key and isinstance(field, models.AutoField):
+            continue
+        value = row.get(field.attname)
+        values[field.attname] = None if value is None else field.to_python(value)
+    return model(**values)
+
+
+def encode_archive_record(
+    license_record: License,
+    activations: List[Activation],
+    rollups: List[UsageRollup],
+) -> bytes:
+    document = {
+        "license": _dump_row(license_record),
+        "activations": [_dump_row(activation) for activation in activations],
+        "usage_rollups": [_dump_row(rollup) for rollup in rollups],
+    }
+    return zlib.compress(json.dumps(document, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_archive_record(record: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(bytes(record)))
+
+
+def archivable_licenses(cutoff: datetime) -> models.QuerySet:
+    """
+    Licenses expired (by valid_until) or superseded (by last change) before cutoff.
+    """
+    return License.objects.filter(
+        models.Q(status="expired", valid_until__lt=cutoff)
+        | models.Q(status="superseded", updated_at__lt=cutoff)
+    )
+
+
+def archive_licenses(
+    *,
+    older_than_days: int,
+    chunk_size: int = 500,
+    now: datetime | None = None,
+) -> int:
+    """
+    Move archivable licenses into ArchivedLicense, one chunk per
+    transaction on every shard. Returns the number of licenses archived.
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=older_than_days)
+    archived = 0
+
+    for shard in each_shard():
+        archived += _archive_shard(shard, cutoff, now, chunk_size)
+    return archived
+
+
+def _archive_shard(shard: str, cutoff: datetime, now: datetime, chunk_size: int) -> int:
+    archived = 0
+    after = None
+
+    while True:
+        with transaction.atomic(), transaction.atomic(using=shard):
+            queryset = archivable_licenses(cutoff)
+            if after is not None:
+                queryset = queryset.filter(pk__gt=after)
+            chunk: List[License] = list(
+                queryset.select_for_update(skip_locked=True).order_by("pk")[:chunk_size]
+            )
+            if not chunk:
+                return archived
+            after = chunk[-1].pk
+
+            # Customers moved off this shard keep their rows on the new one.
+            writable = writable_on_shard(shard, {license_record.customer_id for license_record in chunk})
+            chunk = [license_record for license_record in chunk if license_record.customer_id in writable]
+            if not chunk:
+                continue
+
+            pks = [license_record.pk for license_record in chunk]
+            activations: Dict[uuid.UUID, List[Activation]] = defaultdict(list)
+            for activation in Activation.objects.filter(license_id__in=pks).order_by("pk"):
+                activations[activation.license_id].append(activation)
+            rollups: Dict[uuid.UUID, List[UsageRollup]] = defaultdict(list)
+            for rollup in UsageRollup.objects.filter(license_id__in=pks).order_by("pk"):
+                rollups[rollup.license_id].append(rollup)
+
+            ArchivedLicense.objects.bulk_create(
+                [
+                    ArchivedLicense(
+                        license_id=license_record.pk,
+                        customer_id=license_record.customer_id,
+                        status=license_record.status,
+                        valid_until=license_record.valid_until,
+                        archived_at=now,
+                        record=encode_archive_record(
+                            license_record,
+                            activations[license_record.pk],
+                            rollups[license_record.pk],
+                        ),
+                    )
+                    for license_record in chunk
+                ]
+            )
+            # Cascades to activations, leases, usage events and rollups.
+            License.objects.filter(pk__in=pks).delete()
+            counts = Counter(summary_key(license_record) for license_record in chunk)
+            apply_summary_deltas({key: -count for key, count in counts.items()})
+
+        archived += len(chunk)
+
+
+def find_archived_license(license_id: uuid.UUID) -> ArchivedLicense | None:
+    """
+    Tombstone of an archived license on the current shard, or None.
+    """
+    return ArchivedLicense.objects.filter(license_id=license_id).first()
+
+
+def archived_license_file(tombstone: ArchivedLicense) -> Dict[str, Any]:
+    """
+    The signed license file ({meta, payload, signature}) of an archived license.
+    """
+    row = decode_archive_record(tombstone.record)["license"]
+    return {
+        "meta": {
+            "version": int(row["meta_version"]),
+            "alg": row["meta_alg"],
+            "key_id": row["meta_key_id"],
+        },
+        "payload": row["payload"],
+        "signature": row["signature"],
+    }
+
+
+def restore_license(license_id: uuid.UUID) -> License:
+    """
+    Move an archived license (with its activations and usage rollups) back
+    into License. Raises License.DoesNotExist for unknown licenses and
+    LicenseArchiveError for licenses that are not archived.
+    """
+    with license_write(license_id):
+        tombstone = ArchivedLicense.objects.select_for_update().filter(license_id=license_id).first()
+        if tombstone is None:
+            raise LicenseArchiveError(f"License '{license_id}' is not archived.")
+
+        document = decode_archive_record(tombstone.record)
+        license_record = _load_row(License, document["license"])
+        created_at = license_record.created_at
+        license_record.save(force_insert=True)
+        # auto_now_add stamped the restore time; keep the original.
+        License.objects.filter(pk=license_record.pk).update(created_at=created_at)
+        license_record.created_at = created_at
+
+        Activation.objects.bulk_create(
+            [_load_row(Activation, row) for row in document["activations"]]
+        )
+        UsageRollup.objects.bulk_create(
+            [_load_row(UsageRollup, row) for row in document["usage_rollups"]]
+        )
+        record_license_entitlements([license_record])
+        tombstone.delete()
+        apply_summary_deltas({summary_key(license_record): 1})
+
+    return license_record
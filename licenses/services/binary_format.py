@@ -0,0 +1,293 @@
+# licenses/services/binary_format.py
+
+"""
+Compact binary license encoding (meta.version 2).
+
+Canonical value encoding (deterministic, one encoding per value):
+
+    0x00                      null
+    0x01 / 0x02               false / true
+    0x03 <zigzag varint>      integer
+    0x04 <8 bytes BE>         IEEE-754 double
+    0x05 <varint len> <utf-8> string
+    0x06 <varint index>       string from COMMON_STRINGS (always used when listed)
+    0x07 <varint n> <n values>               array
+    0x08 <varint n> <n (key, value) pairs>   object, keys as strings, sorted by UTF-8 bytes
+
+License file container:
+
+    b"LICB" <version byte> <string alg> <string key_id>
+    <varint payload length> <canonical payload> <64-byte raw Ed25519 signature>
+
+The signature covers the canonical payload bytes only, as in version 1.
+This module has no Django dependency so client-side verifiers can use it.
+"""
+
+import struct
+from typing import Any, Dict, Tuple
+
+
+MAGIC = b"LICB"
+FORMAT_VERSION = 2
+SIGNATURE_LENGTH = 64
+
+# Frequent payload keys and values, encoded as one- or two-byte references.
+# Append only: indexes are part of the signed format.
+COMMON_STRINGS: Tuple[str, ...] = (
+    "license_id",
+    "customer",
+    "product",
+    "edition",
+    "license_type",
+    "validity",
+    "valid_from",
+    "valid_until",
+    "features",
+    "usage_limits",
+    "deployment",
+    "issuer",
+    "issued_at",
+    "issuer_id",
+    "issuer_username",
+    "id",
+    "name",
+    "code",
+    "trial",
+    "subscription",
+    "perpetual",
+    "Ed25519",
+    "max_machines",
+    "max_concurrent_users",
+    "max_runs_per_day",
+    "advanced_export",
+)
+_COMMON_INDEX: Dict[str, int] = {value: index for index, value in enumerate(COMMON_STRINGS)}
+
+_NULL, _FALSE, _TRUE, _INT, _FLOAT, _STR, _STR_REF, _ARRAY, _OBJECT = range(9)
+
+_DOUBLE = struct.Struct(">d")
+
+# Deepest array/object nesting accepted by the decoder. Payloads nest
+# three levels; the limit keeps hostile input from exhausting the stack.
+MAX_NESTING_DEPTH = 32
+
+
+class BinaryFormatError(ValueError):
+    """
+    Raised for malformed or non-canonical binary license data.
+    """
+    pass
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_string(out: bytearray, value: str) -> None:
+    index = _COMMON_INDEX.get(value)
+    if index is not None:
+        out.append(_STR_REF)
+        _write_varint(out, index)
+        return
+    raw = value.encode("utf-8")
+    out.append(_STR)
+    _write_varint(out, len(raw))
+    out += raw
+
+
+def _encode_into(out: bytearray, value: Any) -> None:
+    if value is None:
+        out.append(_NULL)
+    elif value is True:
+        out.append(_TRUE)
+    elif value is False:
+        out.append(_FALSE)
+    elif isinstance(value, int):
+        out.append(_INT)
+        _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+    elif isinstance(value, float):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        _write_string(out, value)
+    elif isinstance(value, (list, tuple)):
+        out.append(_ARRAY)
+        _write_varint(out, len(value))
+        for item in value:
+            _encode_into(out, item)
+    elif isinstance(value, dict):
+        items = sorted(value.items(), key=lambda item: item[0].encode("utf-8"))
+        out.append(_OBJECT)
+        _write_varint(out, len(items))
+        for key, item in items:
+            if not isinstance(key, str):
+                raise BinaryFormatError(f"Object keys must be strings, got {type(key)!r}.")
+            _write_string(out, key)
+            _encode_into(out, item)
+    else:
+        raise BinaryFormatError(f"Cannot encode value of type {type(value)!r}.")
+
+
+def encode_canonical(value: Any) -> bytes:
+    """
+    Encode a JSON-compatible value into its canonical binary form.
+    """
+    out = bytearray()
+    _encode_into(out, value)
+    return bytes(out)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+
+    result = byte & 0x7F
+    shift = 7
+    pos += 1
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            if byte == 0:
+                raise BinaryFormatError("Non-canonical varint.")
+            return result, pos
+        shift += 7
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    tag = data[pos]
+    if tag == _STR_REF:
+        index, pos = _read_varint(data, pos + 1)
+        if index >= len(COMMON_STRINGS):
+            raise BinaryFormatError(f"Unknown string reference {index}.")
+        return COMMON_STRINGS[index], pos
+    if tag != _STR:
+        raise BinaryFormatError(f"Expected a string, got tag {tag}.")
+
+    length, pos = _read_varint(data, pos + 1)
+    end = pos + length
+    if end > len(data):
+        raise BinaryFormatError("Unexpected end of data.")
+    try:
+        value = data[pos:end].decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise BinaryFormatError("Invalid UTF-8 in string.") from exc
+    if value in _COMMON_INDEX:
+        raise BinaryFormatError("Non-canonical string: must use a reference.")
+    return value, end
+
+
+def _read_value(data: bytes, pos: int, depth: int = 0) -> Tuple[Any, int]:
+    tag = data[pos]
+    if (tag == _OBJECT or tag == _ARRAY) and depth >= MAX_NESTING_DEPTH:
+        raise BinaryFormatError(f"Values nested deeper than {MAX_NESTING_DEPTH} levels.")
+
+    if tag == _STR or tag == _STR_REF:
+        return _read_string(data, pos)
+    if tag == _OBJECT:
+        count, pos = _read_varint(data, pos + 1)
+        result: Dict[str, Any] = {}
+        previous = b""
+        for i in range(count):
+            key, pos = _read_string(data, pos)
+            raw_key = key.encode("utf-8")
+            if i and raw_key <= previous:
+                raise BinaryFormatError("Object keys are not in canonical order.")
+            previous = raw_key
+            result[key], pos = _read_value(data, pos, depth + 1)
+        return result, pos
+    if tag == _TRUE:
+        return True, pos + 1
+    if tag == _FALSE:
+        return False, pos + 1
+    if tag == _NULL:
+        return None, pos + 1
+    if tag == _INT:
+        raw, pos = _read_varint(data, pos + 1)
+        return (-((raw + 1) >> 1) if raw & 1 else raw >> 1), pos
+    if tag == _FLOAT:
+        if pos + 9 > len(data):
+            raise BinaryFormatError("Unexpected end of data.")
+        return _DOUBLE.unpack_from(data, pos + 1)[0], pos + 9
+    if tag == _ARRAY:
+        count, pos = _read_varint(data, pos + 1)
+        items = []
+        for _ in range(count):
+            item, pos = _read_value(data, pos, depth + 1)
+            items.append(item)
+        return items, pos
+    raise BinaryFormatError(f"Unknown tag {tag}.")
+
+
+def decode_canonical(data: bytes) -> Any:
+    """
+    Decode canonical binary data, rejecting trailing bytes and non-canonical input.
+    """
+    try:
+        value, pos = _read_value(data, 0)
+    except IndexError as exc:
+        raise BinaryFormatError("Unexpected end of data.") from exc
+    if pos != len(data):
+        raise BinaryFormatError("Trailing bytes after value.")
+    return value
+
+
+def encode_license_file(meta: Dict[str, Any], payload_bytes: bytes, signature: bytes) -> bytes:
+    """
+    Build a version 2 .license file from canonical payload bytes and a raw signature.
+    """
+    if len(signature) != SIGNATURE_LENGTH:
+        raise BinaryFormatError(f"Signature must be {SIGNATURE_LENGTH} bytes.")
+
+    out = bytearray(MAGIC)
+    out.append(int(meta["version"]))
+    _write_string(out, meta["alg"])
+    _write_string(out, meta["key_id"])
+    _write_varint(out, len(payload_bytes))
+    out += payload_bytes
+    out += signature
+    return bytes(out)
+
+
+def split_license_file(data: bytes) -> Tuple[Dict[str, Any], bytes, bytes]:
+    """
+    Split a version 2 .license file into (meta, payload_bytes, signature)
+    without decoding the payload, so the signature can be checked first.
+    """
+    if not data.startswith(MAGIC):
+        raise BinaryFormatError("Not a binary license file.")
+
+    try:
+        pos = len(MAGIC)
+        version = data[pos]
+        if version != FORMAT_VERSION:
+            raise BinaryFormatError(f"Unsupported binary license version {version}.")
+
+        alg, pos = _read_string(data, pos + 1)
+        key_id, pos = _read_string(data, pos)
+        length, pos = _read_varint(data, pos)
+    except IndexError as exc:
+        raise BinaryFormatError("Unexpected end of data.") from exc
+
+    payload_end = pos + length
+    if payload_end + SIGNATURE_LENGTH != len(data):
+        raise BinaryFormatError("Payload length does not match file size.")
+
+    meta = {"version": version, "alg": alg, "key_id": key_id}
+    return meta, data[pos:payload_end], data[payload_end:]
+
+
+def decode_license_file(data: bytes) -> Tuple[Dict[str, Any], Dict[str, Any], bytes, bytes]:
+    """
+    Parse a version 2 .license file.
+
+    Returns (meta, payload, payload_bytes, signature); payload_bytes are the
+    exact signed bytes.
+    """
+    meta, payload_bytes, signature = split_license_file(data)
+    return meta, decode_canonical(payload_bytes), payload_bytes, signature
@@ -0,0 +1,61 @@
+# licenses/services/canonical.py
+
+"""
+Canonical signed-byte rules shared by the server and offline verifiers.
+
+No Django imports: client-side tooling can use this module directly.
+"""
+
+import base64
+import json
+from typing import Any, Dict
+
+from .binary_format import encode_canonical
+
+
+SUPPORTED_META_VERSIONS = (1, 2)
+
+
+def _canonical_json_bytes(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialize a dict to canonical JSON bytes for signing.
+
+    - Sorted keys for deterministic field order
+    - No extraneous whitespace
+    - UTF-8 encoding
+    """
+    return json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),  
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def canonical_payload_bytes(payload: Dict[str, Any], version: int) -> bytes:
+    """
+    Return the bytes that are signed for a given meta.version.
+
+    - 1: canonical JSON
+    - 2: canonical compact binary (see binary_format)
+    """
+    if version == 1:
+        return _canonical_json_bytes(payload)
+    if version == 2:
+        return encode_canonical(payload)
+    raise ValueError(
+        f"Unsupported license meta version {version}; expected one of {SUPPORTED_META_VERSIONS}."
+    )
+
+
+def _b64url_encode_no_padding(raw: bytes) -> str:
+    """
+    Base64 URL-safe encoding without padding ('=').
+    This is common for token-style signatures.
+    """
+    encoded = base64.urlsafe_b64encode(raw).decode("ascii")
+    return encoded.rstrip("=")
+
+
+def _b64url_decode_no_padding(encoded: str) -> bytes:
+    return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
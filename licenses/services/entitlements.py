@@ -0,0 +1,258 @@
+# licenses/services/entitlements.py
+
+"""
+Entitlement index: the features and usage_limits of every license as
+LicenseEntitlement rows with typed values.
+
+record_license_entitlements() writes them with the license (issuance,
+restore), lifecycle copies status changes in with
+record_entitlement_status(), and backfill_entitlements() rebuilds them
+for existing licenses. Queries read only this table, through its
+(key, license_status, <typed value>, license) indexes, instead of every
+License payload.
+"""
+
+import heapq
+import json
+import uuid
+from datetime import timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.db import models, transaction
+from django.db.models import Count
+
+from licenses.models import License, LicenseEntitlement
+from licenses.services.sharding import each_shard, shard_querysets, writable_on_shard
+
+
+ENTITLEMENT_SECTIONS = ("features", "usage_limits")
+
+COMPARISONS = ("gt", "gte", "lt", "lte")
+
+_TEXT_MAX_LENGTH = LicenseEntitlement._meta.get_field("text_value").max_length
+
+
+class EntitlementQueryError(Exception):
+    """
+    Domain-level error for invalid entitlement queries.
+    """
+    pass
+
+
+def _typed_columns(value: Any) -> Dict[str, Any]:
+    # bool before number: True is an int too.
+    if isinstance(value, bool):
+        return {"value_type": "bool", "bool_value": value}
+    if isinstance(value, (int, float)):
+        return {"value_type": "number", "number_value": float(value)}
+    if isinstance(value, str) and len(value) <= _TEXT_MAX_LENGTH:
+        return {"value_type": "string", "text_value": value}
+    return {"value_type": "other"}
+
+
+def entitlement_rows(license_record: License) -> List[LicenseEntitlement]:
+    """
+    Unsaved index rows for the features and usage_limits in a license payload.
+    """
+    rows = []
+    for section in ENTITLEMENT_SECTIONS:
+        entries = license_record.payload.get(section) or {}
+        if not isinstance(entries, dict):
+            continue
+        for key, value in entries.items():
+            rows.append(
+                LicenseEntitlement(
+                    license_id=license_record.pk,
+                    customer_id=license_record.customer_id,
+                    license_status=license_record.status,
+                    section=section,
+                    key=key,
+                    value=value,
+                    **_typed_columns(value),
+                )
+            )
+    return rows
+
+
+def record_license_entitlements(licenses: Iterable[License]) -> None:
+    """
+    Index newly written licenses. Runs in the transaction (and on the
+    shard) that writes them.
+    """
+    rows = [row for license_record in licenses for row in entitlement_rows(license_record)]
+    if rows:
+        LicenseEntitlement.objects.bulk_create(rows)
+
+
+def record_entitlement_status(license_ids: Iterable[uuid.UUID], new_status: str) -> None:
+    """
+    Copy a status change into the index rows. Runs in the transaction
+    (and on the shard) that changes the licenses.
+    """
+    LicenseEntitlement.objects.filter(license_id__in=list(license_ids)).update(license_status=new_status)
+
+
+def backfill_entitlements(*, chunk_size: int = 1000) -> int:
+    """
+    Rebuild the index rows of every license, one chunk per transaction on
+    every shard. Idempotent; returns the number of licenses processed.
+    """
+    processed = 0
+    for shard in each_shard():
+        after = None
+        while True:
+            queryset = License.objects.order_by("pk").only("license_id", "customer_id", "status", "payload")
+            if after is not None:
+                queryset = queryset.filter(pk__gt=after)
+            chunk = list(queryset[:chunk_size])
+            if not chunk:
+                break
+            after = chunk[-1].pk
+
+            with transaction.atomic(), transaction.atomic(using=shard):
+                # Customers moved off this shard are indexed on the new one.
+                writable = writable_on_shard(shard, {record.customer_id for record in chunk})
+                chunk = [record for record in chunk if record.customer_id in writable]
+                LicenseEntitlement.objects.filter(license_id__in=[record.pk for record in chunk]).delete()
+                record_license_entitlements(chunk)
+            processed += len(chunk)
+    return processed
+
+
+def parse_entitlement_value(raw: str) -> Any:
+    """
+    Query-string value: JSON where it parses (true, 100, "pro"), else the
+    raw string.
+    """
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return raw
+
+
+def entitlement_filter(
+    key: str,
+    *,
+    section: str | None = None,
+    value: Any = None,
+    comparisons: Dict[str, Any] | None = None,
+) -> models.Q:
+    """
+    Q over LicenseEntitlement: key present (in section, if given), equal to
+    value (if not None) and satisfying every numeric comparison, e.g.
+    {"gt": 100}.
+    """
+    if not key:
+        raise EntitlementQueryError("key is required.")
+    if section is not None and section not in ENTITLEMENT_SECTIONS:
+        raise EntitlementQueryError(f"section must be one of: {', '.join(ENTITLEMENT_SECTIONS)}.")
+
+    condition = models.Q(key=key)
+    if section is not None:
+        condition &= models.Q(section=section)
+
+    if value is not None:
+        columns = _typed_columns(value)
+        if columns["value_type"] == "other":
+            raise EntitlementQueryError("value must be a boolean, number or string.")
+        # The typed column alone: value_type is implied and not indexed.
+        columns.pop("value_type")
+        condition &= models.Q(**columns)
+
+    for op, bound in (comparisons or {}).items():
+        if op not in COMPARISONS:
+            raise EntitlementQueryError(f"Unknown comparison '{op}'.")
+        if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+            raise EntitlementQueryError(f"{op} must be a number.")
+        condition &= models.Q(**{f"number_value__{op}": float(bound)})
+
+    return condition
+
+
+def matching_entitlements(condition: models.Q, *, status: str | None = "active") -> models.QuerySet:
+    """
+    Index rows matching condition, of licenses with the given status (None for any).
+    """
+    queryset = LicenseEntitlement.objects.filter(condition)
+    if status is not None:
+        queryset = queryset.filter(license_status=status)
+    return queryset
+
+
+def entitlement_license_page(
+    condition: models.Q,
+    *,
+    status: str | None = "active",
+    after: uuid.UUID | None = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], str | None]:
+    """
+    One page of matching licenses in license_id order across shards, each
+    with its matching entitlements. Returns (rows, next_after).
+    """
+    pages = []
+    for queryset in shard_querysets(matching_entitlements(condition, status=status)):
+        if after is not None:
+            queryset = queryset.filter(license_id__gt=after)
+        pages.append(
+            list(queryset.order_by("license_id").values_list("license_id", flat=True).distinct()[:limit])
+        )
+    license_ids = list(heapq.merge(*pages))[:limit]
+    next_after = str(license_ids[-1]) if len(license_ids) == limit else None
+
+    licenses: Dict[uuid.UUID, Dict[str, Any]] = {}
+    matched: Dict[uuid.UUID, Dict[str, Any]] = {}
+    for queryset in shard_querysets(License.objects.filter(pk__in=license_ids)):
+        for row in queryset.values("pk", "customer_id", "product_id", "edition_id", "status", "valid_until"):
+            licenses[row["pk"]] = row
+    for queryset in shard_querysets(
+        LicenseEntitlement.objects.filter(condition, license_id__in=license_ids)
+    ):
+        for license_id, section, key, value in queryset.values_list("license_id", "section", "key", "value"):
+            matched.setdefault(license_id, {}).setdefault(section, {})[key] = value
+
+    rows = []
+    for license_id in license_ids:
+        row = licenses.get(license_id)
+        # Archived between the two reads.
+        if row is None:
+            continue
+        rows.append(
+            {
+                "license_id": str(license_id),
+                "customer_id": row["customer_id"],
+                "product_id": row["product_id"],
+                "edition_id": row["edition_id"],
+                "status": row["status"],
+                "valid_until": row["valid_until"].astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+                "entitlements": matched.get(license_id, {}),
+            }
+        )
+    return rows, next_after
+
+
+def entitlement_customer_page(
+    condition: models.Q,
+    *,
+    status: str | None = "active",
+    after: str | None = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], str | None]:
+    """
+    One page of customers having a matching license, in customer id order,
+    with their number of matching licenses. Returns (rows, next_after).
+    """
+    rows: List[Dict[str, Any]] = []
+    for queryset in shard_querysets(matching_entitlements(condition, status=status)):
+        if after is not None:
+            queryset = queryset.filter(customer_id__gt=after)
+        # A customer's licenses are all on one shard.
+        rows += (
+            queryset.order_by("customer_id")
+            .values("customer_id")
+            .annotate(license_count=Count("license_id", distinct=True))[:limit]
+        )
+
+    rows = sorted(rows, key=lambda row: row["customer_id"])[:limit]
+    next_after = rows[-1]["customer_id"] if len(rows) == limit else None
+    return rows, next_after
@@ -0,0 +1,90 @@
+# licenses/services/events.py
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+from django.db import connection
+
+from licenses.models import License, LicenseEvent
+from licensing_server.db_pool import release_pooled_connections
+
+
+# Arbitrary constant key for the PostgreSQL advisory lock that orders event inserts.
+_EVENT_SEQ_LOCK_KEY = 0x4C49_4345
+
+
+def _event_data(license_record: License, previous_status: str | None) -> Dict[str, Any]:
+    return {
+        "status": license_record.status,
+        "previous_status": previous_status,
+        "customer_id": license_record.customer_id,
+        "product_id": license_record.product_id,
+        "edition_id": license_record.edition_id,
+        "license_type": license_record.license_type,
+        "valid_until": license_record.valid_until.astimezone(timezone.utc)
+        .isoformat()
+        .replace("+00:00", "Z"),
+    }
+
+
+def record_license_events(
+    licenses: Iterable[License],
+    event_type: str,
+    *,
+    previous_status: str | None = None,
+) -> List[LicenseEvent]:
+    """
+    Append one event per license. Must run inside the transaction that
+    made the change, after the change itself.
+
+    On PostgreSQL a transaction-scoped advisory lock is taken first: it is
+    held until commit, so sequence values become visible in order and a
+    consumer reading "after N" never skips a late-committing lower seq.
+    Call this near the end of the transaction to keep the lock short.
+
+    Returns the created events.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        LicenseEvent(
+            license_id=str(license_record.license_id),
+            event_type=event_type,
+            data=_event_data(license_record, previous_status),
+            created_at=now,
+        )
+        for license_record in licenses
+    ]
+    if not rows:
+        return rows
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [_EVENT_SEQ_LOCK_KEY])
+
+    return LicenseEvent.objects.bulk_create(rows)
+
+
+def get_events_after(after: int, *, limit: int) -> List[LicenseEvent]:
+    return list(LicenseEvent.objects.filter(seq__gt=after).order_by("seq")[:limit])
+
+
+def wait_for_events(
+    after: int,
+    *,
+    limit: int,
+    wait_seconds: float,
+    poll_interval: float,
+) -> List[LicenseEvent]:
+    """
+    Return events after `after`, polling for up to wait_seconds when none
+    are available yet. Each poll is a single index range scan on seq.
+    """
+    deadline = time.monotonic() + wait_seconds
+    while True:
+        events = get_events_after(after, limit=limit)
+        if events or time.monotonic() >= deadline:
+            return events
+        # Don't hold a pooled connection while idle between polls.
+        release_pooled_connections()
+        time.sleep(min(poll_interval, max(deadline - time.monotonic(), 0)))
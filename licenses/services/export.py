@@ -0,0 +1,306 @@
+# licenses/services/export.py
+
+"""
+Streaming license export (CSV / NDJSON, optionally gzipped).
+
+Rows are read with QuerySet.values().iterator(chunk_size=...), which uses a
+server-side cursor on PostgreSQL, and rendered into output chunks as they
+arrive, so memory stays flat regardless of table size.
+"""
+
+import csv
+import io
+import json
+import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from licenses.models import License
+from licenses.services.sharding import iter_merged_rows, merged_keyset_page
+from licensing_server.sharding import sharding_enabled
+
+
+# Export column name -> ORM lookup path.
+EXPORT_COLUMNS: Dict[str, str] = {
+    "license_id": "license_id",
+    "customer_id": "customer_id",
+    "customer_name": "customer__name",
+    "customer_external_ref": "customer__external_ref",
+    "product_id": "product_id",
+    "product_code": "product__code",
+    "edition_id": "edition_id",
+    "edition_code": "edition__code",
+    "license_type": "license_type",
+    "status": "status",
+    "valid_from": "valid_from",
+    "valid_until": "valid_until",
+    "issued_at": "issued_at",
+    "issued_by": "issued_by__username",
+    "meta_version": "meta_version",
+    "meta_key_id": "meta_key_id",
+    "payload": "payload",
+    "signature": "signature",
+    "notes": "notes",
+}
+
+DEFAULT_EXPORT_COLUMNS: List[str] = [
+    "license_id",
+    "customer_id",
+    "customer_name",
+    "customer_external_ref",
+    "product_code",
+    "edition_code",
+    "license_type",
+    "status",
+    "valid_from",
+    "valid_until",
+    "issued_at",
+]
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# Rendered rows are buffered up to roughly this many bytes per yielded chunk.
+_OUTPUT_CHUNK_BYTES = 64 * 1024
+
+
+class LicenseExportError(Exception):
+    """
+    Domain-level error for invalid export requests (e.g., unknown columns).
+    """
+    pass
+
+
+def parse_export_columns(raw: str | None) -> List[str]:
+    """
+    Parse a comma-separated column list, defaulting to DEFAULT_EXPORT_COLUMNS.
+    """
+    if not raw:
+        return list(DEFAULT_EXPORT_COLUMNS)
+
+    columns = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise LicenseExportError(
+            f"Unknown export column(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(EXPORT_COLUMNS)}."
+        )
+    return columns
+
+
+def build_export_queryset(
+    *,
+    status: str | None = None,
+    product_id: str | None = None,
+    edition_id: str | None = None,
+    customer_id: str | None = None,
+):
+    """
+    Filtered License queryset for export, ordered by primary key.
+    """
+    qs = License.objects.all()
+    if status:
+        qs = qs.filter(status=status)
+    if product_id:
+        qs = qs.filter(product_id=product_id)
+    if edition_id:
+        qs = qs.filter(edition_id=edition_id)
+    if customer_id:
+        qs = qs.filter(customer_id=customer_id)
+    return qs.order_by("pk")
+
+
+def _license_lookups(lookups: Sequence[str]) -> List[str]:
+    """
+    Lookups to read from the license table itself.
+
+    Shards hold no customers, products or users, so with sharding the
+    foreign keys are read instead and related columns filled in by
+    _fill_related_columns().
+    """
+    if not sharding_enabled():
+        return list(lookups)
+    fields = []
+    for lookup in lookups:
+        if "__" in lookup:
+            lookup = License._meta.get_field(lookup.split("__", 1)[0]).attname
+        if lookup not in fields:
+            fields.append(lookup)
+    return fields
+
+
+def _fill_related_columns(rows: List[Dict[str, Any]], lookups: Sequence[str]) -> None:
+    related: Dict[str, List[str]] = {}
+    for lookup in lookups:
+        if "__" in lookup:
+            relation, attr = lookup.split("__", 1)
+            related.setdefault(relation, []).append(attr)
+
+    for relation, attrs in related.items():
+        field = License._meta.get_field(relation)
+        ids = {row[field.attname] for row in rows if row[field.attname] is not None}
+        values = {
+            item["pk"]: item
+            for item in field.related_model._default_manager.using("default")
+            .filter(pk__in=ids)
+            .values("pk", *attrs)
+        }
+        for row in rows:
+            item = values.get(row[field.attname], {})
+            for attr in attrs:
+                row[f"{relation}__{attr}"] = item.get(attr)
+
+
+def _rows_with_related(rows: Iterable[Dict[str, Any]], lookups: Sequence[str], chunk_size: int):
+    if not sharding_enabled() or not any("__" in lookup for lookup in lookups):
+        yield from rows
+        return
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            _fill_related_columns(chunk, lookups)
+            yield from chunk
+            chunk = []
+    if chunk:
+        _fill_related_columns(chunk, lookups)
+        yield from chunk
+
+
+def iter_export_rows(
+    queryset,
+    columns: Sequence[str],
+    *,
+    chunk_size: int = 2000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one dict per license containing only the requested columns.
+
+    With sharding, every shard is streamed and merged in primary-key order.
+    """
+    lookups = [EXPORT_COLUMNS[name] for name in columns]
+    rows = iter_merged_rows(queryset, _license_lookups(lookups), chunk_size=chunk_size)
+    for row in _rows_with_related(rows, lookups, chunk_size):
+        yield {name: row[EXPORT_COLUMNS[name]] for name in columns}
+
+
+def export_page(
+    queryset,
+    columns: Sequence[str],
+    *,
+    after: str | None = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], str | None]:
+    """
+    One keyset page of export rows (JSON-ready values) after the given
+    primary key. Returns (rows, next_after); next_after is None on the last page.
+    """
+    lookups = [EXPORT_COLUMNS[name] for name in columns]
+    rows, next_after = merged_keyset_page(
+        queryset,
+        _license_lookups(lookups),
+        after=after,
+        limit=limit,
+    )
+    if sharding_enabled():
+        _fill_related_columns(rows, lookups)
+    return (
+        [{name: _format_value(row[EXPORT_COLUMNS[name]]) for name in columns} for row in rows],
+        next_after,
+    )
+
+
+def _format_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _csv_cell(value: Any) -> Any:
+    value = _format_value(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return value
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[bytes]:
+    buffer: List[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= _OUTPUT_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def _csv_lines(rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> Iterator[str]:
+    line = io.StringIO()
+    writer = csv.writer(line)
+
+    def render(values) -> str:
+        line.seek(0)
+        line.truncate()
+        writer.writerow(values)
+        return line.getvalue()
+
+    yield render(columns)
+    for row in rows:
+        yield render([_csv_cell(row[name]) for name in columns])
+
+
+def _ndjson_lines(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(
+            {name: _format_value(value) for name, value in row.items()},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ) + "\n"
+
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _counted(rows: Iterable[Dict[str, Any]], on_rows: Callable[[int], None]) -> Iterator[Dict[str, Any]]:
+    for count, row in enumerate(rows, 1):
+        yield row
+        on_rows(count)
+
+
+def stream_license_export(
+    queryset,
+    *,
+    columns: Sequence[str],
+    output_format: str = "csv",
+    gzip: bool = False,
+    chunk_size: int = 2000,
+    on_rows: Callable[[int], None] | None = None,
+) -> Iterator[bytes]:
+    """
+    Yield the export as byte chunks, ready for a streaming response or a file.
+
+    on_rows, if given, is called with the number of rows read so far after
+    each row (background exports report progress with it).
+    """
+    if output_format not in EXPORT_FORMATS:
+        raise LicenseExportError(
+            f"Unknown export format '{output_format}'. Use one of: {', '.join(EXPORT_FORMATS)}."
+        )
+
+    rows = iter_export_rows(queryset, columns, chunk_size=chunk_size)
+    if on_rows is not None:
+        rows = _counted(rows, on_rows)
+    lines = _csv_lines(rows, columns) if output_format == "csv" else _ndjson_lines(rows)
+    chunks = _chunked(lines)
+    return _gzip(chunks) if gzip else chunks
@@ -1,16 +1,22 @@
 # licenses/services/issuance.py
 
-import uuid
 from typing import Any, Dict, Tuple
 from datetime import datetime, timezone
 
-from django.db import transaction
 from django.contrib.auth.models import AbstractBaseUser
 
 from licenses.models import License
 from customers.models import Customer
 from products.models import Product, Edition
+from licensing_server.sharding import use_shard
+from licenses.services.entitlements import record_license_entitlements
+from licenses.services.events import record_license_events
+from licenses.services.ids import new_license_id
+from licenses.services.lifecycle import supersede_license, LicenseStatusError
+from licenses.services.sharding import CustomerShardMoving, customer_write, shard_for_customer
 from licenses.services.signing import sign_license_payload
+from licenses.services.summary import record_license_created
+from licenses.services.webhooks import enqueue_webhooks
 
 
 class LicenseIssuanceError(Exception):
@@ -73,36 +79,15 @@ def _build_license_payload(
     return payload
 
 
-@transaction.atomic
-def issue_license_from_validated_data(
-    data: Dict[str, Any],
-    *,
-    issued_by: AbstractBaseUser,
-) -> Tuple[Dict[str, Any], License]:
+def _resolve_catalog(data: Dict[str, Any]) -> Tuple[Customer, Product, Edition]:
     """
-    Main orchestration function for issuing a license.
-
-    Steps:
-    - Resolve Customer, Product, Edition from IDs
-    - Validate Edition belongs to Product
-    - Generate license_id (UUID)
-    - Build payload
-    - Sign payload (meta + signature)
-    - Persist License row
-    - Return (full_license_object, license_record)
+    Resolve Customer, Product and Edition from IDs and check that the
+    Edition belongs to the Product.
     """
     customer_id = data["customer_id"]
     product_id = data["product_id"]
     edition_id = data["edition_id"]
 
-    license_type = data["license_type"]
-    valid_from: datetime = data["valid_from"]
-    valid_until: datetime = data["valid_until"]
-    features = data.get("features") or {}
-    usage_limits = data.get("usage_limits") or {}
-    deployment = data.get("deployment") or {}
-    note = data.get("note", "")
-
     try:
         customer = Customer.objects.get(pk=customer_id)
     except Customer.DoesNotExist as exc:
@@ -123,12 +108,86 @@ def issue_license_from_validated_data(
             f"Edition '{edition.id}' does not belong to product '{product.id}'."
         )
 
-    # --- Generate external license ID (UUID) ---
-    license_id = str(uuid.uuid4())
+    return customer, product, edition
+
+
+def _get_replaced_license(
+    supersedes: Any,
+    *,
+    customer: Customer,
+    product: Product,
+    for_update: bool = False,
+) -> License:
+    """
+    The license being superseded, checked to belong to the same customer
+    and product. Must run on the customer's shard.
+    """
+    queryset = License.objects.select_for_update() if for_update else License.objects.all()
+    try:
+        replaced = queryset.get(license_id=supersedes)
+    except License.DoesNotExist as exc:
+        raise LicenseIssuanceError(f"License '{supersedes}' does not exist.") from exc
+
+    if replaced.customer_id != customer.id or replaced.product_id != product.id:
+        raise LicenseIssuanceError(
+            f"License '{supersedes}' belongs to a different customer or product."
+        )
+    return replaced
+
+
+def issue_license_from_validated_data(
+    data: Dict[str, Any],
+    *,
+    issued_by: AbstractBaseUser,
+) -> Tuple[Dict[str, Any], License]:
+    """
+    Main orchestration function for issuing a license.
+
+    Runs in three phases so that the database transaction only covers
+    the writes:
+
+    1. Resolve and validate (autocommit reads): Customer, Product and
+       Edition from IDs, Edition belongs to Product, the customer's shard
+       and the license being superseded, if any.
+    2. Build and sign, with no transaction open: generate license_id
+       (UUID), build the payload, canonicalize and sign it (meta + signature).
+    3. Short atomic insert, under the customer's rebalance lock with the
+       shard re-checked: persist the License row and its entitlement
+       index rows (and supersede the replaced license, locking it and
+       re-checking it), update the license summary, append the "issued"
+       event and queue its webhooks.
+
+    Returns (full_license_object, license_record).
+    """
+    license_type = data["license_type"]
+    valid_from: datetime = data["valid_from"]
+    valid_until: datetime = data["valid_until"]
+    features = data.get("features") or {}
+    usage_limits = data.get("usage_limits") or {}
+    deployment = data.get("deployment") or {}
+    note = data.get("note", "")
+    supersedes = data.get("supersedes")
+
+    # --- Phase 1: resolve and validate ---
+    customer, product, edition = _resolve_catalog(data)
+
+    # Fail fast; re-checked under the rebalance lock in phase 3.
+    try:
+        shard = shard_for_customer(customer.id, for_write=True)
+    except CustomerShardMoving as exc:
+        raise LicenseIssuanceError(str(exc)) from exc
+
+    if supersedes:
+        # Fail fast before signing; re-checked under lock in phase 3.
+        with use_shard(shard):
+            _get_replaced_license(supersedes, customer=customer, product=product)
+
+    # --- Phase 2: build and sign (no transaction open) ---
+    # Generate external license ID (time-ordered UUID)
+    license_id = new_license_id()
 
-    # --- Build payload and sign ---
     payload = _build_license_payload(
-        license_id=license_id,
+        license_id=str(license_id),
         customer=customer,
         product=product,
         edition=edition,
@@ -145,26 +204,51 @@ def issue_license_from_validated_data(
     meta = signed_obj["meta"]
     signature = signed_obj["signature"]
 
-    now = datetime.now(timezone.utc)
-
-    license_record = License.objects.create(
-        id=license_id,
-        license_id=license_id,
-        customer=customer,
-        product=product,
-        edition=edition,
-        license_type=license_type,
-        valid_from=valid_from,
-        valid_until=valid_until,
-        meta_version=meta["version"],
-        meta_alg=meta["alg"],
-        meta_key_id=meta["key_id"],
-        payload=payload,
-        signature=signature,
-        issued_at=now,
-        issued_by=issued_by,
-        status="active",
-        notes=note,
-    )
+    # --- Phase 3: short atomic insert ---
+    # The License row goes to the customer's shard ("default" unless
+    # LICENSE_SHARDS is set), re-resolved under the customer's rebalance
+    # lock in case a move started after phase 1; summary, event and
+    # outbox rows are written in the transaction on "default".
+    try:
+        with customer_write(customer.id):
+            replaced = None
+            if supersedes:
+                replaced = _get_replaced_license(
+                    supersedes, customer=customer, product=product, for_update=True
+                )
+
+            now = datetime.now(timezone.utc)
+
+            license_record = License.objects.create(
+                license_id=license_id,
+                customer=customer,
+                product=product,
+                edition=edition,
+                license_type=license_type,
+                valid_from=valid_from,
+                valid_until=valid_until,
+                meta_version=meta["version"],
+                meta_alg=meta["alg"],
+                meta_key_id=meta["key_id"],
+                payload=payload,
+                signature=signature,
+                issued_at=now,
+                issued_by=issued_by,
+                status="active",
+                notes=note,
+            )
+
+            record_license_entitlements([license_record])
+
+            if replaced is not None:
+                try:
+                    supersede_license(replaced, superseded_by=license_id)
+                except LicenseStatusError as exc:
+                    raise LicenseIssuanceError(str(exc)) from exc
+
+            record_license_created(license_record)
+            enqueue_webhooks(record_license_events([license_record], "issued"))
+    except CustomerShardMoving as exc:
+        raise LicenseIssuanceError(str(exc)) from exc
 
     return signed_obj, license_record
@@ -0,0 +1,543 @@
+# licenses/services/jobs.py
+
+"""
+Background jobs for long-running license operations (mass issuance,
+renewal, revocation, export).
+
+POST /api/jobs/ stores a Job row (enqueue_job) and returns at once, so
+the request costs the same for ten items as for a hundred thousand.
+`manage.py run_workers` claims due jobs (claim_jobs) and runs each one in
+a worker process (run_job).
+
+Handlers go through their items in order and append one result line per
+item to the job's output. A checkpoint then records the items done, the
+output length and the outcome counters, and stores the output written
+since the previous checkpoint as a JobOutputChunk in the same
+transaction. The checkpoint is a conditional UPDATE, which is also how
+the handler learns that the job was cancelled or its lease was lost. As a
+result:
+
+- GET /api/jobs/<id>/ reports progress while the job runs;
+- cancel_job() stops a running job at its next checkpoint;
+- a retried job resumes after its last checkpoint, on any worker host,
+  with exactly the output of that checkpoint. A retry follows an error,
+  or a worker that stopped renewing its lease.
+
+Issuance and renewal checkpoint after every license, so at most the
+license in flight can be issued twice. Revocation repeats harmlessly.
+Exports start over.
+"""
+
+import json
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from rest_framework import serializers
+
+from licenses.models import Job, JobOutputChunk, License
+from licenses.services.export import (
+    EXPORT_FORMATS,
+    LicenseExportError,
+    build_export_queryset,
+    parse_export_columns,
+    stream_license_export,
+)
+from licenses.services.issuance import LicenseIssuanceError, issue_license_from_validated_data
+from licenses.services.lifecycle import LicenseStatusError, revoke_license
+from licenses.services.sharding import license_shard, shard_querysets
+from licenses.validation import validate_issue_request
+
+
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+EXPORT_FILTERS = ("status", "product_id", "edition_id", "customer_id")
+
+
+class JobError(Exception):
+    """
+    Domain-level error for invalid job requests (e.g., unknown kind, bad params).
+    """
+    pass
+
+
+class JobStopped(Exception):
+    """
+    Raised at a checkpoint when the job was cancelled or its lease was lost.
+    """
+    pass
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    ceiling = min(
+        settings.JOB_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)),
+        settings.JOB_BACKOFF_MAX_SECONDS,
+    )
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+# --- Enqueueing and the API side ---
+
+def _item_list(params: Dict[str, Any], key: str) -> List[Any]:
+    # Items themselves are checked by the worker, one by one, so that
+    # enqueueing does not grow with the batch.
+    items = params.get(key)
+    if not isinstance(items, list) or not items:
+        raise JobError(f"params.{key} must be a non-empty list.")
+    if len(items) > settings.JOB_MAX_ITEMS:
+        raise JobError(
+            f"params.{key} has {len(items)} items; the limit is {settings.JOB_MAX_ITEMS}."
+        )
+    return items
+
+
+def _check_issue_params(params: Dict[str, Any]) -> int:
+    return len(_item_list(params, "requests"))
+
+
+def _check_renew_params(params: Dict[str, Any]) -> int:
+    days = params.get("days")
+    if days is not None and (isinstance(days, bool) or not isinstance(days, int) or days <= 0):
+        raise JobError("params.days must be a positive integer.")
+    return len(_item_list(params, "license_ids"))
+
+
+def _check_revoke_params(params: Dict[str, Any]) -> int:
+    if not isinstance(params.get("reason", ""), str):
+        raise JobError("params.reason must be a string.")
+    return len(_item_list(params, "license_ids"))
+
+
+def _check_export_params(params: Dict[str, Any]) -> None:
+    if params.get("output", "csv") not in EXPORT_FORMATS:
+        raise JobError(f"params.output must be one of: {', '.join(EXPORT_FORMATS)}.")
+    for key in ("columns", *EXPORT_FILTERS):
+        if not isinstance(params.get(key, ""), str):
+            raise JobError(f"params.{key} must be a string.")
+    try:
+        parse_export_columns(params.get("columns"))
+    except LicenseExportError as exc:
+        raise JobError(str(exc)) from exc
+    # The row count is taken by the worker.
+    return None
+
+
+def enqueue_job(kind: Any, params: Any, *, created_by: AbstractBaseUser) -> Job:
+    """
+    Store a job for run_workers. Raises JobError for unknown kinds or
+    malformed params.
+    """
+    if not isinstance(kind, str) or kind not in JOB_KINDS:
+        raise JobError(f"Unknown job kind '{kind}'. Use one of: {', '.join(JOB_KINDS)}.")
+    if not isinstance(params, dict):
+        raise JobError("params must be an object.")
+
+    check_params, _ = JOB_KINDS[kind]
+    return Job.objects.create(
+        kind=kind,
+        params=params,
+        progress_total=check_params(params),
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        run_after=datetime.now(timezone.utc),
+        created_by=created_by,
+    )
+
+
+def get_job(job_id: uuid.UUID) -> Job:
+    """
+    Current job state, read from the primary (a replica may lag behind
+    the workers). Raises Job.DoesNotExist.
+    """
+    return Job.objects.using("default").get(pk=job_id)
+
+
+def cancel_job(job_id: uuid.UUID) -> Job:
+    """
+    Cancel a queued job, or ask a running one to stop at its next
+    checkpoint. Raises JobError for finished jobs.
+    """
+    job = get_job(job_id)
+    if job.status in FINISHED_STATUSES:
+        raise JobError(f"Job '{job_id}' has already finished ({job.status}).")
+
+    now = datetime.now(timezone.utc)
+    jobs = Job.objects.using("default").filter(pk=job_id)
+    if not jobs.filter(status="queued").update(status="cancelled", cancel_requested=True, finished_at=now):
+        jobs.filter(status="running").update(cancel_requested=True)
+    return get_job(job_id)
+
+
+def job_output_chunks(job: Job):
+    """
+    Iterate over the output of job as stored by its checkpoints.
+    """
+    chunks = JobOutputChunk.objects.using("default").filter(job=job).order_by("seq")
+    for data in chunks.values_list("data", flat=True).iterator(chunk_size=8):
+        yield bytes(data)
+
+
+# --- Worker side (run_workers) ---
+
+def claim_jobs(worker: str, limit: int) -> List[uuid.UUID]:
+    """
+    Claim up to `limit` due jobs for worker.
+
+    SKIP LOCKED lets several run_workers processes claim side by side on
+    PostgreSQL. On backends without row locks (SQLite) the UPDATE is
+    conditional on the job still being queued and claimed jobs are read
+    back by their exact lease, so no job is handed out twice.
+    """
+    now = datetime.now(timezone.utc)
+    locked_until = now + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+    with transaction.atomic():
+        candidate_ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status="queued", run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not candidate_ids:
+            return []
+        Job.objects.filter(pk__in=candidate_ids, status="queued").update(
+            status="running",
+            locked_by=worker,
+            locked_until=locked_until,
+            attempts=F("attempts") + 1,
+            started_at=now,
+        )
+
+    return list(
+        Job.objects.filter(pk__in=candidate_ids, locked_by=worker, locked_until=locked_until)
+        .order_by("run_after", "id")
+        .values_list("id", flat=True)
+    )
+
+
+def renew_leases(worker: str, job_ids: List[uuid.UUID]) -> None:
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status="running", locked_by=worker).update(
+            locked_until=datetime.now(timezone.utc) + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        )
+
+
+def fail_job_attempt(job_id: uuid.UUID, worker: str, error: str) -> str:
+    """
+    End the current attempt of a job run by worker: requeue it with
+    backoff, or fail it after max_attempts (cancel it if that was asked
+    for). Returns the new status ("lost" if worker no longer holds it).
+    """
+    running = Job.objects.filter(pk=job_id, status="running", locked_by=worker)
+    job = running.values("attempts", "max_attempts", "cancel_requested").first()
+    if job is None:
+        return "lost"
+
+    now = datetime.now(timezone.utc)
+    if job["cancel_requested"]:
+        changes = {"status": "cancelled", "finished_at": now}
+    elif job["attempts"] >= job["max_attempts"]:
+        changes = {"status": "failed", "finished_at": now}
+    else:
+        changes = {"status": "queued", "run_after": now + _retry_delay(job["attempts"])}
+
+    if not running.update(locked_by=None, locked_until=None, last_error=error[:5000], **changes):
+        return "lost"
+    return changes["status"]
+
+
+def requeue_expired_jobs() -> int:
+    """
+    Retry (or fail) running jobs whose worker stopped renewing the lease.
+    """
+    expired = Job.objects.filter(status="running", locked_until__lt=datetime.now(timezone.utc))
+    count = 0
+    for job_id, worker in expired.values_list("id", "locked_by"):
+        if fail_job_attempt(job_id, worker, f"Lease of worker {worker} expired.") != "lost":
+            count += 1
+    return count
+
+
+def release_jobs(worker: str) -> int:
+    """
+    Put the jobs of a stopping worker back in the queue, without counting
+    the interrupted attempt.
+    """
+    return Job.objects.filter(status="running", locked_by=worker).update(
+        status="queued",
+        locked_by=None,
+        locked_until=None,
+        run_after=datetime.now(timezone.utc),
+        attempts=F("attempts") - 1,
+    )
+
+
+class JobRun:
+    """
+    A claimed job as its handler sees it: the resume point, the output
+    and checkpoints.
+
+    Output is buffered until the next checkpoint saves it. Chunks only
+    exist for saved checkpoints, so a resumed job appends to exactly the
+    output its progress covers.
+    """
+
+    def __init__(self, job: Job, worker: str):
+        self.job = job
+        self.worker = worker
+        self.done = job.progress_done
+        self.total = job.progress_total
+        self.counters: Dict[str, int] = dict(job.result or {})
+        self._buffer = bytearray()
+        self._output_bytes = job.output_bytes
+        self._next_seq = 0
+        self._saved_at = time.monotonic()
+
+    def open_output(self, suffix: str, *, restart: bool = False) -> None:
+        """
+        Continue the output after the last checkpoint (or empty it, with
+        restart, which also resets the progress). Raises JobStopped if the
+        job is no longer ours.
+        """
+        self.job.output_file = self.job.output_file or f"{self.job.pk}{suffix}"
+        chunks = JobOutputChunk.objects.filter(job=self.job)
+        if restart:
+            self.done = 0
+            self.counters = {}
+            self._output_bytes = 0
+            with transaction.atomic():
+                if not self._save(stop_on_cancel=False):
+                    raise JobStopped()
+                chunks.delete()
+        last_seq = chunks.order_by("-seq").values_list("seq", flat=True).first()
+        self._next_seq = 0 if last_seq is None else last_seq + 1
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+
+    def record(self, line: Dict[str, Any], outcome: str) -> None:
+        """
+        Append the result line of one item and count it under outcome.
+        """
+        self.write(json.dumps(line, separators=(",", ":"), default=str).encode("utf-8") + b"\n")
+        self.counters[outcome] = self.counters.get(outcome, 0) + 1
+        self.done += 1
+
+    def _save(self, *, stop_on_cancel: bool, **changes) -> bool:
+        jobs = Job.objects.filter(pk=self.job.pk, status="running", locked_by=self.worker)
+        if stop_on_cancel:
+            jobs = jobs.filter(cancel_requested=False)
+        output_bytes = self._output_bytes + len(self._buffer)
+        with transaction.atomic():
+            saved = jobs.update(
+                progress_done=self.done,
+                progress_total=self.total,
+                result=self.counters,
+                output_file=self.job.output_file,
+                output_bytes=output_bytes,
+                **changes,
+            )
+            if saved and self._buffer:
+                JobOutputChunk.objects.create(job=self.job, seq=self._next_seq, data=bytes(self._buffer))
+        if saved and self._buffer:
+            self._next_seq += 1
+            self._buffer.clear()
+            self._output_bytes = output_bytes
+        return bool(saved)
+
+    def checkpoint(self, *, force: bool = False) -> None:
+        """
+        Save progress (at most every JOB_CHECKPOINT_SECONDS unless forced
+        or JOB_OUTPUT_CHUNK_BYTES of output are waiting). Raises JobStopped
+        if the job was cancelled or is no longer ours.
+        """
+        due = force or len(self._buffer) >= settings.JOB_OUTPUT_CHUNK_BYTES
+        if not due and time.monotonic() - self._saved_at < settings.JOB_CHECKPOINT_SECONDS:
+            return
+        self._saved_at = time.monotonic()
+        if not self._save(stop_on_cancel=True):
+            raise JobStopped()
+
+    def finish(self) -> str:
+        now = datetime.now(timezone.utc)
+        done = {"locked_by": None, "locked_until": None, "finished_at": now}
+        if self._save(stop_on_cancel=True, status="succeeded", last_error=None, **done):
+            return "succeeded"
+        return self.stop()
+
+    def stop(self) -> str:
+        """
+        Record a cancelled job as such; returns "lost" if another worker owns it.
+        """
+        now = datetime.now(timezone.utc)
+        done = {"locked_by": None, "locked_until": None, "finished_at": now}
+        if self._save(stop_on_cancel=False, status="cancelled", **done):
+            return "cancelled"
+        return "lost"
+
+
+
+def _parse_license_id(value: Any) -> uuid.UUID:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError as exc:
+        raise License.DoesNotExist(f"License '{value}' does not exist.") from exc
+
+
+def _run_issue_licenses(run: JobRun) -> None:
+    requests = run.job.params["requests"]
+    run.open_output(".ndjson")
+    for index in range(run.done, len(requests)):
+        try:
+            validated_data = validate_issue_request(requests[index])
+            _, license_record = issue_license_from_validated_data(
+                validated_data,
+                issued_by=run.job.created_by,
+            )
+        except serializers.ValidationError as exc:
+            run.record({"index": index, "errors": exc.detail}, "failed")
+        except LicenseIssuanceError as exc:
+            run.record({"index": index, "detail": str(exc)}, "failed")
+        else:
+            run.record({"index": index, "license_id": license_record.license_id}, "succeeded")
+        run.checkpoint(force=True)
+
+
+def _renewal_data(license_record: License, days: int | None, now: datetime) -> Dict[str, Any]:
+    """
+    Issuance data for a license replacing license_record from now on, valid
+    for `days` (default: the original term) past the later of now and the
+    current valid_until.
+    """
+    term = timedelta(days=days) if days else license_record.valid_until - license_record.valid_from
+    payload = license_record.payload
+    return {
+        "customer_id": license_record.customer_id,
+        "product_id": license_record.product_id,
+        "edition_id": license_record.edition_id,
+        "license_type": license_record.license_type,
+        "valid_from": now,
+        "valid_until": max(license_record.valid_until, now) + term,
+        "features": payload.get("features") or {},
+        "usage_limits": payload.get("usage_limits") or {},
+        "deployment": payload.get("deployment") or {},
+        "note": f"Renewal of {license_record.license_id}.",
+        "supersedes": license_record.license_id,
+    }
+
+
+def _run_renew_licenses(run: JobRun) -> None:
+    license_ids = run.job.params["license_ids"]
+    days = run.job.params.get("days")
+    run.open_output(".ndjson")
+    for index in range(run.done, len(license_ids)):
+        try:
+            license_id = _parse_license_id(license_ids[index])
+            with license_shard(license_id):
+                license_record = License.objects.get(license_id=license_id)
+            _, renewed = issue_license_from_validated_data(
+                _renewal_data(license_record, days, datetime.now(timezone.utc)),
+                issued_by=run.job.created_by,
+            )
+        except License.DoesNotExist:
+            run.record({"index": index, "detail": f"License '{license_ids[index]}' does not exist."}, "failed")
+        except LicenseIssuanceError as exc:
+            run.record({"index": index, "detail": str(exc)}, "failed")
+        else:
+            run.record({"index": index, "license_id": renewed.license_id, "renews": license_id}, "succeeded")
+        run.checkpoint(force=True)
+
+
+def _run_revoke_licenses(run: JobRun) -> None:
+    license_ids = run.job.params["license_ids"]
+    reason = run.job.params.get("reason") or None
+    run.open_output(".ndjson")
+    for index in range(run.done, len(license_ids)):
+        try:
+            license_id = _parse_license_id(license_ids[index])
+            revoke_license(license_id, reason=reason)
+        except License.DoesNotExist:
+            run.record({"index": index, "detail": f"License '{license_ids[index]}' does not exist."}, "failed")
+        except LicenseStatusError as exc:
+            with license_shard(license_id):
+                revoked = License.objects.filter(license_id=license_id, status="revoked").exists()
+            if revoked:
+                # Revoked before (or by an interrupted attempt of this job).
+                run.record({"index": index, "license_id": license_id, "detail": "Already revoked."}, "skipped")
+            else:
+                run.record({"index": index, "detail": str(exc)}, "failed")
+        else:
+            run.record({"index": index, "license_id": license_id}, "succeeded")
+        run.checkpoint()
+
+
+def _run_export_licenses(run: JobRun) -> None:
+    params = run.job.params
+    output_format = params.get("output", "csv")
+    use_gzip = bool(params.get("gzip"))
+    queryset = build_export_queryset(**{key: params.get(key) or None for key in EXPORT_FILTERS})
+
+    # Exports are not resumable: every attempt writes the output from the start.
+    run.open_output(f".{output_format}" + (".gz" if use_gzip else ""), restart=True)
+    run.total = sum(qs.count() for qs in shard_querysets(queryset))
+
+    def on_rows(count: int) -> None:
+        run.done = count
+        run.counters = {"rows": count}
+        run.checkpoint()
+
+    for chunk in stream_license_export(
+        queryset,
+        columns=parse_export_columns(params.get("columns")),
+        output_format=output_format,
+        gzip=use_gzip,
+        on_rows=on_rows,
+    ):
+        run.write(chunk)
+    # Licenses may have changed between the count and the read.
+    run.total = run.done
+
+
+# kind -> (params check returning the item count if known upfront, handler)
+JOB_KINDS: Dict[str, Tuple[Callable[[Dict[str, Any]], int | None], Callable[[JobRun], None]]] = {
+    "issue_licenses": (_check_issue_params, _run_issue_licenses),
+    "renew_licenses": (_check_renew_params, _run_renew_licenses),
+    "revoke_licenses": (_check_revoke_params, _run_revoke_licenses),
+    "export_licenses": (_check_export_params, _run_export_licenses),
+}
+
+
+def run_job(job_id: uuid.UUID, worker: str) -> str:
+    """
+    Run a job claimed by worker until it finishes, fails or is stopped.
+    Called in a run_workers pool process; returns the job's new status
+    ("lost" if another worker took it over).
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.select_related("created_by").get(pk=job_id, status="running", locked_by=worker)
+    except Job.DoesNotExist:
+        return "lost"
+
+    run = JobRun(job, worker)
+    try:
+        _, handler = JOB_KINDS[job.kind]
+        handler(run)
+        return run.finish()
+    except JobStopped:
+        return run.stop()
+    except Exception as exc:  # noqa: BLE001 - any error ends the attempt and is retried
+        return fail_job_attempt(job.pk, worker, f"{type(exc).__name__}: {exc}")
+    finally:
+        close_old_connections()
@@ -36,3 +36,42 @@ def load_private_signing_key() -> ed25519.Ed25519PrivateKey:
         )
 
     return private_key
+
+
+def private_key_path(key_id: str) -> Path:
+    """
+    Path of the private key for key_id.
+
+    The configured SIGNING_KEY_ID lives at PRIVATE_KEY_PATH; other keys are
+    looked up as <SIGNING_KEY_DIR>/<key_id>-private.pem (the layout written
+    by scripts/generate_signing_key.py).
+    """
+    if key_id == settings.SIGNING_KEY_ID:
+        return Path(settings.PRIVATE_KEY_PATH)
+    return Path(settings.SIGNING_KEY_DIR) / f"{key_id}-private.pem"
+
+
+def read_private_key_pem(key_id: str) -> bytes:
+    """
+    Read and validate the PEM-encoded Ed25519 private key for key_id.
+
+    Returns the PEM bytes (picklable) so worker processes can load the key
+    themselves.
+    """
+    key_path = private_key_path(key_id)
+
+    if not key_path.exists():
+        raise FileNotFoundError(
+            f"Private key for key_id '{key_id}' not found at {key_path}. "
+            "Check SIGNING_KEY_DIR in .env / settings."
+        )
+
+    pem_data = key_path.read_bytes()
+    private_key = serialization.load_pem_private_key(pem_data, password=None)
+
+    if not isinstance(private_key, ed25519.Ed25519PrivateKey):
+        raise TypeError(
+            f"Private key for key_id '{key_id}' is not an Ed25519 key (got {type(private_key)!r})."
+        )
+
+    return pem_data
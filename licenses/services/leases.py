@@ -0,0 +1,484 @@
+# licenses/services/leases.py
+
+"""
+Floating (concurrent-user) seat leases.
+
+Lease state lives in memory: one expiry min-heap plus a lease dict per
+license. Heartbeats only touch memory; a background thread flushes changed
+leases to FloatingLease every LEASE_FLUSH_INTERVAL_SECONDS, so a burst of
+heartbeats costs at most one row write per lease per interval.
+
+The in-memory table is authoritative for the process that holds it, so
+lease traffic must be routed to a single server process. A license's pool
+is loaded from FloatingLease on first use after a restart (rows that
+expired meanwhile are deleted by the next flush) and dropped again once
+it has no leases left.
+"""
+
+import atexit
+import heapq
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from licenses.models import FloatingLease, License
+from licenses.services.sharding import license_shard, lock_customers_for_write
+from licensing_server.sharding import shard_of, use_shard
+
+
+logger = logging.getLogger(__name__)
+
+# usage_limits key holding the maximum number of concurrently leased seats.
+MAX_CONCURRENT_USERS_LIMIT_KEY = "max_concurrent_users"
+
+
+class LeaseError(Exception):
+    """
+    Domain-level error for lease problems (e.g., license not leasable).
+    """
+    pass
+
+
+class LeaseLimitReached(LeaseError):
+    """
+    Raised when every floating seat of a license is leased.
+    """
+    pass
+
+
+class LeaseNotFound(LeaseError):
+    """
+    Raised when a lease is unknown, released or already expired.
+    """
+    pass
+
+
+@dataclass(slots=True)
+class Lease:
+    lease_id: str
+    license_pk: str
+    customer_id: str
+    client_id: str
+    checked_out_at: float
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _LicensePool:
+    """
+    Leases of one license. The heap holds (expires_at, lease_id) entries;
+    heartbeats push a fresh entry and stale ones are skipped when popped.
+    expired holds restored leases that ended while no process held them.
+    """
+
+    license_pk: str
+    customer_id: str
+    limit: int | None
+    leases: Dict[str, Lease] = field(default_factory=dict)
+    by_client: Dict[str, str] = field(default_factory=dict)
+    heap: List[Tuple[float, str]] = field(default_factory=list)
+    expired: List[Lease] = field(default_factory=list)
+
+
+def _to_datetime(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+def get_concurrent_user_limit(license_record: License) -> int | None:
+    """
+    Return the floating seat limit from the signed payload, or None when unlimited.
+    """
+    usage_limits = (license_record.payload or {}).get("usage_limits") or {}
+    limit = usage_limits.get(MAX_CONCURRENT_USERS_LIMIT_KEY)
+
+    if limit is None:
+        return None
+
+    try:
+        return int(limit)
+    except (TypeError, ValueError) as exc:
+        raise LeaseError(
+            f"License '{license_record.license_id}' has a non-integer "
+            f"'{MAX_CONCURRENT_USERS_LIMIT_KEY}' usage limit."
+        ) from exc
+
+
+class LeaseManager:
+    """
+    Process-wide lease table with write-behind persistence.
+    """
+
+    def __init__(self, *, ttl_seconds: float, flush_interval: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _LicensePool] = {}
+        self._dirty: Dict[str, Lease] = {}
+        # Ended leases by lease_id, until their rows are deleted.
+        self._removed: Dict[str, Lease] = {}
+
+        self._flusher: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    # --- Pool bookkeeping (call with self._lock held) ---
+
+    def _reap(self, pool: _LicensePool, now: float) -> None:
+        heap = pool.heap
+        while heap and heap[0][0] <= now:
+            expires_at, lease_id = heapq.heappop(heap)
+            lease = pool.leases.get(lease_id)
+            if lease is not None and lease.expires_at == expires_at:
+                self._drop(pool, lease)
+
+    def _drop(self, pool: _LicensePool, lease: Lease) -> None:
+        del pool.leases[lease.lease_id]
+        pool.by_client.pop(lease.client_id, None)
+        self._dirty.pop(lease.lease_id, None)
+        self._removed[lease.lease_id] = lease
+
+    def _install(self, license_id: str, pool: _LicensePool) -> _LicensePool:
+        self._pools[license_id] = pool
+        for lease in pool.expired:
+            self._removed[lease.lease_id] = lease
+        pool.expired = []
+        return pool
+
+    def _extend(self, pool: _LicensePool, lease: Lease, now: float) -> None:
+        lease.expires_at = now + self.ttl_seconds
+        heapq.heappush(pool.heap, (lease.expires_at, lease.lease_id))
+        self._dirty[lease.lease_id] = lease
+
+    def _restore_pool(self, license_record: License, now: float) -> _LicensePool:
+        """
+        Build a pool from persisted leases. Leases that have expired go to
+        pool.expired, to be deleted once the pool is installed.
+        Queries the database: call without self._lock.
+        """
+        pool = _LicensePool(
+            license_pk=license_record.pk,
+            customer_id=license_record.customer_id,
+            limit=get_concurrent_user_limit(license_record),
+        )
+        with use_shard(shard_of(license_record)):
+            rows = list(FloatingLease.objects.filter(license_id=license_record.pk))
+        for row in rows:
+            lease = Lease(
+                lease_id=row.lease_id,
+                license_pk=license_record.pk,
+                customer_id=license_record.customer_id,
+                client_id=row.client_id,
+                checked_out_at=row.checked_out_at.timestamp(),
+                expires_at=row.expires_at.timestamp(),
+            )
+            if lease.expires_at <= now:
+                pool.expired.append(lease)
+                continue
+            pool.leases[lease.lease_id] = lease
+            pool.by_client[lease.client_id] = lease.lease_id
+            pool.heap.append((lease.expires_at, lease.lease_id))
+        heapq.heapify(pool.heap)
+        return pool
+
+    def _load_pool(self, license_id: str, now: float) -> _LicensePool | None:
+        """
+        Restore the pool for license_id from the DB after a restart, or
+        return None when it is already loaded. Only this cold path touches
+        the database; it runs without self._lock so that other licenses'
+        checkouts and heartbeats do not wait on the queries.
+        """
+        if license_id in self._pools:
+            return None
+        try:
+            with license_shard(license_id):
+                license_record = License.objects.get(license_id=license_id)
+        except License.DoesNotExist as exc:
+            raise LeaseNotFound(f"License '{license_id}' has no leases.") from exc
+        return self._restore_pool(license_record, now)
+
+    def _get_pool(self, license_id: str, restored: _LicensePool | None, now: float) -> _LicensePool:
+        """
+        Return the loaded pool for license_id (call with self._lock held).
+
+        restored comes from _load_pool(); a concurrent load may have won
+        the race, in which case it is discarded. A pool that is missing
+        although none was restored was evicted in between, with its leases.
+        """
+        pool = self._pools.get(license_id)
+        if pool is None:
+            if restored is None:
+                raise LeaseNotFound(f"License '{license_id}' has no leases.")
+            pool = self._install(license_id, restored)
+        self._reap(pool, now)
+        return pool
+
+    # --- Public API ---
+
+    def checkout(self, license_record: License, client_id: str) -> Tuple[Lease, int, int | None]:
+        """
+        Lease a seat for client_id, reusing the client's live lease if any.
+
+        Returns (lease, seats_used, seats_limit).
+        """
+        now = time.time()
+        if license_record.status != "active":
+            raise LeaseError(f"License '{license_record.license_id}' is {license_record.status}.")
+        if not (license_record.valid_from.timestamp() <= now < license_record.valid_until.timestamp()):
+            raise LeaseError(
+                f"License '{license_record.license_id}' is outside its validity window."
+            )
+
+        self._ensure_flusher()
+
+        restored = None
+        if license_record.license_id not in self._pools:
+            restored = self._restore_pool(license_record, now)
+
+        with self._lock:
+            pool = self._pools.get(license_record.license_id)
+            if pool is None:
+                pool = self._install(
+                    license_record.license_id,
+                    restored
+                    or _LicensePool(
+                        license_pk=license_record.pk,
+                        customer_id=license_record.customer_id,
+                        limit=None,
+                    ),
+                )
+            # Pick up limit changes from a re-issued payload.
+            pool.limit = get_concurrent_user_limit(license_record)
+
+            self._reap(pool, now)
+
+            lease_id = pool.by_client.get(client_id)
+            if lease_id is not None:
+                lease = pool.leases[lease_id]
+            else:
+                if pool.limit is not None and len(pool.leases) >= pool.limit:
+                    raise LeaseLimitReached(
+                        f"All {pool.limit} floating seats are leased for this license."
+                    )
+                lease = Lease(
+                    lease_id=uuid.uuid4().hex,
+                    license_pk=pool.license_pk,
+                    customer_id=pool.customer_id,
+                    client_id=client_id,
+                    checked_out_at=now,
+                    expires_at=now,
+                )
+                pool.leases[lease.lease_id] = lease
+                pool.by_client[client_id] = lease.lease_id
+
+            self._extend(pool, lease, now)
+            return lease, len(pool.leases), pool.limit
+
+    def heartbeat(self, license_id: str, lease_id: str) -> Lease:
+        """
+        Extend a live lease by the TTL. Memory only once the pool is loaded.
+        """
+        now = time.time()
+        self._ensure_flusher()
+        restored = self._load_pool(license_id, now)
+
+        with self._lock:
+            pool = self._get_pool(license_id, restored, now)
+            lease = pool.leases.get(lease_id)
+            if lease is None:
+                raise LeaseNotFound(f"Lease '{lease_id}' is not active.")
+
+            self._extend(pool, lease, now)
+            return lease
+
+    def release(self, license_id: str, lease_id: str) -> None:
+        """
+        Return a seat to the pool.
+        """
+        now = time.time()
+        self._ensure_flusher()
+        restored = self._load_pool(license_id, now)
+
+        with self._lock:
+            pool = self._get_pool(license_id, restored, now)
+            lease = pool.leases.get(lease_id)
+            if lease is None:
+                raise LeaseNotFound(f"Lease '{lease_id}' is not active.")
+            self._drop(pool, lease)
+
+    def evict_license(self, license_id: str) -> None:
+        """
+        Drop every lease of a license (e.g., after revocation).
+        """
+        with self._lock:
+            pool = self._pools.pop(license_id, None)
+            if pool is None:
+                return
+            for lease in list(pool.leases.values()):
+                self._drop(pool, lease)
+
+    # --- Write-behind persistence ---
+
+    def flush(self) -> Tuple[int, int]:
+        """
+        Persist leases changed since the last flush and delete ended ones,
+        then drop pools left without leases. Changes of customers being
+        moved to another shard stay queued for the next flush.
+
+        Returns (upserted, deleted).
+        """
+        with self._lock:
+            now = time.time()
+            for pool in self._pools.values():
+                self._reap(pool, now)
+            dirty = [
+                (
+                    lease.customer_id,
+                    FloatingLease(
+                        lease_id=lease.lease_id,
+                        license_id=lease.license_pk,
+                        client_id=lease.client_id,
+                        checked_out_at=_to_datetime(lease.checked_out_at),
+                        expires_at=_to_datetime(lease.expires_at),
+                    ),
+                )
+                for lease in self._dirty.values()
+            ]
+            removed = self._removed
+            self._dirty = {}
+            self._removed = {}
+
+        if not dirty and not removed:
+            self._prune()
+            return 0, 0
+
+        try:
+            # Shards are resolved under the customers' rebalance locks, held
+            # until the writes commit, so a move cannot copy around them.
+            with transaction.atomic(using="default"):
+                shards = lock_customers_for_write(
+                    [customer_id for customer_id, _ in dirty]
+                    + [lease.customer_id for lease in removed.values()]
+                )
+                by_shard: Dict[str, Tuple[List[FloatingLease], List[str]]] = defaultdict(lambda: ([], []))
+                deferred_dirty = []
+                deferred_removed = {}
+                for customer_id, row in dirty:
+                    if customer_id in shards:
+                        by_shard[shards[customer_id]][0].append(row)
+                    else:
+                        deferred_dirty.append((customer_id, row))
+                for lease_id, lease in removed.items():
+                    if lease.customer_id in shards:
+                        by_shard[shards[lease.customer_id]][1].append(lease_id)
+                    else:
+                        deferred_removed[lease_id] = lease
+
+                for shard, (rows, removed_ids) in by_shard.items():
+                    with use_shard(shard), transaction.atomic(using=shard):
+                        if removed_ids:
+                            FloatingLease.objects.filter(lease_id__in=removed_ids).delete()
+                        if rows:
+                            FloatingLease.objects.bulk_create(
+                                rows,
+                                batch_size=1000,
+                                update_conflicts=True,
+                                unique_fields=["lease_id"],
+                                update_fields=["expires_at"],
+                            )
+        except Exception:
+            # Requeue so the next flush retries.
+            self._requeue(dirty, removed)
+            raise
+
+        self._requeue(deferred_dirty, deferred_removed)
+        self._prune()
+        return len(dirty) - len(deferred_dirty), len(removed) - len(deferred_removed)
+
+    def _prune(self) -> None:
+        # Only once the pool's ended leases are deleted: a pool reloaded
+        # before that would restore them.
+        with self._lock:
+            pending = {lease.license_pk for lease in self._removed.values()}
+            for license_id, pool in list(self._pools.items()):
+                if not pool.leases and pool.license_pk not in pending:
+                    del self._pools[license_id]
+
+    def _requeue(self, dirty: List[Tuple[str, FloatingLease]], removed: Dict[str, Lease]) -> None:
+        # Newer in-memory state wins over what is requeued.
+        if not dirty and not removed:
+            return
+        with self._lock:
+            live = {
+                lease_id: lease
+                for pool in self._pools.values()
+                for lease_id, lease in pool.leases.items()
+            }
+            for _, row in dirty:
+                lease = live.get(row.lease_id)
+                if lease is not None:
+                    self._dirty.setdefault(lease.lease_id, lease)
+            for lease_id, lease in removed.items():
+                if lease_id not in self._dirty:
+                    self._removed.setdefault(lease_id, lease)
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                name="lease-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+            atexit.register(self.stop)
+
+    def _flush_loop(self) -> None:
+        while not self._stopping.wait(self.flush_interval):
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001 - retried on the next tick
+                logger.exception(
+                    "Lease flush failed; retrying in %ss. Unflushed leases are lost on restart.",
+                    self.flush_interval,
+                )
+
+    def stop(self) -> None:
+        """
+        Stop the flusher and write out any pending state.
+        """
+        self._stopping.set()
+        try:
+            self.flush()
+        except Exception:  # noqa: BLE001 - best effort at shutdown
+            logger.exception("Final lease flush failed; unflushed leases are lost.")
+
+
+_manager: LeaseManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_lease_manager() -> LeaseManager:
+    """
+    Return the process-wide LeaseManager, creating it on first use.
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = LeaseManager(
+                    ttl_seconds=settings.LEASE_TTL_SECONDS,
+                    flush_interval=settings.LEASE_FLUSH_INTERVAL_SECONDS,
+                )
+    return _manager
@@ -0,0 +1,181 @@
+# licenses/services/lifecycle.py
+
+"""
+License status transitions (revoke, supersede, expiry sweep).
+
+Every status change goes through here so that derived state kept in the
+same transaction (e.g., the summary table, the entitlement index) stays
+consistent with License.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Set
+
+from django.db import transaction
+
+from licenses.models import License
+from licenses.services.entitlements import record_entitlement_status
+from licenses.services.events import record_license_events
+from licenses.services.leases import get_lease_manager
+from licenses.services.sharding import each_shard, license_write, writable_on_shard
+from licenses.services.summary import record_status_changes
+from licenses.services.webhooks import enqueue_webhooks
+
+
+# Status -> statuses it may transition from.
+ALLOWED_TRANSITIONS: Dict[str, Iterable[str]] = {
+    "revoked": ("active", "superseded"),
+    "superseded": ("active",),
+    "expired": ("active",),
+}
+
+
+class LicenseStatusError(Exception):
+    """
+    Domain-level error for invalid or conflicting status transitions.
+    """
+    pass
+
+
+def _append_note(existing: str | None, note: str | None) -> str | None:
+    if not note:
+        return existing
+    return f"{existing}\n{note}" if existing else note
+
+
+def _evict_leases_on_commit(license_ids: List[str]) -> None:
+    """
+    Drop in-memory floating leases of licenses that can no longer be leased.
+    """
+    def evict() -> None:
+        manager = get_lease_manager()
+        for license_id in license_ids:
+            manager.evict_license(license_id)
+
+    transaction.on_commit(evict)
+
+
+def _transition(license_record: License, new_status: str, *, note: str | None = None) -> License:
+    """
+    Move one license to new_status with a conditional UPDATE.
+
+    Must run inside a transaction on the license's shard. Fails if another
+    writer changed the status since license_record was read.
+    """
+    allowed_from = ALLOWED_TRANSITIONS[new_status]
+    if license_record.status not in allowed_from:
+        raise LicenseStatusError(
+            f"Cannot change license '{license_record.license_id}' "
+            f"from {license_record.status} to {new_status}."
+        )
+
+    now = datetime.now(timezone.utc)
+    notes = _append_note(license_record.notes, note)
+    updated = License.objects.filter(
+        pk=license_record.pk,
+        status=license_record.status,
+    ).update(status=new_status, notes=notes, updated_at=now)
+
+    if not updated:
+        raise LicenseStatusError(
+            f"License '{license_record.license_id}' was modified concurrently; retry."
+        )
+
+    record_status_changes([license_record], new_status)
+    record_entitlement_status([license_record.pk], new_status)
+    _evict_leases_on_commit([license_record.license_id])
+
+    previous_status = license_record.status
+    license_record.status = new_status
+    license_record.notes = notes
+    license_record.updated_at = now
+
+    enqueue_webhooks(
+        record_license_events([license_record], new_status, previous_status=previous_status)
+    )
+    return license_record
+
+
+def revoke_license(license_id: str, *, reason: str | None = None) -> License:
+    """
+    Revoke a license. Raises License.DoesNotExist for unknown licenses.
+    """
+    with license_write(license_id):
+        license_record = License.objects.get(license_id=license_id)
+        note = f"Revoked: {reason}" if reason else None
+        return _transition(license_record, "revoked", note=note)
+
+
+def supersede_license(license_record: License, *, superseded_by: uuid.UUID) -> License:
+    """
+    Mark license_record as superseded by a newly issued license.
+
+    Must run inside the issuance transaction of the replacement.
+    """
+    return _transition(
+        license_record,
+        "superseded",
+        note=f"Superseded by {superseded_by}.",
+    )
+
+
+def sweep_expired_licenses(*, now: datetime | None = None, chunk_size: int = 1000) -> int:
+    """
+    Mark active licenses past valid_until as expired, one chunk per
+    transaction. Returns the number of licenses swept.
+    """
+    now = now or datetime.now(timezone.utc)
+    swept = 0
+
+    for shard in each_shard():
+        swept += _sweep_shard(shard, now, chunk_size)
+    return swept
+
+
+def _sweep_shard(shard: str, now: datetime, chunk_size: int) -> int:
+    swept = 0
+    # Customers moved off this shard since the sweep started; their rows
+    # here are leftovers the rebalance is about to delete.
+    moved: Set[str] = set()
+
+    while True:
+        with transaction.atomic(), transaction.atomic(using=shard):
+            chunk: List[License] = list(
+                License.objects.select_for_update(skip_locked=True)
+                .filter(status="active", valid_until__lte=now)
+                .exclude(customer_id__in=moved)
+                .only(
+                    "pk",
+                    "customer_id",
+                    "product_id",
+                    "edition_id",
+                    "license_type",
+                    "status",
+                    "valid_until",
+                )
+                .order_by("valid_until")[:chunk_size]
+            )
+            if not chunk:
+                return swept
+
+            customer_ids = {license_record.customer_id for license_record in chunk}
+            writable = writable_on_shard(shard, customer_ids)
+            moved |= customer_ids - writable
+            chunk = [license_record for license_record in chunk if license_record.customer_id in writable]
+            if not chunk:
+                continue
+
+            License.objects.filter(
+                pk__in=[license_record.pk for license_record in chunk],
+                status="active",
+            ).update(status="expired", updated_at=now)
+            record_status_changes(chunk, "expired")
+            record_entitlement_status([license_record.pk for license_record in chunk], "expired")
+            _evict_leases_on_commit([license_record.license_id for license_record in chunk])
+
+            for license_record in chunk:
+                license_record.status = "expired"
+            enqueue_webhooks(record_license_events(chunk, "expired", previous_status="active"))
+
+        swept += len(chunk)
@@ -0,0 +1,126 @@
+# licenses/services/rebalance.py
+
+"""
+Moving a customer's rows between shards.
+
+The move marks the customer as moving (new writes are refused with
+CustomerShardMoving), then takes the customer's rebalance lock
+exclusively, which waits for writes still in flight under the shared
+lock (see customer_write() in licenses/services/sharding.py). Rows are
+copied and the shard map switched while the lock is held, so writes
+queued behind it go to the new shard. Old rows are deleted last.
+"""
+
+from typing import Dict, Tuple
+
+from django.db import connections, models, transaction
+
+from licenses.models import (
+    Activation,
+    ArchivedLicense,
+    FloatingLease,
+    License,
+    LicenseEntitlement,
+    ShardAssignment,
+    UsageEvent,
+    UsageRollup,
+)
+from licenses.services.sharding import ShardingError, lock_customers, shard_for_customer
+from licensing_server.sharding import shard_aliases, sharding_enabled
+
+
+# Copy order (parents first); deletes run in reverse.
+SHARDED_DATA: Tuple[Tuple[type[models.Model], str], ...] = (
+    (License, "customer_id"),
+    (Activation, "license__customer_id"),
+    (FloatingLease, "license__customer_id"),
+    (UsageEvent, "license__customer_id"),
+    (UsageRollup, "license__customer_id"),
+    (LicenseEntitlement, "license__customer_id"),
+    (ArchivedLicense, "customer_id"),
+)
+
+
+def _delete_customer_rows(alias: str, customer_id: str, chunk_size: int) -> None:
+    for model, lookup in reversed(SHARDED_DATA):
+        qs = model.objects.using(alias).filter(**{lookup: customer_id})
+        while True:
+            pks = list(qs.values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                break
+            with transaction.atomic(using=alias):
+                model.objects.using(alias).filter(pk__in=pks).delete()
+
+
+def _copy_customer_rows(source: str, target: str, customer_id: str, chunk_size: int) -> Dict[str, int]:
+    copied: Dict[str, int] = {}
+    for model, lookup in SHARDED_DATA:
+        # Auto-increment keys are reassigned by the target; nothing refers to them.
+        renumber = isinstance(model._meta.pk, models.AutoField)
+        qs = model.objects.using(source).filter(**{lookup: customer_id}).order_by("pk")
+        after = None
+        count = 0
+        while True:
+            page = list((qs.filter(pk__gt=after) if after is not None else qs)[:chunk_size])
+            if not page:
+                break
+            after = page[-1].pk
+            if renumber:
+                for obj in page:
+                    obj.pk = None
+            with transaction.atomic(using=target):
+                model.objects.using(target).bulk_create(page, batch_size=chunk_size)
+            count += len(page)
+        copied[model._meta.label] = count
+    return copied
+
+
+def rebalance_customer(customer_id: str, target: str, *, chunk_size: int = 1000) -> Dict[str, int]:
+    """
+    Move a customer's licenses and dependent rows to another shard.
+
+    Writes for the customer are refused or wait while rows are copied;
+    reads keep using the source until the shard map is switched.
+    Leftovers of an earlier interrupted move are cleared from the target
+    first. Returns rows copied per model ({} if already on target).
+
+    Must not run inside a transaction on "default": the moving flag has
+    to be visible to writers before the lock is taken.
+    """
+    if not sharding_enabled():
+        raise ShardingError("Sharding is off (LICENSE_SHARDS is empty).")
+    if target not in shard_aliases():
+        raise ShardingError(f"Unknown shard '{target}'. Shards: {', '.join(shard_aliases())}.")
+    if connections["default"].in_atomic_block:
+        raise transaction.TransactionManagementError(
+            "rebalance_customer() cannot run inside a transaction on 'default'."
+        )
+
+    if shard_for_customer(customer_id) == target:
+        return {}
+
+    assignments = ShardAssignment.objects.using("default")
+    # Placed on its hash shard if it never was; shard is re-read under the lock.
+    assignments.get_or_create(
+        customer_id=customer_id,
+        defaults={"shard": shard_for_customer(customer_id)},
+    )
+    assignments.filter(customer_id=customer_id).update(moving_to=target)
+    try:
+        with transaction.atomic(using="default"):
+            # Waits for writers that resolved the old shard to commit.
+            lock_customers([customer_id], exclusive=True)
+            source = assignments.select_for_update().get(customer_id=customer_id).shard
+            if source == target:
+                assignments.filter(customer_id=customer_id).update(moving_to=None)
+                return {}
+
+            _delete_customer_rows(target, customer_id, chunk_size)
+            copied = _copy_customer_rows(source, target, customer_id, chunk_size)
+            assignments.filter(customer_id=customer_id).update(shard=target, moving_to=None)
+    except BaseException:
+        assignments.filter(customer_id=customer_id).update(moving_to=None)
+        raise
+
+    _delete_customer_rows(source, customer_id, chunk_size)
+    return copied
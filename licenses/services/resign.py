@@ -0,0 +1,225 @@
+# licenses/services/resign.py
+
+"""
+Re-sign active licenses after a signing key is retired.
+
+Affected licenses (active, meta_key_id of a retired KeyMetadata) are walked
+in primary-key order with a keyset cursor. Each page of stored payloads is
+signed by a process pool, and the new signature and key_id are written back
+in one transaction per page together with the JobCheckpoint, so an
+interrupted run resumes after the last committed page. The payload itself
+is unchanged; only the signature and meta.key_id move to the new key.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Sequence, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from keys.models import KeyMetadata
+from licenses.models import JobCheckpoint, License
+from licensing_server.sharding import shard_aliases, use_shard
+from licenses.services.keys import read_private_key_pem
+from licenses.services.sharding import each_shard, writable_on_shard
+from licenses.services.signing_pool import init_signing_worker, sign_payloads
+
+
+class ResignError(Exception):
+    """
+    Domain-level error for invalid re-signing runs (e.g., retired target key).
+    """
+    pass
+
+
+@dataclass
+class ResignReport:
+    new_key_id: str
+    old_key_ids: List[str]
+    resigned: int = 0
+    skipped: int = 0
+    batches: int = 0
+    resumed_from: str | None = None
+    resigned_this_run: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def licenses_per_second(self) -> float:
+        return self.resigned_this_run / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def retired_key_ids() -> List[str]:
+    return list(
+        KeyMetadata.objects.filter(retired_at__isnull=False)
+        .order_by("key_id")
+        .values_list("key_id", flat=True)
+    )
+
+
+def _fetch_page(old_key_ids: Sequence[str], after: str | None, batch_size: int):
+    qs = License.objects.filter(status="active", meta_key_id__in=old_key_ids)
+    if after is not None:
+        qs = qs.filter(pk__gt=after)
+    return [
+        (row["pk"], row["payload"], row["meta_version"])
+        for row in qs.order_by("pk").values("pk", "payload", "meta_version")[:batch_size]
+    ]
+
+
+def _write_page(
+    shard: str,
+    checkpoint_name: str,
+    cursor: Dict[str, Any],
+    old_key_ids: Sequence[str],
+    new_key_id: str,
+    signatures: List[Tuple[str, str]],
+) -> int:
+    """
+    Store one page of new signatures and advance the checkpoint atomically.
+
+    Rows that were revoked or re-keyed since the page was read, or whose
+    customer moved to another shard, are skipped.
+    cursor["resigned"] / cursor["skipped"] are incremented by this page.
+    """
+    now = datetime.now(timezone.utc)
+    # Raw executemany: bulk_update() builds a CASE per column and per row,
+    # which costs far more than the signing itself.
+    db = connections[shard]
+    table = db.ops.quote_name(License._meta.db_table)
+    pk_field = License._meta.pk
+    updated_at = License._meta.get_field("updated_at").get_db_prep_value(now, db)
+
+    # Licenses commit on their shard just before the checkpoint (one
+    # transaction when unsharded); a page replayed after a crash in between
+    # is skipped because its rows already carry the new key_id.
+    with use_shard(shard), transaction.atomic(), transaction.atomic(using=shard):
+        rows = list(
+            License.objects.select_for_update()
+            .filter(
+                pk__in=[pk for pk, _ in signatures],
+                status="active",
+                meta_key_id__in=old_key_ids,
+            )
+            .values_list("pk", "customer_id")
+        )
+        writable = writable_on_shard(shard, {customer_id for _, customer_id in rows})
+        current = {pk for pk, customer_id in rows if customer_id in writable}
+        params = [
+            (signature, new_key_id, updated_at, pk_field.get_db_prep_value(pk, db))
+            for pk, signature in signatures
+            if pk in current
+        ]
+        with db.cursor() as db_cursor:
+            db_cursor.executemany(
+                f"UPDATE {table} SET signature = %s, meta_key_id = %s, updated_at = %s "
+                f"WHERE {db.ops.quote_name(pk_field.column)} = %s",
+                params,
+            )
+        cursor["resigned"] += len(params)
+        cursor["skipped"] += len(signatures) - len(params)
+        JobCheckpoint.objects.update_or_create(name=checkpoint_name, defaults={"cursor": cursor})
+    return len(params)
+
+
+def resign_licenses(
+    *,
+    new_key_id: str | None = None,
+    old_key_ids: Sequence[str] | None = None,
+    batch_size: int = 1000,
+    workers: int | None = None,
+    restart: bool = False,
+    progress: Callable[[ResignReport], None] | None = None,
+) -> ResignReport:
+    """
+    Re-sign every active license signed with a retired key under new_key_id.
+
+    old_key_ids defaults to all KeyMetadata rows with retired_at set. Pages
+    are signed in the pool while earlier pages are written, so the database
+    and the workers stay busy at the same time.
+    """
+    new_key_id = new_key_id or settings.SIGNING_KEY_ID
+    old_key_ids = sorted(old_key_ids if old_key_ids is not None else retired_key_ids())
+    old_key_ids = [key_id for key_id in old_key_ids if key_id != new_key_id]
+
+    if KeyMetadata.objects.filter(key_id=new_key_id, retired_at__isnull=False).exists():
+        raise ResignError(f"Cannot re-sign with retired key '{new_key_id}'.")
+
+    report = ResignReport(new_key_id=new_key_id, old_key_ids=old_key_ids)
+    if not old_key_ids:
+        return report
+
+    private_key_pem = read_private_key_pem(new_key_id)
+    checkpoint_name = f"resign:{new_key_id}"
+
+    checkpoint = JobCheckpoint.objects.filter(name=checkpoint_name).first()
+    shards = shard_aliases()
+    resume_shard, resume_after = shards[0], None
+    if checkpoint and not restart:
+        if checkpoint.cursor.get("old_key_ids") != old_key_ids:
+            raise ResignError(
+                f"Checkpoint '{checkpoint_name}' was written for keys "
+                f"{checkpoint.cursor.get('old_key_ids')}; re-run with restart."
+            )
+        resume_shard = checkpoint.cursor.get("shard", shards[0])
+        resume_after = checkpoint.cursor.get("after")
+        report.resigned = checkpoint.cursor.get("resigned", 0)
+        report.skipped = checkpoint.cursor.get("skipped", 0)
+        report.resumed_from = resume_after
+
+    def pages():
+        # Shards are walked one after another in LICENSE_SHARDS order.
+        for shard in each_shard():
+            if shards.index(shard) < shards.index(resume_shard):
+                continue
+            after = resume_after if shard == resume_shard else None
+            while True:
+                page = _fetch_page(old_key_ids, after, batch_size)
+                if not page:
+                    break
+                after = page[-1][0]
+                yield shard, after, page
+
+    started = time.perf_counter()
+    pending: Deque[Tuple[str, str, Future]] = deque()
+
+    def drain_one() -> None:
+        shard, last_pk, future = pending.popleft()
+        cursor = {
+            "old_key_ids": old_key_ids,
+            "shard": shard,
+            "after": str(last_pk),
+            "resigned": report.resigned,
+            "skipped": report.skipped,
+        }
+        _write_page(shard, checkpoint_name, cursor, old_key_ids, new_key_id, future.result())
+        report.resigned_this_run += cursor["resigned"] - report.resigned
+        report.resigned = cursor["resigned"]
+        report.skipped = cursor["skipped"]
+        report.batches += 1
+        report.elapsed_seconds = time.perf_counter() - started
+        if progress:
+            progress(report)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_signing_worker,
+        initargs=(private_key_pem,),
+    ) as executor:
+        # Keep every worker busy while the coordinator writes finished pages.
+        max_in_flight = 2 * workers
+        for shard, last_pk, page in pages():
+            pending.append((shard, last_pk, executor.submit(sign_payloads, page)))
+            if len(pending) >= max_in_flight:
+                drain_one()
+        while pending:
+            drain_one()
+
+    report.elapsed_seconds = time.perf_counter() - started
+    JobCheckpoint.objects.filter(name=checkpoint_name).delete()
+    return report
@@ -0,0 +1,336 @@
+# licenses/services/sharding.py
+
+"""
+Shard map, customer write locks, license lookup and cross-shard reads.
+
+Routing rules live in licensing_server/sharding.py. A customer is placed
+on a shard the first time a license is issued for it (crc32 of the
+customer_id over LICENSE_SHARDS) and the placement is stored in
+ShardAssignment, so adding shards later does not move anyone; only
+rebalance_customer() (licenses/services/rebalance.py) does.
+
+Every write to a customer's sharded rows runs inside a "default"
+transaction holding the customer's rebalance lock in shared mode (a
+PostgreSQL advisory lock), and resolves the shard under it: see
+customer_write(), license_write() and, for batch jobs walking a shard,
+writable_on_shard(). A rebalance takes the same lock exclusively, so it
+waits for writes already in flight and later writes see the new shard.
+On other backends only the moving_to check applies.
+"""
+
+import contextlib
+import functools
+import heapq
+import uuid
+import zlib
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from django.db import IntegrityError, connections, models, transaction
+
+from licenses.models import ArchivedLicense, License, ShardAssignment
+from licensing_server.sharding import shard_aliases, sharding_enabled, use_shard
+
+
+# First key of the per-customer rebalance advisory locks (the second is
+# the customer_id's crc32).
+_CUSTOMER_LOCK_CLASS = 0x4C53_4843
+
+
+class ShardingError(Exception):
+    """
+    Domain-level error for invalid shard operations (e.g., unknown shard).
+    """
+    pass
+
+
+class CustomerShardMoving(ShardingError):
+    """
+    Raised for writes to a customer whose data is being moved between shards.
+    """
+    pass
+
+
+def _hash_shard(customer_id: str) -> str:
+    shards = shard_aliases()
+    return shards[zlib.crc32(customer_id.encode("utf-8")) % len(shards)]
+
+
+def shard_for_customer(customer_id: str, *, for_write: bool = False) -> str:
+    """
+    Database holding the customer's licenses ("default" when sharding is off).
+
+    for_write pins new customers to their hash shard and refuses customers
+    that are being rebalanced.
+    """
+    if not sharding_enabled():
+        return "default"
+
+    assignment = (
+        ShardAssignment.objects.using("default")
+        .filter(customer_id=customer_id)
+        .values("shard", "moving_to")
+        .first()
+    )
+    if assignment is None:
+        if not for_write:
+            # No licenses yet, so any shard answers "nothing" correctly.
+            return _hash_shard(customer_id)
+        try:
+            with transaction.atomic(using="default"):
+                assignment, _ = ShardAssignment.objects.using("default").get_or_create(
+                    customer_id=customer_id,
+                    defaults={"shard": _hash_shard(customer_id)},
+                )
+        except IntegrityError:
+            assignment = ShardAssignment.objects.using("default").get(customer_id=customer_id)
+        return assignment.shard
+
+    if for_write and assignment["moving_to"]:
+        raise CustomerShardMoving(
+            f"Customer '{customer_id}' is being moved to shard "
+            f"'{assignment['moving_to']}'; retry shortly."
+        )
+    return assignment["shard"]
+
+
+def _customer_lock_key(customer_id: str) -> int:
+    # pg_advisory locks take int4 keys: fold the crc32 into the signed range.
+    key = zlib.crc32(customer_id.encode("utf-8"))
+    return key - (1 << 32) if key >= (1 << 31) else key
+
+
+def lock_customers(customer_ids: Iterable[str], *, exclusive: bool = False) -> None:
+    """
+    Take the rebalance lock of each customer until the enclosing "default"
+    transaction ends: shared for writers, exclusive for rebalance. No-op
+    on backends without advisory locks.
+    """
+    connection = connections["default"]
+    if not connection.in_atomic_block:
+        raise transaction.TransactionManagementError(
+            "Customer locks must be taken inside transaction.atomic(using='default')."
+        )
+    if connection.vendor != "postgresql":
+        return
+
+    keys = sorted({_customer_lock_key(customer_id) for customer_id in customer_ids})
+    if not keys:
+        return
+    function = "pg_advisory_xact_lock" if exclusive else "pg_advisory_xact_lock_shared"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {function}(%s, key) FROM unnest(%s::integer[]) AS key",
+            [_CUSTOMER_LOCK_CLASS, keys],
+        )
+
+
+def lock_customers_for_write(customer_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    Take the customers' rebalance locks in shared mode and return
+    customer_id -> shard to write to, leaving out customers that are
+    being moved. New customers are placed on their hash shard.
+
+    Call inside transaction.atomic(using="default") enclosing the shard
+    writes; the locks are held until it ends.
+    """
+    customer_ids = sorted(set(customer_ids))
+    if not sharding_enabled():
+        return dict.fromkeys(customer_ids, "default")
+
+    lock_customers(customer_ids)
+    shards: Dict[str, str] = {}
+    placed = set()
+    for row in (
+        ShardAssignment.objects.using("default")
+        .filter(customer_id__in=customer_ids)
+        .values("customer_id", "shard", "moving_to")
+    ):
+        placed.add(row["customer_id"])
+        if not row["moving_to"]:
+            shards[row["customer_id"]] = row["shard"]
+    for customer_id in customer_ids:
+        if customer_id not in placed:
+            shards[customer_id] = shard_for_customer(customer_id, for_write=True)
+    return shards
+
+
+def writable_on_shard(alias: str, customer_ids: Iterable[str]) -> Set[str]:
+    """
+    Customers whose rows on alias a batch job may write in the current
+    transaction (see lock_customers_for_write()). Customers moved away or
+    being moved are left out; their rows are handled on their new shard.
+    """
+    shards = lock_customers_for_write(customer_ids)
+    return {customer_id for customer_id, shard in shards.items() if shard == alias}
+
+
+@contextlib.contextmanager
+def customer_write(customer_id: str):
+    """
+    Transaction for writing a customer's sharded rows: a "default"
+    transaction holding the customer's rebalance lock, with the customer's
+    shard selected and a transaction open on it. Yields the shard alias.
+
+    Raises CustomerShardMoving while the customer is being moved.
+    """
+    if not sharding_enabled():
+        with transaction.atomic(using="default"):
+            yield "default"
+        return
+
+    # Refuse early, without waiting on a lock held by a running move.
+    shard_for_customer(customer_id, for_write=True)
+    with transaction.atomic(using="default"):
+        alias = lock_customers_for_write([customer_id]).get(customer_id)
+        if alias is None:
+            raise CustomerShardMoving(
+                f"Customer '{customer_id}' is being moved to another shard; retry shortly."
+            )
+        with use_shard(alias), transaction.atomic(using=alias):
+            yield alias
+
+
+@contextlib.contextmanager
+def license_write(license_id: uuid.UUID):
+    """
+    customer_write() for the customer owning license_id (live or archived).
+    Raises License.DoesNotExist if no shard has it.
+    """
+    if not sharding_enabled():
+        with transaction.atomic(using="default"):
+            yield "default"
+        return
+
+    with customer_write(_license_customer_id(license_id)) as alias:
+        yield alias
+
+
+@functools.lru_cache(maxsize=100_000)
+def _license_customer_id(license_id: uuid.UUID) -> str:
+    # license_id -> customer_id never changes (not even when the license is
+    # archived or restored), so this cache survives rebalancing; the shard
+    # is looked up from the map on every call.
+    for model in (License, ArchivedLicense):
+        for alias in shard_aliases():
+            customer_id = (
+                model.objects.using(alias)
+                .filter(license_id=license_id)
+                .values_list("customer_id", flat=True)
+                .first()
+            )
+            if customer_id is not None:
+                return customer_id
+    raise License.DoesNotExist(f"License '{license_id}' does not exist.")
+
+
+def locate_license_shard(license_id: uuid.UUID, *, for_write: bool = False) -> str | None:
+    """
+    Shard holding license_id, or None if no shard has it.
+    """
+    try:
+        customer_id = _license_customer_id(license_id)
+    except License.DoesNotExist:
+        return None
+    return shard_for_customer(customer_id, for_write=for_write)
+
+
+@contextlib.contextmanager
+def license_shard(license_id: uuid.UUID, *, for_write: bool = False):
+    """
+    Select the shard holding license_id. Raises License.DoesNotExist if none does.
+    """
+    if not sharding_enabled():
+        yield None
+        return
+
+    alias = locate_license_shard(license_id, for_write=for_write)
+    if alias is None:
+        raise License.DoesNotExist(f"License '{license_id}' does not exist.")
+    with use_shard(alias):
+        yield alias
+
+
+@contextlib.contextmanager
+def customer_shard(customer_id: str, *, for_write: bool = False):
+    """
+    Select the shard of customer_id (placing the customer on first write).
+    """
+    if not sharding_enabled():
+        yield None
+        return
+
+    with use_shard(shard_for_customer(customer_id, for_write=for_write)) as alias:
+        yield alias
+
+
+def each_shard() -> Iterator[str]:
+    """
+    Yield every license database with its shard selected, for batch jobs.
+    """
+    for alias in shard_aliases():
+        with use_shard(alias if sharding_enabled() else None):
+            yield alias
+
+
+# --- Cross-shard reads ---
+
+def shard_querysets(queryset) -> List[models.QuerySet]:
+    """
+    The queryset bound to every shard (unchanged when sharding is off, so
+    the regular primary/replica routing still applies).
+    """
+    if not sharding_enabled():
+        return [queryset]
+    return [queryset.using(alias) for alias in shard_aliases()]
+
+
+def iter_merged_rows(
+    queryset,
+    fields: Sequence[str],
+    *,
+    chunk_size: int = 2000,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream values(*fields) rows of every shard merged into one pk order.
+
+    Each shard is read with its own cursor; memory stays at one chunk per shard.
+    """
+    streams = [
+        qs.order_by("pk").values("pk", *fields).iterator(chunk_size=chunk_size)
+        for qs in shard_querysets(queryset)
+    ]
+    if len(streams) == 1:
+        return streams[0]
+    return heapq.merge(*streams, key=itemgetter("pk"))
+
+
+def merged_keyset_page(
+    queryset,
+    fields: Sequence[str],
+    *,
+    after: str | None = None,
+    limit: int = 100,
+) -> Tuple[List[Dict[str, Any]], str | None]:
+    """
+    One page of rows ordered by pk across all shards.
+
+    Each shard returns at most `limit` rows after the cursor; the merged
+    first `limit` rows are the page. Returns (rows, next_after), where
+    next_after is None on the last page.
+    """
+    pages = []
+    for qs in shard_querysets(queryset):
+        if after is not None:
+            qs = qs.filter(pk__gt=after)
+        pages.append(list(qs.order_by("pk").values("pk", *fields)[:limit]))
+
+    rows = list(heapq.merge(*pages, key=itemgetter("pk")))[:limit]
+    next_after = rows[-1]["pk"] if len(rows) == limit else None
+    return rows, next_after
+
+
+# --- Rebalancing ---
+
+def shard_license_counts() -> Dict[str, int]:
+    return {alias: License.objects.using(alias).count() for alias in shard_aliases()}
@@ -1,39 +1,20 @@
 
-import base64
-import json
 from typing import Any, Dict, Tuple
 
 from django.conf import settings
 
+from .binary_format import encode_license_file
+# Canonicalization lives in canonical.py (Django-free); names are re-exported here.
+from .canonical import (  # noqa: F401
+    _b64url_decode_no_padding,
+    _b64url_encode_no_padding,
+    _canonical_json_bytes,
+    canonical_payload_bytes,
+    SUPPORTED_META_VERSIONS,
+)
 from .keys import load_private_signing_key
 
 
-def _canonical_json_bytes(payload: Dict[str, Any]) -> bytes:
-    """
-    Serialize a dict to canonical JSON bytes for signing.
-
-    - Sorted keys for deterministic field order
-    - No extraneous whitespace
-    - UTF-8 encoding
-    """
-    return json.dumps(
-        payload,
-        sort_keys=True,
-        separators=(",", ":"),  
-        ensure_ascii=False,
-    ).encode("utf-8")
-
-
-def _b64url_encode_no_padding(raw: bytes) -> str:
-    """
-    Base64 URL-safe encoding without padding ('=').
-    This is common for token-style signatures.
-    """
-    encoded = base64.urlsafe_b64encode(raw).decode("ascii")
-    return encoded.rstrip("=")
-
-
-
 def build_license_meta_and_signature(
     payload: Dict[str, Any],
     key_id: str | None = None,
@@ -41,6 +22,8 @@ def build_license_meta_and_signature(
     """
     Given a payload dict, construct the meta section and compute the signature.
 
+    The signed bytes depend on LICENSE_META_VERSION (1: JSON, 2: binary).
+
     Returns:
         meta: dict with version, alg, key_id
         signature: base64-url (no padding) encoded Ed25519 signature
@@ -51,7 +34,7 @@ def build_license_meta_and_signature(
         "key_id": key_id or settings.SIGNING_KEY_ID,
     }
 
-    payload_bytes = _canonical_json_bytes(payload)
+    payload_bytes = canonical_payload_bytes(payload, meta["version"])
 
     private_key = load_private_signing_key()
     raw_sig = private_key.sign(payload_bytes)
@@ -77,3 +60,21 @@ def sign_license_payload(
         "payload": payload,
         "signature": signature_b64,
     }
+
+
+def encode_binary_license(
+    meta: Dict[str, Any],
+    payload: Dict[str, Any],
+    signature_b64: str,
+) -> bytes:
+    """
+    Render a stored version 2 license as a compact binary .license file.
+    """
+    if meta["version"] != 2:
+        raise ValueError("Only meta.version 2 licenses have a binary encoding.")
+
+    return encode_license_file(
+        meta,
+        canonical_payload_bytes(payload, 2),
+        _b64url_decode_no_padding(signature_b64),
+    )
@@ -0,0 +1,35 @@
+# licenses/services/signing_pool.py
+
+"""
+Process-pool workers for bulk signing.
+
+Kept free of Django imports so worker processes stay cheap to start under
+any multiprocessing start method: the coordinator passes the PEM bytes of
+the key to the pool initializer and plain (pk, payload, version) tuples to
+the workers.
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from cryptography.hazmat.primitives import serialization
+
+from .canonical import _b64url_encode_no_padding, canonical_payload_bytes
+
+
+_worker_key = None
+
+
+def init_signing_worker(private_key_pem: bytes) -> None:
+    global _worker_key
+    _worker_key = serialization.load_pem_private_key(private_key_pem, password=None)
+
+
+def sign_payloads(rows: Sequence[Tuple[Any, Dict[str, Any], int]]) -> List[Tuple[Any, str]]:
+    """
+    Sign (pk, payload, meta_version) rows; returns (pk, signature_b64) pairs.
+    """
+    sign = _worker_key.sign
+    return [
+        (pk, _b64url_encode_no_padding(sign(canonical_payload_bytes(payload, version))))
+        for pk, payload, version in rows
+    ]
@@ -0,0 +1,178 @@
+# licenses/services/summary.py
+
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, CharField, Count, F, Sum, Value, When
+from django.db.models.functions import TruncDate
+
+from licenses.models import License, LicenseSummary
+from licenses.services.sharding import shard_querysets
+
+
+# (product_id, edition_id, license_type, status, expiry_date)
+SummaryKey = Tuple[str, str, str, str, date]
+
+SUMMARY_DIMENSIONS = ("product", "edition", "license_type", "status", "expiry_bucket")
+
+# Upper bounds (in days from today) of the expiry buckets, after "expired".
+EXPIRY_BUCKETS = ((7, "next_7_days"), (30, "next_30_days"), (90, "next_90_days"))
+
+
+def summary_key(license_record: License, status: str | None = None) -> SummaryKey:
+    """
+    Summary group a license belongs to, optionally under a different status.
+    """
+    return (
+        license_record.product_id,
+        license_record.edition_id,
+        license_record.license_type,
+        status or license_record.status,
+        license_record.valid_until.astimezone(timezone.utc).date(),
+    )
+
+
+def apply_summary_deltas(deltas: Dict[SummaryKey, int]) -> None:
+    """
+    Add count deltas to their summary groups, creating missing ones.
+
+    Must run inside the transaction that changes the licenses. Keys are
+    applied in sorted order so concurrent writers lock rows consistently.
+    """
+    for key in sorted(k for k, delta in deltas.items() if delta):
+        product_id, edition_id, license_type, status, expiry_date = key
+        delta = deltas[key]
+        group = LicenseSummary.objects.filter(
+            product_id=product_id,
+            edition_id=edition_id,
+            license_type=license_type,
+            status=status,
+            expiry_date=expiry_date,
+        )
+
+        if group.update(count=F("count") + delta):
+            continue
+
+        try:
+            with transaction.atomic():
+                LicenseSummary.objects.create(
+                    product_id=product_id,
+                    edition_id=edition_id,
+                    license_type=license_type,
+                    status=status,
+                    expiry_date=expiry_date,
+                    count=delta,
+                )
+        except IntegrityError:
+            # A concurrent transaction created the group first.
+            group.update(count=F("count") + delta)
+
+
+def record_license_created(license_record: License) -> None:
+    apply_summary_deltas({summary_key(license_record): 1})
+
+
+def record_status_changes(licenses: Iterable[License], new_status: str) -> None:
+    """
+    Move licenses from their current (pre-change) status group to new_status.
+    """
+    deltas: Counter = Counter()
+    for license_record in licenses:
+        deltas[summary_key(license_record)] -= 1
+        deltas[summary_key(license_record, new_status)] += 1
+    apply_summary_deltas(deltas)
+
+
+def _expiry_bucket_expression(today: date) -> Case:
+    whens = [When(expiry_date__lt=today, then=Value("expired"))]
+    whens += [
+        When(expiry_date__lt=today + timedelta(days=days), then=Value(label))
+        for days, label in EXPIRY_BUCKETS
+    ]
+    return Case(*whens, default=Value("later"), output_field=CharField())
+
+
+def get_license_summary(
+    group_by: Sequence[str] = SUMMARY_DIMENSIONS,
+    *,
+    today: date | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate the summary table over the requested dimensions.
+
+    Cost is proportional to the number of summary groups, not licenses.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    fields = {
+        "product": F("product_id"),
+        "edition": F("edition_id"),
+        "license_type": F("license_type"),
+        "status": F("status"),
+        "expiry_bucket": _expiry_bucket_expression(today),
+    }
+    selected = {name: fields[name] for name in group_by}
+
+    rows = (
+        LicenseSummary.objects.filter(count__gt=0)
+        .annotate(**{f"g_{name}": expr for name, expr in selected.items()})
+        .values(*(f"g_{name}" for name in selected))
+        .annotate(total=Sum("count"))
+        .order_by(*(f"g_{name}" for name in selected))
+    )
+
+    return [
+        {**{name: row[f"g_{name}"] for name in selected}, "count": row["total"]}
+        for row in rows
+    ]
+
+
+@transaction.atomic
+def rebuild_license_summary() -> int:
+    """
+    Recompute the summary table from License. Returns the number of groups.
+
+    On PostgreSQL the summary table is locked for the duration, so in-flight
+    issuance/transition transactions finish first and new ones wait. With
+    sharding, the groups of every shard are added together.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"LOCK TABLE {LicenseSummary._meta.db_table} IN EXCLUSIVE MODE"
+            )
+
+    LicenseSummary.objects.all().delete()
+
+    totals: Counter = Counter()
+    grouped = (
+        License.objects.annotate(expiry_date=TruncDate("valid_until", tzinfo=timezone.utc))
+        .values("product_id", "edition_id", "license_type", "status", "expiry_date")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    for queryset in shard_querysets(grouped):
+        for group in queryset:
+            key = (
+                group["product_id"],
+                group["edition_id"],
+                group["license_type"],
+                group["status"],
+                group["expiry_date"],
+            )
+            totals[key] += group["total"]
+
+    rows = [
+        LicenseSummary(
+            product_id=product_id,
+            edition_id=edition_id,
+            license_type=license_type,
+            status=status,
+            expiry_date=expiry_date,
+            count=count,
+        )
+        for (product_id, edition_id, license_type, status, expiry_date), count in totals.items()
+    ]
+    LicenseSummary.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,304 @@
+# licenses/services/usage.py
+
+import re
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.dateparse import parse_datetime
+
+from licenses.models import License, UsageEvent, UsageRollup
+from licenses.services.sharding import each_shard, lock_customers_for_write
+from licensing_server.sharding import current_shard, shard_of, use_shard
+
+
+# usage_limits keys such as "max_runs_per_day" map to (metric="runs", granularity="day").
+USAGE_LIMIT_KEY_RE = re.compile(r"^max_(?P<metric>.+)_per_(?P<granularity>hour|day)$")
+
+RollupKey = Tuple[uuid.UUID, str, str, datetime]
+
+# Largest value of the BigIntegerField quantity column.
+MAX_QUANTITY = 2**63 - 1
+
+
+class UsageIngestionError(Exception):
+    """
+    Domain-level error for a usage batch that cannot be accepted as a whole.
+    """
+    pass
+
+
+def _bucket_start(ts: datetime, granularity: str) -> datetime:
+    ts = ts.astimezone(timezone.utc)
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _clean_event(raw: Any, now: datetime) -> Dict[str, Any]:
+    """
+    Validate one decoded NDJSON object. Raises ValueError with a client-facing message.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Event must be a JSON object.")
+
+    license_id = raw.get("license_id")
+    metric = raw.get("metric")
+    if not isinstance(license_id, str) or not license_id:
+        raise ValueError("'license_id' must be a non-empty string.")
+    try:
+        license_id = uuid.UUID(license_id)
+    except ValueError as exc:
+        raise ValueError("'license_id' must be a UUID.") from exc
+    if not isinstance(metric, str) or not metric or len(metric) > 128:
+        raise ValueError("'metric' must be a non-empty string of at most 128 characters.")
+
+    quantity = raw.get("quantity", 1)
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 0:
+        raise ValueError("'quantity' must be a non-negative integer.")
+    if quantity > MAX_QUANTITY:
+        raise ValueError(f"'quantity' must be at most {MAX_QUANTITY}.")
+
+    occurred_at = now
+    if raw.get("occurred_at") is not None:
+        occurred_at = parse_datetime(str(raw["occurred_at"]))
+        if occurred_at is None or occurred_at.tzinfo is None:
+            raise ValueError("'occurred_at' must be an ISO 8601 datetime with a timezone.")
+
+    return {
+        "license_id": license_id,
+        "metric": metric,
+        "quantity": quantity,
+        "occurred_at": occurred_at,
+    }
+
+
+_ROLLUP_KEY_FIELDS = ("license", "metric", "granularity", "bucket_start")
+_ROLLUP_UPSERT_BATCH = 500
+
+
+def _apply_rollup_increments(increments: Dict[RollupKey, List[int]]) -> None:
+    """
+    Add (total, event_count) deltas to their buckets, creating missing ones,
+    with one INSERT ... ON CONFLICT DO UPDATE per batch of buckets.
+
+    bulk_create(update_conflicts=True) can only overwrite columns with the
+    inserted values, not add to them, hence the hand-written statement.
+    Keys are applied in sorted order so concurrent batches lock rows in the
+    same sequence and cannot deadlock each other.
+    """
+    connection = connections[current_shard()]
+    qn = connection.ops.quote_name
+    meta = UsageRollup._meta
+    fields = [
+        meta.get_field(name)
+        for name in (*_ROLLUP_KEY_FIELDS, "total", "event_count", "updated_at")
+    ]
+    table = qn(meta.db_table)
+    sql_prefix = (
+        f"INSERT INTO {table} ({', '.join(qn(f.column) for f in fields)}) VALUES "
+    )
+    sql_suffix = (
+        f" ON CONFLICT ({', '.join(qn(meta.get_field(name).column) for name in _ROLLUP_KEY_FIELDS)})"
+        f" DO UPDATE SET {qn('total')} = {table}.{qn('total')} + EXCLUDED.{qn('total')},"
+        f" {qn('event_count')} = {table}.{qn('event_count')} + EXCLUDED.{qn('event_count')},"
+        f" {qn('updated_at')} = EXCLUDED.{qn('updated_at')}"
+    )
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+
+    now = datetime.now(timezone.utc)
+    keys = sorted(increments)
+    with connection.cursor() as cursor:
+        for offset in range(0, len(keys), _ROLLUP_UPSERT_BATCH):
+            batch = keys[offset:offset + _ROLLUP_UPSERT_BATCH]
+            params = []
+            for key in batch:
+                total, count = increments[key]
+                values = (*key, total, count, now)
+                params.extend(
+                    field.get_db_prep_value(value, connection)
+                    for field, value in zip(fields, values)
+                )
+            cursor.execute(
+                sql_prefix + ", ".join([placeholders] * len(batch)) + sql_suffix,
+                params,
+            )
+
+
+def ingest_usage_events(raw_events: Iterable[Any]) -> Dict[str, Any]:
+    """
+    Append a batch of usage events and fold them into hourly/daily rollups.
+
+    Invalid lines are reported and skipped; valid ones are stored in one
+    transaction per shard. Returns {"accepted": n, "rejected": [{"index": i, "error": "..."}]},
+    where index is the 0-based position of the event in the batch.
+    """
+    raw_events = list(raw_events)
+    if len(raw_events) > settings.USAGE_MAX_EVENTS_PER_REQUEST:
+        raise UsageIngestionError(
+            f"At most {settings.USAGE_MAX_EVENTS_PER_REQUEST} events are accepted per request."
+        )
+
+    now = datetime.now(timezone.utc)
+    cleaned: List[Tuple[int, Dict[str, Any]]] = []
+    rejected: List[Dict[str, Any]] = []
+
+    for index, raw in enumerate(raw_events):
+        try:
+            cleaned.append((index, _clean_event(raw, now)))
+        except ValueError as exc:
+            rejected.append({"index": index, "error": str(exc)})
+
+    # license_id -> customer_id
+    license_customers: Dict[uuid.UUID, str] = {}
+    requested_ids = {event["license_id"] for _, event in cleaned}
+    for _ in each_shard():
+        license_customers.update(
+            License.objects.filter(license_id__in=requested_ids).values_list("license_id", "customer_id")
+        )
+
+    rows: Dict[str, List[UsageEvent]] = defaultdict(list)
+    increments: Dict[str, Dict[RollupKey, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+
+    # The shard is resolved under the customers' rebalance locks, held
+    # until the events commit, so a move cannot copy around them.
+    with transaction.atomic(using="default"):
+        customer_shards = lock_customers_for_write(license_customers.values())
+
+        for index, event in cleaned:
+            license_pk = event["license_id"]
+            if license_pk not in license_customers:
+                rejected.append(
+                    {"index": index, "error": f"License '{event['license_id']}' does not exist."}
+                )
+                continue
+            shard = customer_shards.get(license_customers[license_pk])
+            if shard is None:
+                rejected.append(
+                    {
+                        "index": index,
+                        "error": f"License '{event['license_id']}' is being moved; retry shortly.",
+                    }
+                )
+                continue
+
+            keys = [
+                (license_pk, event["metric"], granularity, _bucket_start(event["occurred_at"], granularity))
+                for granularity in ("hour", "day")
+            ]
+            # The day bucket holds at least the hour bucket's total.
+            if increments[shard][keys[-1]][0] + event["quantity"] > MAX_QUANTITY:
+                rejected.append(
+                    {"index": index, "error": "'quantity' would overflow the usage total for its bucket."}
+                )
+                continue
+
+            rows[shard].append(
+                UsageEvent(
+                    license_id=license_pk,
+                    metric=event["metric"],
+                    quantity=event["quantity"],
+                    occurred_at=event["occurred_at"],
+                    received_at=now,
+                )
+            )
+            for key in keys:
+                increments[shard][key][0] += event["quantity"]
+                increments[shard][key][1] += 1
+
+        # One transaction per shard ("default" only, unless sharded).
+        for shard, shard_rows in rows.items():
+            with use_shard(shard), transaction.atomic(using=shard):
+                UsageEvent.objects.bulk_create(shard_rows, batch_size=1000)
+                _apply_rollup_increments(increments[shard])
+
+    rejected.sort(key=lambda item: item["index"])
+    return {"accepted": sum(len(shard_rows) for shard_rows in rows.values()), "rejected": rejected}
+
+
+def get_usage_against_limits(license_record: License, *, now: datetime | None = None) -> List[Dict[str, Any]]:
+    """
+    Compare current-bucket usage with every max_<metric>_per_<hour|day> limit
+    of the license. Reads one rollup row per limit.
+    """
+    now = now or datetime.now(timezone.utc)
+    usage_limits = (license_record.payload or {}).get("usage_limits") or {}
+
+    report = []
+    for limit_key, limit in sorted(usage_limits.items()):
+        match = USAGE_LIMIT_KEY_RE.match(limit_key)
+        if match is None:
+            continue
+
+        metric = match["metric"]
+        granularity = match["granularity"]
+        bucket_start = _bucket_start(now, granularity)
+
+        with use_shard(shard_of(license_record)):
+            used = (
+                UsageRollup.objects.filter(
+                    license=license_record,
+                    metric=metric,
+                    granularity=granularity,
+                    bucket_start=bucket_start,
+                )
+                .values_list("total", flat=True)
+                .first()
+            ) or 0
+
+        report.append(
+            {
+                "limit_key": limit_key,
+                "metric": metric,
+                "granularity": granularity,
+                "bucket_start": bucket_start.isoformat().replace("+00:00", "Z"),
+                "used": used,
+                "limit": limit,
+                "exceeded": isinstance(limit, int) and used > limit,
+            }
+        )
+
+    return report
+
+
+def _delete_in_chunks(queryset, chunk_size: int) -> int:
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+        with transaction.atomic(using=current_shard()):
+            deleted += queryset.model.objects.filter(pk__in=pks).delete()[0]
+
+
+def compact_usage(
+    *,
+    raw_retention_days: int,
+    hourly_retention_days: int,
+    chunk_size: int = 5000,
+    now: datetime | None = None,
+) -> Dict[str, int]:
+    """
+    Retention job: drop raw events already folded into rollups and hourly
+    buckets past their window. Daily rollups are kept for reporting.
+    """
+    now = now or datetime.now(timezone.utc)
+    totals = {"raw_events_deleted": 0, "hourly_rollups_deleted": 0}
+
+    for _ in each_shard():
+        totals["raw_events_deleted"] += _delete_in_chunks(
+            UsageEvent.objects.filter(received_at__lt=now - timedelta(days=raw_retention_days)),
+            chunk_size,
+        )
+        totals["hourly_rollups_deleted"] += _delete_in_chunks(
+            UsageRollup.objects.filter(
+                granularity="hour",
+                bucket_start__lt=_bucket_start(now - timedelta(days=hourly_retention_days), "hour"),
+            ),
+            chunk_size,
+        )
+
+    return totals
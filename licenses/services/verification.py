@@ -0,0 +1,313 @@
+# licenses/services/verification.py
+
+"""
+Offline .license verification.
+
+Rebuilds the signed bytes exactly as the server does (canonical.py /
+binary_format.py), checks the Ed25519 signature against the public key
+named by meta.key_id and, optionally, the validity window. Public keys are
+read from a key directory laid out by scripts/generate_signing_key.py
+(<key_id>-public.pem) and cached per process.
+
+No Django imports: this module is meant for client tooling and fleet audits.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from cryptography.exceptions import InvalidSignature, UnsupportedAlgorithm
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+from .binary_format import MAGIC, BinaryFormatError, decode_canonical, split_license_file
+from .canonical import _b64url_decode_no_padding, canonical_payload_bytes
+
+
+class LicenseVerificationError(Exception):
+    """
+    Raised when a license cannot be parsed or its key cannot be loaded.
+    """
+    pass
+
+
+@dataclass
+class VerificationResult:
+    path: str | None
+    ok: bool
+    reason: str | None = None
+    license_id: str | None = None
+    key_id: str | None = None
+    meta_version: int | None = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PublicKeyCache:
+    """
+    Loads <key_dir>/<key_id>-public.pem on first use and keeps it in memory.
+    """
+
+    def __init__(self, key_dir: str | Path) -> None:
+        self.key_dir = Path(key_dir)
+        self._keys: Dict[str, ed25519.Ed25519PublicKey] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key_id: Any) -> ed25519.Ed25519PublicKey:
+        """
+        Return the public key for key_id. Raises LicenseVerificationError
+        for an invalid key_id and for a missing or unreadable key file.
+        """
+        if not isinstance(key_id, str) or not key_id or "/" in key_id or "\\" in key_id or key_id.startswith("."):
+            raise LicenseVerificationError(f"Invalid key_id {key_id!r}.")
+
+        key = self._keys.get(key_id)
+        if key is not None:
+            return key
+
+        key_path = self.key_dir / f"{key_id}-public.pem"
+        try:
+            pem_data = key_path.read_bytes()
+        except FileNotFoundError as exc:
+            raise LicenseVerificationError(f"No public key for key_id '{key_id}' at {key_path}.") from exc
+        except OSError as exc:
+            raise LicenseVerificationError(f"Cannot read public key for '{key_id}': {exc}") from exc
+
+        try:
+            public_key = serialization.load_pem_public_key(pem_data)
+        except (ValueError, TypeError, UnsupportedAlgorithm) as exc:
+            raise LicenseVerificationError(f"Cannot load public key for '{key_id}': {exc}") from exc
+        if not isinstance(public_key, ed25519.Ed25519PublicKey):
+            raise LicenseVerificationError(
+                f"Public key for '{key_id}' is not an Ed25519 key (got {type(public_key)!r})."
+            )
+
+        with self._lock:
+            self._keys[key_id] = public_key
+        return public_key
+
+
+def parse_license(data: bytes) -> Tuple[Dict[str, Any], Dict[str, Any], bytes, bytes]:
+    """
+    Parse a v1 (JSON) or v2 (binary) .license file.
+
+    Returns (meta, payload, signed_bytes, raw_signature).
+    """
+    if data.startswith(MAGIC):
+        try:
+            meta, signed_bytes, signature = split_license_file(data)
+            return meta, decode_canonical(signed_bytes), signed_bytes, signature
+        except BinaryFormatError as exc:
+            raise LicenseVerificationError(f"Malformed binary license: {exc}") from exc
+
+    try:
+        doc = json.loads(data.decode("utf-8"))
+        meta = doc["meta"]
+        payload = doc["payload"]
+        signature = _b64url_decode_no_padding(doc["signature"])
+        signed_bytes = canonical_payload_bytes(payload, int(meta["version"]))
+    except (ValueError, KeyError, TypeError) as exc:
+        raise LicenseVerificationError(f"Malformed license file: {exc}") from exc
+
+    return meta, payload, signed_bytes, signature
+
+
+def check_signature(
+    meta: Dict[str, Any],
+    signed_bytes: bytes,
+    signature: bytes,
+    keys: PublicKeyCache,
+) -> str | None:
+    """
+    Verify signature over signed_bytes with the key named in meta.
+
+    Returns None if valid, otherwise the reason it is not.
+    """
+    if meta.get("alg") != "Ed25519":
+        return f"Unsupported signature algorithm {meta.get('alg')!r}."
+
+    try:
+        keys.get(meta.get("key_id")).verify(signature, signed_bytes)
+    except LicenseVerificationError as exc:
+        return str(exc)
+    except InvalidSignature:
+        return "Signature does not match payload."
+    return None
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if not isinstance(value, str):
+        raise ValueError(f"timestamp must be a string, got {value!r}")
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        raise ValueError(f"timestamp {value!r} has no timezone")
+    return parsed
+
+
+def verify_license_bytes(
+    data: bytes,
+    keys: PublicKeyCache,
+    *,
+    path: str | None = None,
+    check_validity: bool = True,
+    now: datetime | None = None,
+) -> VerificationResult:
+    """
+    Verify one license file's signature and, optionally, its validity window.
+
+    Never raises for bad input: a malformed file is a failed result, so one
+    such file cannot stop a batch.
+    """
+    try:
+        meta, payload, signed_bytes, signature = parse_license(data)
+    except LicenseVerificationError as exc:
+        return VerificationResult(path=path, ok=False, reason=str(exc))
+
+    result = VerificationResult(
+        path=path,
+        ok=False,
+        license_id=payload.get("license_id") if isinstance(payload, dict) else None,
+        key_id=meta.get("key_id"),
+        meta_version=meta.get("version"),
+    )
+
+    try:
+        result.reason = check_signature(meta, signed_bytes, signature, keys)
+    except (ValueError, TypeError) as exc:
+        result.reason = f"Malformed license file: {exc}"
+    if result.reason:
+        return result
+
+    if check_validity:
+        now = now or datetime.now(timezone.utc)
+        try:
+            validity = payload["validity"]
+            valid_from = _parse_timestamp(validity["valid_from"])
+            valid_until = _parse_timestamp(validity["valid_until"])
+        except (KeyError, TypeError, ValueError) as exc:
+            result.reason = f"Malformed validity section: {exc}"
+            return result
+
+        if now < valid_from:
+            result.reason = f"Not valid before {validity['valid_from']}."
+            return result
+        if now >= valid_until:
+            result.reason = f"Expired at {validity['valid_until']}."
+            return result
+
+    result.ok = True
+    return result
+
+
+def verify_license_file(path: str | Path, keys: PublicKeyCache, **kwargs) -> VerificationResult:
+    try:
+        data = Path(path).read_bytes()
+    except OSError as exc:
+        return VerificationResult(path=str(path), ok=False, reason=f"Cannot read file: {exc}")
+    return verify_license_bytes(data, keys, path=str(path), **kwargs)
+
+
+# --- Batch mode (process pool) ---
+
+_worker_keys: PublicKeyCache | None = None
+_worker_check_validity = True
+
+
+def init_verification_worker(key_dir: str, check_validity: bool = False) -> None:
+    global _worker_keys, _worker_check_validity
+    _worker_keys = PublicKeyCache(key_dir)
+    _worker_check_validity = check_validity
+
+
+def _verify_in_worker(path: str) -> VerificationResult:
+    return verify_license_file(path, _worker_keys, check_validity=_worker_check_validity)
+
+
+def verify_stored_signatures(
+    rows: Sequence[Tuple[Any, Dict[str, Any], Dict[str, Any], str]],
+) -> List[Tuple[Any, str, bool]]:
+    """
+    Verify (pk, meta, payload, signature_b64) rows as stored by the server.
+
+    Returns (pk, reason, verified) for every row that fails; verified is
+    False when the row could not be checked at all (e.g., its public key
+    is missing or unreadable) rather than found not to match. A bad row
+    never stops the others. Runs in a worker set up by
+    init_verification_worker().
+    """
+    failures = []
+    key_errors: Dict[Any, str] = {}
+    for pk, meta, payload, signature_b64 in rows:
+        try:
+            signed_bytes = canonical_payload_bytes(payload, int(meta["version"]))
+            signature = _b64url_decode_no_padding(signature_b64)
+        except (ValueError, TypeError) as exc:
+            failures.append((pk, f"Cannot canonicalize stored license: {exc}", True))
+            continue
+
+        key_id = meta.get("key_id")
+        if key_id not in key_errors:
+            try:
+                _worker_keys.get(key_id)
+            except LicenseVerificationError as exc:
+                key_errors[key_id] = str(exc)
+        if key_id in key_errors:
+            failures.append((pk, key_errors[key_id], False))
+            continue
+
+        try:
+            reason = check_signature(meta, signed_bytes, signature, _worker_keys)
+        except (ValueError, TypeError) as exc:
+            failures.append((pk, f"Cannot verify stored license: {exc}", False))
+            continue
+        if reason:
+            failures.append((pk, reason, True))
+    return failures
+
+
+def iter_license_paths(paths: Iterable[str | Path], pattern: str = "*.license") -> Iterator[Path]:
+    """
+    Expand directories (recursively) into the license files they contain.
+    """
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.rglob(pattern))
+        else:
+            yield path
+
+
+def verify_license_files(
+    paths: Iterable[str | Path],
+    *,
+    key_dir: str | Path,
+    workers: int | None = None,
+    check_validity: bool = True,
+    chunksize: int = 64,
+) -> Iterator[VerificationResult]:
+    """
+    Verify many license files across a process pool, yielding results in input order.
+
+    Each worker keeps its own public key cache, so every key is loaded at
+    most once per worker.
+    """
+    path_list: List[str] = [str(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(path_list) < chunksize:
+        keys = PublicKeyCache(key_dir)
+        for path in path_list:
+            yield verify_license_file(path, keys, check_validity=check_validity)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_verification_worker,
+        initargs=(str(key_dir), check_validity),
+    ) as executor:
+        yield from executor.map(_verify_in_worker, path_list, chunksize=chunksize)
@@ -0,0 +1,196 @@
+# licenses/services/warmup.py
+
+"""
+Process warm-up, when LICENSE_WARMUP is on.
+
+Moves one-off costs of the first requests to boot. warm_up(), run from
+LicensesConfig.ready(), loads the signing key, makes the first Ed25519
+signature, imports the views through the URLconf, DRF's lazily imported
+settings classes, serializer fields, and compiles the ORM queries of the
+issuance lookups. None of it touches the database, so it does not trip
+Django's "database access during app initialization" warning.
+
+warm_up_database(), run by the WSGI/ASGI entry points once the
+application is loaded, fills the caches that need the database: the
+rendered product catalog and the customer search index (built before
+the fork, so a --preload master's workers share it copy-on-write). It
+closes its connections afterwards, so a pre-fork master (gunicorn
+--preload) hands none to its workers.
+
+A failing step is logged and skipped; the first request that needs it
+raises the real error.
+"""
+
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Step name -> seconds (-1.0 if it failed), from the last warm-up in this process.
+last_warmup: Dict[str, float] = {}
+
+# Placeholder license ID for lookups that are compiled, never run.
+_WARMUP_LICENSE_ID = uuid.UUID(int=0)
+
+
+def _sample_issue_request() -> Dict[str, str]:
+    now = datetime.now(timezone.utc)
+    return {
+        "customer_id": "warmup",
+        "product_id": "warmup",
+        "edition_id": "warmup",
+        "license_type": "subscription",
+        "valid_from": now.isoformat(),
+        "valid_until": (now + timedelta(days=1)).isoformat(),
+    }
+
+
+def _load_signing_key() -> None:
+    from licenses.services.keys import load_private_signing_key
+
+    load_private_signing_key()
+
+
+def _sign_sample_payload() -> None:
+    # Exercises canonicalization (both meta versions) and the first Ed25519
+    # signature, which initializes the crypto backend.
+    from licenses.services.signing import sign_license_payload
+
+    payload = {
+        "license_id": str(_WARMUP_LICENSE_ID),
+        "customer": {"id": "warmup", "name": "warmup"},
+        "issued_at": datetime.now(timezone.utc).isoformat(),
+        "features": {},
+        "usage_limits": {},
+    }
+    sign_license_payload(payload)
+
+
+def _load_urlconf() -> None:
+    from django.urls import get_resolver, reverse
+
+    # Imports every view module and builds the reverse lookup tables.
+    reverse("license-issue")
+    get_resolver().resolve(f"/api/licenses/{_WARMUP_LICENSE_ID}/download/")
+
+
+def _load_drf_settings() -> None:
+    from rest_framework.settings import api_settings
+
+    for name in (
+        "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES",
+        "DEFAULT_AUTHENTICATION_CLASSES",
+        "DEFAULT_PERMISSION_CLASSES",
+        "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+        "DEFAULT_VERSIONING_CLASS",
+        "DEFAULT_THROTTLE_CLASSES",
+    ):
+        getattr(api_settings, name)
+
+
+def _build_serializers() -> None:
+    from licenses.serializers import (
+        ActivationRequestSerializer,
+        LeaseCheckoutRequestSerializer,
+        LicenseIssueRequestSerializer,
+        LicenseRevokeRequestSerializer,
+    )
+
+    for serializer_class in (
+        ActivationRequestSerializer,
+        LeaseCheckoutRequestSerializer,
+        LicenseRevokeRequestSerializer,
+    ):
+        serializer_class().fields
+
+    # A full validation pass also warms the datetime and choice parsing.
+    LicenseIssueRequestSerializer(data=_sample_issue_request()).is_valid()
+
+
+def _compile_issuance_queries() -> None:
+    # Compiling (not running) the lookups fills model, field and
+    # SQL compiler caches.
+    from django.db import connections
+
+    from customers.models import Customer
+    from licenses.models import License
+    from products.models import Edition, Product
+
+    connection = connections["default"]
+    for queryset in (
+        Customer.objects.filter(pk="warmup"),
+        Product.objects.filter(pk="warmup"),
+        Edition.objects.filter(pk="warmup"),
+        License.objects.using("default").filter(license_id=_WARMUP_LICENSE_ID, status="active"),
+    ):
+        queryset.query.get_compiler(connection=connection).as_sql()
+
+
+def _render_catalog() -> None:
+    from products.services.catalog import get_catalog_document
+
+    get_catalog_document()
+
+
+def _build_customer_index() -> None:
+    from customers.services.search import customer_index
+
+    customer_index()
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("signing_key", _load_signing_key),
+    ("sign_sample", _sign_sample_payload),
+    ("urlconf", _load_urlconf),
+    ("drf_settings", _load_drf_settings),
+    ("serializers", _build_serializers),
+    ("orm_queries", _compile_issuance_queries),
+]
+
+DATABASE_WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("catalog", _render_catalog),
+    ("customer_index", _build_customer_index),
+]
+
+
+def _run_steps(steps: List[Tuple[str, Callable[[], None]]]) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:  # noqa: BLE001 - surfaced by the first real request
+            logger.warning("Warm-up step '%s' failed; skipped.", name, exc_info=True)
+            timings[name] = -1.0
+            continue
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def warm_up() -> Dict[str, float]:
+    """
+    Run the warm-up steps that need no database; returns seconds per step.
+    """
+    timings = _run_steps(WARMUP_STEPS)
+    last_warmup.clear()
+    last_warmup.update(timings)
+    return timings
+
+
+def warm_up_database() -> Dict[str, float]:
+    """
+    Run the warm-up steps that read the database; returns seconds per step.
+    """
+    from django.db import connections
+
+    try:
+        timings = _run_steps(DATABASE_WARMUP_STEPS)
+    finally:
+        connections.close_all()
+    last_warmup.update(timings)
+    return timings
@@ -0,0 +1,347 @@
+# licenses/services/webhooks.py
+
+"""
+Transactional outbox for license webhooks.
+
+enqueue_webhooks() writes OutboxMessage rows inside the transaction that
+changes the license, so a notification exists if and only if the change
+committed. dispatch_due_messages() runs out of band (dispatch_webhooks
+command): it claims due messages, POSTs them to each endpoint in batches
+over pooled keep-alive connections, and reschedules failures with
+exponential backoff until they are dead-lettered.
+
+Delivery is at-least-once; receivers should de-duplicate on the event seq.
+"""
+
+import hashlib
+import hmac
+import http.client
+import json
+import random
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from licenses.models import LicenseEvent, OutboxMessage, WebhookEndpoint
+
+
+SIGNATURE_HEADER = "X-License-Signature"
+
+# How long a claimed message stays invisible to other dispatchers.
+_CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+def enqueue_webhooks(events: Iterable[LicenseEvent]) -> int:
+    """
+    Write one outbox message per (event, subscribed endpoint). Events of
+    customers in WEBHOOK_SKIP_CUSTOMER_PREFIXES are not sent.
+
+    Must run inside the transaction that recorded the events.
+    """
+    skipped_prefixes = tuple(settings.WEBHOOK_SKIP_CUSTOMER_PREFIXES)
+    events = [
+        event
+        for event in events
+        if not (skipped_prefixes and str(event.data.get("customer_id", "")).startswith(skipped_prefixes))
+    ]
+    if not events:
+        return 0
+
+    endpoints = list(WebhookEndpoint.objects.filter(is_active=True).only("id", "event_types"))
+    if not endpoints:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        OutboxMessage(
+            endpoint=endpoint,
+            event_type=event.event_type,
+            payload={
+                "seq": event.seq,
+                "event_type": event.event_type,
+                "license_id": event.license_id,
+                "data": event.data,
+                "created_at": event.created_at.isoformat().replace("+00:00", "Z"),
+            },
+            next_attempt_at=now,
+        )
+        for event in events
+        for endpoint in endpoints
+        if not endpoint.event_types or event.event_type in endpoint.event_types
+    ]
+    OutboxMessage.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """
+    Exponential backoff with jitter, capped at WEBHOOK_BACKOFF_MAX_SECONDS.
+    """
+    ceiling = min(
+        settings.WEBHOOK_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)),
+        settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+    )
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+class HTTPConnectionPool:
+    """
+    Keep-alive HTTP(S) connections, reused per (scheme, host, port).
+    """
+
+    def __init__(self, *, timeout: float, max_idle_per_host: int = 4) -> None:
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def _key(self, url: str) -> Tuple[str, str, int]:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        return parts.scheme, parts.hostname or "", port
+
+    def _acquire(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop()
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=self.timeout)
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle[key]) < self.max_idle_per_host:
+                self._idle[key].append(conn)
+                return
+        conn.close()
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes]:
+        """
+        POST body to url. A stale pooled connection is retried once on a fresh one.
+        """
+        key = self._key(url)
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        for attempt in range(2):
+            conn = self._acquire(key)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, data
+
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+def _claim_due_messages(limit: int) -> List[OutboxMessage]:
+    """
+    Claim up to `limit` due messages by pushing next_attempt_at forward.
+
+    SKIP LOCKED lets several dispatchers run side by side on PostgreSQL. The
+    UPDATE is also conditional on the message still being due, and claimed
+    rows are read back by their exact claim timestamp, so backends without
+    row locks cannot hand the same message to two dispatchers.
+    """
+    now = datetime.now(timezone.utc)
+    claim_until = now + _CLAIM_TIMEOUT
+
+    with transaction.atomic():
+        candidate_ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not candidate_ids:
+            return []
+        OutboxMessage.objects.filter(
+            pk__in=candidate_ids,
+            status="pending",
+            next_attempt_at__lte=now,
+        ).update(next_attempt_at=claim_until)
+
+    return list(
+        OutboxMessage.objects.filter(pk__in=candidate_ids, next_attempt_at=claim_until)
+        .select_related("endpoint")
+        .order_by("id")
+    )
+
+
+def _sign(secret: str, body: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def _deliver_batch(
+    pool: HTTPConnectionPool,
+    endpoint: WebhookEndpoint,
+    messages: List[OutboxMessage],
+) -> Tuple[bool, str | None]:
+    body = json.dumps(
+        {"events": [message.payload for message in messages]},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "licensing-server-webhooks",
+    }
+    if endpoint.secret:
+        headers[SIGNATURE_HEADER] = _sign(endpoint.secret, body)
+
+    try:
+        status_code, response_body = pool.post(endpoint.url, body, headers)
+    except Exception as exc:  # noqa: BLE001 - any transport error is retried
+        return False, f"{type(exc).__name__}: {exc}"
+
+    if 200 <= status_code < 300:
+        return True, None
+    return False, f"HTTP {status_code}: {response_body[:500].decode('utf-8', 'replace')}"
+
+
+def _record_outcome(messages: List[OutboxMessage], ok: bool, error: str | None) -> Dict[str, int]:
+    now = datetime.now(timezone.utc)
+    ids = [message.pk for message in messages]
+
+    if ok:
+        OutboxMessage.objects.filter(pk__in=ids).update(
+            status="delivered",
+            delivered_at=now,
+            attempts=messages[0].attempts + 1,
+            last_error=None,
+        )
+        return {"delivered": len(ids)}
+
+    outcome = {"retried": 0, "dead": 0}
+    with transaction.atomic():
+        for message in messages:
+            attempts = message.attempts + 1
+            if attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                changes = {"status": "dead"}
+                outcome["dead"] += 1
+            else:
+                changes = {"next_attempt_at": now + backoff_delay(attempts)}
+                outcome["retried"] += 1
+            OutboxMessage.objects.filter(pk=message.pk).update(
+                attempts=attempts,
+                last_error=error,
+                **changes,
+            )
+    return outcome
+
+
+def _dispatch_endpoint(
+    pool: HTTPConnectionPool,
+    endpoint: WebhookEndpoint,
+    messages: List[OutboxMessage],
+    batch_size: int,
+) -> Dict[str, int]:
+    totals: Dict[str, int] = defaultdict(int)
+
+    try:
+        _deliver_endpoint_messages(pool, endpoint, messages, batch_size, totals)
+    finally:
+        # Runs in a worker thread, which owns its own DB connection.
+        connection.close()
+
+    return totals
+
+
+def _deliver_endpoint_messages(
+    pool: HTTPConnectionPool,
+    endpoint: WebhookEndpoint,
+    messages: List[OutboxMessage],
+    batch_size: int,
+    totals: Dict[str, int],
+) -> None:
+    # Batches share one attempt counter, so group messages by attempts first.
+    by_attempts: Dict[int, List[OutboxMessage]] = defaultdict(list)
+    for message in messages:
+        by_attempts[message.attempts].append(message)
+
+    for group in by_attempts.values():
+        for start in range(0, len(group), batch_size):
+            batch = group[start:start + batch_size]
+            ok, error = _deliver_batch(pool, endpoint, batch)
+            for key, value in _record_outcome(batch, ok, error).items():
+                totals[key] += value
+
+
+def dispatch_due_messages(
+    pool: HTTPConnectionPool,
+    *,
+    limit: int = 1000,
+    batch_size: int | None = None,
+    max_workers: int = 8,
+) -> Dict[str, int]:
+    """
+    Claim and deliver one round of due messages.
+
+    Returns counts of delivered, retried and dead-lettered messages.
+    """
+    batch_size = batch_size or settings.WEBHOOK_BATCH_SIZE
+    messages = _claim_due_messages(limit)
+
+    by_endpoint: Dict[str, List[OutboxMessage]] = defaultdict(list)
+    endpoints: Dict[str, WebhookEndpoint] = {}
+    for message in messages:
+        by_endpoint[message.endpoint_id].append(message)
+        endpoints[message.endpoint_id] = message.endpoint
+
+    totals = {"claimed": len(messages), "delivered": 0, "retried": 0, "dead": 0}
+    if not messages:
+        return totals
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_dispatch_endpoint, pool, endpoints[endpoint_id], group, batch_size)
+            for endpoint_id, group in by_endpoint.items()
+        ]
+        for future in futures:
+            for key, value in future.result().items():
+                totals[key] += value
+
+    return totals
+
+
+def requeue_dead_messages(endpoint_id: str | None = None) -> int:
+    """
+    Move dead-lettered messages back to pending with a fresh attempt budget.
+    """
+    qs = OutboxMessage.objects.filter(status="dead")
+    if endpoint_id:
+        qs = qs.filter(endpoint_id=endpoint_id)
+    return qs.update(
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+
@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from customers.models import Customer
+from licenses.models import License
+from licenses.services.keys import load_private_signing_key
+from licenses.services.sharding import customer_shard
+from products.models import Edition, Product
+
+
+def create_catalog():
+    user = get_user_model().objects.create_user(username="op", is_staff=True, is_superuser=True)
+    customer = Customer.objects.create(id="cust-1", name="Acme")
+    product = Product.objects.create(id="prod-1", code="app", name="App")
+    edition = Edition.objects.create(id="ed-1", product=product, code="ent", name="Enterprise")
+    return user, customer, edition
+
+
+def create_license(user, customer, edition, *, usage_limits=None, **fields) -> License:
+    """
+    An unsigned license row, on the customer's shard; enough for services
+    that do not verify signatures.
+    """
+    now = datetime.now(timezone.utc)
+    values = {
+        "customer": customer,
+        "product": edition.product,
+        "edition": edition,
+        "license_type": "subscription",
+        "valid_from": now - timedelta(days=1),
+        "valid_until": now + timedelta(days=365),
+        "meta_key_id": "test",
+        "payload": {"usage_limits": usage_limits or {}},
+        "signature": "",
+        "issued_at": now,
+        "issued_by": user,
+        **fields,
+    }
+    with customer_shard(customer.id, for_write=True):
+        return License.objects.create(**values)
+
+
+def write_key_pair(key_dir: Path, key_id: str) -> ed25519.Ed25519PrivateKey:
+    """
+    Write <key_id>-private.pem and <key_id>-public.pem to key_dir (the
+    layout of scripts/generate_signing_key.py).
+    """
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    (key_dir / f"{key_id}-private.pem").write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    (key_dir / f"{key_id}-public.pem").write_bytes(
+        private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return private_key
+
+
+class SigningKeyMixin:
+    """
+    Signs with a throwaway "test-v1" key in a temporary SIGNING_KEY_DIR
+    (self.key_dir).
+    """
+
+    def setUp(self):
+        super().setUp()
+        key_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(key_dir.cleanup)
+        self.key_dir = Path(key_dir.name)
+        write_key_pair(self.key_dir, "test-v1")
+
+        signing = override_settings(
+            PRIVATE_KEY_PATH=str(self.key_dir / "test-v1-private.pem"),
+            SIGNING_KEY_DIR=str(self.key_dir),
+            SIGNING_KEY_ID="test-v1",
+        )
+        signing.enable()
+        self.addCleanup(signing.disable)
+        load_private_signing_key.cache_clear()
+        self.addCleanup(load_private_signing_key.cache_clear)
+
+
+def requires_databases(*aliases):
+    """
+    Class decorator: the test case uses "default" and the extra database
+    aliases, and is skipped unless they are configured (they are in
+    licensing_server.settings_test).
+    """
+    missing = [alias for alias in aliases if alias not in settings.DATABASES]
+
+    def decorate(test_case):
+        if missing:
+            # The runner sets up the databases of skipped cases too.
+            test_case.databases = {"default"}
+            return unittest.skip(
+                f"Needs the {', '.join(missing)} database(s); run with --settings=licensing_server.settings_test."
+            )(test_case)
+        test_case.databases = {"default", *aliases}
+        return test_case
+
+    return decorate
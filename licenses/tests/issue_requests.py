@@ -0,0 +1,129 @@
+"""
+Generated issuance requests for checking licenses/validation.py against
+LicenseIssueRequestSerializer; shared by the differential tests and the
+benchmark_issue_validation command.
+"""
+
+import random
+import uuid
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.http import QueryDict
+from rest_framework import serializers
+from rest_framework.exceptions import ErrorDetail
+
+from licenses.serializers import LicenseIssueRequestSerializer
+from licenses.validation import validate_issue_request
+
+
+_MISSING = object()
+
+# Replacement values per field; _MISSING drops the key.
+_COMMON = [_MISSING, None, 0, 1.5, True, [], {}, ""]
+_VARIANTS = {
+    "customer_id": _COMMON + [
+        "cust-1", "  cust-1  ", " ", "\t\n", 42, "cüst-ä", "cust\x00", "cust-\ud800", ["cust-1"],
+    ],
+    "product_id": _COMMON + ["prod-1", "prod-1 ", Decimal("1.5"), " ", " prod "],
+    "edition_id": _COMMON + ["ed-1", "ed\x00ent"],
+    "license_type": _COMMON + [
+        "trial", "subscription", "perpetual", "Trial", " trial", "lifetime", 7,
+    ],
+    "valid_from": _COMMON + [
+        "2026-01-01T00:00:00Z", "2026-01-01T00:00:00", "2026-01-01T00:00:00+05:30",
+        "2026-01-01 10:00", "2026-01-01T00:00:00.123456Z", "2026-01-01", "2026-13-01T00:00:00Z",
+        "2026-02-30T00:00:00Z", "tomorrow", "20260101T000000Z", 1767225600,
+        datetime(2026, 1, 1, tzinfo=timezone.utc), datetime(2026, 1, 1), date(2026, 1, 1),
+    ],
+    "valid_until": _COMMON + [
+        "2027-01-01T00:00:00Z", "2027-01-01T00:00:00-08:00", "2025-01-01T00:00:00Z",
+        "2026-01-01T00:00:00Z", "9999-12-31T23:59:59-01:00", "0001-01-01T00:00:00+01:00",
+        "2027-01-01T00:00:00+25:00", "not a date",
+    ],
+    "features": _COMMON + [
+        {"advanced_export": True, "tier": "pro"}, {"nested": {"a": [1, 2, {"b": None}]}},
+        ["a", "b"], "plain string", 12, float("nan"), {1: "int key"}, {"s": {1, 2}},
+        {"when": datetime(2026, 1, 1)}, ("tuple",), {"ratio": float("nan")}, [float("-inf")],
+    ],
+    "usage_limits": _COMMON + [
+        {"max_activations": 5, "max_runs_per_day": 50}, {"x": object()}, {"max_runs_per_day": float("inf")},
+    ],
+    "deployment": _COMMON + [{"mode": "online", "region": "eu"}, [{"host": "a"}]],
+    "note": _COMMON + ["renewal", "  padded  ", "ünïcode", "x" * 5000],
+    "supersedes": _COMMON + [
+        "01a15257-942c-71a9-a9cb-7c5e4830e35c", "01A15257942C71A9A9CB7C5E4830E35C",
+        "{01a15257-942c-71a9-a9cb-7c5e4830e35c}", "urn:uuid:01a15257-942c-71a9-a9cb-7c5e4830e35c",
+        " 01a15257-942c-71a9-a9cb-7c5e4830e35c", "not-a-uuid", 12345, -1, 2**130,
+        uuid.UUID("01a15257-942c-71a9-a9cb-7c5e4830e35c"),
+    ],
+}
+
+_NON_DICT_INPUTS = [None, [], "string", 42, [{"customer_id": "cust-1"}]]
+
+
+def valid_request(rng: random.Random) -> dict:
+    valid_from = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(10**6))
+    request = {
+        "customer_id": f"cust-{rng.randrange(10**6)}",
+        "product_id": f"prod-{rng.randrange(100)}",
+        "edition_id": f"ed-{rng.randrange(300)}",
+        "license_type": rng.choice(LicenseIssueRequestSerializer.LICENSE_TYPE_CHOICES),
+        "valid_from": valid_from.isoformat().replace("+00:00", "Z"),
+        "valid_until": (valid_from + timedelta(days=rng.choice((30, 365, 730)))).isoformat().replace("+00:00", "Z"),
+        "features": {f"feature_{i}": rng.choice((True, False)) for i in range(rng.randint(0, 12))},
+        "usage_limits": {f"max_{i}": rng.randrange(1, 10**4) for i in range(rng.randint(0, 6))},
+        "deployment": {"mode": rng.choice(("online", "offline")), "region": rng.choice(("eu", "us", "ap"))},
+    }
+    if rng.random() < 0.5:
+        request["note"] = "renewal"
+    if rng.random() < 0.2:
+        request["supersedes"] = str(uuid.UUID(int=rng.getrandbits(128)))
+    return request
+
+
+def mutated_request(rng: random.Random):
+    roll = rng.random()
+    if roll < 0.02:
+        return rng.choice(_NON_DICT_INPUTS)
+    request = valid_request(rng)
+    for name in rng.sample(sorted(_VARIANTS), rng.randint(1, 3)):
+        value = rng.choice(_VARIANTS[name])
+        if value is _MISSING:
+            request.pop(name, None)
+        else:
+            request[name] = value
+    if roll < 0.05:
+        request["unknown_field"] = "ignored"
+    if roll < 0.03:
+        form = QueryDict(mutable=True)
+        for key, value in request.items():
+            if isinstance(value, str):
+                form[key] = value
+        return form
+    return request
+
+
+def _normalized(detail):
+    if isinstance(detail, Mapping):
+        return {key: _normalized(value) for key, value in detail.items()}
+    if isinstance(detail, list):
+        return [_normalized(item) for item in detail]
+    if isinstance(detail, ErrorDetail):
+        return (str(detail), detail.code)
+    return detail
+
+
+def serializer_result(data):
+    serializer = LicenseIssueRequestSerializer(data=data)
+    if serializer.is_valid():
+        return "valid", repr(dict(serializer.validated_data))
+    return "invalid", _normalized(serializer.errors)
+
+
+def compiled_result(data):
+    try:
+        return "valid", repr(dict(validate_issue_request(data)))
+    except serializers.ValidationError as exc:
+        return "invalid", _normalized(exc.detail)
@@ -0,0 +1,62 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, connections
+from django.test import TransactionTestCase
+
+from licenses.models import Activation
+from licenses.services.activation import ActivationLimitReached, activate_machine, deactivate_machine
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class ActivationSeatLimitTests(TransactionTestCase):
+    def setUp(self):
+        user, customer, edition = create_catalog()
+        self.license = create_license(user, customer, edition, usage_limits={"max_machines": 5})
+
+    @unittest.skipIf(connection.vendor == "sqlite", "SQLite runs one writer at a time; the race needs concurrent transactions.")
+    def test_concurrent_activations_never_exceed_the_limit(self):
+        fingerprints = [f"machine-{i}" for i in range(40) for _ in range(2)]
+
+        def attempt(fingerprint: str) -> str:
+            try:
+                activate_machine(license_id=self.license.license_id, machine_fingerprint=fingerprint)
+                return "activated"
+            except ActivationLimitReached:
+                return "rejected"
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            outcomes = list(pool.map(attempt, fingerprints))
+
+        self.license.refresh_from_db()
+        active = Activation.objects.filter(license=self.license, is_active=True).count()
+        self.assertEqual(active, 5)
+        self.assertEqual(self.license.activation_count, 5)
+        # The five winners may activate twice (idempotent); every other machine is rejected.
+        self.assertGreaterEqual(outcomes.count("rejected"), 70)
+
+    def test_reactivating_the_same_machine_takes_no_extra_seat(self):
+        for _ in range(3):
+            activate_machine(license_id=self.license.license_id, machine_fingerprint="machine-1")
+
+        self.license.refresh_from_db()
+        self.assertEqual(self.license.activation_count, 1)
+
+    def test_activations_beyond_the_limit_are_rejected_until_a_seat_is_released(self):
+        for i in range(5):
+            _, created = activate_machine(license_id=self.license.license_id, machine_fingerprint=f"machine-{i}")
+            self.assertTrue(created)
+        with self.assertRaises(ActivationLimitReached):
+            activate_machine(license_id=self.license.license_id, machine_fingerprint="machine-5")
+
+        deactivate_machine(license_id=self.license.license_id, machine_fingerprint="machine-0")
+        activate_machine(license_id=self.license.license_id, machine_fingerprint="machine-5")
+        with self.assertRaises(ActivationLimitReached):
+            activate_machine(license_id=self.license.license_id, machine_fingerprint="machine-0")
+
+        self.license.refresh_from_db()
+        self.assertEqual(self.license.activation_count, 5)
+        active = Activation.objects.filter(license=self.license, is_active=True)
+        self.assertEqual(sorted(active.values_list("machine_fingerprint", flat=True)), [f"machine-{i}" for i in range(1, 6)])
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Sum
+from django.test import TestCase
+
+from licenses.models import Activation, ArchivedLicense, License, LicenseSummary, UsageRollup
+from licenses.services.archive import LicenseArchiveError, archive_licenses, restore_license
+from licenses.services.summary import record_license_created
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class LicenseArchiveTests(TestCase):
+    def setUp(self):
+        self.now = datetime.now(timezone.utc)
+        self.user, customer, edition = create_catalog()
+        self.expired = self._license(
+            customer, edition, status="expired", valid_until=self.now - timedelta(days=400), notes="old"
+        )
+        self.superseded = self._license(customer, edition, status="superseded")
+        License.objects.filter(pk=self.superseded.pk).update(updated_at=self.now - timedelta(days=400))
+        self.recently_expired = self._license(
+            customer, edition, status="expired", valid_until=self.now - timedelta(days=5)
+        )
+        self.active = self._license(customer, edition)
+
+        Activation.objects.create(
+            license=self.expired,
+            machine_fingerprint="fp-1",
+            hostname="build-1",
+            activated_at=self.now - timedelta(days=500),
+            last_seen_at=self.now - timedelta(days=450),
+        )
+        UsageRollup.objects.create(
+            license=self.expired,
+            metric="runs",
+            granularity="day",
+            bucket_start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            total=12,
+            event_count=3,
+        )
+        self.client.force_login(self.user)
+
+    def _license(self, customer, edition, **fields):
+        license_record = create_license(self.user, customer, edition, **fields)
+        record_license_created(license_record)
+        return license_record
+
+    def _counts(self):
+        return dict(
+            LicenseSummary.objects.filter(count__gt=0)
+            .values_list("status")
+            .annotate(total=Sum("count"))
+            .order_by()
+        )
+
+    def test_archive_and_restore_round_trip(self):
+        original = License.objects.get(pk=self.expired.pk)
+        self.assertEqual(self._counts(), {"active": 1, "expired": 2, "superseded": 1})
+
+        self.assertEqual(archive_licenses(older_than_days=365, chunk_size=1, now=self.now), 2)
+
+        self.assertEqual(
+            set(License.objects.values_list("pk", flat=True)), {self.recently_expired.pk, self.active.pk}
+        )
+        self.assertEqual(
+            set(ArchivedLicense.objects.values_list("license_id", flat=True)),
+            {self.expired.pk, self.superseded.pk},
+        )
+        self.assertFalse(Activation.objects.exists())
+        self.assertFalse(UsageRollup.objects.exists())
+        self.assertEqual(self._counts(), {"active": 1, "expired": 1})
+
+        status = self.client.get(f"/api/licenses/{self.expired.pk}/status/").json()
+        self.assertEqual((status["status"], status["archived"]), ("expired", True))
+        download = self.client.get(f"/api/licenses/{self.expired.pk}/download/")
+        self.assertEqual(download.json()["payload"], original.payload)
+
+        restored = restore_license(self.expired.pk)
+
+        self.assertFalse(ArchivedLicense.objects.filter(license_id=self.expired.pk).exists())
+        reloaded = License.objects.get(pk=self.expired.pk)
+        # updated_at records the restore.
+        for field in License._meta.concrete_fields:
+            if field.name == "updated_at":
+                continue
+            self.assertEqual(field.value_from_object(reloaded), field.value_from_object(original), field.name)
+        self.assertEqual(restored.created_at, original.created_at)
+        self.assertEqual(
+            list(Activation.objects.values_list("license_id", "machine_fingerprint", "hostname")),
+            [(self.expired.pk, "fp-1", "build-1")],
+        )
+        self.assertEqual(
+            list(UsageRollup.objects.values_list("license_id", "metric", "total", "event_count")),
+            [(self.expired.pk, "runs", 12, 3)],
+        )
+        self.assertEqual(self._counts(), {"active": 1, "expired": 2})
+
+    def test_restore_requires_an_archived_license(self):
+        with self.assertRaises(LicenseArchiveError):
+            restore_license(self.active.pk)
@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+
+from licenses.services.binary_format import (
+    BinaryFormatError,
+    decode_canonical,
+    decode_license_file,
+    encode_canonical,
+    encode_license_file,
+)
+
+
+class CanonicalEncodingTests(SimpleTestCase):
+    def test_values_round_trip(self):
+        payload = {
+            "license_id": "01a15257-942c-71a9-a9cb-7c5e4830e35c",
+            "customer": {"id": "cust-1", "name": "Acme ünïcode"},
+            "license_type": "subscription",
+            "features": {"advanced_export": True, "beta": False, "tier": None},
+            "usage_limits": {"max_machines": 5, "offset": -300, "big": 2**70, "ratio": 0.25},
+            "deployment": [[], {}, "", 0, -1],
+        }
+
+        encoded = encode_canonical(payload)
+
+        self.assertEqual(decode_canonical(encoded), payload)
+        # One encoding per value, whatever the key order of the input.
+        self.assertEqual(encode_canonical(dict(reversed(payload.items()))), encoded)
+
+    def test_common_strings_are_references(self):
+        self.assertEqual(encode_canonical("name"), bytes([0x06, 16]))
+        self.assertEqual(encode_canonical("names"), b"\x05\x05names")
+
+    def test_non_canonical_input_is_rejected(self):
+        cases = {
+            # 1 (zigzag 2) padded to two varint bytes.
+            "padded varint": (b"\x03\x82\x00", "Non-canonical varint."),
+            "unreferenced common string": (b"\x05\x04name", "must use a reference"),
+            "unsorted keys": (b"\x08\x02\x05\x01b\x00\x05\x01a\x00", "not in canonical order"),
+            "duplicate keys": (b"\x08\x02\x05\x01a\x00\x05\x01a\x00", "not in canonical order"),
+            "trailing bytes": (b"\x00\x00", "Trailing bytes"),
+            "truncated string": (b"\x05\x05abc", "Unexpected end of data."),
+            "unknown reference": (b"\x06\x7f", "Unknown string reference"),
+            "deep nesting": (b"\x07\x01" * 40 + b"\x00", "nested deeper"),
+        }
+        for name, (data, message) in cases.items():
+            with self.subTest(name):
+                with self.assertRaisesMessage(BinaryFormatError, message):
+                    decode_canonical(data)
+
+    def test_license_file_round_trip(self):
+        payload_bytes = encode_canonical({"license_id": "x"})
+        meta = {"version": 2, "alg": "Ed25519", "key_id": "test-v1"}
+        data = encode_license_file(meta, payload_bytes, b"\x01" * 64)
+
+        self.assertEqual(decode_license_file(data), (meta, {"license_id": "x"}, payload_bytes, b"\x01" * 64))
+        with self.assertRaisesMessage(BinaryFormatError, "does not match file size"):
+            decode_license_file(data + b"\x00")
+        with self.assertRaisesMessage(BinaryFormatError, "Not a binary license file."):
+            decode_license_file(b"{}")
@@ -0,0 +1,78 @@
+import base64
+
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+
+from licenses.models import License
+from licenses.tests.helpers import SigningKeyMixin, create_catalog, create_license, requires_databases
+
+
+@requires_databases("replica1")
+@override_settings(READ_REPLICA_DATABASES=["replica1"], READ_YOUR_WRITES_SECONDS=60)
+class ReadReplicaRoutingTests(SigningKeyMixin, TransactionTestCase):
+    """
+    "replica1" is a separate, empty database that nothing replicates to,
+    so a read finds the primary's rows only if it was routed there.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user, self.customer, self.edition = create_catalog()
+        self.user.set_password("pw")
+        self.user.save()
+
+    def _issue(self, **extra):
+        response = self.client.post(
+            "/api/licenses/issue/",
+            {
+                "customer_id": "cust-1",
+                "product_id": "prod-1",
+                "edition_id": "ed-1",
+                "license_type": "subscription",
+                "valid_from": "2026-01-01T00:00:00Z",
+                "valid_until": "2027-01-01T00:00:00Z",
+            },
+            content_type="application/json",
+            **extra,
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["license_id"]
+
+    def test_reads_go_to_the_replica(self):
+        license_record = create_license(self.user, self.customer, self.edition)
+        self.client.force_login(self.user)
+
+        # The login lives on the primary only: authentication still works.
+        response = self.client.get(f"/api/licenses/{license_record.license_id}/status/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(License.objects.using("replica1").exists())
+
+    def test_session_user_reads_its_own_writes(self):
+        self.client.force_login(self.user)
+        license_id = self._issue()
+
+        response = self.client.get(f"/api/licenses/{license_id}/download/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["payload"]["license_id"], license_id)
+
+    def test_basic_auth_user_reads_its_own_writes(self):
+        credentials = base64.b64encode(b"op:pw").decode("ascii")
+        auth = {"HTTP_AUTHORIZATION": f"Basic {credentials}"}
+        license_id = self._issue(**auth)
+
+        response = self.client.get(f"/api/licenses/{license_id}/download/", **auth)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_stickiness_ends_after_read_your_writes_seconds(self):
+        self.client.force_login(self.user)
+        license_id = self._issue()
+        cache.clear()
+
+        response = self.client.get(f"/api/licenses/{license_id}/download/")
+
+        self.assertEqual(response.status_code, 404)
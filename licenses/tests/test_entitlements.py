@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from customers.models import Customer
+from licenses.models import License, LicenseEntitlement
+from licenses.services.lifecycle import revoke_license
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class EntitlementQueryTests(TestCase):
+    def setUp(self):
+        user, customer, edition = create_catalog()
+        other = Customer.objects.create(id="cust-2", name="Beta")
+
+        def license_with(customer, features, usage_limits):
+            return create_license(
+                user, customer, edition, payload={"features": features, "usage_limits": usage_limits}
+            )
+
+        self.pro = license_with(customer, {"advanced_export": True, "tier": "pro"}, {"max_runs_per_day": 500})
+        self.basic = license_with(customer, {"advanced_export": False, "tier": "basic"}, {"max_runs_per_day": 50})
+        self.other_pro = license_with(other, {"advanced_export": True, "tier": "pro"}, {"max_runs_per_day": 100})
+        self.no_limits = license_with(other, {"tier": "pro"}, {})
+        self.client.force_login(user)
+
+        out = StringIO()
+        call_command("backfill_entitlements", chunk_size=3, stdout=out)
+        self.assertIn("Indexed entitlements of 4 licenses.", out.getvalue())
+
+    def _license_ids(self, **params):
+        response = self.client.get("/api/licenses/entitlements/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return sorted(row["license_id"] for row in response.json()["results"])
+
+    def _ids(self, *licenses):
+        return sorted(str(license_record.pk) for license_record in licenses)
+
+    def test_value_and_range_queries(self):
+        self.assertEqual(self._license_ids(key="advanced_export", value="true"), self._ids(self.pro, self.other_pro))
+        self.assertEqual(self._license_ids(key="tier", value="pro"), self._ids(self.pro, self.other_pro, self.no_limits))
+        self.assertEqual(self._license_ids(key="max_runs_per_day", gte="100"), self._ids(self.pro, self.other_pro))
+        self.assertEqual(
+            self._license_ids(key="max_runs_per_day", gt="50", lt="500", section="usage_limits"),
+            self._ids(self.other_pro),
+        )
+        self.assertEqual(self._license_ids(key="max_runs_per_day", section="features"), [])
+
+        response = self.client.get("/api/licenses/entitlements/", {"key": "tier", "value": "pro", "limit": 1})
+        self.assertEqual(response.json()["results"][0]["entitlements"], {"features": {"tier": "pro"}})
+        self.assertIsNotNone(response.json()["next_after"])
+
+    def test_status_changes_reach_the_index(self):
+        revoke_license(self.pro.pk)
+
+        self.assertEqual(self._license_ids(key="advanced_export", value="true"), self._ids(self.other_pro))
+        self.assertEqual(
+            self._license_ids(key="advanced_export", value="true", status="any"), self._ids(self.pro, self.other_pro)
+        )
+        self.assertEqual(self._license_ids(key="advanced_export", status="revoked"), self._ids(self.pro))
+
+    def test_customer_query(self):
+        response = self.client.get("/api/licenses/entitlements/customers/", {"key": "tier", "value": "pro"})
+
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {"customer_id": "cust-1", "license_count": 1},
+                    {"customer_id": "cust-2", "license_count": 2},
+                ],
+                "next_after": None,
+            },
+        )
+
+    def test_invalid_queries_are_rejected(self):
+        for params in ({}, {"key": "tier", "gt": "many"}, {"key": "tier", "section": "deployment"}):
+            with self.subTest(params=params):
+                response = self.client.get("/api/licenses/entitlements/", params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_backfill_is_idempotent_and_follows_payload_changes(self):
+        rows = LicenseEntitlement.objects.count()
+        License.objects.filter(pk=self.basic.pk).update(
+            payload={"features": {"tier": "pro"}, "usage_limits": {}}
+        )
+
+        call_command("backfill_entitlements", stdout=StringIO())
+
+        self.assertEqual(LicenseEntitlement.objects.count(), rows - 2)
+        self.assertEqual(
+            self._license_ids(key="tier", value="pro"), self._ids(self.pro, self.basic, self.other_pro, self.no_limits)
+        )
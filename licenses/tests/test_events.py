@@ -0,0 +1,55 @@
+from django.test import TestCase, override_settings
+
+from licenses.services.events import record_license_events
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class LicenseEventFeedTests(TestCase):
+    def setUp(self):
+        user, customer, edition = create_catalog()
+        self.licenses = [create_license(user, customer, edition) for _ in range(3)]
+        record_license_events(self.licenses, "issued")
+        self.licenses[0].status = "revoked"
+        record_license_events(self.licenses[:1], "revoked", previous_status="active")
+        self.client.force_login(user)
+
+    def _page(self, **params):
+        response = self.client.get("/api/events/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_pages_through_events_in_order(self):
+        seen = []
+        after = 0
+        while True:
+            page = self._page(after=after, limit=2)
+            if not page["events"]:
+                break
+            self.assertLessEqual(len(page["events"]), 2)
+            seen += page["events"]
+            after = page["next_after"]
+            self.assertEqual(after, page["events"][-1]["seq"])
+
+        self.assertEqual(page["next_after"], after)
+        seqs = [event["seq"] for event in seen]
+        self.assertEqual(seqs, sorted(set(seqs)))
+        self.assertEqual(
+            [(event["license_id"], event["event_type"]) for event in seen],
+            [(str(record.license_id), "issued") for record in self.licenses]
+            + [(str(self.licenses[0].license_id), "revoked")],
+        )
+        self.assertEqual(seen[-1]["data"]["previous_status"], "active")
+        self.assertEqual(seen[-1]["data"]["status"], "revoked")
+
+    @override_settings(LICENSE_EVENTS_POLL_INTERVAL_SECONDS=0.01)
+    def test_long_poll_returns_empty_when_nothing_arrives(self):
+        last = self._page()["next_after"]
+
+        page = self._page(after=last, wait=0.05)
+
+        self.assertEqual(page, {"events": [], "next_after": last})
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/events/", {"after": "x"})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,87 @@
+import csv
+import gzip
+import io
+import json
+from unittest import mock
+
+from django.test import TestCase
+
+from licenses.models import License
+from licenses.services import export
+from licenses.services.export import build_export_queryset, stream_license_export
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class LicenseExportTests(TestCase):
+    def setUp(self):
+        self.user, customer, edition = create_catalog()
+        customer.external_ref = "crm-1"
+        customer.save()
+        self.licenses = [
+            create_license(self.user, customer, edition, usage_limits={"max_activations": i}, notes=f"n{i}")
+            for i in range(5)
+        ]
+        License.objects.filter(pk=self.licenses[0].pk).update(status="revoked")
+        self.client.force_login(self.user)
+
+    def test_csv_has_the_requested_columns(self):
+        response = self.client.get(
+            "/api/licenses/export/", {"columns": "license_id,customer_external_ref,status,payload"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8"))))
+        self.assertEqual(rows[0], ["license_id", "customer_external_ref", "status", "payload"])
+        self.assertEqual(
+            rows[1:],
+            [
+                [
+                    str(record.license_id),
+                    "crm-1",
+                    "revoked" if index == 0 else "active",
+                    '{"usage_limits":{"max_activations":%d}}' % index,
+                ]
+                for index, record in enumerate(self.licenses)
+            ],
+        )
+
+    def test_gzipped_ndjson_with_filters(self):
+        response = self.client.get(
+            "/api/licenses/export/",
+            {"output": "ndjson", "gzip": "1", "status": "active", "columns": "license_id,notes,valid_from"},
+        )
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('filename="licenses.ndjson.gz"', response["Content-Disposition"])
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode("utf-8").splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [(row["license_id"], row["notes"]) for row in rows],
+            [(str(record.license_id), record.notes) for record in self.licenses[1:]],
+        )
+        self.assertTrue(rows[0]["valid_from"].endswith("Z"))
+
+    def test_unknown_columns_are_rejected(self):
+        response = self.client.get("/api/licenses/export/", {"columns": "license_id,secret"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Unknown export column(s): secret.", response.json()["detail"])
+
+    def test_rows_are_read_as_the_output_is_consumed(self):
+        read = []
+        with mock.patch.object(export, "_OUTPUT_CHUNK_BYTES", 1):
+            chunks = stream_license_export(
+                build_export_queryset(),
+                columns=["license_id"],
+                chunk_size=2,
+                on_rows=read.append,
+            )
+            self.assertEqual(next(chunks), b"license_id\r\n")
+            self.assertEqual(next(chunks), f"{self.licenses[0].license_id}\r\n".encode("ascii"))
+            self.assertEqual(next(chunks), f"{self.licenses[1].license_id}\r\n".encode("ascii"))
+            # Rows are counted once the next one is pulled.
+            self.assertEqual(read, [1])
+            self.assertEqual(len(list(chunks)), 3)
+        self.assertEqual(read, [1, 2, 3, 4, 5])
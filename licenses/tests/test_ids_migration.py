@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime, timezone
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class LicenseUUIDMigrationTests(TransactionTestCase):
+    before = [("licenses", "0010_shardassignment_alter_license_customer_and_more")]
+    after = [("licenses", "0011_license_uuid_primary_key")]
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def _create_licenses(self, apps, license_ids):
+        now = datetime.now(timezone.utc)
+        user = apps.get_model("auth", "User").objects.create(username="op")
+        customer = apps.get_model("customers", "Customer").objects.create(id="cust-1", name="Acme")
+        product = apps.get_model("products", "Product").objects.create(id="prod-1", code="app", name="App")
+        edition = apps.get_model("products", "Edition").objects.create(
+            id="ed-1", product=product, code="ent", name="Enterprise"
+        )
+        License = apps.get_model("licenses", "License")
+        Activation = apps.get_model("licenses", "Activation")
+        for license_id in license_ids:
+            license_record = License.objects.create(
+                id=license_id,
+                license_id=license_id,
+                customer=customer,
+                product=product,
+                edition=edition,
+                license_type="subscription",
+                valid_from=now,
+                valid_until=now,
+                meta_key_id="test",
+                payload={"license_id": license_id},
+                signature="",
+                issued_at=now,
+                issued_by=user,
+            )
+            Activation.objects.create(
+                license=license_record,
+                machine_fingerprint=f"fp-{license_id}",
+                activated_at=now,
+                last_seen_at=now,
+            )
+
+    def test_existing_ids_are_kept_and_references_follow(self):
+        license_ids = [str(uuid.uuid4()) for _ in range(3)]
+        self._create_licenses(self._migrate(self.before), license_ids)
+
+        apps = self._migrate(self.after)
+
+        License = apps.get_model("licenses", "License")
+        Activation = apps.get_model("licenses", "Activation")
+        self.assertEqual(
+            sorted(License.objects.values_list("license_id", flat=True)),
+            sorted(uuid.UUID(license_id) for license_id in license_ids),
+        )
+        self.assertEqual(
+            sorted(Activation.objects.values_list("license_id", "machine_fingerprint")),
+            sorted((uuid.UUID(license_id), f"fp-{license_id}") for license_id in license_ids),
+        )
+        license_record = License.objects.get(license_id=license_ids[0])
+        self.assertEqual(license_record.payload["license_id"], license_ids[0])
+        self.assertEqual(Activation.objects.filter(license=license_record).count(), 1)
+
+    def test_non_uuid_ids_stop_the_migration(self):
+        apps = self._migrate(self.before)
+        self._create_licenses(apps, ["lic-legacy"])
+
+        with self.assertRaisesMessage(ValueError, "License id 'lic-legacy' is not a UUID"):
+            self._migrate(self.after)
+
+        # Let tearDown migrate forward again.
+        apps.get_model("licenses", "Activation").objects.all().delete()
+        apps.get_model("licenses", "License").objects.all().delete()
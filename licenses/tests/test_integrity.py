@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from licenses.models import JobCheckpoint, License
+from licenses.services.integrity import CHECKPOINT_NAME, scan_license_signatures
+from licenses.services.signing import sign_license_payload
+from licenses.tests.helpers import SigningKeyMixin, create_catalog, create_license
+
+
+class SignatureScanTests(SigningKeyMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user, self.customer, self.edition = create_catalog()
+        self.good = [self._signed(f"lic-{i}") for i in range(3)]
+        self.tampered = self._signed("lic-tampered", payload={"license_id": "lic-tampered", "seats": 1000})
+        self.unverifiable = self._signed("lic-old", meta_key_id="gone-v1")
+
+    def _signed(self, name, **fields):
+        signed = sign_license_payload({"license_id": name, "seats": 5})
+        values = {"payload": signed["payload"], "signature": signed["signature"], "meta_key_id": "test-v1"}
+        return create_license(self.user, self.customer, self.edition, **{**values, **fields})
+
+    def _scan(self, **kwargs):
+        return scan_license_signatures(workers=1, chunk_size=2, settle_seconds=0, **kwargs)
+
+    def test_scan_reports_mismatches_and_unverifiable_rows(self):
+        report = self._scan()
+
+        self.assertEqual(report.scanned, 5)
+        self.assertEqual([entry["license_id"] for entry in report.mismatches], [str(self.tampered.pk)])
+        self.assertEqual(report.mismatches[0]["reason"], "Signature does not match payload.")
+        self.assertEqual([entry["license_id"] for entry in report.unverifiable], [str(self.unverifiable.pk)])
+        self.assertIn("No public key for key_id 'gone-v1'", report.unverifiable[0]["reason"])
+
+    def test_next_scan_starts_at_the_high_water_mark(self):
+        first = self._scan()
+        mark = JobCheckpoint.objects.get(name=CHECKPOINT_NAME).cursor
+        self.assertEqual(first.high_water_mark, {"default": mark})
+        self.assertEqual(mark["id"], str(self.unverifiable.pk))
+
+        again = self._scan()
+        self.assertEqual((again.scanned, again.started_after), (0, {"default": mark}))
+
+        License.objects.filter(pk=self.good[0].pk).update(
+            payload={"license_id": "lic-0", "seats": 6}, updated_at=datetime.now(timezone.utc)
+        )
+        changed = self._scan()
+        self.assertEqual(changed.scanned, 1)
+        self.assertEqual([entry["license_id"] for entry in changed.mismatches], [str(self.good[0].pk)])
+
+        full = self._scan(full=True)
+        self.assertEqual((full.scanned, len(full.mismatches), len(full.unverifiable)), (5, 2, 1))
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from licenses.models import License, LicenseEntitlement, LicenseEvent, LicenseSummary, OutboxMessage
+from licenses.services import issuance
+from licenses.services.issuance import issue_license_from_validated_data
+from licenses.tests.helpers import SigningKeyMixin, create_catalog
+
+
+class IssuanceTransactionTests(SigningKeyMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user, customer, edition = create_catalog()
+        self.data = {
+            "customer_id": customer.id,
+            "product_id": edition.product_id,
+            "edition_id": edition.id,
+            "license_type": "subscription",
+            "valid_from": datetime(2026, 1, 1, tzinfo=timezone.utc),
+            "valid_until": datetime(2027, 1, 1, tzinfo=timezone.utc),
+            "features": {"advanced_export": True},
+        }
+
+    def test_license_is_signed_before_the_transaction_opens(self):
+        sign = issuance.sign_license_payload
+        in_transaction = []
+
+        def signing(payload):
+            in_transaction.append(connection.in_atomic_block)
+            return sign(payload)
+
+        with mock.patch.object(issuance, "sign_license_payload", side_effect=signing):
+            signed, license_record = issue_license_from_validated_data(self.data, issued_by=self.user)
+
+        self.assertEqual(in_transaction, [False])
+        self.assertEqual(License.objects.get().signature, signed["signature"])
+        self.assertEqual(signed["payload"]["license_id"], str(license_record.license_id))
+
+    def test_failed_insert_leaves_nothing_behind(self):
+        with mock.patch.object(issuance, "record_license_created", side_effect=RuntimeError("summary down")):
+            with self.assertRaisesMessage(RuntimeError, "summary down"):
+                issue_license_from_validated_data(self.data, issued_by=self.user)
+
+        self.assertFalse(License.objects.exists())
+        self.assertFalse(LicenseEntitlement.objects.exists())
+        self.assertFalse(LicenseSummary.objects.exists())
+        self.assertFalse(LicenseEvent.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+        issue_license_from_validated_data(self.data, issued_by=self.user)
+        self.assertEqual(License.objects.count(), 1)
+        self.assertEqual(LicenseSummary.objects.get().count, 1)
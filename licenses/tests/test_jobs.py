@@ -0,0 +1,50 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+
+from licenses.models import Job, JobOutputChunk, License
+from licenses.services import jobs
+from licenses.tests.helpers import create_catalog
+
+
+class JobApiTests(TransactionTestCase):
+    def setUp(self):
+        self.user, _, _ = create_catalog()
+        self.client.force_login(self.user)
+
+    def test_malformed_kind_is_rejected(self):
+        for kind in (["issue_licenses"], {"x": 1}, 7, None, "unknown"):
+            with self.subTest(kind=kind):
+                response = self.client.post(
+                    "/api/jobs/",
+                    {"kind": kind, "params": {"license_ids": ["x"]}},
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("Unknown job kind", response.json()["detail"])
+
+    @override_settings(JOB_CHECKPOINT_SECONDS=0)
+    def test_output_survives_resume_on_another_worker(self):
+        license_ids = [str(uuid.uuid4()) for _ in range(3)]
+        job = jobs.enqueue_job("revoke_licenses", {"license_ids": license_ids}, created_by=self.user)
+
+        # The first worker checkpoints two items, then fails on the third.
+        self.assertEqual(jobs.claim_jobs("host-a:1", 1), [job.pk])
+        errors = [License.DoesNotExist(), License.DoesNotExist(), RuntimeError("boom")]
+        with mock.patch.object(jobs, "revoke_license", side_effect=errors):
+            self.assertEqual(jobs.run_job(job.pk, "host-a:1"), "queued")
+        self.assertEqual(JobOutputChunk.objects.filter(job=job).count(), 2)
+
+        Job.objects.filter(pk=job.pk).update(run_after=datetime.now(timezone.utc))
+        self.assertEqual(jobs.claim_jobs("host-b:1", 1), [job.pk])
+        self.assertEqual(jobs.run_job(job.pk, "host-b:1"), "succeeded")
+
+        response = self.client.get(f"/api/jobs/{job.pk}/output/")
+        self.assertEqual(response.status_code, 200)
+        body = b"".join(response.streaming_content)
+        self.assertEqual(len(body), Job.objects.get(pk=job.pk).output_bytes)
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2])
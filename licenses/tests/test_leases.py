@@ -0,0 +1,115 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from licenses.models import FloatingLease
+from licenses.services import leases
+from licenses.services.leases import LeaseLimitReached, LeaseManager, LeaseNotFound
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class _Clock:
+    """
+    Stands in for the time module in licenses.services.leases.
+    """
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+class LeaseManagerTests(TransactionTestCase):
+    def setUp(self):
+        user, customer, edition = create_catalog()
+        self.license = create_license(user, customer, edition, usage_limits={"max_concurrent_users": 2})
+        self.clock = _Clock()
+        patcher = mock.patch.object(leases, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = self._manager()
+
+    def _manager(self):
+        manager = LeaseManager(ttl_seconds=60, flush_interval=3600)
+        self.addCleanup(manager.stop)
+        return manager
+
+    def test_checkout_stops_at_the_limit(self):
+        first, used, limit = self.manager.checkout(self.license, "client-a")
+        self.assertEqual((used, limit), (1, 2))
+        self.manager.checkout(self.license, "client-b")
+        with self.assertRaises(LeaseLimitReached):
+            self.manager.checkout(self.license, "client-c")
+
+        # A client holding a lease gets the same one back.
+        again, used, _ = self.manager.checkout(self.license, "client-a")
+        self.assertEqual((again.lease_id, used), (first.lease_id, 2))
+
+        self.manager.release(self.license.license_id, first.lease_id)
+        self.manager.checkout(self.license, "client-c")
+
+    def test_leases_expire_unless_renewed(self):
+        kept, _, _ = self.manager.checkout(self.license, "client-a")
+        dropped, _, _ = self.manager.checkout(self.license, "client-b")
+
+        self.clock.now += 40
+        self.manager.heartbeat(self.license.license_id, kept.lease_id)
+        self.clock.now += 40
+
+        with self.assertRaises(LeaseNotFound):
+            self.manager.heartbeat(self.license.license_id, dropped.lease_id)
+        self.manager.heartbeat(self.license.license_id, kept.lease_id)
+        _, used, _ = self.manager.checkout(self.license, "client-c")
+        self.assertEqual(used, 2)
+
+    def test_flush_writes_changed_leases_and_deletes_ended_ones(self):
+        first, _, _ = self.manager.checkout(self.license, "client-a")
+        second, _, _ = self.manager.checkout(self.license, "client-b")
+        self.assertEqual(self.manager.flush(), (2, 0))
+        self.assertEqual(self.manager.flush(), (0, 0))
+
+        self.clock.now += 30
+        self.manager.heartbeat(self.license.license_id, first.lease_id)
+        self.manager.release(self.license.license_id, second.lease_id)
+        self.assertEqual(self.manager.flush(), (1, 1))
+
+        row = FloatingLease.objects.get()
+        self.assertEqual(row.lease_id, first.lease_id)
+        self.assertAlmostEqual(row.expires_at.timestamp(), self.clock.now + 60, places=3)
+
+    def test_pools_are_dropped_once_empty_and_flushed(self):
+        lease, _, _ = self.manager.checkout(self.license, "client-a")
+        self.manager.flush()
+        self.manager.release(self.license.license_id, lease.lease_id)
+        self.assertIn(self.license.license_id, self.manager._pools)
+
+        self.assertEqual(self.manager.flush(), (0, 1))
+
+        self.assertEqual(self.manager._pools, {})
+        self.assertFalse(FloatingLease.objects.exists())
+
+    def test_leases_are_restored_after_a_restart(self):
+        live, _, _ = self.manager.checkout(self.license, "client-a")
+        self.manager.checkout(self.license, "client-b")
+        self.manager.flush()
+        # client-b's row outlives its lease: the process stopped before reaping it.
+        FloatingLease.objects.exclude(lease_id=live.lease_id).update(
+            expires_at=FloatingLease.objects.get(lease_id=live.lease_id).expires_at - timedelta(seconds=59)
+        )
+        self.clock.now += 30
+
+        restarted = self._manager()
+        restarted.heartbeat(self.license.license_id, live.lease_id)
+        _, used, _ = restarted.checkout(self.license, "client-c")
+        self.assertEqual(used, 2)
+        with self.assertRaises(LeaseLimitReached):
+            restarted.checkout(self.license, "client-d")
+
+        self.assertEqual(restarted.flush(), (2, 1))
+        self.assertEqual(
+            sorted(FloatingLease.objects.values_list("client_id", flat=True)),
+            ["client-a", "client-c"],
+        )
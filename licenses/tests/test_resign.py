@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+
+from django.test import TestCase
+
+from keys.models import KeyMetadata
+from licenses.models import JobCheckpoint, License
+from licenses.services.canonical import _b64url_decode_no_padding, canonical_payload_bytes
+from licenses.services.resign import resign_licenses
+from licenses.services.verification import PublicKeyCache, check_signature
+from licenses.tests.helpers import SigningKeyMixin, create_catalog, create_license
+
+
+class _Interrupted(Exception):
+    pass
+
+
+class ResignTests(SigningKeyMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        KeyMetadata.objects.create(
+            id="key-old-v1", key_id="old-v1", alg="Ed25519", retired_at=datetime.now(timezone.utc)
+        )
+        user, customer, edition = create_catalog()
+        self.licenses = [
+            create_license(user, customer, edition, usage_limits={"max_machines": i}, meta_key_id="old-v1")
+            for i in range(5)
+        ]
+        revoked = create_license(user, customer, edition, meta_key_id="old-v1", status="revoked")
+        self.revoked_pk = revoked.pk
+
+    def _interrupt_after_first_batch(self, report):
+        raise _Interrupted
+
+    def test_an_interrupted_run_resumes_from_its_checkpoint(self):
+        with self.assertRaises(_Interrupted):
+            resign_licenses(batch_size=2, workers=1, progress=self._interrupt_after_first_batch)
+
+        checkpoint = JobCheckpoint.objects.get(name="resign:test-v1")
+        self.assertEqual(checkpoint.cursor["after"], str(self.licenses[1].pk))
+        self.assertEqual(checkpoint.cursor["resigned"], 2)
+        self.assertEqual(
+            list(License.objects.filter(meta_key_id="test-v1").order_by("pk").values_list("pk", flat=True)),
+            [record.pk for record in self.licenses[:2]],
+        )
+
+        report = resign_licenses(batch_size=2, workers=1)
+
+        self.assertEqual(report.resumed_from, str(self.licenses[1].pk))
+        self.assertEqual((report.resigned, report.resigned_this_run, report.batches), (5, 3, 2))
+        self.assertFalse(JobCheckpoint.objects.exists())
+        self.assertEqual(License.objects.get(pk=self.revoked_pk).meta_key_id, "old-v1")
+
+        keys = PublicKeyCache(self.key_dir)
+        for record in License.objects.filter(status="active"):
+            meta = {"version": record.meta_version, "alg": "Ed25519", "key_id": record.meta_key_id}
+            signed_bytes = canonical_payload_bytes(record.payload, record.meta_version)
+            self.assertIsNone(
+                check_signature(meta, signed_bytes, _b64url_decode_no_padding(record.signature), keys)
+            )
@@ -0,0 +1,184 @@
+import threading
+import time
+import unittest
+
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase, override_settings
+
+from customers.models import Customer
+from licenses.models import Activation, License, ShardAssignment
+from licenses.services.activation import activate_machine
+from licenses.services.rebalance import rebalance_customer
+from licenses.services.sharding import (
+    CustomerShardMoving,
+    _hash_shard,
+    _license_customer_id,
+    license_shard,
+    lock_customers,
+    lock_customers_for_write,
+)
+from licenses.tests.helpers import create_catalog, create_license, requires_databases
+from licensing_server.sharding import ShardNotSelected, ShardRouter
+
+
+@unittest.skipIf(connection.vendor == "sqlite", "SQLite has no advisory locks.")
+class CustomerLockTests(TransactionTestCase):
+    def _hold(self, customer_id, *, exclusive, events, held, release=None):
+        try:
+            with transaction.atomic():
+                lock_customers([customer_id], exclusive=exclusive)
+                events.append(("locked", customer_id, exclusive))
+                held.set()
+                if release is not None:
+                    release.wait(5)
+                # Still inside the transaction: the lock is released on commit.
+                events.append(("releasing", customer_id, exclusive))
+        finally:
+            connections.close_all()
+
+    def _start(self, *args, **kwargs):
+        thread = threading.Thread(target=self._hold, args=args, kwargs=kwargs)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return thread
+
+    def test_move_waits_for_writes_in_flight(self):
+        events = []
+        writer_held, mover_held, other_held, release = (threading.Event() for _ in range(4))
+        writer = self._start("cust-1", exclusive=False, events=events, held=writer_held, release=release)
+        self.assertTrue(writer_held.wait(5))
+
+        mover = self._start("cust-1", exclusive=True, events=events, held=mover_held)
+        # Another customer's writes are not held up.
+        self._start("cust-2", exclusive=False, events=events, held=other_held)
+        self.assertTrue(other_held.wait(5))
+        time.sleep(0.2)
+        self.assertFalse(mover_held.is_set())
+
+        release.set()
+        writer.join(5)
+        mover.join(5)
+        cust_1 = [event for event in events if event[1] == "cust-1"]
+        self.assertEqual(
+            cust_1,
+            [
+                ("locked", "cust-1", False),
+                ("releasing", "cust-1", False),
+                ("locked", "cust-1", True),
+                ("releasing", "cust-1", True),
+            ],
+        )
+
+    def test_locks_require_a_transaction(self):
+        with self.assertRaises(transaction.TransactionManagementError):
+            lock_customers(["cust-1"])
+
+
+def _customer_on(shard: str) -> str:
+    """
+    A customer id whose hash shard is `shard`.
+    """
+    return next(f"cust-{i}" for i in range(100) if _hash_shard(f"cust-{i}") == shard)
+
+
+@requires_databases("shard1", "shard2")
+@override_settings(LICENSE_SHARDS=["shard1", "shard2"])
+class ShardingTests(TransactionTestCase):
+    def setUp(self):
+        _license_customer_id.cache_clear()
+        self.addCleanup(_license_customer_id.cache_clear)
+        self.user, _, self.edition = create_catalog()
+        self.customers = {
+            shard: Customer.objects.create(id=_customer_on(shard), name=f"Customer on {shard}")
+            for shard in ("shard1", "shard2")
+        }
+
+    def _licenses(self, shard, count):
+        return [create_license(self.user, self.customers[shard], self.edition) for _ in range(count)]
+
+    def test_licenses_are_stored_on_the_customer_shard(self):
+        first = self._licenses("shard1", 2)
+        second = self._licenses("shard2", 3)
+
+        for shard, licenses in (("shard1", first), ("shard2", second)):
+            stored = License.objects.using(shard).values_list("license_id", flat=True)
+            self.assertEqual(set(stored), {license.license_id for license in licenses})
+        self.assertEqual(
+            dict(ShardAssignment.objects.values_list("customer_id", "shard")),
+            {customer.id: shard for shard, customer in self.customers.items()},
+        )
+
+        with self.assertRaises(ShardNotSelected):
+            License.objects.count()
+        with license_shard(second[0].license_id) as alias:
+            self.assertEqual(alias, "shard2")
+            self.assertEqual(License.objects.get(license_id=second[0].license_id).customer_id, self.customers["shard2"].id)
+
+    def test_listing_merges_shards_in_key_order(self):
+        # Interleaved, so neither shard's keys form one block of the order.
+        licenses = [self._licenses(shard, 1)[0] for shard in ["shard2", "shard1"] * 3 + ["shard2"]]
+        self.client.force_login(self.user)
+
+        pages, after = [], None
+        while True:
+            params = {"limit": 3, "columns": "license_id,customer_name"}
+            if after:
+                params["after"] = after
+            body = self.client.get("/api/licenses/", params).json()
+            pages.append(body["results"])
+            after = body["next_after"]
+            if after is None:
+                break
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        rows = [row for page in pages for row in page]
+        self.assertEqual([row["license_id"] for row in rows], sorted(str(license.license_id) for license in licenses))
+        names = {row["customer_name"] for row in rows}
+        self.assertEqual(names, {"Customer on shard1", "Customer on shard2"})
+
+    def test_moving_a_customer_copies_its_rows_and_switches_the_map(self):
+        licenses = self._licenses("shard1", 2)
+        activate_machine(license_id=licenses[0].license_id, machine_fingerprint="machine-1")
+        customer_id = self.customers["shard1"].id
+
+        copied = rebalance_customer(customer_id, "shard2", chunk_size=1)
+
+        self.assertEqual(copied["licenses.License"], 2)
+        self.assertEqual(copied["licenses.Activation"], 1)
+        self.assertFalse(License.objects.using("shard1").filter(customer_id=customer_id).exists())
+        self.assertEqual(License.objects.using("shard2").filter(customer_id=customer_id).count(), 2)
+        self.assertEqual(Activation.objects.using("shard2").get().machine_fingerprint, "machine-1")
+        self.assertEqual(ShardAssignment.objects.get(customer_id=customer_id).shard, "shard2")
+        self.assertIsNone(ShardAssignment.objects.get(customer_id=customer_id).moving_to)
+
+        # Writes follow the customer to its new shard.
+        activate_machine(license_id=licenses[0].license_id, machine_fingerprint="machine-2")
+        self.assertEqual(Activation.objects.using("shard2").count(), 2)
+        self.assertEqual(rebalance_customer(customer_id, "shard2"), {})
+
+    def test_writes_are_refused_while_the_customer_moves(self):
+        license_record = self._licenses("shard1", 1)[0]
+        customer_id = self.customers["shard1"].id
+        ShardAssignment.objects.filter(customer_id=customer_id).update(moving_to="shard2")
+
+        with self.assertRaises(CustomerShardMoving):
+            activate_machine(license_id=license_record.license_id, machine_fingerprint="machine-1")
+        with transaction.atomic():
+            shards = lock_customers_for_write([customer_id, self.customers["shard2"].id, "cust-new"])
+        self.assertEqual(shards, {self.customers["shard2"].id: "shard2", "cust-new": _hash_shard("cust-new")})
+
+        self.client.force_login(self.user)
+        url = f"/api/licenses/{license_record.license_id}/"
+        self.assertEqual(self.client.get(url + "status/").status_code, 200)
+        response = self.client.post(url + "activate/", {"machine_fingerprint": "machine-1"}, content_type="application/json")
+        self.assertEqual(response.status_code, 503)
+
+    def test_license_tables_are_only_migrated_on_shards(self):
+        router = ShardRouter()
+        self.assertIs(router.allow_migrate("default", "licenses", "license"), False)
+        self.assertIs(router.allow_migrate("default", "licenses", "activation"), False)
+        self.assertIsNone(router.allow_migrate("default", "licenses", "shardassignment"))
+        self.assertIsNone(router.allow_migrate("shard1", "licenses", "license"))
+        self.assertIsNone(router.allow_migrate("shard1", "customers", "customer"))
+        with override_settings(LICENSE_SHARDS=[]):
+            self.assertIsNone(router.allow_migrate("default", "licenses", "license"))
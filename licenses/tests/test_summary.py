@@ -0,0 +1,78 @@
+from datetime import date, datetime, timezone
+
+from django.test import TestCase
+
+from licenses.models import LicenseSummary
+from licenses.services.issuance import issue_license_from_validated_data
+from licenses.services.lifecycle import revoke_license, sweep_expired_licenses
+from licenses.services.summary import get_license_summary, rebuild_license_summary
+from licenses.tests.helpers import SigningKeyMixin, create_catalog
+
+
+class LicenseSummaryTests(SigningKeyMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user, self.customer, self.edition = create_catalog()
+
+    def _issue(self, valid_until, license_type="subscription"):
+        _, license_record = issue_license_from_validated_data(
+            {
+                "customer_id": self.customer.id,
+                "product_id": self.edition.product_id,
+                "edition_id": self.edition.id,
+                "license_type": license_type,
+                "valid_from": datetime(2025, 1, 1, tzinfo=timezone.utc),
+                "valid_until": valid_until,
+            },
+            issued_by=self.user,
+        )
+        return license_record
+
+    def _groups(self):
+        return {
+            (row.license_type, row.status, row.expiry_date): row.count
+            for row in LicenseSummary.objects.filter(count__gt=0)
+        }
+
+    def test_issue_revoke_and_expire_move_counts_between_groups(self):
+        first = self._issue(datetime(2030, 1, 1, tzinfo=timezone.utc))
+        self._issue(datetime(2030, 1, 1, 23, 59, tzinfo=timezone.utc))
+        self._issue(datetime(2025, 6, 1, tzinfo=timezone.utc), license_type="trial")
+        self.assertEqual(
+            self._groups(),
+            {
+                ("subscription", "active", date(2030, 1, 1)): 2,
+                ("trial", "active", date(2025, 6, 1)): 1,
+            },
+        )
+
+        revoke_license(first.license_id)
+        self.assertEqual(sweep_expired_licenses(), 1)
+
+        incremental = self._groups()
+        self.assertEqual(
+            incremental,
+            {
+                ("subscription", "active", date(2030, 1, 1)): 1,
+                ("subscription", "revoked", date(2030, 1, 1)): 1,
+                ("trial", "expired", date(2025, 6, 1)): 1,
+            },
+        )
+        self.assertEqual(rebuild_license_summary(), 3)
+        self.assertEqual(self._groups(), incremental)
+
+    def test_summary_groups_by_expiry_bucket(self):
+        self._issue(datetime(2026, 3, 3, tzinfo=timezone.utc))
+        self._issue(datetime(2026, 3, 20, tzinfo=timezone.utc))
+        self._issue(datetime(2027, 1, 1, tzinfo=timezone.utc))
+        self._issue(datetime(2026, 2, 1, tzinfo=timezone.utc), license_type="trial")
+
+        self.assertEqual(
+            get_license_summary(["license_type", "expiry_bucket"], today=date(2026, 3, 1)),
+            [
+                {"license_type": "subscription", "expiry_bucket": "later", "count": 1},
+                {"license_type": "subscription", "expiry_bucket": "next_30_days", "count": 1},
+                {"license_type": "subscription", "expiry_bucket": "next_7_days", "count": 1},
+                {"license_type": "trial", "expiry_bucket": "expired", "count": 1},
+            ],
+        )
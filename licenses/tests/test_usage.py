@@ -0,0 +1,108 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase
+
+from licenses.models import UsageEvent, UsageRollup
+from licenses.services.usage import MAX_QUANTITY, compact_usage, get_usage_against_limits, ingest_usage_events
+from licenses.tests.helpers import create_catalog, create_license
+
+
+class UsageIngestionTests(TestCase):
+    def setUp(self):
+        self.user, customer, edition = create_catalog()
+        self.license = create_license(
+            self.user, customer, edition, usage_limits={"max_runs_per_day": 10, "max_runs_per_hour": 3}
+        )
+        self.client.force_login(self.user)
+
+    def _event(self, **fields):
+        return {"license_id": str(self.license.license_id), "metric": "runs", **fields}
+
+    def test_valid_lines_are_accepted_and_invalid_ones_reported(self):
+        lines = [
+            self._event(),
+            self._event(quantity=MAX_QUANTITY, occurred_at="2026-01-01T00:00:00Z"),
+            self._event(quantity=MAX_QUANTITY + 1),
+            self._event(occurred_at="2026-01-01T23:00:00Z"),
+            self._event(quantity=True),
+            self._event(occurred_at="2026-01-01T00:00:00"),
+            {"license_id": "01a15257-942c-71a9-a9cb-7c5e4830e35c", "metric": "runs"},
+            self._event(metric=""),
+        ]
+        body = "\n".join(json.dumps(line) for line in lines)
+
+        response = self.client.post("/api/licenses/usage/", body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, 202)
+        result = response.json()
+        self.assertEqual(result["accepted"], 2)
+        self.assertEqual([item["index"] for item in result["rejected"]], [2, 3, 4, 5, 6, 7])
+        self.assertEqual(result["rejected"][0]["error"], f"'quantity' must be at most {MAX_QUANTITY}.")
+        self.assertEqual(
+            result["rejected"][1]["error"], "'quantity' would overflow the usage total for its bucket."
+        )
+        self.assertEqual(
+            sorted(UsageEvent.objects.values_list("quantity", flat=True)), [1, MAX_QUANTITY]
+        )
+
+    def test_rollups_total_events_per_hour_and_day(self):
+        ingest_usage_events(
+            [
+                self._event(quantity=2, occurred_at="2026-03-01T10:15:00Z"),
+                self._event(quantity=3, occurred_at="2026-03-01T10:45:00Z"),
+                self._event(quantity=4, occurred_at="2026-03-01T11:05:00+01:00"),
+                self._event(quantity=5, occurred_at="2026-03-02T00:30:00Z"),
+            ]
+        )
+        # A second batch adds to the existing buckets.
+        ingest_usage_events([self._event(quantity=1, occurred_at="2026-03-01T10:59:59Z")])
+
+        rollups = {
+            (granularity, bucket_start.isoformat()): (total, count)
+            for granularity, bucket_start, total, count in UsageRollup.objects.values_list(
+                "granularity", "bucket_start", "total", "event_count"
+            )
+        }
+        self.assertEqual(
+            rollups,
+            {
+                ("hour", "2026-03-01T10:00:00+00:00"): (10, 4),
+                ("hour", "2026-03-02T00:00:00+00:00"): (5, 1),
+                ("day", "2026-03-01T00:00:00+00:00"): (10, 4),
+                ("day", "2026-03-02T00:00:00+00:00"): (5, 1),
+            },
+        )
+
+        report = get_usage_against_limits(
+            self.license, now=datetime(2026, 3, 1, 10, 30, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            [(item["limit_key"], item["used"], item["exceeded"]) for item in report],
+            [("max_runs_per_day", 10, False), ("max_runs_per_hour", 10, True)],
+        )
+
+    def test_compaction_keeps_daily_rollups(self):
+        now = datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
+        ingest_usage_events(
+            [
+                self._event(occurred_at="2026-01-01T08:00:00Z"),
+                self._event(occurred_at="2026-05-31T08:00:00Z"),
+            ]
+        )
+        UsageEvent.objects.filter(occurred_at__year=2026, occurred_at__month=1).update(
+            received_at=now - timedelta(days=8)
+        )
+        UsageEvent.objects.filter(occurred_at__month=5).update(received_at=now - timedelta(days=1))
+
+        totals = compact_usage(raw_retention_days=7, hourly_retention_days=90, chunk_size=1, now=now)
+
+        self.assertEqual(totals, {"raw_events_deleted": 1, "hourly_rollups_deleted": 1})
+        self.assertEqual(UsageEvent.objects.get().occurred_at.month, 5)
+        self.assertEqual(
+            sorted(
+                (granularity, bucket_start.month)
+                for granularity, bucket_start in UsageRollup.objects.values_list("granularity", "bucket_start")
+            ),
+            [("day", 1), ("day", 5), ("hour", 5)],
+        )
@@ -0,0 +1,33 @@
+import random
+
+from django.test import SimpleTestCase
+
+from licenses.tests.issue_requests import compiled_result, mutated_request, serializer_result, valid_request
+
+
+class IssueValidationDifferentialTests(SimpleTestCase):
+    """
+    The compiled issuance validator must agree with
+    LicenseIssueRequestSerializer on validated data, errors and codes.
+    """
+
+    def assertSameResult(self, data):
+        self.assertEqual(compiled_result(data), serializer_result(data), data)
+
+    def test_non_finite_numbers_in_json_fields_are_rejected(self):
+        rng = random.Random(1)
+        for field, value in [
+            ("features", {"ratio": float("nan")}),
+            ("features", [1.0, float("inf")]),
+            ("usage_limits", {"max_runs_per_day": float("-inf")}),
+            ("deployment", {"nested": {"weights": [float("nan")]}}),
+        ]:
+            data = {**valid_request(rng), field: value}
+            with self.subTest(field=field, value=value):
+                self.assertSameResult(data)
+                self.assertEqual(compiled_result(data)[0], "invalid")
+
+    def test_generated_requests(self):
+        rng = random.Random(1)
+        for _ in range(3000):
+            self.assertSameResult(mutated_request(rng))
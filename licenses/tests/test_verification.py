@@ -0,0 +1,85 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from licenses.services.signing import encode_binary_license, sign_license_payload
+from licenses.tests.helpers import SigningKeyMixin
+
+
+class VerifyLicenseScriptTests(SigningKeyMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.license_dir = self.key_dir / "licenses"
+        self.license_dir.mkdir()
+
+    def _payload(self, license_id, valid_until="2100-01-01T00:00:00Z"):
+        return {
+            "license_id": license_id,
+            "customer": {"id": "cust-1", "name": "Acme"},
+            "validity": {"valid_from": "2020-01-01T00:00:00Z", "valid_until": valid_until},
+        }
+
+    def _write(self, name, data):
+        path = self.license_dir / name
+        path.write_bytes(data if isinstance(data, bytes) else json.dumps(data).encode("utf-8"))
+        return str(path)
+
+    def _verify(self, *args):
+        completed = subprocess.run(
+            [sys.executable, "-m", "scripts.verify_license", "--key-dir", str(self.key_dir), "--json", *args],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        results = [json.loads(line) for line in completed.stdout.splitlines()]
+        return completed.returncode, {result["path"]: result for result in results}
+
+    def test_valid_licenses_pass(self):
+        json_path = self._write("v1.license", sign_license_payload(self._payload("lic-1")))
+        with override_settings(LICENSE_META_VERSION=2):
+            signed = sign_license_payload(self._payload("lic-2"))
+        binary_path = self._write(
+            "v2.license", encode_binary_license(signed["meta"], signed["payload"], signed["signature"])
+        )
+
+        returncode, results = self._verify(str(self.license_dir))
+
+        self.assertEqual(returncode, 0)
+        self.assertEqual(
+            {path: (result["ok"], result["license_id"], result["meta_version"]) for path, result in results.items()},
+            {json_path: (True, "lic-1", 1), binary_path: (True, "lic-2", 2)},
+        )
+
+    def test_bad_licenses_fail_without_stopping_the_batch(self):
+        good = self._write("good.license", sign_license_payload(self._payload("lic-1")))
+        tampered_license = sign_license_payload(self._payload("lic-2"))
+        tampered_license["payload"]["customer"]["name"] = "Someone else"
+        tampered = self._write("tampered.license", tampered_license)
+        expired = self._write(
+            "expired.license", sign_license_payload(self._payload("lic-3", valid_until="2021-01-01T00:00:00Z"))
+        )
+        invalid_key = sign_license_payload(self._payload("lic-4"))
+        invalid_key["meta"]["key_id"] = 5
+        bad_key = self._write("bad-key.license", invalid_key)
+        malformed = self._write("malformed.license", b"LICB\x02\x06")
+
+        returncode, results = self._verify(good, tampered, expired, bad_key, malformed)
+
+        self.assertEqual(returncode, 1)
+        self.assertEqual(
+            {path: (result["ok"], result["reason"]) for path, result in results.items()},
+            {
+                good: (True, None),
+                tampered: (False, "Signature does not match payload."),
+                expired: (False, "Expired at 2021-01-01T00:00:00Z."),
+                bad_key: (False, "Invalid key_id 5."),
+                malformed: (False, "Malformed binary license: Unexpected end of data."),
+            },
+        )
+
+        returncode, results = self._verify("--no-validity", "--failures-only", good, expired)
+        self.assertEqual((returncode, results), (0, {}))
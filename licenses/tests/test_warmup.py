@@ -0,0 +1,39 @@
+import json
+from unittest import mock
+
+from django.test import TransactionTestCase
+
+from customers.services import search
+from licenses.services import warmup
+from licenses.tests.helpers import create_catalog
+from products.services.catalog import get_catalog_document
+
+
+class WarmupTests(TransactionTestCase):
+    def test_database_warm_up_renders_the_catalog_and_customer_index(self):
+        search.reset_customer_index()
+        self.addCleanup(search.reset_customer_index)
+        create_catalog()
+
+        timings = warmup.warm_up_database()
+
+        self.assertGreaterEqual(timings["catalog"], 0)
+        self.assertGreaterEqual(timings["customer_index"], 0)
+        with self.assertNumQueries(0):
+            _, document = get_catalog_document()
+            matches = search.customer_index().search("acme", 10)
+        self.assertEqual(json.loads(document)["products"][0]["editions"][0]["id"], "ed-1")
+        self.assertEqual([match.id for match in matches], ["cust-1"])
+
+    def test_failing_step_is_logged_and_skipped(self):
+        def broken():
+            raise FileNotFoundError("no key")
+
+        steps = [("broken", broken), ("fine", lambda: None)]
+        with mock.patch.object(warmup, "WARMUP_STEPS", steps), self.assertLogs(warmup.logger, "WARNING") as logs:
+            timings = warmup.warm_up()
+
+        self.assertEqual(timings["broken"], -1.0)
+        self.assertGreaterEqual(timings["fine"], 0)
+        self.assertIn("'broken' failed", logs.output[0])
+        self.assertIn("FileNotFoundError: no key", logs.output[0])
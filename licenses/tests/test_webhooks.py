@@ -0,0 +1,162 @@
+import hashlib
+import hmac
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import TransactionTestCase, override_settings
+
+from licenses.models import LicenseEvent, OutboxMessage, WebhookEndpoint
+from licenses.services.webhooks import (
+    SIGNATURE_HEADER,
+    HTTPConnectionPool,
+    dispatch_due_messages,
+    enqueue_webhooks,
+    requeue_dead_messages,
+)
+
+
+class _Receiver:
+    """
+    In-process webhook receiver: records every POST and answers with the
+    next status from `statuses` (200 once they run out).
+    """
+
+    def __init__(self, statuses=()):
+        self.requests = []
+        self.statuses = list(statuses)
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                receiver.requests.append((self.path, dict(self.headers), body))
+                status = receiver.statuses.pop(0) if receiver.statuses else 200
+                self.send_response(status)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def events(self):
+        return [event for _, _, body in self.requests for event in json.loads(body)["events"]]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(WEBHOOK_MAX_ATTEMPTS=3, WEBHOOK_BACKOFF_BASE_SECONDS=10, WEBHOOK_BACKOFF_MAX_SECONDS=60)
+class WebhookDispatchTests(TransactionTestCase):
+    def setUp(self):
+        self.pool = HTTPConnectionPool(timeout=5)
+        self.addCleanup(self.pool.close)
+
+    def _receiver(self, statuses=()):
+        receiver = _Receiver(statuses)
+        self.addCleanup(receiver.close)
+        return receiver
+
+    def _enqueue(self, endpoint, count, *, attempts=0):
+        now = datetime.now(timezone.utc)
+        OutboxMessage.objects.bulk_create(
+            OutboxMessage(
+                endpoint=endpoint,
+                event_type="issued",
+                payload={"seq": seq, "event_type": "issued"},
+                attempts=attempts,
+                next_attempt_at=now,
+            )
+            for seq in range(1, count + 1)
+        )
+
+    def test_delivers_signed_batches(self):
+        receiver = self._receiver()
+        endpoint = WebhookEndpoint.objects.create(id="wh-1", url=receiver.url, secret="s3cret")
+        self._enqueue(endpoint, 5)
+
+        totals = dispatch_due_messages(self.pool, batch_size=2)
+
+        self.assertEqual(totals, {"claimed": 5, "delivered": 5, "retried": 0, "dead": 0})
+        self.assertEqual([len(json.loads(body)["events"]) for _, _, body in receiver.requests], [2, 2, 1])
+        self.assertEqual(sorted(event["seq"] for event in receiver.events()), [1, 2, 3, 4, 5])
+        for path, headers, body in receiver.requests:
+            self.assertEqual(path, "/hook")
+            expected = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+            self.assertEqual(headers[SIGNATURE_HEADER], expected)
+        self.assertEqual(OutboxMessage.objects.filter(status="delivered", attempts=1).count(), 5)
+        # Nothing is due any more.
+        self.assertEqual(dispatch_due_messages(self.pool)["claimed"], 0)
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        receiver = self._receiver(statuses=[503])
+        endpoint = WebhookEndpoint.objects.create(id="wh-1", url=receiver.url)
+        self._enqueue(endpoint, 3)
+
+        before = datetime.now(timezone.utc)
+        totals = dispatch_due_messages(self.pool)
+
+        self.assertEqual(totals, {"claimed": 3, "delivered": 0, "retried": 3, "dead": 0})
+        for message in OutboxMessage.objects.all():
+            self.assertEqual(message.status, "pending")
+            self.assertEqual(message.attempts, 1)
+            self.assertTrue(message.last_error.startswith("HTTP 503"))
+            # First retry: between half and all of the 10 s base delay.
+            self.assertGreaterEqual(message.next_attempt_at, before + timedelta(seconds=5))
+            self.assertLessEqual(message.next_attempt_at, datetime.now(timezone.utc) + timedelta(seconds=10))
+        # Not due yet, so the next round claims nothing.
+        self.assertEqual(dispatch_due_messages(self.pool)["claimed"], 0)
+
+        OutboxMessage.objects.update(next_attempt_at=datetime.now(timezone.utc))
+        totals = dispatch_due_messages(self.pool)
+        self.assertEqual(totals["delivered"], 3)
+        self.assertEqual(OutboxMessage.objects.filter(status="delivered", attempts=2).count(), 3)
+
+    def test_unreachable_endpoint_is_retried(self):
+        receiver = self._receiver()
+        url = receiver.url
+        receiver.close()
+        endpoint = WebhookEndpoint.objects.create(id="wh-1", url=url)
+        self._enqueue(endpoint, 1)
+
+        totals = dispatch_due_messages(self.pool)
+
+        self.assertEqual(totals["retried"], 1)
+        self.assertIn("ConnectionRefusedError", OutboxMessage.objects.get().last_error)
+
+    @override_settings(WEBHOOK_SKIP_CUSTOMER_PREFIXES=("loadtest-",))
+    def test_skipped_customers_get_no_messages(self):
+        WebhookEndpoint.objects.create(id="wh-1", url="http://127.0.0.1:9/hook")
+        now = datetime.now(timezone.utc)
+        events = [
+            LicenseEvent(seq=seq, license_id=str(seq), event_type="issued", data={"customer_id": customer_id}, created_at=now)
+            for seq, customer_id in enumerate(["cust-1", "loadtest-cust-0", "loadtest-cust-1"], start=1)
+        ]
+
+        self.assertEqual(enqueue_webhooks(events), 1)
+        self.assertEqual(OutboxMessage.objects.get().payload["seq"], 1)
+
+    def test_dead_letter_after_max_attempts_and_requeue(self):
+        receiver = self._receiver(statuses=[500])
+        endpoint = WebhookEndpoint.objects.create(id="wh-1", url=receiver.url)
+        self._enqueue(endpoint, 2, attempts=2)
+
+        totals = dispatch_due_messages(self.pool)
+
+        self.assertEqual(totals, {"claimed": 2, "delivered": 0, "retried": 0, "dead": 2})
+        self.assertEqual(OutboxMessage.objects.filter(status="dead", attempts=3).count(), 2)
+        self.assertEqual(dispatch_due_messages(self.pool)["claimed"], 0)
+
+        self.assertEqual(requeue_dead_messages("wh-1"), 2)
+        self.assertEqual(dispatch_due_messages(self.pool)["delivered"], 2)
+        self.assertEqual(sorted(event["seq"] for event in receiver.events()), [1, 1, 2, 2])
@@ -2,9 +2,52 @@
 
 from django.urls import path
 
-from .views import IssueLicenseView, DownloadLicenseView
+from .views import (
+    IssueLicenseView,
+    LicenseListView,
+    DownloadLicenseView,
+    LicenseStatusView,
+    ActivateLicenseView,
+    DeactivateLicenseView,
+    LeaseCheckoutView,
+    LeaseHeartbeatView,
+    LeaseReleaseView,
+    UsageIngestView,
+    LicenseUsageView,
+    LicenseExportView,
+    RevokeLicenseView,
+    LicenseSummaryView,
+    EntitlementLicensesView,
+    EntitlementCustomersView,
+)
 
 urlpatterns = [
+    path("", LicenseListView.as_view(), name="license-list"),
     path("issue/", IssueLicenseView.as_view(), name="license-issue"),
-    path("<str:license_id>/download/", DownloadLicenseView.as_view(), name="license-download"),
+    path("usage/", UsageIngestView.as_view(), name="license-usage-ingest"),
+    path("export/", LicenseExportView.as_view(), name="license-export"),
+    path("summary/", LicenseSummaryView.as_view(), name="license-summary"),
+    path("entitlements/", EntitlementLicensesView.as_view(), name="license-entitlements"),
+    path(
+        "entitlements/customers/",
+        EntitlementCustomersView.as_view(),
+        name="license-entitlement-customers",
+    ),
+    path("<uuid:license_id>/download/", DownloadLicenseView.as_view(), name="license-download"),
+    path("<uuid:license_id>/status/", LicenseStatusView.as_view(), name="license-status"),
+    path("<uuid:license_id>/revoke/", RevokeLicenseView.as_view(), name="license-revoke"),
+    path("<uuid:license_id>/activate/", ActivateLicenseView.as_view(), name="license-activate"),
+    path("<uuid:license_id>/deactivate/", DeactivateLicenseView.as_view(), name="license-deactivate"),
+    path("<uuid:license_id>/usage/", LicenseUsageView.as_view(), name="license-usage"),
+    path("<uuid:license_id>/leases/", LeaseCheckoutView.as_view(), name="license-lease-checkout"),
+    path(
+        "<uuid:license_id>/leases/<str:lease_id>/heartbeat/",
+        LeaseHeartbeatView.as_view(),
+        name="license-lease-heartbeat",
+    ),
+    path(
+        "<uuid:license_id>/leases/<str:lease_id>/",
+        LeaseReleaseView.as_view(),
+        name="license-lease-release",
+    ),
 ]
@@ -0,0 +1,238 @@
+# licenses/validation.py
+
+"""
+Compiled validators for request serializers.
+
+compile_serializer() turns a plain DRF Serializer class into a single
+function over dict input. Each field is compiled to a conversion for its
+common, valid input (a str for CharField, an ISO 8601 string for
+DateTimeField, ...) and hands anything else to the DRF field itself, so
+errors, codes and validated data are those of serializer.is_valid();
+only the per-field framework overhead is skipped. Input that is not a
+plain dict (e.g., form data) goes through the serializer unchanged.
+
+The differential check and the per-item cost are in
+`manage.py benchmark_issue_validation`.
+"""
+
+import functools
+import uuid
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import ProhibitNullCharactersValidator
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601, SkipField, empty, get_error_detail
+from rest_framework.settings import api_settings
+from rest_framework.utils import html, json
+from rest_framework.validators import ProhibitSurrogateCharactersValidator
+
+from .serializers import LicenseIssueRequestSerializer
+
+
+FieldStep = Callable[[Any], Any]
+
+
+def _char_step(field: serializers.CharField) -> FieldStep | None:
+    default_validators = [type(v) for v in field.validators] == [
+        ProhibitNullCharactersValidator,
+        ProhibitSurrogateCharactersValidator,
+    ]
+    if not (field.trim_whitespace and default_validators):
+        return None
+
+    run_validation = field.run_validation
+
+    def step(value):
+        if type(value) is str and value.isascii() and "\x00" not in value:
+            stripped = value.strip()
+            if stripped:
+                return stripped
+        return run_validation(value)
+
+    return step
+
+
+def _choice_step(field: serializers.ChoiceField) -> FieldStep | None:
+    if field.validators:
+        return None
+
+    choices = field.choice_strings_to_values
+    run_validation = field.run_validation
+
+    def step(value):
+        if type(value) is str and value in choices:
+            return choices[value]
+        return run_validation(value)
+
+    return step
+
+
+def _datetime_step(field: serializers.DateTimeField) -> FieldStep | None:
+    input_formats = getattr(field, "input_formats", api_settings.DATETIME_INPUT_FORMATS)
+    if field.validators or [f.lower() for f in input_formats] != [ISO_8601]:
+        return None
+
+    enforce_timezone = field.enforce_timezone
+    run_validation = field.run_validation
+
+    def step(value):
+        if type(value) is str:
+            try:
+                parsed = parse_datetime(value)
+            except ValueError:
+                parsed = None
+            if parsed is not None:
+                return enforce_timezone(parsed)
+        return run_validation(value)
+
+    return step
+
+
+def _json_step(field: serializers.JSONField) -> FieldStep | None:
+    if field.validators or field.binary:
+        return None
+
+    encoder = field.encoder
+    run_validation = field.run_validation
+
+    def step(value):
+        if type(value) in (dict, list):
+            # DRF's json module (allow_nan=False), as JSONField uses: NaN
+            # and Infinity are rejected, not passed through.
+            try:
+                json.dumps(value, cls=encoder)
+            except (TypeError, ValueError):
+                pass
+            else:
+                return value
+        return run_validation(value)
+
+    return step
+
+
+def _uuid_step(field: serializers.UUIDField) -> FieldStep | None:
+    if field.validators:
+        return None
+
+    run_validation = field.run_validation
+
+    def step(value):
+        if type(value) is str:
+            try:
+                return uuid.UUID(hex=value)
+            except ValueError:
+                pass
+        return run_validation(value)
+
+    return step
+
+
+# Matched on the exact class: subclasses (e.g., EmailField) validate more.
+_FIELD_STEPS: Tuple[Tuple[type, Callable[[Any], FieldStep | None]], ...] = (
+    (serializers.CharField, _char_step),
+    (serializers.ChoiceField, _choice_step),
+    (serializers.DateTimeField, _datetime_step),
+    (serializers.JSONField, _json_step),
+    (serializers.UUIDField, _uuid_step),
+)
+
+
+def _compile_field(field: serializers.Field) -> FieldStep:
+    for field_class, compile_step in _FIELD_STEPS:
+        if type(field) is field_class:
+            step = compile_step(field)
+            if step is not None:
+                return step
+    return field.run_validation
+
+
+class CompiledSerializer:
+    """
+    serializer.is_valid() for one Serializer class, compiled per field.
+
+    Use compile_serializer() to build one; instances are shared and
+    thread-safe (the bound fields hold no per-call state).
+    """
+
+    def __init__(self, serializer_class: type[serializers.Serializer]):
+        if isinstance(serializer_class, type) and issubclass(serializer_class, serializers.ModelSerializer):
+            raise TypeError("compile_serializer() supports plain Serializer classes only.")
+
+        self.serializer_class = serializer_class
+        self._prototype = serializer_class()
+        self._steps: List[Tuple[str, bool, FieldStep, Callable[[Any], Any] | None]] = []
+        for field in self._prototype._writable_fields:
+            if field.source_attrs != [field.field_name] or field.default is not empty:
+                raise TypeError(
+                    f"Field '{field.field_name}' uses a source or default; "
+                    "compile_serializer() does not support it."
+                )
+            self._steps.append(
+                (
+                    field.field_name,
+                    field.required,
+                    _compile_field(field),
+                    getattr(self._prototype, f"validate_{field.field_name}", None),
+                )
+            )
+
+    def validate(self, data: Any) -> Dict[str, Any]:
+        """
+        Validated data for data, or serializers.ValidationError carrying
+        the same detail as serializer.errors.
+        """
+        if not isinstance(data, Mapping) or html.is_html_input(data):
+            serializer = self.serializer_class(data=data)
+            serializer.is_valid(raise_exception=True)
+            return serializer.validated_data
+
+        attrs: Dict[str, Any] = {}
+        errors: Dict[str, Any] = {}
+        for name, required, step, validate_method in self._steps:
+            value = data.get(name, empty)
+            if value is empty and not required:
+                continue
+            try:
+                value = step(value)
+                if validate_method is not None:
+                    value = validate_method(value)
+            except serializers.ValidationError as exc:
+                errors[name] = exc.detail
+            except DjangoValidationError as exc:
+                errors[name] = get_error_detail(exc)
+            except SkipField:
+                pass
+            else:
+                attrs[name] = value
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        try:
+            if self._prototype.validators:
+                self._prototype.run_validators(attrs)
+            attrs = self._prototype.validate(attrs)
+        except (serializers.ValidationError, DjangoValidationError) as exc:
+            raise serializers.ValidationError(detail=serializers.as_serializer_error(exc))
+        return attrs
+
+
+def compile_serializer(serializer_class: type[serializers.Serializer]) -> CompiledSerializer:
+    return CompiledSerializer(serializer_class)
+
+
+@functools.lru_cache(maxsize=None)
+def _issue_request_validator() -> CompiledSerializer:
+    return compile_serializer(LicenseIssueRequestSerializer)
+
+
+def validate_issue_request(data: Any) -> Dict[str, Any]:
+    """
+    LicenseIssueRequestSerializer(data=data) validation without the
+    per-field DRF overhead. Raises serializers.ValidationError with the
+    serializer's error detail.
+    """
+    return _issue_request_validator().validate(data)
@@ -1,12 +1,74 @@
 # licenses/views.py
 
+import os
+import uuid
+from datetime import datetime, timezone
+
 from rest_framework import status, permissions
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
+from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
-from .models import License
-from .serializers import LicenseIssueRequestSerializer
+from licensing_server.db_pool import pool_stats
+
+from .models import Job, License
+from .parsers import NDJSONParser
+from .renderers import LicenseBinaryRenderer
+from .serializers import (
+    ActivationRequestSerializer,
+    LeaseCheckoutRequestSerializer,
+    LicenseRevokeRequestSerializer,
+)
+from .validation import validate_issue_request
+from .services.activation import (
+    activate_machine,
+    deactivate_machine,
+    get_machine_limit,
+    ActivationError,
+    ActivationLimitReached,
+)
+from .services.leases import (
+    get_lease_manager,
+    LeaseError,
+    LeaseLimitReached,
+    LeaseNotFound,
+)
+from .services.export import (
+    build_export_queryset,
+    export_page,
+    parse_export_columns,
+    stream_license_export,
+    LicenseExportError,
+)
+from .services.archive import archived_license_file, find_archived_license
+from .services.entitlements import (
+    COMPARISONS,
+    EntitlementQueryError,
+    entitlement_customer_page,
+    entitlement_filter,
+    entitlement_license_page,
+    parse_entitlement_value,
+)
+from .services.events import wait_for_events
+from .services.jobs import (
+    cancel_job,
+    enqueue_job,
+    get_job,
+    job_output_chunks,
+    JobError,
+)
+from .services.lifecycle import revoke_license, LicenseStatusError
+from .services.summary import get_license_summary, SUMMARY_DIMENSIONS
+from .services.signing import encode_binary_license
+from .services.usage import (
+    get_usage_against_limits,
+    ingest_usage_events,
+    UsageIngestionError,
+)
 from .services.issuance import (
     issue_license_from_validated_data,
     LicenseIssuanceError,
@@ -23,17 +85,19 @@ class IssueLicenseView(APIView):
       "license_id": "...",
       "db_id": "..."
     }
+
+    The body is validated as LicenseIssueRequestSerializer, through its
+    compiled validator (licenses/validation.py).
     """
 
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        serializer = LicenseIssueRequestSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        validated_data = validate_issue_request(request.data)
 
         try:
             signed_obj, license_record = issue_license_from_validated_data(
-                serializer.validated_data,
+                validated_data,
                 issued_by=request.user,
             )
         except LicenseIssuanceError as exc:
@@ -45,7 +109,7 @@ class IssueLicenseView(APIView):
         response_data = {
             "license": signed_obj,
             "license_id": license_record.license_id,
-            "db_id": license_record.id,
+            "db_id": license_record.pk,
         }
         return Response(response_data, status=status.HTTP_201_CREATED)
 
@@ -60,21 +124,871 @@ class DownloadLicenseView(APIView):
       "payload": { ... },
       "signature": "..."
     }
+
+    Clients sending "Accept: application/vnd.license+binary" receive the
+    compact binary file instead (meta.version 2 licenses only; 406 otherwise).
+
+    Archived licenses are served from the archive.
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, LicenseBinaryRenderer]
 
     def get(self, request, license_id: str, *args, **kwargs):
+        license_record = License.objects.filter(license_id=license_id).first()
+        if license_record is not None:
+            license_json = {
+                "meta": {
+                    "version": license_record.meta_version,
+                    "alg": license_record.meta_alg,
+                    "key_id": license_record.meta_key_id,
+                },
+                "payload": license_record.payload,
+                "signature": license_record.signature,
+            }
+        else:
+            tombstone = find_archived_license(license_id)
+            if tombstone is None:
+                raise Http404
+            license_json = archived_license_file(tombstone)
+
+        if request.accepted_renderer.format == LicenseBinaryRenderer.format:
+            if license_json["meta"]["version"] != 2:
+                return Response(
+                    {"detail": "Binary encoding is only available for meta.version 2 licenses."},
+                    status=status.HTTP_406_NOT_ACCEPTABLE,
+                )
+            response = Response(
+                encode_binary_license(
+                    license_json["meta"],
+                    license_json["payload"],
+                    license_json["signature"],
+                ),
+                status=status.HTTP_200_OK,
+            )
+            response["Content-Disposition"] = f'attachment; filename="{license_id}.license"'
+            return response
+
+        return Response(license_json, status=status.HTTP_200_OK)
+
+
+class LicenseStatusView(APIView):
+    """
+    GET /api/licenses/{license_id}/status/
+
+    Current status of a license, including archived ones:
+    {
+      "license_id": "...",
+      "status": "expired",
+      "valid_until": "...",
+      "archived": true,
+      "archived_at": "..."
+    }
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, license_id: str, *args, **kwargs):
+        license_record = (
+            License.objects.filter(license_id=license_id)
+            .only("pk", "status", "valid_until")
+            .first()
+        )
+        if license_record is not None:
+            response_data = {
+                "license_id": license_record.license_id,
+                "status": license_record.status,
+                "valid_until": license_record.valid_until,
+                "archived": False,
+                "archived_at": None,
+            }
+            return Response(response_data, status=status.HTTP_200_OK)
+
+        tombstone = find_archived_license(license_id)
+        if tombstone is None:
+            raise Http404
+
+        response_data = {
+            "license_id": tombstone.license_id,
+            "status": tombstone.status,
+            "valid_until": tombstone.valid_until,
+            "archived": True,
+            "archived_at": tombstone.archived_at,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class ActivateLicenseView(APIView):
+    """
+    POST /api/licenses/{license_id}/activate/
+
+    Takes a seat for a machine (idempotent per machine_fingerprint) and returns:
+    {
+      "license_id": "...",
+      "machine_fingerprint": "...",
+      "activated_at": "...",
+      "seats_used": 3,
+      "seats_limit": 10
+    }
+
+    Responds 409 when every seat is in use.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, license_id: str, *args, **kwargs):
+        serializer = ActivationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            activation, created = activate_machine(
+                license_id=license_id,
+                machine_fingerprint=serializer.validated_data["machine_fingerprint"],
+                hostname=serializer.validated_data.get("hostname") or None,
+            )
+        except License.DoesNotExist:
+            raise Http404
+        except ActivationLimitReached as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except ActivationError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        license_record = License.objects.only("payload", "activation_count").get(
+            pk=activation.license_id
+        )
+
+        response_data = {
+            "license_id": license_id,
+            "machine_fingerprint": activation.machine_fingerprint,
+            "activated_at": activation.activated_at,
+            "seats_used": license_record.activation_count,
+            "seats_limit": get_machine_limit(license_record),
+        }
+        return Response(
+            response_data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class DeactivateLicenseView(APIView):
+    """
+    POST /api/licenses/{license_id}/deactivate/
+
+    Releases the seat held by machine_fingerprint. Returns 204 on success.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, license_id: str, *args, **kwargs):
+        serializer = ActivationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            deactivate_machine(
+                license_id=license_id,
+                machine_fingerprint=serializer.validated_data["machine_fingerprint"],
+            )
+        except License.DoesNotExist:
+            raise Http404
+        except ActivationError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def _lease_expiry(lease) -> str:
+    return datetime.fromtimestamp(lease.expires_at, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class LeaseCheckoutView(APIView):
+    """
+    POST /api/licenses/{license_id}/leases/
+
+    Checks out a floating seat (reusing the client's live lease) and returns:
+    {
+      "lease_id": "...",
+      "expires_at": "...",
+      "ttl_seconds": 180,
+      "seats_used": 4,
+      "seats_limit": 25
+    }
+
+    Responds 409 when every floating seat is leased.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, license_id: str, *args, **kwargs):
+        serializer = LeaseCheckoutRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
         license_record = get_object_or_404(License, license_id=license_id)
+        manager = get_lease_manager()
+
+        try:
+            lease, seats_used, seats_limit = manager.checkout(
+                license_record,
+                serializer.validated_data["client_id"],
+            )
+        except LeaseLimitReached as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except LeaseError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        license_json = {
-            "meta": {
-                "version": license_record.meta_version,
-                "alg": license_record.meta_alg,
-                "key_id": license_record.meta_key_id,
-            },
-            "payload": license_record.payload,
-            "signature": license_record.signature,
+        response_data = {
+            "lease_id": lease.lease_id,
+            "expires_at": _lease_expiry(lease),
+            "ttl_seconds": manager.ttl_seconds,
+            "seats_used": seats_used,
+            "seats_limit": seats_limit,
         }
+        return Response(response_data, status=status.HTTP_201_CREATED)
+
+
+class LeaseHeartbeatView(APIView):
+    """
+    POST /api/licenses/{license_id}/leases/{lease_id}/heartbeat/
+
+    Extends a live lease. Responds 404 once the lease has expired, in which
+    case the client must check out again.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, license_id: str, lease_id: str, *args, **kwargs):
+        try:
+            lease = get_lease_manager().heartbeat(license_id, lease_id)
+        except LeaseNotFound as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            {"lease_id": lease.lease_id, "expires_at": _lease_expiry(lease)},
+            status=status.HTTP_200_OK,
+        )
+
+
+class LeaseReleaseView(APIView):
+    """
+    DELETE /api/licenses/{license_id}/leases/{lease_id}/
+
+    Returns the seat to the pool. Returns 204 on success.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def delete(self, request, license_id: str, lease_id: str, *args, **kwargs):
+        try:
+            get_lease_manager().release(license_id, lease_id)
+        except LeaseNotFound as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UsageIngestView(APIView):
+    """
+    POST /api/licenses/usage/
+
+    Accepts a batch of usage events as NDJSON (application/x-ndjson) or a
+    JSON array, one event per line/item (blank lines are skipped and do not
+    count towards the rejection index):
+    { "license_id": "...", "metric": "runs", "quantity": 1, "occurred_at": "..." }
+
+    Returns:
+    {
+      "accepted": 998,
+      "rejected": [ { "index": 17, "error": "..." } ]
+    }
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [NDJSONParser, JSONParser]
+
+    def post(self, request, *args, **kwargs):
+        events = request.data
+        if not isinstance(events, list):
+            return Response(
+                {"detail": "Expected NDJSON lines or a JSON array of events."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            result = ingest_usage_events(events)
+        except UsageIngestionError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(result, status=status.HTTP_202_ACCEPTED)
+
+
+class LicenseUsageView(APIView):
+    """
+    GET /api/licenses/{license_id}/usage/
+
+    Returns current-bucket usage for every max_<metric>_per_<hour|day> limit:
+    {
+      "license_id": "...",
+      "usage": [
+        { "limit_key": "max_runs_per_day", "metric": "runs", "used": 12, "limit": 50, ... }
+      ]
+    }
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, license_id: str, *args, **kwargs):
+        license_record = get_object_or_404(
+            License.objects.only("pk", "payload"),
+            license_id=license_id,
+        )
+
+        response_data = {
+            "license_id": license_record.license_id,
+            "usage": get_usage_against_limits(license_record),
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class LicenseListView(APIView):
+    """
+    GET /api/licenses/?after=<license pk>&limit=100&columns=a,b,c
+
+    Admin listing in primary-key order, merged across shards:
+    {
+      "results": [ { "license_id": "...", "status": "active", ... } ],
+      "next_after": "<pk of the last row, or null on the last page>"
+    }
+
+    Accepts the export filters (status, product_id, edition_id, customer_id)
+    and column names.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    MAX_LIMIT = 500
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            after = uuid.UUID(params["after"]) if params.get("after") else None
+        except ValueError:
+            return Response(
+                {"detail": "after must be a license ID."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(params.get("limit", 100))
+            columns = parse_export_columns(params.get("columns"))
+        except ValueError:
+            return Response(
+                {"detail": "limit must be an integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except LicenseExportError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows, next_after = export_page(
+            build_export_queryset(
+                status=params.get("status"),
+                product_id=params.get("product_id"),
+                edition_id=params.get("edition_id"),
+                customer_id=params.get("customer_id"),
+            ),
+            columns,
+            after=after,
+            limit=max(1, min(limit, self.MAX_LIMIT)),
+        )
+
+        response_data = {
+            "results": rows,
+            "next_after": next_after,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+def _entitlement_query(params):
+    """
+    (condition, status, limit) from entitlement query parameters.
+    Raises EntitlementQueryError for invalid ones.
+    """
+    comparisons = {}
+    for op in COMPARISONS:
+        if op in params:
+            comparisons[op] = parse_entitlement_value(params[op])
+    condition = entitlement_filter(
+        params.get("key", ""),
+        section=params.get("section") or None,
+        value=parse_entitlement_value(params["value"]) if "value" in params else None,
+        comparisons=comparisons,
+    )
+
+    license_status = params.get("status", "active")
+    if license_status not in {choice for choice, _ in License.STATUS_CHOICES} | {"any"}:
+        raise EntitlementQueryError("status must be a license status or 'any'.")
+
+    try:
+        limit = int(params.get("limit", 100))
+    except ValueError as exc:
+        raise EntitlementQueryError("limit must be an integer.") from exc
+
+    return condition, None if license_status == "any" else license_status, limit
+
+
+class EntitlementLicensesView(APIView):
+    """
+    GET /api/licenses/entitlements/?key=advanced_export&value=true
+    GET /api/licenses/entitlements/?key=max_runs_per_day&gt=100
+
+    Licenses having a feature or usage limit, from the entitlement index:
+    {
+      "results": [
+        { "license_id": "...", "customer_id": "...", "product_id": "...",
+          "edition_id": "...", "status": "active", "valid_until": "...",
+          "entitlements": { "usage_limits": { "max_runs_per_day": 500 } } }
+      ],
+      "next_after": "<license_id of the last row, or null on the last page>"
+    }
+
+    key is required. Optional: value (JSON: true, 100, "pro"), gt/gte/lt/lte
+    (numbers), section (features | usage_limits), status (default active;
+    "any" for all), after and limit.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    MAX_LIMIT = 500
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            condition, license_status, limit = _entitlement_query(params)
+            after = uuid.UUID(params["after"]) if params.get("after") else None
+        except EntitlementQueryError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ValueError:
+            return Response(
+                {"detail": "after must be a license ID."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows, next_after = entitlement_license_page(
+            condition,
+            status=license_status,
+            after=after,
+            limit=max(1, min(limit, self.MAX_LIMIT)),
+        )
+
+        response_data = {
+            "results": rows,
+            "next_after": next_after,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class EntitlementCustomersView(APIView):
+    """
+    GET /api/licenses/entitlements/customers/?key=advanced_export&value=true
+
+    Customers having a license with a feature or usage limit (same
+    parameters as /api/licenses/entitlements/, with after a customer id):
+    {
+      "results": [ { "customer_id": "cust-1", "license_count": 2 } ],
+      "next_after": "<customer_id of the last row, or null on the last page>"
+    }
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    MAX_LIMIT = 1000
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            condition, license_status, limit = _entitlement_query(params)
+        except EntitlementQueryError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows, next_after = entitlement_customer_page(
+            condition,
+            status=license_status,
+            after=params.get("after") or None,
+            limit=max(1, min(limit, self.MAX_LIMIT)),
+        )
+
+        response_data = {
+            "results": rows,
+            "next_after": next_after,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class LicenseExportView(APIView):
+    """
+    GET /api/licenses/export/?output=csv|ndjson&columns=a,b,c&gzip=1
+
+    Streams every matching license without loading the table into memory.
+    Optional filters: status, product_id, edition_id, customer_id.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        output_format = params.get("output", "csv")
+        use_gzip = params.get("gzip", "").lower() in ("1", "true", "yes")
+
+        try:
+            columns = parse_export_columns(params.get("columns"))
+            chunks = stream_license_export(
+                build_export_queryset(
+                    status=params.get("status"),
+                    product_id=params.get("product_id"),
+                    edition_id=params.get("edition_id"),
+                    customer_id=params.get("customer_id"),
+                ),
+                columns=columns,
+                output_format=output_format,
+                gzip=use_gzip,
+            )
+        except LicenseExportError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        content_type = "text/csv" if output_format == "csv" else "application/x-ndjson"
+        filename = f"licenses.{output_format}"
+        if use_gzip:
+            content_type = "application/gzip"
+            filename += ".gz"
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class RevokeLicenseView(APIView):
+    """
+    POST /api/licenses/{license_id}/revoke/
+
+    Marks the license as revoked and returns:
+    { "license_id": "...", "status": "revoked" }
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, license_id: str, *args, **kwargs):
+        serializer = LicenseRevokeRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            license_record = revoke_license(
+                license_id,
+                reason=serializer.validated_data.get("reason") or None,
+            )
+        except License.DoesNotExist:
+            if find_archived_license(license_id) is None:
+                raise Http404
+            return Response(
+                {"detail": f"License '{license_id}' is archived; restore it first."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except LicenseStatusError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        response_data = {
+            "license_id": license_record.license_id,
+            "status": license_record.status,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class LicenseSummaryView(APIView):
+    """
+    GET /api/licenses/summary/?group_by=product,status,expiry_bucket
+
+    Returns license counts from the incrementally maintained summary table:
+    {
+      "group_by": ["product", "status", "expiry_bucket"],
+      "groups": [ { "product": "...", "status": "active", "expiry_bucket": "next_30_days", "count": 12 } ]
+    }
+
+    expiry_bucket is one of: expired, next_7_days, next_30_days, next_90_days, later.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        raw = request.query_params.get("group_by")
+        group_by = [name.strip() for name in raw.split(",") if name.strip()] if raw else list(SUMMARY_DIMENSIONS)
+
+        unknown = [name for name in group_by if name not in SUMMARY_DIMENSIONS]
+        if unknown:
+            return Response(
+                {"detail": f"Unknown group_by dimension(s): {', '.join(unknown)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response_data = {
+            "group_by": group_by,
+            "groups": get_license_summary(group_by),
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class LicenseEventFeedView(APIView):
+    """
+    GET /api/events/?after=<seq>&limit=500&wait=30
+
+    Returns journal events with seq > after, oldest first:
+    {
+      "events": [ { "seq": 42, "license_id": "...", "event_type": "revoked", "data": {...}, "created_at": "..." } ],
+      "next_after": 42
+    }
+
+    With wait > 0 the request is held (long poll) until an event arrives or
+    the wait elapses; wait is capped by LICENSE_EVENTS_MAX_WAIT_SECONDS.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    MAX_LIMIT = 1000
+
+    def get(self, request, *args, **kwargs):
+        try:
+            after = int(request.query_params.get("after", 0))
+            limit = int(request.query_params.get("limit", 500))
+            wait = float(request.query_params.get("wait", 0))
+        except ValueError:
+            return Response(
+                {"detail": "after and limit must be integers; wait must be a number."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        wait = max(0.0, min(wait, settings.LICENSE_EVENTS_MAX_WAIT_SECONDS))
+
+        events = wait_for_events(
+            after,
+            limit=limit,
+            wait_seconds=wait,
+            poll_interval=settings.LICENSE_EVENTS_POLL_INTERVAL_SECONDS,
+        )
+
+        response_data = {
+            "events": [
+                {
+                    "seq": event.seq,
+                    "license_id": event.license_id,
+                    "event_type": event.event_type,
+                    "data": event.data,
+                    "created_at": event.created_at,
+                }
+                for event in events
+            ],
+            "next_after": events[-1].seq if events else after,
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    GET /api/ops/db-pool/
+
+    Connection pool metrics of the process serving the request, per
+    database alias (see licensing_server.db_pool.pool_stats):
+    {
+      "pid": 1234,
+      "pools": { "default": { "max_size": 20, "in_use": 3, "saturation": 0.15, "wait_ms_avg": 0.4, ... } }
+    }
+
+    "pools" is empty when pooling is off or no connection was made yet.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        response_data = {
+            "pid": os.getpid(),
+            "pools": pool_stats(),
+        }
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+def _job_data(job: Job) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "progress": {"done": job.progress_done, "total": job.progress_total},
+        "result": job.result,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "cancel_requested": job.cancel_requested,
+        "last_error": job.last_error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class JobEnqueueView(APIView):
+    """
+    POST /api/jobs/
+
+    Enqueues a background job for `manage.py run_workers`:
+    { "kind": "issue_licenses", "params": { "requests": [ { ...issue request... } ] } }
+
+    Kinds and params:
+    - issue_licenses:  { "requests": [...] }  (bodies of POST /api/licenses/issue/)
+    - renew_licenses:  { "license_ids": [...], "days": 365 }  (days defaults to the original term)
+    - revoke_licenses: { "license_ids": [...], "reason": "..." }
+    - export_licenses: { "output": "csv|ndjson", "columns": "a,b", "gzip": true, "status": ..., ... }
+
+    Returns 202 with the job (see GET /api/jobs/{job_id}/). Items are
+    checked by the worker, so the request does not grow with the batch.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        data = request.data if isinstance(request.data, dict) else {}
+        try:
+            job = enqueue_job(
+                data.get("kind"),
+                data.get("params"),
+                created_by=request.user,
+            )
+        except JobError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(_job_data(job), status=status.HTTP_202_ACCEPTED)
+
+
+class JobDetailView(APIView):
+    """
+    GET /api/jobs/{job_id}/
+
+    Returns the job's status and progress:
+    {
+      "job_id": "...",
+      "kind": "issue_licenses",
+      "status": "queued|running|succeeded|failed|cancelled",
+      "progress": { "done": 1200, "total": 5000 },
+      "result": { "succeeded": 1198, "failed": 2 },
+      ...
+    }
+
+    Per-item results (or the export) are at GET /api/jobs/{job_id}/output/.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, job_id: str, *args, **kwargs):
+        try:
+            job = get_job(job_id)
+        except Job.DoesNotExist:
+            raise Http404
+
+        return Response(_job_data(job), status=status.HTTP_200_OK)
+
+
+class JobCancelView(APIView):
+    """
+    POST /api/jobs/{job_id}/cancel/
+
+    Cancels a queued job; a running job stops at its next checkpoint
+    (cancel_requested is true until it does). 409 for finished jobs.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, job_id: str, *args, **kwargs):
+        try:
+            job = cancel_job(job_id)
+        except Job.DoesNotExist:
+            raise Http404
+        except JobError as exc:
+            return Response(
+                {"detail": str(exc)},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(_job_data(job), status=status.HTTP_200_OK)
+
+
+class JobOutputView(APIView):
+    """
+    GET /api/jobs/{job_id}/output/
+
+    Downloads the output of a finished job: one JSON line per item
+    ({"index": 0, "license_id": "..."} or {"index": 1, "detail": "..."})
+    or the export file. 409 while the job is queued or running.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, job_id: str, *args, **kwargs):
+        try:
+            job = get_job(job_id)
+        except Job.DoesNotExist:
+            raise Http404
+
+        if job.status in ("queued", "running"):
+            return Response(
+                {"detail": f"Job '{job.id}' has not finished yet ({job.status})."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if not job.output_file:
+            return Response(
+                {"detail": f"Job '{job.id}' has no output."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
 
-        return Response(license_json, status=status.HTTP_200_OK)
\ No newline at end of file
+        content_type = "application/x-ndjson"
+        if job.output_file.endswith(".gz"):
+            content_type = "application/gzip"
+        elif job.output_file.endswith(".csv"):
+            content_type = "text/csv"
+        response = StreamingHttpResponse(job_output_chunks(job), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{job.output_file}"'
+        response["Content-Length"] = str(job.output_bytes)
+        return response
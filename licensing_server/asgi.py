@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'licensing_server.settings')
 
 application = get_asgi_application()
+
+if settings.LICENSE_WARMUP:
+    from licenses.services.warmup import warm_up_database
+
+    warm_up_database()
@@ -0,0 +1,75 @@
+# licensing_server/db_pool.py
+
+"""
+Connection pooling helpers.
+
+Pooling itself is Django's (OPTIONS["pool"] with psycopg 3 and
+psycopg_pool): each process keeps one bounded pool per database alias, a
+request borrows a connection for its lifetime and returns it when Django
+closes the connection at request end. CONN_HEALTH_CHECKS makes the pool
+check each connection before lending it out. This module reads the pool
+metrics back and lets long-waiting code hand its connection back in the
+meantime.
+"""
+
+from typing import Any, Dict
+
+from django.db import connections
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-alias pool metrics for this process (empty when pooling is off).
+
+    Counters are cumulative since the pool was opened:
+
+    - requests / requests_queued: connections borrowed, and how many of
+      those had to wait for a free one (queued_ratio = saturation over time);
+    - wait_ms_total / wait_ms_avg: time spent waiting for a connection;
+    - timeouts: borrows that gave up after the pool timeout;
+    - in_use / size / max_size: connections lent out right now, opened,
+      and allowed (saturation = in_use / max_size);
+    - waiting: requests queued right now.
+    """
+    # Imported here: the PostgreSQL backend needs psycopg, which SQLite
+    # profiles may not have installed.
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    stats = {}
+    for alias, pool in sorted(DatabaseWrapper._connection_pools.items()):
+        raw = pool.get_stats()
+        requests = raw.get("requests_num", 0)
+        size = raw.get("pool_size", 0)
+        in_use = size - raw.get("pool_available", 0)
+        stats[alias] = {
+            "min_size": raw.get("pool_min", 0),
+            "max_size": raw.get("pool_max", 0),
+            "size": size,
+            "in_use": in_use,
+            "waiting": raw.get("requests_waiting", 0),
+            "saturation": round(in_use / raw["pool_max"], 3) if raw.get("pool_max") else 0.0,
+            "requests": requests,
+            "requests_queued": raw.get("requests_queued", 0),
+            "queued_ratio": round(raw.get("requests_queued", 0) / requests, 3) if requests else 0.0,
+            "wait_ms_total": raw.get("requests_wait_ms", 0),
+            "wait_ms_avg": round(raw.get("requests_wait_ms", 0) / requests, 3) if requests else 0.0,
+            "timeouts": raw.get("requests_errors", 0),
+            "connections_opened": raw.get("connections_num", 0),
+            "connections_lost": raw.get("connections_lost", 0),
+            "returns_bad": raw.get("returns_bad", 0),
+        }
+    return stats
+
+
+def release_pooled_connections() -> None:
+    """
+    Return this thread's idle pooled connections to their pools.
+
+    For code that sleeps between queries inside a request (long polling),
+    so waiting requests do not pin pool slots. Connections in a
+    transaction, and unpooled connections (reconnecting would cost more
+    than holding them), are left alone.
+    """
+    for connection in connections.all(initialized_only=True):
+        if getattr(connection, "pool", None) and not connection.in_atomic_block:
+            connection.close()
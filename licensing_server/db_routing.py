@@ -0,0 +1,173 @@
+# licensing_server/db_routing.py
+
+"""
+Primary / read-replica routing.
+
+- Requests with an unsafe method (POST, DELETE, ...) use the primary
+  ("default") for everything, so issuance and other writes read their own
+  rows and lock on the primary.
+- Safe requests (GET, HEAD, OPTIONS) read from a replica in
+  READ_REPLICA_DATABASES, except:
+    * users, sessions and content types (PRIMARY_ONLY_APPS), so a login
+      or session written a moment ago is always found,
+    * inside a transaction on the primary,
+    * after the request itself wrote something,
+    * for READ_YOUR_WRITES_SECONDS after a write by the same user
+      (tracked in the Django cache, so multi-process deployments need a
+      shared cache backend for stickiness to hold across workers).
+- Code running outside a request (management commands, background threads)
+  always uses the primary.
+"""
+
+import contextvars
+import random
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+
+PRIMARY_DATABASE = "default"
+
+PRIMARY_ONLY_APPS = frozenset({"auth", "sessions", "contenttypes"})
+
+_STICKY_CACHE_KEY = "db-routing:sticky:{user_pk}"
+
+
+@dataclass
+class _RequestRouting:
+    request: object
+    use_primary: bool
+    wrote: bool = False
+    sticky_checked: bool = False
+
+
+_routing: contextvars.ContextVar[_RequestRouting | None] = contextvars.ContextVar(
+    "db_routing",
+    default=None,
+)
+
+
+def _replica_aliases():
+    return getattr(settings, "READ_REPLICA_DATABASES", [])
+
+
+def _user_id(request):
+    """
+    Id of the request's user, or None if anonymous.
+
+    Session authentication leaves request.user as Django's lazy user (DRF
+    keeps the same object). It is not evaluated from inside the router,
+    which would itself issue routed queries; the session names the user.
+    """
+    user = vars(request).get("user")
+    if isinstance(user, SimpleLazyObject):
+        if user._wrapped is empty:
+            session = getattr(request, "session", None)
+            return session.get(SESSION_KEY) if session is not None else None
+        user = user._wrapped
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def _check_sticky(state: _RequestRouting) -> None:
+    user_pk = _user_id(state.request)
+    if user_pk is None:
+        return
+    state.sticky_checked = True
+    if cache.get(_STICKY_CACHE_KEY.format(user_pk=user_pk)):
+        state.use_primary = True
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router implementing the rules in the module docstring.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return PRIMARY_DATABASE
+        state = _routing.get()
+        replicas = _replica_aliases()
+        if state is None or not replicas:
+            return PRIMARY_DATABASE
+
+        if not state.sticky_checked and not state.use_primary:
+            _check_sticky(state)
+        if state.use_primary or connections[PRIMARY_DATABASE].in_atomic_block:
+            return PRIMARY_DATABASE
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+            state.use_primary = True
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY_DATABASE, *_replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return True
+
+
+def _iterate_with_routing(content, state: _RequestRouting):
+    """
+    Apply the request's routing while a streaming response is consumed,
+    which happens after the middleware has returned.
+    """
+    iterator = iter(content)
+    while True:
+        token = _routing.set(state)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            _routing.reset(token)
+        yield chunk
+
+
+class ReadReplicaMiddleware:
+    """
+    Sets up per-request routing state and records writes for stickiness.
+
+    Must come after AuthenticationMiddleware.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = _RequestRouting(
+            request=request,
+            use_primary=request.method not in self.SAFE_METHODS,
+        )
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if response.streaming:
+            response.streaming_content = _iterate_with_routing(response.streaming_content, state)
+
+        if state.wrote:
+            user_pk = _user_id(request)
+            if user_pk is not None:
+                cache.set(
+                    _STICKY_CACHE_KEY.format(user_pk=user_pk),
+                    True,
+                    timeout=settings.READ_YOUR_WRITES_SECONDS,
+                )
+        return response
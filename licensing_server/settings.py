@@ -43,6 +43,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'licensing_server.db_routing.ReadReplicaMiddleware',
+    'licensing_server.sharding.ShardMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,6 +82,65 @@ DATABASES = {
     }
 }
 
+# Connection pool per process and database alias (psycopg 3 + psycopg_pool;
+# see licensing_server/db_pool.py). Off by default: with DB_POOL_MAX_SIZE=0
+# each request opens a fresh connection. When enabling it, size the pools
+# so that processes x max_size stays below the server's max_connections.
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "0"))
+if DB_POOL_MAX_SIZE > 0:
+    # Pre-ping: the pool checks a connection before lending it out and
+    # replaces it if the check fails.
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = (
+        os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    )
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": DB_POOL_MAX_SIZE,
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10")),
+            # Connections are replaced after this age and closed after this
+            # long unused (down to min_size).
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300")),
+        },
+    }
+
+# Read replicas of the default database: comma-separated hosts, same
+# credentials. Safe (GET/HEAD) requests read from them; see
+# licensing_server/db_routing.py.
+READ_REPLICA_DATABASES = []
+for index, host in enumerate(
+    (h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()),
+    start=1,
+):
+    DATABASES[f"replica{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "TEST": {"MIRROR": "default"},
+    }
+    READ_REPLICA_DATABASES.append(f"replica{index}")
+
+# License shards: comma-separated hosts, same credentials and database
+# name. When set, licenses and their activations, leases and usage live on
+# the shards (aliases shard1..N), partitioned by customer; see
+# licensing_server/sharding.py. Run migrate with --database=shardN for each.
+LICENSE_SHARDS = []
+for index, host in enumerate(
+    (h.strip() for h in os.getenv("DB_SHARD_HOSTS", "").split(",") if h.strip()),
+    start=1,
+):
+    DATABASES[f"shard{index}"] = {**DATABASES["default"], "HOST": host}
+    LICENSE_SHARDS.append(f"shard{index}")
+
+DATABASE_ROUTERS = [
+    "licensing_server.sharding.ShardRouter",
+    "licensing_server.db_routing.PrimaryReplicaRouter",
+]
+
+# Seconds a user's reads stay on the primary after they wrote something.
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
 
 # Password validation
 
@@ -140,5 +201,104 @@ SIGNING_KEY_ID = os.getenv(
     "main-v1",  
 )
 
+# Directory holding <key_id>-private.pem for keys other than SIGNING_KEY_ID
+# (used when re-signing licenses during key rotation).
+SIGNING_KEY_DIR = os.getenv(
+    "SIGNING_KEY_DIR",
+    str(Path(PRIVATE_KEY_PATH).parent),
+)
+
+# 1 = canonical JSON (default), 2 = compact binary (see licenses/services/binary_format.py)
 LICENSE_META_VERSION = int(os.getenv("LICENSE_META_VERSION", "1"))
 LICENSE_META_ALG = os.getenv("LICENSE_META_ALG", "Ed25519")
+
+# --- Startup warm-up ---
+
+# Preload the signing key, views, serializers and ORM caches in
+# LicensesConfig.ready() (also for management commands), and the rendered
+# catalog and customer search index when the WSGI/ASGI application
+# loads, so the first request after boot is not slow (see
+# licenses/services/warmup.py).
+LICENSE_WARMUP = os.getenv("LICENSE_WARMUP", "false").lower() == "true"
+
+# --- Floating license leases ---
+
+# Seconds a lease survives without a heartbeat.
+LEASE_TTL_SECONDS = int(os.getenv("LEASE_TTL_SECONDS", "180"))
+# Seconds between write-behind flushes of in-memory lease state to the DB.
+LEASE_FLUSH_INTERVAL_SECONDS = float(os.getenv("LEASE_FLUSH_INTERVAL_SECONDS", "10"))
+
+# --- Usage reporting ---
+
+# Maximum number of NDJSON events accepted per ingestion request.
+USAGE_MAX_EVENTS_PER_REQUEST = int(os.getenv("USAGE_MAX_EVENTS_PER_REQUEST", "10000"))
+# Days raw usage events are kept before compact_usage prunes them.
+USAGE_RAW_RETENTION_DAYS = int(os.getenv("USAGE_RAW_RETENTION_DAYS", "7"))
+# Days hourly rollups are kept; daily rollups are kept indefinitely.
+USAGE_HOURLY_RETENTION_DAYS = int(os.getenv("USAGE_HOURLY_RETENTION_DAYS", "90"))
+
+# --- Customer sync ---
+
+# Maximum number of records accepted by one POST /api/customers/sync/.
+CUSTOMER_SYNC_MAX_RECORDS = int(os.getenv("CUSTOMER_SYNC_MAX_RECORDS", "100000"))
+
+# --- Customer search ---
+
+# Upper bound for ?limit= on GET /api/customers/search/.
+CUSTOMER_SEARCH_MAX_RESULTS = int(os.getenv("CUSTOMER_SEARCH_MAX_RESULTS", "50"))
+# Each process's in-memory search index picks up changes immediately when
+# processes share the cache, and at least this often otherwise.
+CUSTOMER_SEARCH_REFRESH_SECONDS = float(os.getenv("CUSTOMER_SEARCH_REFRESH_SECONDS", "30"))
+
+# --- Product catalog ---
+
+# Lifetime of the cached catalog document and version. Saves invalidate
+# the catalog immediately in the process (or shared cache) that made
+# them; this bounds staleness elsewhere.
+CATALOG_CACHE_SECONDS = int(os.getenv("CATALOG_CACHE_SECONDS", "300"))
+
+# --- License archive ---
+
+# Days after expiry (valid_until) or supersession before archive_licenses
+# moves a license out of the hot License table.
+LICENSE_ARCHIVE_AFTER_DAYS = int(os.getenv("LICENSE_ARCHIVE_AFTER_DAYS", "365"))
+
+# --- License event feed ---
+
+# Upper bound for ?wait= on GET /api/events/ (long polling).
+LICENSE_EVENTS_MAX_WAIT_SECONDS = float(os.getenv("LICENSE_EVENTS_MAX_WAIT_SECONDS", "30"))
+LICENSE_EVENTS_POLL_INTERVAL_SECONDS = float(os.getenv("LICENSE_EVENTS_POLL_INTERVAL_SECONDS", "0.5"))
+
+# --- Webhook outbox ---
+
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))
+WEBHOOK_TIMEOUT_SECONDS = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "10"))
+# Attempts before a message is dead-lettered.
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_BACKOFF_BASE_SECONDS = float(os.getenv("WEBHOOK_BACKOFF_BASE_SECONDS", "5"))
+WEBHOOK_BACKOFF_MAX_SECONDS = float(os.getenv("WEBHOOK_BACKOFF_MAX_SECONDS", "3600"))
+# Events of customers whose id starts with one of these prefixes get no
+# outbox messages (the synthetic customers of the loadtest command).
+WEBHOOK_SKIP_CUSTOMER_PREFIXES = tuple(
+    prefix.strip()
+    for prefix in os.getenv("WEBHOOK_SKIP_CUSTOMER_PREFIXES", "loadtest-").split(",")
+    if prefix.strip()
+)
+
+# --- Background jobs ---
+
+# Attempts before a job fails for good; retries wait an exponential
+# backoff (with jitter) between these bounds.
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_BACKOFF_BASE_SECONDS = float(os.getenv("JOB_BACKOFF_BASE_SECONDS", "30"))
+JOB_BACKOFF_MAX_SECONDS = float(os.getenv("JOB_BACKOFF_MAX_SECONDS", "900"))
+# A running job whose worker has not renewed its lease for this long is
+# requeued (run_workers renews leases every poll).
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Progress of idempotent steps (revocations, export rows) is saved at most
+# this often; issuance and renewal save it after every license.
+JOB_CHECKPOINT_SECONDS = float(os.getenv("JOB_CHECKPOINT_SECONDS", "1"))
+JOB_MAX_ITEMS = int(os.getenv("JOB_MAX_ITEMS", "100000"))
+# Job results and exports are stored in the database (JobOutputChunk);
+# output is buffered in the worker and saved in pieces of about this size.
+JOB_OUTPUT_CHUNK_BYTES = int(os.getenv("JOB_OUTPUT_CHUNK_BYTES", str(1024 * 1024)))
@@ -0,0 +1,30 @@
+# licensing_server/settings_sqlite_replica.py
+
+"""
+Local profile with a primary and a read replica as two SQLite files.
+
+Nothing replicates between the files, which makes routing easy to observe:
+rows written through the API exist only in the primary until copied over.
+
+    export DJANGO_SETTINGS_MODULE=licensing_server.settings_sqlite_replica
+    python manage.py migrate
+    python manage.py migrate --database=replica1
+    cp db-primary.sqlite3 db-replica.sqlite3   # "replicate" a snapshot
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db-primary.sqlite3",
+    },
+    "replica1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db-replica.sqlite3",
+    },
+}
+
+READ_REPLICA_DATABASES = ["replica1"]
@@ -0,0 +1,35 @@
+# licensing_server/settings_sqlite_shards.py
+
+"""
+Local profile with license data split over two SQLite shards.
+
+"default" holds customers, products, users and the shard map; licenses and
+their activations, leases and usage go to shard1 / shard2 by customer.
+
+    export DJANGO_SETTINGS_MODULE=licensing_server.settings_sqlite_shards
+    python manage.py migrate
+    python manage.py migrate --database=shard1
+    python manage.py migrate --database=shard2
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+    },
+    "shard1": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db-shard1.sqlite3",
+    },
+    "shard2": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db-shard2.sqlite3",
+    },
+}
+
+READ_REPLICA_DATABASES = []
+LICENSE_SHARDS = ["shard1", "shard2"]
@@ -0,0 +1,29 @@
+# licensing_server/settings_test.py
+
+"""
+Test profile on SQLite, with a spare read replica and two spare shards.
+
+READ_REPLICA_DATABASES and LICENSE_SHARDS stay empty, so tests run
+against "default" as a single-database deployment does. Routing and
+sharding tests switch them on with override_settings.
+
+    python manage.py test --settings=licensing_server.settings_test
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+
+DATABASES = {
+    alias: {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / f"db-test-{alias}.sqlite3",
+    }
+    for alias in ("default", "replica1", "shard1", "shard2")
+}
+
+READ_REPLICA_DATABASES = []
+LICENSE_SHARDS = []
+
+# Fast hashing for the test users.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
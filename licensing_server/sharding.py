@@ -0,0 +1,194 @@
+# licensing_server/sharding.py
+
+"""
+Optional sharding of customer-scoped license data by customer_id.
+
+LICENSE_SHARDS lists the database aliases that hold License and the tables
+hanging off it (SHARDED_MODELS); everything else (customers, products,
+users, keys, events, summary, outbox) stays on "default". With
+LICENSE_SHARDS empty, sharding is off and nothing here changes routing
+or migrations.
+
+For a sharded model, ShardRouter picks the database from, in order:
+
+- the instance hint: a fetched sharded object stays on its shard, and a
+  Customer resolves to its own shard (customer.licenses.all());
+- the shard selected with use_shard(), set per request by ShardMiddleware
+  for URLs carrying a license_id and by services that know the customer;
+- for a new License, the shard of its customer.
+
+Any other query on a sharded model raises ShardNotSelected rather than
+quietly reading a single shard. The shard map itself (customer -> shard) is
+licenses.services.sharding.
+"""
+
+import contextlib
+import contextvars
+
+from django.conf import settings
+from django.http import JsonResponse
+
+
+SHARDED_MODELS = frozenset(
+    {
+        "licenses.license",
+        "licenses.activation",
+        "licenses.floatinglease",
+        "licenses.usageevent",
+        "licenses.usagerollup",
+        "licenses.licenseentitlement",
+        "licenses.archivedlicense",
+    }
+)
+
+_current_shard: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_shard",
+    default=None,
+)
+
+
+class ShardNotSelected(Exception):
+    """
+    Raised when a sharded model is queried without a shard to route to.
+    """
+    pass
+
+
+def sharding_enabled() -> bool:
+    return bool(getattr(settings, "LICENSE_SHARDS", None))
+
+
+def shard_aliases() -> list[str]:
+    """
+    Databases holding license data: the shards, or just "default".
+    """
+    return list(settings.LICENSE_SHARDS) if sharding_enabled() else ["default"]
+
+
+def current_shard() -> str:
+    """
+    Database of the selected shard ("default" when sharding is off).
+
+    Use for transaction.atomic(using=...) and raw cursors in code that
+    touches sharded models.
+    """
+    if not sharding_enabled():
+        return "default"
+    alias = _current_shard.get()
+    if alias is None:
+        raise ShardNotSelected("No license shard selected; wrap the call in use_shard().")
+    return alias
+
+
+def shard_of(instance) -> str | None:
+    """
+    Shard a fetched sharded object lives on, or None when sharding is off.
+    """
+    return instance._state.db if sharding_enabled() else None
+
+
+@contextlib.contextmanager
+def use_shard(alias: str | None):
+    """
+    Route sharded models to alias inside the block. None leaves routing alone.
+    """
+    if alias is None:
+        yield None
+        return
+    token = _current_shard.set(alias)
+    try:
+        yield alias
+    finally:
+        _current_shard.reset(token)
+
+
+def _is_sharded(model) -> bool:
+    return model._meta.label_lower in SHARDED_MODELS
+
+
+class ShardRouter:
+    """
+    Database router for SHARDED_MODELS. Defers to the next router for
+    everything else (and for everything when sharding is off).
+    """
+
+    def _db_for(self, model, **hints):
+        if not sharding_enabled() or not _is_sharded(model):
+            return None
+
+        instance = hints.get("instance")
+        if instance is not None:
+            if _is_sharded(instance) and instance._state.db:
+                return instance._state.db
+            if instance._meta.label_lower == "customers.customer":
+                from licenses.services.sharding import shard_for_customer
+
+                return shard_for_customer(instance.pk)
+
+        alias = _current_shard.get()
+        if alias is not None:
+            return alias
+
+        if instance is not None and instance._meta.label_lower == "licenses.license":
+            from licenses.services.sharding import shard_for_customer
+
+            return shard_for_customer(instance.customer_id, for_write=True)
+
+        raise ShardNotSelected(
+            f"No shard selected for {model._meta.label}; wrap the query in use_shard()."
+        )
+
+    db_for_read = _db_for
+    db_for_write = _db_for
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Licenses on a shard point at customers/products/users on "default".
+        if sharding_enabled() and (_is_sharded(obj1) or _is_sharded(obj2)):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # SHARDED_MODELS get no tables on "default". Shards get every table:
+        # the license migrations create foreign keys to customers, products
+        # and users, which therefore exist (empty) on each shard.
+        if not sharding_enabled() or model_name is None:
+            return None
+        if db == "default" and f"{app_label}.{model_name}" in SHARDED_MODELS:
+            return False
+        return None
+
+
+class ShardMiddleware:
+    """
+    Selects the shard of the license named by a license_id URL argument
+    for the rest of the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        token = getattr(request, "_shard_token", None)
+        if token is not None:
+            _current_shard.reset(token)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        license_id = view_kwargs.get("license_id")
+        if not sharding_enabled() or not license_id:
+            return None
+
+        from licenses.services.sharding import CustomerShardMoving, locate_license_shard
+
+        try:
+            alias = locate_license_shard(
+                license_id,
+                for_write=request.method not in ("GET", "HEAD", "OPTIONS"),
+            )
+        except CustomerShardMoving as exc:
+            return JsonResponse({"detail": str(exc)}, status=503)
+
+        # Unknown licenses fall through to the view's own 404 on the first shard.
+        request._shard_token = _current_shard.set(alias or shard_aliases()[0])
+        return None
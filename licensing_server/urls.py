@@ -6,4 +6,9 @@ from django.urls import path, include
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/licenses/", include("licenses.urls")),
+    path("api/customers/", include("customers.urls")),
+    path("api/products/", include("products.urls")),
+    path("api/events/", include("licenses.event_urls")),
+    path("api/ops/", include("licenses.ops_urls")),
+    path("api/jobs/", include("licenses.job_urls")),
 ]
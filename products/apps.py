@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'products'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from .models import Edition, FeatureDefinition, Product
+        from .services.catalog import invalidate_catalog
+
+        for model in (Product, Edition, FeatureDefinition):
+            post_save.connect(invalidate_catalog, sender=model, dispatch_uid=f"catalog-{model.__name__}-save")
+            post_delete.connect(invalidate_catalog, sender=model, dispatch_uid=f"catalog-{model.__name__}-delete")
@@ -0,0 +1,130 @@
+# products/services/catalog.py
+
+"""
+Read-only product catalog (products with their editions and features).
+
+The catalog is served as one pre-rendered JSON document stored in the
+Django cache under the current catalog version. Saving or deleting a
+Product, Edition or FeatureDefinition bumps the version (after commit),
+so the next request renders a fresh document and clients holding the
+old ETag get the new one instead of a 304.
+
+The document is built from the primary, not a read replica: a lagging
+replica would render the pre-change catalog and cache it under the new
+version, where no later bump replaces it until it expires.
+
+Like the read-your-writes marker in licensing_server/db_routing.py this
+relies on the cache: with several processes, use a shared cache backend
+or bumps only reach the process that made the change (until
+CATALOG_CACHE_SECONDS runs out).
+"""
+
+import json
+import time
+from typing import Any, Dict, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+
+from licensing_server.db_routing import PRIMARY_DATABASE
+from products.models import Edition, FeatureDefinition, Product
+
+
+_VERSION_CACHE_KEY = "catalog:version"
+_DOCUMENT_CACHE_KEY = "catalog:document:{version}"
+
+
+def catalog_version() -> int:
+    """
+    Current catalog version. A missing version (cold or evicted cache)
+    starts from the clock, so it never repeats one handed out before.
+    """
+    version = cache.get(_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(_VERSION_CACHE_KEY, time.time_ns() // 1000, settings.CATALOG_CACHE_SECONDS)
+        version = cache.get(_VERSION_CACHE_KEY)
+    return version
+
+
+def catalog_etag(version: int) -> str:
+    return f'"catalog-{version}"'
+
+
+def bump_catalog_version() -> None:
+    try:
+        cache.incr(_VERSION_CACHE_KEY)
+    except ValueError:
+        # Not cached: the next catalog_version() starts a new one.
+        pass
+
+
+def invalidate_catalog(**kwargs) -> None:
+    """
+    post_save / post_delete receiver for the catalog models.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+def build_catalog() -> Dict[str, Any]:
+    """
+    The full catalog as plain data, read from the primary: three
+    queries, regardless of size.
+    """
+    products = (
+        Product.objects.using(PRIMARY_DATABASE)
+        .order_by("code")
+        .prefetch_related(
+            Prefetch("editions", queryset=Edition.objects.using(PRIMARY_DATABASE).order_by("code")),
+            Prefetch("features", queryset=FeatureDefinition.objects.using(PRIMARY_DATABASE).order_by("key")),
+        )
+    )
+    return {
+        "products": [
+            {
+                "id": product.id,
+                "code": product.code,
+                "name": product.name,
+                "description": product.description,
+                "is_active": product.is_active,
+                "editions": [
+                    {
+                        "id": edition.id,
+                        "code": edition.code,
+                        "name": edition.name,
+                        "description": edition.description,
+                        "is_active": edition.is_active,
+                    }
+                    for edition in product.editions.all()
+                ],
+                "features": [
+                    {
+                        "id": feature.id,
+                        "key": feature.key,
+                        "name": feature.name,
+                        "description": feature.description,
+                        "feature_type": feature.feature_type,
+                        "default_value": feature.default_value,
+                        "is_deprecated": feature.is_deprecated,
+                    }
+                    for feature in product.features.all()
+                ],
+            }
+            for product in products
+        ],
+    }
+
+
+def get_catalog_document() -> Tuple[int, bytes]:
+    """
+    (version, rendered JSON) of the current catalog, rendering it on a miss.
+    """
+    version = catalog_version()
+    cache_key = _DOCUMENT_CACHE_KEY.format(version=version)
+    document = cache.get(cache_key)
+    if document is None:
+        catalog = {"version": version, **build_catalog()}
+        document = json.dumps(catalog, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        cache.set(cache_key, document, settings.CATALOG_CACHE_SECONDS)
+    return version, document
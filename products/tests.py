@@ -1,3 +1,58 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from products.models import Edition, Product
+from products.services import catalog
+
+
+class CatalogViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.product = Product.objects.create(id="prod-1", code="app", name="App")
+        Edition.objects.create(id="ed-1", product=self.product, code="ent", name="Enterprise")
+        self.client.force_login(get_user_model().objects.create_user(username="op"))
+
+    def test_unchanged_catalog_is_not_modified(self):
+        with mock.patch.object(catalog, "build_catalog", wraps=catalog.build_catalog) as build:
+            first = self.client.get("/api/products/catalog/")
+            etag = first["ETag"]
+
+            self.assertEqual(first.status_code, 200)
+            document = json.loads(first.content)
+            self.assertEqual(etag, f'"catalog-{document["version"]}"')
+            self.assertEqual(
+                [(item["code"], [edition["code"] for edition in item["editions"]]) for item in document["products"]],
+                [("app", ["ent"])],
+            )
+
+            for if_none_match in (etag, f"W/{etag}", f'"catalog-0", {etag}', "*"):
+                with self.subTest(if_none_match=if_none_match):
+                    response = self.client.get("/api/products/catalog/", HTTP_IF_NONE_MATCH=if_none_match)
+                    self.assertEqual(response.status_code, 304)
+                    self.assertEqual(response.content, b"")
+                    self.assertEqual(response["ETag"], etag)
+
+            self.assertEqual(self.client.get("/api/products/catalog/").content, first.content)
+        self.assertEqual(build.call_count, 1)
+
+    def test_changes_replace_the_etag(self):
+        etag = self.client.get("/api/products/catalog/")["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.name = "App 2"
+            self.product.save()
+        response = self.client.get("/api/products/catalog/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(json.loads(response.content)["products"][0]["name"], "App 2")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Edition.objects.get(id="ed-1").delete()
+        response = self.client.get("/api/products/catalog/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(json.loads(response.content)["products"][0]["editions"], [])
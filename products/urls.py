@@ -0,0 +1,9 @@
+# products/urls.py
+
+from django.urls import path
+
+from .views import CatalogView
+
+urlpatterns = [
+    path("catalog/", CatalogView.as_view(), name="product-catalog"),
+]
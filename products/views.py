@@ -1,3 +1,50 @@
-from django.shortcuts import render
+# products/views.py
 
-# Create your views here.
+from django.http import HttpResponse
+from rest_framework import permissions, status
+from rest_framework.views import APIView
+
+from .services.catalog import catalog_etag, catalog_version, get_catalog_document
+
+
+class CatalogView(APIView):
+    """
+    GET /api/products/catalog/
+
+    Every product with its editions and features:
+    {
+      "version": 1760842112000000,
+      "products": [
+        { "id": "prod-...", "code": "...", "name": "...", "description": "...",
+          "is_active": true,
+          "editions": [ { "id", "code", "name", "description", "is_active" } ],
+          "features": [ { "id", "key", "name", "description", "feature_type",
+                          "default_value", "is_deprecated" } ] }
+      ]
+    }
+
+    The response carries an ETag; send it back in If-None-Match to get
+    304 Not Modified while the catalog is unchanged.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        etag = catalog_etag(catalog_version())
+        if _etag_matches(request.headers.get("If-None-Match", ""), etag):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            version, document = get_catalog_document()
+            # Label the document with the version it was rendered for.
+            etag = catalog_etag(version)
+            response = HttpResponse(document, content_type="application/json", status=status.HTTP_200_OK)
+
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match.
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
@@ -0,0 +1,85 @@
+import argparse
+import json
+import sys
+import time
+
+from licenses.services.verification import (
+    iter_license_paths,
+    verify_license_files,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Verify .license files offline against the public keys in a key directory. "
+            "Run from the repository root as: python -m scripts.verify_license ..."
+        )
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="License files and/or directories (searched recursively for *.license).",
+    )
+    parser.add_argument(
+        "--key-dir",
+        default="keys",
+        help="Directory containing <key-id>-public.pem files (default: ./keys)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for batch mode (default: number of CPUs).",
+    )
+    parser.add_argument(
+        "--no-validity",
+        action="store_true",
+        help="Only check signatures, not valid_from / valid_until.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON result per line instead of text.",
+    )
+    parser.add_argument(
+        "--failures-only",
+        action="store_true",
+        help="Only print licenses that failed verification.",
+    )
+
+    # Parse CLI args
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    total = failed = 0
+
+    for result in verify_license_files(
+        iter_license_paths(args.paths),
+        key_dir=args.key_dir,
+        workers=args.workers,
+        check_validity=not args.no_validity,
+    ):
+        total += 1
+        failed += not result.ok
+
+        if args.failures_only and result.ok:
+            continue
+        if args.json:
+            print(json.dumps(result.as_dict()))
+        else:
+            status = "OK  " if result.ok else "FAIL"
+            detail = f" - {result.reason}" if result.reason else ""
+            print(f"[{status}] {result.path} ({result.license_id}, key {result.key_id}){detail}")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{total} verified, {failed} failed in {elapsed:.2f}s "
+        f"({total / elapsed if elapsed else 0:.0f} files/s)",
+        file=sys.stderr,
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()